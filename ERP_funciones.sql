@@ -41,7 +41,7 @@ INSERT INTO usuario (usu_id, usu_nombre, usu_correo, usu_contra, usu_puesto, usu
 ### CRUD tabla logistica
 
 ### Gestion de gastos internos:
-SELECT SUM(fin_monto) FROM finanza WHERE fin_tipo = 'gasto' AND fin_desc LIKE '%interno%';
+SELECT SUM(fin_monto) FROM finanza WHERE fin_tipo = 'gasto' AND MATCH(fin_desc) AGAINST ('+interno*' IN BOOLEAN MODE);
 
 ### Gestión de viajes: (viajes planificados).
 SELECT * FROM logistica WHERE log_estado = 'Planificado';
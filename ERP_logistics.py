@@ -7,20 +7,30 @@
 # pip install python-dotenv
 # pip install matplotlib
 # pip install pyqt5
+# pip install openpyxl  (opcional, exportar a XLSX)
+# pip install pyarrow   (opcional, exportar a Parquet)
 # en mysql terminal: 
 # CREATE USER 'gp_log'@'localhost' IDENTIFIED BY '1234'; GRANT ALL PRIVILEGES ON gp_logistics.* TO 'gp_log'@'localhost'; FLUSH PRIVILEGES;
 # mysql -u gp_log -p -h localhost
 # mysql -u gp_log -p -h 127.0.0.1 -P 3306 -- para fedora
 import sys
+import arranque
+# --profile-startup: tiempos de los imports y de cada fase del arranque (ver arranque.py)
+arranque.iniciar(sys.argv)
 from PyQt5.QtWidgets import (QApplication, QWidget, QVBoxLayout, QHBoxLayout,
                             QLabel, QLineEdit, QPushButton, QMessageBox, QCheckBox)
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QTimer
 from PyQt5.QtGui import QFont, QIcon, QPixmap
 import mysql.connector
 from dotenv import load_dotenv
 from login import *
+from conexion import obtenerConexion
+import medicion
+import vigilancia
+import atexit
 import os
 
+arranque.marca("importaciones")
 load_dotenv()
 """
 print(f"DB_HOST: {os.environ.get('DB_HOST')}")
@@ -28,35 +38,41 @@ print(f"DB_DATABASE: {os.environ.get('DB_DATABASE')}")
 print(f"DB_USER: {os.environ.get('DB_USER')}")
 print(f"DB_PASSWORD: {os.environ.get('DB_PASSWORD')}")
 """
-try:
-    # Obtener las variables de entorno
-    db_host = os.environ.get("DB_HOST")
-    db_database = os.environ.get("DB_DATABASE")
-    db_user = os.environ.get("DB_USER")
-    db_password = os.environ.get("DB_PASSWORD")
+# Prueba de conexion; con --profile-startup se mide como sonda_bd
+with arranque.fase("sonda_bd"):
+    try:
+        # Obtener las variables de entorno
+        db_host = os.environ.get("DB_HOST")
+        db_database = os.environ.get("DB_DATABASE")
+        db_user = os.environ.get("DB_USER")
+        db_password = os.environ.get("DB_PASSWORD")
 
-    # Establecer la conexión utilizando las variables de entorno
-    conn = mysql.connector.connect(
-        host=db_host,
-        database=db_database,
-        user=db_user,
-        password=db_password
-    )
+        # Establecer la conexión utilizando el pool compartido (queda precalentado para los modulos)
+        conn = obtenerConexion()
 
-    if conn.is_connected():
-        print(f"Conexión exitosa a la base de datos: {db_database} en {db_host}")
-        cursor = conn.cursor(dictionary=True)
+        if conn.is_connected():
+            print(f"Conexión exitosa a la base de datos: {db_database} en {db_host}")
+            cursor = conn.cursor(dictionary=True)
 
-except mysql.connector.Error as err:
-    print(f"Error al conectar a MySQL: {err}")
+    except mysql.connector.Error as err:
+        print(f"Error al conectar a MySQL: {err}")
 
-finally:
-        if 'conn' in locals() and conn.is_connected():
-            cursor.close()
-            conn.close()
+    finally:
+            if 'conn' in locals() and conn.is_connected():
+                cursor.close()
+                conn.close()
 
 if __name__ == '__main__':
-    app = QApplication(sys.argv)
-    login_window = LoginWindow()
+    if medicion.ACTIVA:
+        # Al cerrar: metodos y consultas que mas tiempo pasaron en la base
+        atexit.register(medicion.imprimirResumen)
+    with arranque.fase("qapplication"):
+        app = QApplication(sys.argv)
+    with arranque.fase("login_window"):
+        login_window = LoginWindow()
+    arranque.medirPintado(login_window, "pintado_login")
     login_window.show()
+    # Registra en congelamientos.log las pilas de la interfaz cuando se congela; arranca
+    # ya dentro del ciclo de eventos para no contar la creacion de LoginWindow como congelamiento
+    QTimer.singleShot(0, lambda: vigilancia.iniciar(app))
     sys.exit(app.exec_())
@@ -0,0 +1,114 @@
+# Columna de acciones dibujada por un delegate.
+# Antes cada fila tenia un QWidget con su layout y 2-3 QPushButton creados con
+# setIndexWidget; con tablas grandes eso eran cientos de miles de widgets.
+# Aqui los botones solo se pintan y los clicks se resuelven por posicion.
+from PyQt5.QtWidgets import QStyledItemDelegate
+from PyQt5.QtCore import Qt, QEvent, QRect, QSize, QTimer
+from PyQt5.QtGui import QColor, QFont, QPainter
+
+# Colores (normal, hover, presionado), los mismos de las hojas de estilo de las ventanas
+COLORES_BOTON = ("#94a7cb", "#3a68be", "#1f3868")
+COLORES_ELIMINAR = ("#dc3545", "#9c1b28", "#9c1b28")
+
+class Boton:
+    # funcion recibe la fila de la tabla en la que se hizo click
+    def __init__(self, texto, funcion, ancho=90, eliminar=False):
+        self.texto = texto
+        self.funcion = funcion
+        self.ancho = ancho
+        self.colores = COLORES_ELIMINAR if eliminar else COLORES_BOTON
+
+class BotonesDelegate(QStyledItemDelegate):
+    def __init__(self, vista, botones, alto=30, espacio=6, margen=4):
+        super().__init__(vista)
+        self.vista = vista
+        self.botones = botones
+        self.alto = alto
+        self.espacio = espacio
+        self.margen = margen
+        self._hover = None       # (fila, boton) bajo el mouse
+        self._presionado = None  # (fila, boton) donde se presiono el mouse
+        vista.setMouseTracking(True)
+        vista.viewport().installEventFilter(self)
+
+    def _rectangulos(self, rect):
+        ancho_total = sum(b.ancho for b in self.botones) + self.espacio * (len(self.botones) - 1)
+        alto = min(self.alto, max(0, rect.height() - 2 * self.margen))
+        x = rect.x() + max(self.margen, (rect.width() - ancho_total) // 2)
+        y = rect.y() + (rect.height() - alto) // 2
+        rectangulos = []
+        for boton in self.botones:
+            rectangulos.append(QRect(x, y, boton.ancho, alto))
+            x += boton.ancho + self.espacio
+        return rectangulos
+
+    def paint(self, painter, option, index):
+        # Fondo de la celda (seleccion, colores alternos) como en las demas columnas
+        super().paint(painter, option, index)
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        fuente = QFont(option.font)
+        fuente.setBold(True)
+        painter.setFont(fuente)
+        for i, rect in enumerate(self._rectangulos(option.rect)):
+            boton = self.botones[i]
+            normal, hover, presionado = boton.colores
+            if self._presionado == (index.row(), i):
+                color = presionado
+            elif self._hover == (index.row(), i):
+                color = hover
+            else:
+                color = normal
+            painter.setPen(Qt.NoPen)
+            painter.setBrush(QColor(color))
+            painter.drawRoundedRect(rect, 4, 4)
+            painter.setPen(QColor("white"))
+            painter.drawText(rect, Qt.AlignCenter, boton.texto)
+        painter.restore()
+
+    def sizeHint(self, option, index):
+        ancho = sum(b.ancho for b in self.botones) + self.espacio * (len(self.botones) - 1)
+        return QSize(ancho + 2 * self.margen, self.alto + 2 * self.margen)
+
+    def _botonEn(self, pos):
+        """Retorna (fila, boton) bajo la posicion del viewport, o None."""
+        index = self.vista.indexAt(pos)
+        if not index.isValid() or self.vista.itemDelegate(index) is not self:
+            return None
+        for i, rect in enumerate(self._rectangulos(self.vista.visualRect(index))):
+            if rect.contains(pos):
+                return (index.row(), i)
+        return None
+
+    def _actualizarHover(self, actual):
+        if actual != self._hover:
+            self._hover = actual
+            if actual is None:
+                self.vista.viewport().unsetCursor()
+            else:
+                self.vista.viewport().setCursor(Qt.PointingHandCursor)
+            self.vista.viewport().update()
+
+    def eventFilter(self, objeto, event):
+        tipo = event.type()
+        if tipo == QEvent.MouseMove:
+            self._actualizarHover(self._botonEn(event.pos()))
+        elif tipo == QEvent.Leave:
+            self._actualizarHover(None)
+        elif tipo in (QEvent.MouseButtonPress, QEvent.MouseButtonDblClick) and event.button() == Qt.LeftButton:
+            actual = self._botonEn(event.pos())
+            if actual is not None:
+                self._presionado = actual
+                self.vista.viewport().update()
+                return True
+        elif tipo == QEvent.MouseButtonRelease and event.button() == Qt.LeftButton and self._presionado is not None:
+            presionado = self._presionado
+            self._presionado = None
+            self.vista.viewport().update()
+            if self._botonEn(event.pos()) == presionado:
+                fila, boton = presionado
+                funcion = self.botones[boton].funcion
+                # Se llama despues del evento, la funcion puede abrir dialogos o recargar el modelo
+                QTimer.singleShot(0, lambda: funcion(fila))
+            return True
+        return super().eventFilter(objeto, event)
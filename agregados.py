@@ -0,0 +1,116 @@
+# Servicio de agregados de finanzas.
+# El tablero de Finanzas y el de Gestion necesitaban la serie diaria y mensual
+# de ingresos y gastos mas los totales de cada tipo; antes eran 4-5 consultas
+# (un GROUP BY y un SUM por tipo). Aqui se hace un solo recorrido de `finanza`
+# con agregacion condicional y el resto se calcula en Python.
+# consultarResumenMensual lee los meses completos de resumen_finanza_mes
+# (005_resumenes.sql) y solo los dias de los meses incompletos de `finanza`.
+import datetime
+import decimal
+from collections import OrderedDict
+
+class ResumenFinanzas:
+    def __init__(self, filas=()):
+        # filas: (fecha, monto ingresos, monto gastos, num ingresos, num gastos) ordenadas por fecha
+        self.ingresos_diarios = []  # [(fecha, monto)] solo dias con ingresos
+        self.gastos_diarios = []    # [(fecha, monto)] solo dias con gastos
+        self.total_ingresos = 0
+        self.total_gastos = 0
+        ingresos_mes = OrderedDict()
+        gastos_mes = OrderedDict()
+
+        for fecha, ingreso, gasto, num_ingresos, num_gastos in filas:
+            mes = fecha.strftime("%Y-%m")
+            if num_ingresos:
+                self.ingresos_diarios.append((fecha, ingreso))
+                ingresos_mes[mes] = ingresos_mes.get(mes, 0) + ingreso
+                self.total_ingresos += ingreso
+            if num_gastos:
+                self.gastos_diarios.append((fecha, gasto))
+                gastos_mes[mes] = gastos_mes.get(mes, 0) + gasto
+                self.total_gastos += gasto
+
+        self.ingresos_mensuales = list(ingresos_mes.items())  # [("YYYY-MM", monto)]
+        self.gastos_mensuales = list(gastos_mes.items())
+
+def consultarResumenFinanzas(cursor, fecha_inicio=None, fecha_fin=None):
+    """Retorna el ResumenFinanzas de todo finanza o del rango de fechas indicado."""
+    query = """
+        SELECT fin_fecha,
+               SUM(CASE WHEN fin_tipo = 'ingreso' THEN fin_monto ELSE 0 END),
+               SUM(CASE WHEN fin_tipo = 'gasto' THEN fin_monto ELSE 0 END),
+               SUM(fin_tipo = 'ingreso'),
+               SUM(fin_tipo = 'gasto')
+        FROM finanza
+    """
+    params = ()
+    if fecha_inicio is not None and fecha_fin is not None:
+        query += " WHERE fin_fecha BETWEEN %s AND %s"
+        params = (fecha_inicio, fecha_fin)
+    query += " GROUP BY fin_fecha ORDER BY fin_fecha"
+    cursor.execute(query, params)
+    return ResumenFinanzas(cursor.fetchall())
+
+def consultarTotalesTipo(cursor, tipo, fecha_inicio, fecha_fin):
+    """Retorna (total general, total en el rango de fechas) de un tipo en una sola consulta."""
+    cursor.execute("""
+        SELECT SUM(fin_monto),
+               SUM(CASE WHEN fin_fecha BETWEEN %s AND %s THEN fin_monto ELSE 0 END)
+        FROM finanza
+        WHERE fin_tipo = %s
+    """, (fecha_inicio, fecha_fin, tipo))
+    total, total_periodo = cursor.fetchone()
+    return total or 0, total_periodo or 0
+
+def _fecha(valor):
+    return datetime.date.fromisoformat(valor) if isinstance(valor, str) else valor
+
+def _decimal(valor):
+    # bdmemoria (sqlite) regresa SUM() como float y las columnas DECIMAL como Decimal
+    return valor if isinstance(valor, decimal.Decimal) else decimal.Decimal(str(valor))
+
+def _meses(inicio, fin):
+    """Divide [inicio, fin] en (primer dia, ultimo dia, completo) por mes."""
+    partes = []
+    dia = inicio
+    while dia <= fin:
+        siguiente = datetime.date(dia.year + dia.month // 12, dia.month % 12 + 1, 1)
+        fin_mes = siguiente - datetime.timedelta(days=1)
+        partes.append((dia, min(fin, fin_mes), dia.day == 1 and fin >= fin_mes))
+        dia = siguiente
+    return partes
+
+def consultarResumenMensual(cursor, fecha_inicio, fecha_fin):
+    """Retorna el ResumenFinanzas por mes del rango de fechas (sin las series diarias).
+
+    Los meses completos salen de resumen_finanza_mes; solo el primer y el ultimo mes
+    del rango, si estan incompletos, se suman desde finanza con el indice de fin_fecha.
+    """
+    partes = _meses(_fecha(fecha_inicio), _fecha(fecha_fin))
+    montos = OrderedDict((inicio.strftime("%Y-%m"), {}) for inicio, _, _ in partes)
+    completos = [inicio.strftime("%Y-%m") for inicio, _, completo in partes if completo]
+    if completos:
+        cursor.execute("""
+            SELECT rfm_mes, rfm_tipo, rfm_monto FROM resumen_finanza_mes
+            WHERE rfm_mes BETWEEN %s AND %s AND rfm_num > 0
+        """, (completos[0], completos[-1]))
+        for mes, tipo, monto in cursor.fetchall():
+            montos[mes][tipo] = _decimal(monto)
+    for inicio, fin, completo in partes:
+        if completo:
+            continue
+        cursor.execute("""
+            SELECT fin_tipo, SUM(fin_monto) FROM finanza
+            WHERE fin_fecha BETWEEN %s AND %s GROUP BY fin_tipo
+        """, (inicio, fin))
+        montos[inicio.strftime("%Y-%m")].update((tipo, _decimal(monto)) for tipo, monto in cursor.fetchall())
+
+    resumen = ResumenFinanzas()
+    for mes, tipos in montos.items():
+        if "ingreso" in tipos:
+            resumen.ingresos_mensuales.append((mes, tipos["ingreso"]))
+            resumen.total_ingresos += tipos["ingreso"]
+        if "gasto" in tipos:
+            resumen.gastos_mensuales.append((mes, tipos["gasto"]))
+            resumen.total_gastos += tipos["gasto"]
+    return resumen
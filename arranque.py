@@ -0,0 +1,232 @@
+# Perfil del arranque de la aplicacion (python3 ERP_logistics.py --profile-startup).
+# Mide el tiempo de cada import (acumulado y propio, como python -X importtime,
+# incluidos los de los modulos que se importan al iniciar sesion), la prueba de
+# conexion a la base, la creacion de QApplication y de LoginWindow, el primer
+# pintado de la ventana de inicio de sesion y, despues del click en "Iniciar
+# sesión", la construccion de la ventana del modulo, su primer pintado y su
+# primera tabla con filas.
+#
+# El reporte es JSON: --profile-startup lo imprime en la salida estandar y
+# --profile-startup=arranque.json lo guarda en el archivo. Se escribe cuando se
+# llena la primera tabla del modulo o, si no se inicia sesion, al cerrar.
+#
+# Este modulo solo importa la biblioteca estandar (PyQt5 hasta que se necesita)
+# y ERP_logistics.py lo importa antes que todo lo demas.
+import atexit
+import builtins
+import contextlib
+import datetime
+import importlib
+import importlib.util
+import json
+import os
+import platform
+import sys
+import threading
+import time
+
+OPCION = "--profile-startup"
+# Revision de las tablas del modulo hasta que una tiene filas
+REVISION_MS = 10
+ESPERA_TABLA_S = 120
+
+ACTIVO = False
+_inicio = time.perf_counter()
+_destino = None
+_escrito = False
+_importaciones = []
+_fases = {}
+_marcas = {}
+_modulo = None
+_local = threading.local()
+_lock = threading.Lock()
+_importar_original = builtins.__import__
+_import_module_original = importlib.import_module
+# Filtros de eventos y timers vivos mientras se mide
+_vivos = []
+
+def _ms(segundos):
+    return round(segundos * 1000, 3)
+
+def _ahora():
+    return time.perf_counter() - _inicio
+
+def _interprete():
+    # Segundos desde que arranco el proceso hasta este modulo (solo Linux, resolucion de ~10 ms)
+    try:
+        with open("/proc/self/stat") as archivo:
+            inicio = int(archivo.read().rsplit(")", 1)[1].split()[19])
+        with open("/proc/uptime") as archivo:
+            activo = float(archivo.read().split()[0])
+        return max(0.0, activo - inicio / os.sysconf("SC_CLK_TCK") - _ahora())
+    except (OSError, ValueError, IndexError):
+        return None
+
+def _medirImportacion(nombre, importar):
+    if not nombre or nombre in sys.modules:
+        return importar()
+    pila = getattr(_local, "pila", None)
+    if pila is None:
+        pila = _local.pila = []
+    # Cada nivel acumula el tiempo de sus imports hijos para calcular el propio
+    pila.append(0.0)
+    inicio = time.perf_counter()
+    try:
+        return importar()
+    finally:
+        acumulado = time.perf_counter() - inicio
+        hijos = pila.pop()
+        if pila:
+            pila[-1] += acumulado
+        if nombre in sys.modules:
+            with _lock:
+                _importaciones.append({
+                    "modulo": nombre,
+                    "inicio_ms": _ms(inicio - _inicio),
+                    "acumulado_ms": _ms(acumulado),
+                    "propio_ms": _ms(acumulado - hijos),
+                    "nivel": len(pila),
+                    "hilo": threading.current_thread().name,
+                })
+
+def _importar(name, globals=None, locals=None, fromlist=(), level=0):
+    nombre = name
+    if level:
+        try:
+            nombre = importlib.util.resolve_name("." * level + name, (globals or {}).get("__package__"))
+        except (ImportError, ValueError):
+            nombre = None
+    return _medirImportacion(nombre, lambda: _importar_original(name, globals, locals, fromlist, level))
+
+def _importModule(name, package=None):
+    try:
+        nombre = importlib.util.resolve_name(name, package)
+    except (ImportError, ValueError):
+        nombre = None
+    return _medirImportacion(nombre, lambda: _import_module_original(name, package))
+
+def iniciar(argv):
+    """Activa el perfil si argv trae --profile-startup (y la quita de argv)."""
+    global ACTIVO, _destino
+    for argumento in list(argv[1:]):
+        if argumento == OPCION or argumento.startswith(OPCION + "="):
+            argv.remove(argumento)
+            _destino = argumento.partition("=")[2] or None
+            ACTIVO = True
+    if not ACTIVO:
+        return False
+    segundos = _interprete()
+    _fases["interprete_ms"] = None if segundos is None else _ms(segundos)
+    builtins.__import__ = _importar
+    importlib.import_module = _importModule
+    atexit.register(escribir)
+    return True
+
+@contextlib.contextmanager
+def fase(nombre):
+    """Mide la duracion del bloque como <nombre>_ms (no hace nada sin --profile-startup)."""
+    if not ACTIVO:
+        yield
+        return
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        _fases[f"{nombre}_ms"] = _ms(time.perf_counter() - inicio)
+
+def marca(nombre):
+    """Guarda los milisegundos desde el arranque hasta este punto (la primera vez)."""
+    if ACTIVO and nombre not in _marcas:
+        _marcas[nombre] = _ms(_ahora())
+
+def medirPintado(widget, nombre):
+    """Marca nombre con el primer evento Paint de widget."""
+    if not ACTIVO:
+        return
+    from PyQt5.QtCore import QEvent, QObject
+
+    class FiltroPintado(QObject):
+        def eventFilter(self, objeto, evento):
+            if evento.type() == QEvent.Paint:
+                marca(nombre)
+                objeto.removeEventFilter(self)
+            return False
+
+    filtro = FiltroPintado(widget)
+    widget.installEventFilter(filtro)
+    _vivos.append(filtro)
+
+def medirVentanaModulo(ventana, usu_mod):
+    """Despues de crear la ventana del modulo: marca su primer pintado y su primera tabla con filas."""
+    global _modulo
+    if not ACTIVO:
+        return
+    from PyQt5.QtCore import QTimer
+    from PyQt5.QtWidgets import QAbstractItemView
+
+    _modulo = usu_mod
+    marca("ventana_modulo")
+    medirPintado(ventana, "pintado_modulo")
+    limite = time.perf_counter() + ESPERA_TABLA_S
+
+    def revisar():
+        # Las tablas se llenan en el constructor, en el ejecutor o al cambiar de pagina
+        for vista in ventana.findChildren(QAbstractItemView):
+            modelo = vista.model()
+            if modelo is not None and modelo.rowCount() > 0:
+                marca("tabla_modulo")
+                break
+        if ("tabla_modulo" in _marcas and "pintado_modulo" in _marcas) or time.perf_counter() > limite:
+            timer.stop()
+            escribir()
+
+    timer = QTimer(ventana)
+    timer.timeout.connect(revisar)
+    timer.start(REVISION_MS)
+    _vivos.append(timer)
+    revisar()
+
+def _desde(marcas, inicio, fin):
+    if inicio in marcas and fin in marcas:
+        return round(marcas[fin] - marcas[inicio], 3)
+    return None
+
+def reporte():
+    """Retorna el perfil del arranque como diccionario."""
+    with _lock:
+        importaciones = list(_importaciones)
+    marcas = dict(_marcas)
+    return {
+        "fecha": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "modulo": _modulo,
+        "fases": {
+            **_fases,
+            "importaciones_ms": marcas.get("importaciones"),
+            "pintado_login_ms": marcas.get("pintado_login"),
+            "login_a_ventana_ms": _desde(marcas, "clic_login", "ventana_modulo"),
+            "login_a_pintado_ms": _desde(marcas, "clic_login", "pintado_modulo"),
+            "login_a_tabla_ms": _desde(marcas, "clic_login", "tabla_modulo"),
+        },
+        # Milisegundos desde que se importo este modulo
+        "marcas": marcas,
+        "importaciones": importaciones,
+    }
+
+def escribir():
+    """Escribe el reporte una sola vez en el destino de --profile-startup."""
+    global _escrito
+    if not ACTIVO or _escrito:
+        return
+    _escrito = True
+    texto = json.dumps(reporte(), indent=2, ensure_ascii=False)
+    if _destino is None:
+        print(texto)
+        return
+    try:
+        with open(_destino, "w", encoding="utf-8") as archivo:
+            archivo.write(texto)
+        print(f"Perfil del arranque en {_destino}")
+    except OSError as err:
+        print(f"No se pudo escribir el perfil del arranque: {err}")
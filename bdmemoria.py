@@ -0,0 +1,238 @@
+# Base de datos en memoria para pruebas de carga sin servidor MySQL.
+# Crea el esquema de ERP_GP_logistics.sql (y los indices de migraciones/) en un
+# sqlite3 en memoria, con el control de cambios de 002_control_cambios.sql
+# traducido a sqlite (columnas en el CREATE TABLE y triggers AFTER UPDATE/DELETE),
+# y expone una conexion con la misma interfaz que usan los modulos de
+# mysql.connector: cursor(), execute con parametros %s, fetchone, fetchall,
+# lastrowid, commit, close. Solo la usa benchmark.py; los tiempos no
+# son los de MySQL pero sirven para comparar el costo de Python/Qt entre commits.
+# MATCH ... AGAINST (busqueda.py) se emula con la funcion coincidenciaTexto, que
+# recorre la tabla: sqlite no tiene los indices FULLTEXT de 004_busqueda_texto.sql.
+# Los triggers de 005_resumenes.sql se crean con el UPSERT de sqlite.
+import datetime
+import decimal
+import os
+import re
+import sqlite3
+import threading
+import unicodedata
+import migrar
+from sincronizacion import TABLAS
+from resumenes import RESUMENES, columnasResumen, expresionGrupo
+
+ESQUEMA = os.path.join(os.path.dirname(os.path.abspath(__file__)), "ERP_GP_logistics.sql")
+
+sqlite3.register_adapter(datetime.date, lambda fecha: fecha.isoformat())
+sqlite3.register_adapter(datetime.datetime, lambda fecha: fecha.isoformat(" "))
+sqlite3.register_adapter(decimal.Decimal, float)
+sqlite3.register_converter("DATE", lambda valor: datetime.date.fromisoformat(valor.decode()))
+sqlite3.register_converter("DECIMAL", lambda valor: decimal.Decimal(valor.decode()))
+sqlite3.register_converter("TIMESTAMP", lambda valor: datetime.datetime.fromisoformat(valor.decode()))
+
+# Equivalente de NOW(6) / CURRENT_TIMESTAMP(6), con milisegundos
+AHORA = "strftime('%Y-%m-%d %H:%M:%f', 'now')"
+
+_FOR_UPDATE = re.compile(r"\s+FOR\s+UPDATE\s*$", re.IGNORECASE)
+_DATE_FORMAT = re.compile(r"DATE_FORMAT\(\s*([\w.]+)\s*,\s*('[^']*')\s*\)", re.IGNORECASE)
+_NOW = re.compile(r"\bNOW\(6\)", re.IGNORECASE)
+_CREATE_TABLE = re.compile(r"^\s*CREATE TABLE (\w+)", re.IGNORECASE)
+_MATCH = re.compile(r"MATCH\(\s*([\w.]+)\s*\)\s*AGAINST\s*\(\s*%s\s+IN\s+BOOLEAN\s+MODE\s*\)", re.IGNORECASE)
+_TERMINO = re.compile(r"\+(\w+)\*")
+_PALABRA = re.compile(r"\w+")
+
+def traducirEsquema(texto):
+    """Convierte el DDL de MySQL de ERP_GP_logistics.sql a sentencias de sqlite."""
+    lineas = []
+    for linea in texto.splitlines():
+        limpia = linea.strip().upper()
+        if limpia.startswith("#") or limpia.startswith("CREATE DATABASE") or limpia.startswith("USE "):
+            continue
+        lineas.append(linea)
+    texto = "\n".join(lineas)
+    texto = re.sub(r"INT PRIMARY KEY AUTO_INCREMENT", "INTEGER PRIMARY KEY AUTOINCREMENT", texto)
+    texto = re.sub(r"ENUM\([^)]*\)", "TEXT", texto)
+    return migrar.leerSentencias(texto)
+
+def agregarColumnasControl(sentencia):
+    """Agrega <prefijo>_version y <prefijo>_modificado al CREATE TABLE de una tabla de negocio."""
+    coincidencia = _CREATE_TABLE.match(sentencia)
+    if not coincidencia or coincidencia.group(1) not in TABLAS:
+        return sentencia
+    prefijo = TABLAS[coincidencia.group(1)][0]
+    columnas = (f"    {prefijo}_version INTEGER NOT NULL DEFAULT 1,\n"
+                f"    {prefijo}_modificado TIMESTAMP NOT NULL DEFAULT ({AHORA}),\n")
+    # sqlite pide las columnas antes de las restricciones de tabla
+    restriccion = re.search(r"^\s*FOREIGN KEY", sentencia, re.MULTILINE)
+    if restriccion:
+        return sentencia[:restriccion.start()] + "\n" + columnas.rstrip(",\n") + "," + sentencia[restriccion.start():]
+    cierre = sentencia.rstrip().rfind(")")
+    return sentencia[:cierre].rstrip() + ",\n" + columnas.rstrip(",\n") + "\n)"
+
+def sentenciasControlCambios():
+    """Retorna las sentencias de sqlite con la tabla de lapidas y los triggers de cada tabla."""
+    sentencias = [
+        "CREATE TABLE registro_borrado (bor_id INTEGER PRIMARY KEY AUTOINCREMENT, bor_tabla TEXT NOT NULL, "
+        f"bor_llave INTEGER NOT NULL, bor_fecha TIMESTAMP NOT NULL DEFAULT ({AHORA}))",
+        "CREATE INDEX idx_borrado_tabla_fecha ON registro_borrado (bor_tabla, bor_fecha)",
+    ]
+    for tabla, (prefijo, llave) in TABLAS.items():
+        sentencias.append(f"CREATE INDEX idx_{tabla}_modificado ON {tabla} ({prefijo}_modificado)")
+        # sqlite no permite SET NEW en un BEFORE UPDATE; el trigger no se vuelve a disparar
+        # porque recursive_triggers esta apagado
+        sentencias.append(
+            f"CREATE TRIGGER trg_{tabla}_version AFTER UPDATE ON {tabla} FOR EACH ROW BEGIN "
+            f"UPDATE {tabla} SET {prefijo}_version = OLD.{prefijo}_version + 1, {prefijo}_modificado = {AHORA} "
+            f"WHERE {llave} = NEW.{llave}; END")
+        sentencias.append(
+            f"CREATE TRIGGER trg_{tabla}_borrado AFTER DELETE ON {tabla} FOR EACH ROW BEGIN "
+            f"INSERT INTO registro_borrado (bor_tabla, bor_llave) VALUES ('{tabla}', OLD.{llave}); END")
+    return sentencias
+
+def sentenciasResumenes():
+    """Retorna los triggers de sqlite que mantienen las tablas de resumen de 005_resumenes.sql."""
+    sentencias = []
+    for resumen, (tabla, _, grupos, monto) in RESUMENES.items():
+        columnas = columnasResumen(resumen)
+        llaves = ", ".join(columnas[:len(grupos)])
+        acumular = ", ".join(f"{columna} = {columna} + excluded.{columna}" for columna in columnas[len(grupos):])
+
+        def sumar(fila, signo):
+            valores = [traducirConsulta(expresionGrupo(nombre, columna, fila)) for nombre, columna in grupos]
+            if monto:
+                valores.append(f"{signo}{fila}.{monto}")
+            valores.append(f"{signo}1")
+            return (f"INSERT INTO {resumen} ({', '.join(columnas)}) VALUES ({', '.join(valores)}) "
+                    f"ON CONFLICT ({llaves}) DO UPDATE SET {acumular};")
+
+        sentencias.append(f"CREATE TRIGGER trg_{tabla}_resumen_alta AFTER INSERT ON {tabla} FOR EACH ROW BEGIN "
+                          f"{sumar('NEW', '')} END")
+        sentencias.append(f"CREATE TRIGGER trg_{tabla}_resumen_cambio AFTER UPDATE ON {tabla} FOR EACH ROW BEGIN "
+                          f"{sumar('OLD', '-')} {sumar('NEW', '')} END")
+        sentencias.append(f"CREATE TRIGGER trg_{tabla}_resumen_baja AFTER DELETE ON {tabla} FOR EACH ROW BEGIN "
+                          f"{sumar('OLD', '-')} END")
+    return sentencias
+
+def _sinAcentos(texto):
+    # Como la collation de MySQL: sin distinguir mayusculas ni acentos
+    return "".join(c for c in unicodedata.normalize("NFD", texto.lower()) if not unicodedata.combining(c))
+
+def coincidenciaTexto(texto, terminos):
+    """Relevancia de texto para los terminos "+palabra* ..." de busqueda.terminosBusqueda; 0 si falta alguno."""
+    if not texto:
+        return 0.0
+    palabras = _PALABRA.findall(_sinAcentos(texto))
+    relevancia = 0
+    for termino in _TERMINO.findall(_sinAcentos(terminos)):
+        encontradas = sum(1 for palabra in palabras if palabra.startswith(termino))
+        if not encontradas:
+            return 0.0
+        relevancia += encontradas
+    return float(relevancia)
+
+def traducirConsulta(query):
+    """Adapta una consulta de MySQL a sqlite (parametros %s, DATE_FORMAT, MATCH y FOR UPDATE)."""
+    query = _DATE_FORMAT.sub(r"strftime(\2, \1)", query)
+    query = _MATCH.sub(r"coincidenciaTexto(\1, %s)", query)
+    query = _NOW.sub(AHORA, query)
+    query = _FOR_UPDATE.sub("", query)
+    return query.replace("%s", "?")
+
+class CursorMemoria:
+    # Cursor con buffer: execute lee todas las filas de una vez, como un cursor
+    # de mysql.connector con buffered=True
+    def __init__(self, conexion, dictionary=False):
+        self._conexion = conexion
+        self._dictionary = dictionary
+        self._filas = []
+        self._posicion = 0
+        self.description = None
+        self.lastrowid = None
+        self.rowcount = -1
+
+    @property
+    def with_rows(self):
+        return self.description is not None
+
+    def execute(self, query, params=None):
+        with self._conexion._lock:
+            cursor = self._conexion._sqlite.execute(traducirConsulta(query), tuple(params or ()))
+            self.description = cursor.description
+            self._filas = cursor.fetchall() if cursor.description else []
+            self.lastrowid = cursor.lastrowid
+            self.rowcount = cursor.rowcount if cursor.description is None else len(self._filas)
+        if self._dictionary and self.description:
+            nombres = [columna[0] for columna in self.description]
+            self._filas = [dict(zip(nombres, fila)) for fila in self._filas]
+        self._posicion = 0
+
+    def executemany(self, query, filas):
+        with self._conexion._lock:
+            cursor = self._conexion._sqlite.executemany(traducirConsulta(query), [tuple(f) for f in filas])
+            self.description = None
+            self._filas = []
+            self.lastrowid = cursor.lastrowid
+            self.rowcount = cursor.rowcount
+
+    def fetchone(self):
+        if self._posicion >= len(self._filas):
+            return None
+        fila = self._filas[self._posicion]
+        self._posicion += 1
+        return fila
+
+    def fetchmany(self, size=1):
+        filas = self._filas[self._posicion:self._posicion + size]
+        self._posicion += len(filas)
+        return filas
+
+    def fetchall(self):
+        filas = self._filas[self._posicion:]
+        self._posicion = len(self._filas)
+        return filas
+
+    def close(self):
+        self._filas = []
+
+class ConexionMemoria:
+    # Una sola base sqlite compartida por todos los hilos; las sentencias se
+    # serializan con un lock (el ejecutor de consultas usa hilos de trabajo)
+    def __init__(self, indices=True):
+        self._sqlite = sqlite3.connect(":memory:", check_same_thread=False,
+                                       detect_types=sqlite3.PARSE_DECLTYPES, isolation_level=None)
+        self._lock = threading.RLock()
+        self._sqlite.create_function("coincidenciaTexto", 2, coincidenciaTexto, deterministic=True)
+        with open(ESQUEMA, encoding="utf-8") as archivo:
+            for sentencia in traducirEsquema(archivo.read()):
+                self._sqlite.execute(agregarColumnasControl(sentencia))
+        for sentencia in sentenciasControlCambios():
+            self._sqlite.execute(sentencia)
+        self.omitidas = []  # sentencias de migraciones que sqlite no entiende
+        if indices:
+            for _, nombre, ruta in migrar.listarMigraciones():
+                with open(ruta, encoding="utf-8") as archivo:
+                    for sentencia in migrar.leerSentencias(archivo.read()):
+                        try:
+                            self._sqlite.execute(traducirConsulta(sentencia))
+                        except sqlite3.Error:
+                            self.omitidas.append((nombre, sentencia))
+            for sentencia in sentenciasResumenes():
+                self._sqlite.execute(sentencia)
+
+    def cursor(self, dictionary=False, buffered=None, prepared=None):
+        return CursorMemoria(self, dictionary)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def ping(self, reconnect=False, attempts=1, delay=0):
+        pass
+
+    def is_connected(self):
+        return True
+
+    def close(self):
+        # La base vive mientras exista el objeto; close() solo "regresa" la conexion
+        pass
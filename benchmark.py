@@ -0,0 +1,281 @@
+# Benchmark de los cargadores de datos de cada modulo.
+# Crea cada ventana (sin mostrar dialogos) y mide cuanto tarda cada metodo de
+# carga, incluyendo las consultas en segundo plano del ejecutor y el repintado.
+# Los resultados se guardan en JSON para comparar entre commits.
+#
+# Uso:
+#   python3 benchmark.py --motor memoria --escala 0.01      -> sqlite en memoria con datos generados
+#   python3 benchmark.py --motor mysql                       -> la base del .env (llenarla antes con generar_datos.py)
+#   python3 benchmark.py --salida actual.json --comparar base.json --tolerancia 20
+#   python3 benchmark.py --solo FinanzasWindow --solo cargarDatosVentas
+#
+# Con --comparar el proceso termina con codigo 1 si algun cargador es mas lento
+# que en el archivo base por mas de --tolerancia por ciento (mediana) y por al
+# menos --min-ms milisegundos.
+import os
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import argparse
+import datetime
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import traceback
+from PyQt5.QtWidgets import QApplication, QMessageBox, QWidget
+import mysql.connector
+import conexion
+import medicion
+from conexion import obtenerConexion, estadisticasPool
+from generar_datos import calcularConteos, poblar
+
+try:
+    import resource  # no existe en Windows
+except ImportError:
+    resource = None
+
+USUARIO = object()  # se reemplaza por el usu_id de prueba
+
+# (ventana, metodo, argumentos) en el orden en que se miden
+CARGADORES = [
+    ("FinanzasWindow", "loadDataMain", ()),
+    ("FinanzasWindow", "loadQueryData", ()),
+    ("RRHHWindow", "loadDataMain", (USUARIO,)),
+    ("RRHHWindow", "loadDataEvaluation", (0, USUARIO)),
+    ("RRHHWindow", "loadRHData", (USUARIO,)),
+    ("LogisticaWindow", "loadDataMain", (USUARIO,)),
+    ("LogisticaWindow", "loadAlmacenData", (USUARIO,)),
+    ("LogisticaWindow", "loadInventarioData", (0, USUARIO)),
+    ("LogisticaWindow", "loadReportesData", (USUARIO,)),
+    ("ComprasWindow", "loadInventarioItems", ()),
+    ("ComprasWindow", "loadSolicitudes", ()),
+    ("ComprasWindow", "loadCompras", ()),
+    ("VentasWindow", "loadInventarioItems", ()),
+    ("VentasWindow", "loadVentas", ()),
+    ("VentasWindow", "loadReportesData", ()),
+    ("MantenimientoWindow", "loadDataMain", (USUARIO,)),
+    ("MantenimientoWindow", "loadDataIncidencia", (USUARIO,)),
+    ("GestionWindow", "cargarDatosFinanzas", ()),
+    ("GestionWindow", "cargarDatosRRHH", ()),
+    ("GestionWindow", "cargarDatosLogistica", ()),
+    ("GestionWindow", "cargarDatosCompras", ()),
+    ("GestionWindow", "cargarDatosVentas", ()),
+    ("GestionWindow", "cargarDatosMantenimiento", ()),
+]
+
+class _Mensajes:
+    # Reemplaza los QMessageBox estaticos durante el benchmark: un dialogo modal
+    # detendria la medicion. Los mensajes de error se reportan en el JSON.
+    def __init__(self):
+        self.errores = []
+
+    def instalar(self):
+        QMessageBox.critical = staticmethod(self._error)
+        QMessageBox.warning = staticmethod(self._error)
+        QMessageBox.information = staticmethod(lambda *args, **kwargs: QMessageBox.Ok)
+        QMessageBox.question = staticmethod(lambda *args, **kwargs: QMessageBox.No)
+
+        # Una excepcion dentro de un slot de Qt aborta el proceso si no hay excepthook propio
+        sys.excepthook = self._excepcion
+
+    def _excepcion(self, tipo, valor, tb):
+        self.errores.append("".join(traceback.format_exception(tipo, valor, tb)))
+
+    def _error(self, parent, titulo, texto, *args, **kwargs):
+        self.errores.append(f"{titulo}: {texto}")
+        return QMessageBox.Ok
+
+    def tomar(self):
+        errores, self.errores = self.errores, []
+        return errores
+
+def _esperar(app, ventana):
+    # Las cargas de Finanzas y Gestion terminan cuando el ejecutor entrega el resultado
+    ejecutor = getattr(ventana, "ejecutor", None)
+    while ejecutor is not None and ejecutor.enCurso():
+        ejecutor.esperar(5)
+        app.processEvents()
+    app.processEvents()
+
+def _crearVentana(nombre, login, usu_id):
+    import finanzas, recursoshumanos, logistica, compras, ventas, mantenimiento, gestion
+    clases = {
+        "FinanzasWindow": finanzas.FinanzasWindow,
+        "RRHHWindow": recursoshumanos.RRHHWindow,
+        "LogisticaWindow": logistica.LogisticaWindow,
+        "ComprasWindow": compras.ComprasWindow,
+        "VentasWindow": ventas.VentasWindow,
+        "MantenimientoWindow": mantenimiento.MantenimientoWindow,
+        "GestionWindow": gestion.GestionWindow,
+    }
+    if nombre == "GestionWindow":
+        return clases[nombre](login)
+    return clases[nombre](login, usu_id)
+
+def _resumen(tiempos, errores):
+    resultado = {"tiempos": [round(t, 6) for t in tiempos], "errores": errores}
+    if tiempos:
+        resultado.update({
+            "min": round(min(tiempos), 6),
+            "mediana": round(statistics.median(tiempos), 6),
+            "promedio": round(statistics.mean(tiempos), 6),
+            "max": round(max(tiempos), 6),
+        })
+    return resultado
+
+def _commitActual():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+def _usuarioPrueba():
+    conn = obtenerConexion()
+    try:
+        cursor = conn.cursor()
+        cursor.execute("SELECT MIN(usu_id) FROM usuario")
+        usu_id = cursor.fetchone()[0]
+        cursor.close()
+    finally:
+        conn.close()
+    return usu_id or 1
+
+def medir(app, repeticiones=5, solo=None):
+    """Mide los cargadores y retorna {"Ventana.metodo": resumen}."""
+    mensajes = _Mensajes()
+    mensajes.instalar()
+    login = QWidget()  # las ventanas solo usan loginWindow para el logout
+    usu_id = _usuarioPrueba()
+    resultados = {}
+
+    ventanas = []
+    for nombre, _, _ in CARGADORES:
+        if nombre not in ventanas:
+            ventanas.append(nombre)
+
+    for nombre_ventana in ventanas:
+        cargadores = [(m, a) for v, m, a in CARGADORES if v == nombre_ventana
+                      and (not solo or v in solo or m in solo or f"{v}.{m}" in solo)]
+        if not cargadores:
+            continue
+
+        # El constructor ya hace la primera carga del modulo
+        inicio = time.perf_counter()
+        try:
+            ventana = _crearVentana(nombre_ventana, login, usu_id)
+            ventana.show()
+            _esperar(app, ventana)
+        except Exception:
+            resultados[f"{nombre_ventana}.__init__"] = _resumen([], mensajes.tomar() + [traceback.format_exc()])
+            continue
+        resultados[f"{nombre_ventana}.__init__"] = _resumen([time.perf_counter() - inicio], mensajes.tomar())
+        print(f"{nombre_ventana + '.__init__':<45} {resultados[nombre_ventana + '.__init__']['mediana'] * 1000:10.1f} ms")
+
+        for metodo, argumentos in cargadores:
+            argumentos = tuple(usu_id if a is USUARIO else a for a in argumentos)
+            tiempos = []
+            errores = []
+            for _ in range(repeticiones):
+                inicio = time.perf_counter()
+                try:
+                    getattr(ventana, metodo)(*argumentos)
+                    _esperar(app, ventana)
+                except Exception:
+                    errores.append(traceback.format_exc())
+                    break
+                tiempos.append(time.perf_counter() - inicio)
+            errores.extend(mensajes.tomar())
+            clave = f"{nombre_ventana}.{metodo}"
+            resultados[clave] = _resumen(tiempos, errores)
+            mediana = resultados[clave].get("mediana")
+            print(f"{clave:<45} {mediana * 1000 if mediana is not None else float('nan'):10.1f} ms"
+                  f"{'  (con errores)' if errores else ''}")
+
+        ventana.close()
+        ventana.deleteLater()
+        app.processEvents()
+    return resultados
+
+def comparar(actual, base, tolerancia, minimo_ms=5.0):
+    """Imprime la comparacion contra un resultado anterior y retorna los cargadores mas lentos."""
+    regresiones = []
+    print(f"\n{'cargador':<45} {'base ms':>10} {'actual ms':>10} {'cambio':>8}")
+    for clave, resultado in actual["resultados"].items():
+        anterior = base.get("resultados", {}).get(clave, {})
+        if "mediana" not in resultado or "mediana" not in anterior or not anterior["mediana"]:
+            continue
+        cambio = (resultado["mediana"] - anterior["mediana"]) / anterior["mediana"] * 100
+        marca = ""
+        # Las diferencias de unos cuantos milisegundos son ruido, no regresiones
+        if cambio > tolerancia and (resultado["mediana"] - anterior["mediana"]) * 1000 >= minimo_ms:
+            regresiones.append(clave)
+            marca = "  <-- regresion"
+        print(f"{clave:<45} {anterior['mediana'] * 1000:10.1f} {resultado['mediana'] * 1000:10.1f} {cambio:+7.1f}%{marca}")
+    return regresiones
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mide los tiempos de carga de cada modulo")
+    parser.add_argument("--motor", choices=("memoria", "mysql"), default="memoria",
+                        help="memoria: sqlite con datos generados (por defecto); mysql: la base del .env")
+    parser.add_argument("--escala", type=float, default=0.01,
+                        help="escala de generar_datos.py para el motor memoria (por defecto 0.01)")
+    parser.add_argument("--semilla", type=int, default=1)
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--solo", action="append", metavar="NOMBRE",
+                        help="solo mide la ventana o el metodo indicado (se puede repetir)")
+    parser.add_argument("--salida", default="benchmark.json", help="archivo JSON de resultados")
+    parser.add_argument("--comparar", metavar="BASE_JSON", help="resultado anterior contra el cual comparar")
+    parser.add_argument("--tolerancia", type=float, default=20.0,
+                        help="porcentaje de aumento de la mediana que se considera regresion")
+    parser.add_argument("--min-ms", type=float, default=5.0,
+                        help="aumento minimo en milisegundos para considerar regresion (por defecto 5)")
+    args = parser.parse_args(argv)
+
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    conteos = None
+    if args.motor == "memoria":
+        from bdmemoria import ConexionMemoria
+        bd = ConexionMemoria()
+        conteos = calcularConteos(args.escala)
+        print(f"Generando {sum(conteos.values())} filas en memoria...")
+        poblar(bd, conteos, args.semilla, progreso=None)
+        conexion.usarFabrica(lambda: bd)
+
+    try:
+        resultados = medir(app, max(1, args.repeticiones), args.solo)
+    except mysql.connector.Error as err:
+        print(f"Error de base de datos: {err}")
+        return 2
+
+    salida = {
+        "fecha": datetime.datetime.now().isoformat(timespec="seconds"),
+        "commit": _commitActual(),
+        "motor": args.motor,
+        "escala": args.escala if args.motor == "memoria" else None,
+        "conteos": conteos,
+        "repeticiones": args.repeticiones,
+        "python": platform.python_version(),
+        "plataforma": platform.platform(),
+        "memoria_max_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss if resource else None,
+        "pool": estadisticasPool(),
+        "consultas": medicion.resumen("consulta", 30),
+        "resultados": resultados,
+    }
+    with open(args.salida, "w", encoding="utf-8") as archivo:
+        json.dump(salida, archivo, indent=2, ensure_ascii=False)
+    print(f"\nResultados en {args.salida}")
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as archivo:
+            base = json.load(archivo)
+        regresiones = comparar(salida, base, args.tolerancia, args.min_ms)
+        if regresiones:
+            print(f"\n{len(regresiones)} cargador(es) mas lentos que la base por mas de {args.tolerancia:.0f}%")
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
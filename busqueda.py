@@ -0,0 +1,78 @@
+# Busqueda de texto en las columnas libres (descripciones, observaciones y comentarios).
+# Antes la unica forma era LIKE '%texto%', que no puede usar un indice y recorre
+# la tabla completa. La migracion 004_busqueda_texto.sql crea un indice FULLTEXT
+# sobre cada columna de CAMPOS_TEXTO y aqui se consulta con
+# MATCH(columna) AGAINST (... IN BOOLEAN MODE):
+#   - cada palabra escrita se vuelve "+palabra*": todas deben aparecer y cada una
+#     coincide como prefijo ("mant" encuentra "mantenimiento")
+#   - las palabras de menos de MIN_PALABRA letras se ignoran, InnoDB no las indexa
+#     (innodb_ft_min_token_size)
+#   - los operadores del modo booleano que escriba el usuario se descartan
+#
+# condicionTexto() es la condicion para el filtro de una tabla (tablas.filtroTexto)
+# y buscar() busca en varias tablas a la vez, ordenado por relevancia y por paginas.
+import re
+
+# tabla -> (columna con indice FULLTEXT, llave primaria, modulo)
+CAMPOS_TEXTO = {
+    "finanza": ("fin_desc", "fin_id", "Finanzas"),
+    "solicitud_compra": ("sol_descripcion", "sol_id", "Compras"),
+    "mantenimiento": ("man_descripcion", "man_id", "Mantenimiento"),
+    "incidencia": ("inc_descripcion", "inc_id", "Mantenimiento"),
+    "recursoshumanos": ("reh_observaciones", "reh_id", "Recursos Humanos"),
+    "evaluacion_desempeno": ("eva_comentarios", "eva_id", "Recursos Humanos"),
+}
+
+MIN_PALABRA = 3
+# Resultados por pagina de buscar()
+LIMITE = 50
+
+_PALABRA = re.compile(r"\w+")
+
+def terminosBusqueda(texto):
+    """Convierte el texto del usuario en la consulta del modo booleano ("+palabra* ..."); "" si no hay palabras."""
+    terminos = []
+    for palabra in _PALABRA.findall(texto.lower()):
+        termino = f"+{palabra}*"
+        if len(palabra) >= MIN_PALABRA and termino not in terminos:
+            terminos.append(termino)
+    return " ".join(terminos)
+
+def expresionTexto(columna):
+    return f"MATCH({columna}) AGAINST (%s IN BOOLEAN MODE)"
+
+def condicionTexto(columna, texto):
+    """Retorna (condicion, valores) para buscar texto en columna, o None si el texto no tiene palabras."""
+    terminos = terminosBusqueda(texto)
+    if not terminos:
+        return None
+    return expresionTexto(columna), (terminos,)
+
+def consultaBusqueda(tabla, terminos, limite):
+    """Retorna (sql, params) con las limite filas de tabla mas relevantes para terminos."""
+    columna, llave, _ = CAMPOS_TEXTO[tabla]
+    expresion = expresionTexto(columna)
+    # Solo ORDER BY relevancia y LIMIT: InnoDB toma las mejores filas del indice
+    # FULLTEXT sin ordenar todas las coincidencias
+    sql = (f"SELECT {llave}, {columna}, {expresion} AS relevancia FROM {tabla} "
+           f"WHERE {expresion} ORDER BY relevancia DESC LIMIT %s")
+    return sql, (terminos, terminos, limite)
+
+def buscar(cursor, texto, tablas=None, limite=LIMITE, pagina=0):
+    """Busca texto en las tablas de CAMPOS_TEXTO (todas por defecto).
+
+    Retorna [(tabla, llave, texto, relevancia)] de la pagina pedida, de la mas
+    relevante a la menos relevante.
+    """
+    terminos = terminosBusqueda(texto)
+    if not terminos:
+        return []
+    # Cada tabla aporta a lo mas las filas de las paginas hasta la pedida
+    hasta = (pagina + 1) * limite
+    resultados = []
+    for tabla in tablas or CAMPOS_TEXTO:
+        sql, params = consultaBusqueda(tabla, terminos, hasta)
+        cursor.execute(sql, params)
+        resultados.extend((tabla, llave, valor, float(relevancia)) for llave, valor, relevancia in cursor.fetchall())
+    resultados.sort(key=lambda resultado: resultado[3], reverse=True)
+    return resultados[pagina * limite:hasta]
@@ -0,0 +1,150 @@
+# Catalogo de productos del inventario compartido por Compras y Ventas.
+# Antes cada ventana guardaba su propia lista de inventario, la volvia a leer
+# completa despues de cada compra o venta completada, y DetalleDialog la copiaba
+# a su QComboBox con un addItem por producto cada vez que se abria.
+# Aqui hay un solo catalogo por proceso:
+#   - las filas se indexan por inv_id y el catalogo lleva un numero de version
+#     que sube con cada cambio
+#   - al completar una orden solo se actualizan las existencias de los productos
+#     que movio (las de movimientos.ResultadoMovimiento, leidas con FOR UPDATE)
+#   - el mismo catalogo es un modelo de Qt: los combos usan setModel() y no
+#     copian nada
+#   - los cambios de otros usuarios llegan por el Sincronizador de Compras y
+#     Ventas (registrar(catalogo, ventana)), que pide solo los productos con
+#     inv_modificado reciente; si son demasiados se relee todo en segundo plano
+from bisect import bisect_right
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex
+from ejecutor import EjecutorConsultas
+from paginacion import ConsultaPaginada
+
+# Columnas de cada fila del catalogo
+INV_ID, INV_ALM_ID, INV_PRODUCTO, INV_CANTIDAD = range(4)
+
+# Solo para los cambios de sincronizacion.leerCambios; el catalogo se lee completo con leerInventario
+CONSULTA_CATALOGO = ConsultaPaginada("SELECT inv_id, inv_alm_id, inv_producto, inv_cantidad FROM inventario",
+                                     orden=[("inv_producto", INV_PRODUCTO, False), ("inv_id", INV_ID, False)])
+
+_catalogo = None
+
+def catalogoInventario():
+    """Retorna el catalogo del proceso (se crea la primera vez, ya con QApplication)."""
+    global _catalogo
+    if _catalogo is None:
+        _catalogo = CatalogoInventario()
+    return _catalogo
+
+def leerInventario(cursor):
+    """Retorna las filas del catalogo (se puede usar en un hilo de trabajo)."""
+    cursor.execute("SELECT inv_id, inv_alm_id, inv_producto, inv_cantidad FROM inventario ORDER BY inv_producto")
+    return cursor.fetchall()
+
+class CatalogoInventario(QAbstractListModel):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._filas = []       # (inv_id, inv_alm_id, inv_producto, inv_cantidad) ordenadas por producto
+        self._posiciones = {}  # inv_id -> indice en _filas
+        self.version = 0
+        self.cargado = False
+        self.consulta = CONSULTA_CATALOGO
+        self.ejecutor = EjecutorConsultas(self, max_hilos=1)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._filas)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        fila = self._filas[index.row()]
+        if role == Qt.DisplayRole:
+            return f"{fila[INV_ID]} - {fila[INV_PRODUCTO]}"  # ID - Producto
+        if role == Qt.UserRole:
+            return fila[INV_ID]
+        return None
+
+    def cargar(self, cursor):
+        """Lee todo el inventario y reemplaza el catalogo."""
+        self.mostrar(leerInventario(cursor))
+
+    def mostrar(self, filas):
+        # filas viene de leerInventario(), por ejemplo leida en segundo plano
+        self.beginResetModel()
+        self._filas = [tuple(fila) for fila in filas]
+        self._posiciones = {fila[INV_ID]: i for i, fila in enumerate(self._filas)}
+        self.version += 1
+        self.cargado = True
+        self.endResetModel()
+
+    def fila(self, inv_id):
+        """Retorna la fila (inv_id, inv_alm_id, inv_producto, inv_cantidad) o None."""
+        posicion = self._posiciones.get(inv_id)
+        return None if posicion is None else self._filas[posicion]
+
+    def posicion(self, inv_id):
+        """Retorna el indice de inv_id en el modelo, -1 si no esta."""
+        return self._posiciones.get(inv_id, -1)
+
+    def filas(self):
+        return list(self._filas)
+
+    def actualizarExistencias(self, resultados):
+        """Aplica las existencias nuevas de [ResultadoMovimiento] ya confirmados; retorna cuantas cambiaron."""
+        cambios = 0
+        for resultado in resultados:
+            posicion = self._posiciones.get(resultado.inv_id)
+            if posicion is None or resultado.nueva is None:
+                continue
+            fila = self._filas[posicion]
+            if fila[INV_CANTIDAD] == resultado.nueva:
+                continue
+            self._filas[posicion] = fila[:INV_CANTIDAD] + (resultado.nueva,)
+            indice = self.index(posicion)
+            self.dataChanged.emit(indice, indice)
+            cambios += 1
+        if cambios:
+            self.version += 1
+        return cambios
+
+    def aplicarCambios(self, cambios):
+        """Aplica un sincronizacion.Cambios de inventario; retorna False si hay que releer el catalogo."""
+        if cambios.completa:
+            return False
+        if not self.cargado:
+            return True  # la carga en curso ya trae los cambios
+        quitar = set(cambios.quitadas)
+        nuevas = {}
+        for fila in cambios.filas:
+            fila = tuple(fila)
+            actual = self.fila(fila[INV_ID])
+            if actual == fila:
+                continue
+            if actual is not None and actual[INV_PRODUCTO] == fila[INV_PRODUCTO]:
+                # Mismo lugar en el orden: solo cambian las existencias o el almacen
+                posicion = self._posiciones[fila[INV_ID]]
+                self._filas[posicion] = fila
+                indice = self.index(posicion)
+                self.dataChanged.emit(indice, indice)
+                self.version += 1
+                continue
+            quitar.add(fila[INV_ID])
+            nuevas[fila[INV_ID]] = fila
+
+        for posicion in sorted((self._posiciones[inv_id] for inv_id in quitar if inv_id in self._posiciones),
+                               reverse=True):
+            self.beginRemoveRows(QModelIndex(), posicion, posicion)
+            del self._filas[posicion]
+            self.endRemoveRows()
+        for fila in nuevas.values():
+            # Como el ORDER BY inv_producto de leerInventario
+            posicion = bisect_right([actual[INV_PRODUCTO] for actual in self._filas], fila[INV_PRODUCTO])
+            self.beginInsertRows(QModelIndex(), posicion, posicion)
+            self._filas.insert(posicion, fila)
+            self.endInsertRows()
+        if quitar or nuevas:
+            self._posiciones = {fila[INV_ID]: i for i, fila in enumerate(self._filas)}
+            self.version += 1
+        return True
+
+    def recargarConsulta(self):
+        # Demasiados cambios para aplicarlos uno por uno: se relee todo sin congelar la ventana
+        self.ejecutor.ejecutar(leerInventario, self.mostrar,
+                               lambda err: print(f"Error al recargar el catalogo: {err}"), grupo="catalogo")
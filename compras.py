@@ -4,149 +4,65 @@ from PyQt5.QtWidgets import (QMainWindow, QPushButton, QVBoxLayout, QHBoxLayout,
                             QLineEdit, QDateEdit, QComboBox, QMessageBox, QLabel, QSplitter,
                             QDialogButtonBox, QApplication, QFrame, QGridLayout, QSizePolicy, 
                             QStackedWidget, QSpinBox, QTabWidget, QTextEdit, QDoubleSpinBox)
-from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QDate, QSize, pyqtSignal
-from PyQt5.QtGui import QPixmap, QIcon, QFont, QColor, QStandardItemModel, QStandardItem
+from PyQt5.QtCore import Qt, QModelIndex, QDate, QSize, pyqtSignal
+from PyQt5.QtGui import QIcon, QFont, QColor, QStandardItemModel, QStandardItem
 from PyQt5.QtSql import QSqlDatabase, QSqlQuery, QSqlTableModel, QSqlQueryModel
 import mysql.connector
 from datetime import datetime
-import os
-from dotenv import load_dotenv
-
-class SolicitudCompraTableModel(QAbstractTableModel):
-    def __init__(self, data=None):
-        super().__init__()
-        self._data = data if data is not None else []
-        self._headers = ["ID", "Usuario ID", "Fecha", "Descripción", "Estado", "Acciones"]
-
-    def data(self, index, role):
-        if not index.isValid() or not (0 <= index.row() < len(self._data)):
-            return None
-
-        if role == Qt.DisplayRole:
-            if index.column() == 5:  # Columna de acciones
-                return None
-            value = self._data[index.row()][index.column()]
-            if index.column() == 2 and isinstance(value, datetime):  # Fecha
-                return value.strftime("%Y-%m-%d")
-            return str(value)
-
-        elif role == Qt.TextAlignmentRole:
-            return Qt.AlignCenter
-
-        elif role == Qt.BackgroundRole:
-            estado = self._data[index.row()][4]
-            return {
-                'Pendiente': QColor(255, 255, 224),    # Amarillo claro
-                'Aprobada': QColor(240, 255, 240),     # Verde claro
-                'Rechazada': QColor(255, 240, 240)     # Rojo claro
-            }.get(estado, QColor(255, 255, 255))
-
-        return None
-
-    def rowCount(self, parent=None):
-        return len(self._data)
-
-    def columnCount(self, parent=None):
-        return len(self._headers)
-
-    def headerData(self, section, orientation, role):
-        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
-            return self._headers[section]
-        return None
-
-    def refreshData(self, data):
-        self.beginResetModel()
-        self._data = data
-        self.endResetModel()
-
-class CompraTableModel(QAbstractTableModel):
-    def __init__(self, data=None):
-        super().__init__()
-        self._data = data if data is not None else []
-        self._headers = ["ID", "Proveedor", "Usuario ID", "Fecha", "Solicitud ID", "Monto Total", "Estado", "Acciones"]
-
-    def data(self, index, role):
-        if not index.isValid() or not (0 <= index.row() < len(self._data)):
-            return None
-
-        if role == Qt.DisplayRole:
-            if index.column() == 7:  # Columna de acciones
-                return None
-            value = self._data[index.row()][index.column()]
-            if index.column() == 3 and isinstance(value, datetime):  # Fecha
-                return value.strftime("%Y-%m-%d")
-            elif index.column() == 5:  # Monto total
-                return f"${value:,.2f}"
-            return str(value)
-
-        elif role == Qt.TextAlignmentRole:
-            if index.column() == 5:  # Monto total
-                return Qt.AlignRight | Qt.AlignVCenter
-            return Qt.AlignCenter
-
-        elif role == Qt.BackgroundRole:
-            estado = self._data[index.row()][6]
-            return {
-                'Pendiente': QColor(255, 255, 224),    # Amarillo claro
-                'Completada': QColor(240, 255, 240)    # Verde claro
-            }.get(estado, QColor(255, 255, 255))
-
-        return None
-
-    def rowCount(self, parent=None):
-        return len(self._data)
-
-    def columnCount(self, parent=None):
-        return len(self._headers)
-
-    def headerData(self, section, orientation, role):
-        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
-            return self._headers[section]
-        return None
-
-    def refreshData(self, data):
-        self.beginResetModel()
-        self._data = data
-        self.endResetModel()
-
-class DetalleTableModel(QAbstractTableModel):
-    def __init__(self, data=None):
-        super().__init__()
-        self._data = data if data is not None else []
-        self._headers = ["ID", "Referencia ID", "Inventario ID", "Cantidad", "Acciones"]
-
-    def data(self, index, role):
-        if not index.isValid() or not (0 <= index.row() < len(self._data)):
-            return None
-
-        if role == Qt.DisplayRole:
-            if index.column() == 4:  # Columna de acciones
-                return None
-            value = self._data[index.row()][index.column()]
-            if index.column() == 3:  # Cantidad
-                return f"{value} unidades"
-            return str(value)
-
-        elif role == Qt.TextAlignmentRole:
-            return Qt.AlignCenter
-
-        return None
-
-    def rowCount(self, parent=None):
-        return len(self._data)
-
-    def columnCount(self, parent=None):
-        return len(self._headers)
-
-    def headerData(self, section, orientation, role):
-        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
-            return self._headers[section]
-        return None
-
-    def refreshData(self, data):
-        self.beginResetModel()
-        self._data = data
-        self.endResetModel()
+from conexion import obtenerConexion
+import imagenes
+from paginacion import ConsultaPaginada, leerConsulta
+from ejecutor import EjecutorConsultas
+from tablas import (TablaModel, Columna, ColorPorValor, ACCIONES, CENTRO, DERECHA, fecha, moneda,
+                    unidades, filtroIgual, filtroFecha, filtroTexto, tablaConFiltros)
+from sincronizacion import Sincronizador
+from acciones import BotonesDelegate, Boton
+from movimientos import completarOrden, describirFallidos
+from catalogo import catalogoInventario, leerInventario
+
+# Consultas de lectura de la ventana; migrar.py --verificar corre EXPLAIN sobre estas mismas
+CONSULTA_SOLICITUDES = ConsultaPaginada("SELECT * FROM solicitud_compra", [("sol_fecha", 2, True), ("sol_id", 0, True)])
+CONSULTA_COMPRAS = ConsultaPaginada("SELECT * FROM compra", [("com_fecha_compra", 3, True), ("com_id", 0, True)])
+SQL_SOLICITUDES_APROBADAS = "SELECT sol_id, sol_descripcion FROM solicitud_compra WHERE sol_estado = 'Aprobada'"
+
+def consultaDetalleSolicitud(sol_id):
+    """Retorna la consulta del detalle de una solicitud."""
+    return ConsultaPaginada("SELECT * FROM detalle_solicitud", [("ds_id", 0, False)], "sol_id = %s", (sol_id,))
+
+def consultaDetalleCompra(com_id):
+    """Retorna la consulta del detalle de una compra."""
+    return ConsultaPaginada("SELECT * FROM detalle_compra", [("dc_id", 0, False)], "com_id = %s", (com_id,))
+
+class SolicitudCompraTableModel(TablaModel):
+    columnas = [Columna("ID", campo="sol_id"),
+                Columna("Usuario ID", campo="sol_usu_id", nulos=True, filtro=filtroIgual("sol_usu_id")),
+                Columna("Fecha", fecha, campo="sol_fecha", filtro=filtroFecha("sol_fecha")),
+                Columna("Descripción", filtro=filtroTexto("sol_descripcion")),
+                Columna("Estado", campo="sol_estado", filtro=filtroIgual("sol_estado")), ACCIONES]
+    alineacion = CENTRO
+    color = ColorPorValor(4, {
+        'Pendiente': QColor(255, 255, 224),    # Amarillo claro
+        'Aprobada': QColor(240, 255, 240),     # Verde claro
+        'Rechazada': QColor(255, 240, 240)     # Rojo claro
+    })
+
+class CompraTableModel(TablaModel):
+    columnas = [Columna("ID", campo="com_id"), Columna("Proveedor"),
+                Columna("Usuario ID", campo="com_usu_id", nulos=True, filtro=filtroIgual("com_usu_id")),
+                Columna("Fecha", fecha, campo="com_fecha_compra", filtro=filtroFecha("com_fecha_compra")),
+                Columna("Solicitud ID", campo="com_sol_id", nulos=True, filtro=filtroIgual("com_sol_id")),
+                Columna("Monto Total", moneda, DERECHA, campo="com_monto_total"),
+                Columna("Estado", filtro=filtroIgual("com_estado")), ACCIONES]
+    alineacion = CENTRO
+    color = ColorPorValor(6, {
+        'Pendiente': QColor(255, 255, 224),    # Amarillo claro
+        'Completada': QColor(240, 255, 240)    # Verde claro
+    })
+
+class DetalleTableModel(TablaModel):
+    columnas = [Columna("ID"), Columna("Referencia ID"), Columna("Inventario ID"), Columna("Cantidad", unidades),
+                ACCIONES]
+    alineacion = CENTRO
 
 class SolicitudCompraDialog(QDialog):
     def __init__(self, parent=None, solicitud_data=None):
@@ -344,10 +260,10 @@ class CompraDialog(QDialog):
         }
 
 class DetalleDialog(QDialog):
-    def __init__(self, parent=None, detalle_data=None, inventario_items=None, tipo="solicitud"):
+    def __init__(self, parent=None, detalle_data=None, catalogo=None, tipo="solicitud"):
         super().__init__(parent)
         self.detalle_data = detalle_data
-        self.inventario_items = inventario_items or []
+        self.catalogo = catalogo if catalogo is not None else catalogoInventario()
         self.tipo = tipo  # "solicitud" o "compra"
         self.initUI()
 
@@ -398,12 +314,15 @@ class DetalleDialog(QDialog):
         layout = QFormLayout()
 
         # Campo para inventario
+        # El combo usa el catalogo compartido como modelo, sin copiar los productos
         self.inventario_combo = QComboBox()
-        if self.inventario_items:
-            for item in self.inventario_items:
-                self.inventario_combo.addItem(f"{item[0]} - {item[2]}", item[0])  # ID - Producto
-        else:
-            self.inventario_combo.addItem("Sin productos disponibles")
+        self.inventario_combo.setModel(self.catalogo)
+        self.inventario_combo.view().setUniformItemSizes(True)
+        # AdjustToContents recorreria todos los productos para medir el texto mas largo
+        self.inventario_combo.setSizeAdjustPolicy(QComboBox.AdjustToMinimumContentsLengthWithIcon)
+        self.inventario_combo.setMinimumContentsLength(30)
+        if self.catalogo.rowCount() == 0:
+            self.inventario_combo.setPlaceholderText("Sin productos disponibles")
         layout.addRow("Producto:", self.inventario_combo)
 
         # Campo para cantidad
@@ -422,10 +341,9 @@ class DetalleDialog(QDialog):
         # Precargar datos si se está editando
         if self.detalle_data:
             # Buscar el item en el combo por ID
-            for i in range(self.inventario_combo.count()):
-                if self.inventario_combo.itemData(i) == self.detalle_data[2]:
-                    self.inventario_combo.setCurrentIndex(i)
-                    break
+            posicion = self.catalogo.posicion(self.detalle_data[2])
+            if posicion >= 0:
+                self.inventario_combo.setCurrentIndex(posicion)
             self.cantidad_spin.setValue(int(self.detalle_data[3]))
 
     def getDetalleData(self):
@@ -449,13 +367,23 @@ class ComprasWindow(QMainWindow):
         self.compras_data = []
         self.detalle_solicitud_data = []
         self.detalle_compra_data = []
-        self.inventario_items = []
+        self.catalogo = catalogoInventario()
         
         # Variables para tracking
         self.selected_solicitud_id = None
         self.selected_compra_id = None
         
+        # Refresco periodico con solo las filas que cambiaron; la primera marca se toma en segundo plano
+        self.sincronizador = Sincronizador(self)
+        # Las cargas de las tablas corren en segundo plano, la ventana no se congela
+        self.ejecutor = EjecutorConsultas(self)
         self.initUI()
+        self.sincronizador.registrar(self.solicitudes_model, self.solicitudes_table)
+        self.sincronizador.registrar(self.detalle_solicitud_model, self.detalle_solicitud_table)
+        self.sincronizador.registrar(self.compras_model, self.compras_table)
+        self.sincronizador.registrar(self.detalle_compra_model, self.detalle_compra_table)
+        # El catalogo compartido recibe las existencias que cambiaron otros usuarios
+        self.sincronizador.registrar(self.catalogo, self)
         self.loadInitialData()
 
     def initUI(self):
@@ -586,9 +514,8 @@ class ComprasWindow(QMainWindow):
 
         # Logo
         logo_label = QLabel()
-        logo_pixmap = QPixmap("Logo-Grupo-Porteo-White.png")
+        logo_pixmap = imagenes.pixmap("Logo-Grupo-Porteo-White.png", 40)
         if not logo_pixmap.isNull():
-            logo_pixmap = logo_pixmap.scaled(40, 40, Qt.KeepAspectRatio, Qt.SmoothTransformation)
             logo_label.setPixmap(logo_pixmap)
         logo_label.setStyleSheet("background-color: transparent; border: none;")
         self.toolbar.addWidget(logo_label)
@@ -661,11 +588,15 @@ class ComprasWindow(QMainWindow):
         
         self.solicitudes_model = SolicitudCompraTableModel()
         self.solicitudes_table.setModel(self.solicitudes_model)
+        # Botones de acción pintados por un delegate en lugar de crear widgets por fila
+        self.solicitudes_table.setItemDelegateForColumn(5, BotonesDelegate(self.solicitudes_table, [
+            Boton("Editar", self.editSolicitud),
+            Boton("Eliminar", self.deleteSolicitud, eliminar=True)]))
         
         # Conectar selección de fila
         self.solicitudes_table.selectionModel().selectionChanged.connect(self.onSolicitudSelected)
         
-        solicitudes_layout.addWidget(self.solicitudes_table)
+        solicitudes_layout.addWidget(tablaConFiltros(self.solicitudes_table))
         
         # Botones para solicitudes
         solicitudes_buttons = QHBoxLayout()
@@ -704,6 +635,9 @@ class ComprasWindow(QMainWindow):
         
         self.detalle_solicitud_model = DetalleTableModel()
         self.detalle_solicitud_table.setModel(self.detalle_solicitud_model)
+        self.detalle_solicitud_table.setItemDelegateForColumn(4, BotonesDelegate(self.detalle_solicitud_table, [
+            Boton("Editar", self.editDetalleSolicitud),
+            Boton("Eliminar", self.deleteDetalleSolicitud, eliminar=True)], alto=25))
         
         detalle_solicitud_layout.addWidget(self.detalle_solicitud_table)
         
@@ -799,11 +733,14 @@ class ComprasWindow(QMainWindow):
         
         self.compras_model = CompraTableModel()
         self.compras_table.setModel(self.compras_model)
+        self.compras_table.setItemDelegateForColumn(7, BotonesDelegate(self.compras_table, [
+            Boton("Editar", self.editCompra),
+            Boton("Eliminar", self.deleteCompra, eliminar=True)]))
         
         # Conectar selección de fila
         self.compras_table.selectionModel().selectionChanged.connect(self.onCompraSelected)
         
-        compras_layout.addWidget(self.compras_table)
+        compras_layout.addWidget(tablaConFiltros(self.compras_table))
         
         # Botones para compras
         compras_buttons = QHBoxLayout()
@@ -839,6 +776,9 @@ class ComprasWindow(QMainWindow):
         
         self.detalle_compra_model = DetalleTableModel()
         self.detalle_compra_table.setModel(self.detalle_compra_model)
+        self.detalle_compra_table.setItemDelegateForColumn(4, BotonesDelegate(self.detalle_compra_table, [
+            Boton("Editar", self.editDetalleCompra),
+            Boton("Eliminar", self.deleteDetalleCompra, eliminar=True)], alto=25))
         
         detalle_compra_layout.addWidget(self.detalle_compra_table)
         
@@ -866,13 +806,8 @@ class ComprasWindow(QMainWindow):
 
     def connectToDatabase(self):
         try:
-            load_dotenv()
-            self.db_connection = mysql.connector.connect(
-                host=os.environ.get("DB_HOST"),
-                database=os.environ.get("DB_DATABASE"),
-                user=os.environ.get("DB_USER"),
-                password=os.environ.get("DB_PASSWORD")
-            )
+            # Conexion prestada del pool compartido, close() la regresa al pool
+            self.db_connection = obtenerConexion()
             return True
         except mysql.connector.Error as err:
             QMessageBox.critical(self, "Error de base de datos", f"No se pudo conectar: {err}")
@@ -883,99 +818,31 @@ class ComprasWindow(QMainWindow):
         self.loadSolicitudes()
         self.loadCompras()
 
+    def mostrarErrorCarga(self, que):
+        """Retorna la funcion que muestra el error de una carga en segundo plano."""
+        return lambda err: QMessageBox.critical(self, "Error de base de datos", f"Error al cargar {que}: {err}")
+
     def loadInventarioItems(self):
-        if not self.connectToDatabase():
-            return
-        try:
-            cursor = self.db_connection.cursor()
-            cursor.execute("SELECT inv_id, inv_alm_id, inv_producto, inv_cantidad FROM inventario ORDER BY inv_producto")
-            self.inventario_items = cursor.fetchall()
-            cursor.close()
-        except mysql.connector.Error as err:
-            QMessageBox.critical(self, "Error de base de datos", f"Error al cargar inventario: {err}")
-        finally:
-            if self.db_connection:
-                self.db_connection.close()
+        # Carga completa del catalogo compartido; despues solo se actualizan los productos movidos
+        # (en una lambda de la ventana, medicion atribuye la consulta a este metodo)
+        self.ejecutor.ejecutar(lambda cursor: leerInventario(cursor), self.catalogo.mostrar,
+                               self.mostrarErrorCarga("inventario"), grupo="inventario")
 
     def loadSolicitudes(self):
-        if not self.connectToDatabase():
-            return
-        try:
-            cursor = self.db_connection.cursor()
-            cursor.execute("SELECT * FROM solicitud_compra ORDER BY sol_fecha DESC")
-            self.solicitudes_data = cursor.fetchall()
-            self.solicitudes_model.refreshData(self.solicitudes_data)
-            
-            # Configurar botones de acción
-            for row in range(len(self.solicitudes_data)):
-                widget = QWidget()
-                layout = QHBoxLayout(widget)
-                layout.setContentsMargins(4, 4, 4, 4)
-                
-                edit_btn = QPushButton("Editar")
-                edit_btn.setFixedWidth(90)
-                edit_btn.setFixedHeight(30)
-                edit_btn.clicked.connect(lambda _, r=row: self.editSolicitud(r))
-                layout.addWidget(edit_btn)
-                
-                delete_btn = QPushButton("Eliminar")
-                delete_btn.setObjectName("deleteBtn")
-                delete_btn.setFixedWidth(90)
-                delete_btn.setFixedHeight(30)
-                delete_btn.clicked.connect(lambda _, r=row: self.deleteSolicitud(r))
-                layout.addWidget(delete_btn)
-                
-                layout.setAlignment(Qt.AlignCenter)
-                widget.setLayout(layout)
-                
-                self.solicitudes_table.setIndexWidget(self.solicitudes_model.index(row, 5), widget)
-            
-            cursor.close()
-        except mysql.connector.Error as err:
-            QMessageBox.critical(self, "Error de base de datos", f"Error al cargar solicitudes: {err}")
-        finally:
-            if self.db_connection:
-                self.db_connection.close()
+        # Las solicitudes se cargan por paginas (keyset sobre fecha, id)
+        self.ejecutor.ejecutar(lambda cursor: leerConsulta(CONSULTA_SOLICITUDES, cursor), self.mostrarSolicitudes,
+                               self.mostrarErrorCarga("solicitudes"), grupo="solicitudes")
+
+    def mostrarSolicitudes(self, solicitudes):
+        self.solicitudes_data = self.solicitudes_model.mostrarConsulta(solicitudes)
 
     def loadCompras(self):
-        if not self.connectToDatabase():
-            return
-        try:
-            cursor = self.db_connection.cursor()
-            cursor.execute("SELECT * FROM compra ORDER BY com_fecha_compra DESC")
-            self.compras_data = cursor.fetchall()
-            self.compras_model.refreshData(self.compras_data)
-            
-            # Configurar botones de acción
-            for row in range(len(self.compras_data)):
-                widget = QWidget()
-                layout = QHBoxLayout(widget)
-                layout.setContentsMargins(4, 4, 4, 4)
-                
-                edit_btn = QPushButton("Editar")
-                edit_btn.setFixedWidth(90)
-                edit_btn.setFixedHeight(30)
-                edit_btn.clicked.connect(lambda _, r=row: self.editCompra(r))
-                layout.addWidget(edit_btn)
-                
-                delete_btn = QPushButton("Eliminar")
-                delete_btn.setObjectName("deleteBtn")
-                delete_btn.setFixedWidth(90)
-                delete_btn.setFixedHeight(30)
-                delete_btn.clicked.connect(lambda _, r=row: self.deleteCompra(r))
-                layout.addWidget(delete_btn)
-                
-                layout.setAlignment(Qt.AlignCenter)
-                widget.setLayout(layout)
-                
-                self.compras_table.setIndexWidget(self.compras_model.index(row, 7), widget)
-            
-            cursor.close()
-        except mysql.connector.Error as err:
-            QMessageBox.critical(self, "Error de base de datos", f"Error al cargar compras: {err}")
-        finally:
-            if self.db_connection:
-                self.db_connection.close()
+        # Las compras se cargan por paginas (keyset sobre fecha, id)
+        self.ejecutor.ejecutar(lambda cursor: leerConsulta(CONSULTA_COMPRAS, cursor), self.mostrarCompras,
+                               self.mostrarErrorCarga("compras"), grupo="compras")
+
+    def mostrarCompras(self, compras):
+        self.compras_data = self.compras_model.mostrarConsulta(compras)
 
     def onSolicitudSelected(self, selected, deselected):
         indexes = selected.indexes()
@@ -1010,34 +877,10 @@ class ComprasWindow(QMainWindow):
         if not self.connectToDatabase():
             return
         try:
-            cursor = self.db_connection.cursor()
-            cursor.execute("SELECT * FROM detalle_solicitud WHERE sol_id = %s", (solicitud_id,))
-            self.detalle_solicitud_data = cursor.fetchall()
-            self.detalle_solicitud_model.refreshData(self.detalle_solicitud_data)
-            
-            # Configurar botones de acción
-            for row in range(len(self.detalle_solicitud_data)):
-                widget = QWidget()
-                layout = QHBoxLayout(widget)
-                layout.setContentsMargins(2, 2, 2, 2)
-                
-                edit_btn = QPushButton("Editar")
-                edit_btn.setFixedWidth(90)
-                edit_btn.setFixedHeight(25)
-                edit_btn.clicked.connect(lambda _, r=row: self.editDetalleSolicitud(r))
-                layout.addWidget(edit_btn)
-                
-                delete_btn = QPushButton("Eliminar")
-                delete_btn.setObjectName("deleteBtn")
-                delete_btn.setFixedWidth(90)
-                delete_btn.setFixedHeight(25)
-                delete_btn.clicked.connect(lambda _, r=row: self.deleteDetalleSolicitud(r))
-                layout.addWidget(delete_btn)
-                
-                layout.setAlignment(Qt.AlignCenter)
-                widget.setLayout(layout)
-                
-                self.detalle_solicitud_table.setIndexWidget(self.detalle_solicitud_model.index(row, 4), widget)
+            # Se repite en cada click de la tabla de solicitudes: sentencia preparada de la conexion
+            cursor = self.db_connection.cursor(prepared=True)
+            self.detalle_solicitud_data = self.detalle_solicitud_model.cargarLista(
+                consultaDetalleSolicitud(solicitud_id), cursor)
             
             cursor.close()
         except mysql.connector.Error as err:
@@ -1050,34 +893,10 @@ class ComprasWindow(QMainWindow):
         if not self.connectToDatabase():
             return
         try:
-            cursor = self.db_connection.cursor()
-            cursor.execute("SELECT * FROM detalle_compra WHERE com_id = %s", (compra_id,))
-            self.detalle_compra_data = cursor.fetchall()
-            self.detalle_compra_model.refreshData(self.detalle_compra_data)
-            
-            # Configurar botones de acción
-            for row in range(len(self.detalle_compra_data)):
-                widget = QWidget()
-                layout = QHBoxLayout(widget)
-                layout.setContentsMargins(2, 2, 2, 2)
-                
-                edit_btn = QPushButton("Editar")
-                edit_btn.setFixedWidth(90)
-                edit_btn.setFixedHeight(25)
-                edit_btn.clicked.connect(lambda _, r=row: self.editDetalleCompra(r))
-                layout.addWidget(edit_btn)
-                
-                delete_btn = QPushButton("Eliminar")
-                delete_btn.setObjectName("deleteBtn")
-                delete_btn.setFixedWidth(90)
-                delete_btn.setFixedHeight(25)
-                delete_btn.clicked.connect(lambda _, r=row: self.deleteDetalleCompra(r))
-                layout.addWidget(delete_btn)
-                
-                layout.setAlignment(Qt.AlignCenter)
-                widget.setLayout(layout)
-                
-                self.detalle_compra_table.setIndexWidget(self.detalle_compra_model.index(row, 4), widget)
+            # Se repite en cada click de la tabla de compras: sentencia preparada de la conexion
+            cursor = self.db_connection.cursor(prepared=True)
+            self.detalle_compra_data = self.detalle_compra_model.cargarLista(
+                consultaDetalleCompra(compra_id), cursor)
             
             cursor.close()
         except mysql.connector.Error as err:
@@ -1102,10 +921,11 @@ class ComprasWindow(QMainWindow):
                 """
                 cursor.execute(query, (self.usu_id, data["fecha"], data["descripcion"], data["estado"]))
                 self.db_connection.commit()
+                # Solo se agrega la fila nueva, sin volver a cargar la tabla
+                self.solicitudes_model.releerFila(cursor, "sol_id", cursor.lastrowid)
                 cursor.close()
                 
                 QMessageBox.information(self, "Éxito", "Solicitud creada correctamente")
-                self.loadSolicitudes()
             except mysql.connector.Error as err:
                 QMessageBox.critical(self, "Error de base de datos", f"Error al crear solicitud: {err}")
             finally:
@@ -1129,10 +949,10 @@ class ComprasWindow(QMainWindow):
                 """
                 cursor.execute(query, (data["fecha"], data["descripcion"], data["estado"], record[0]))
                 self.db_connection.commit()
+                self.solicitudes_model.releerFila(cursor, "sol_id", record[0], row)
                 cursor.close()
                 
                 QMessageBox.information(self, "Éxito", "Solicitud actualizada correctamente")
-                self.loadSolicitudes()
             except mysql.connector.Error as err:
                 QMessageBox.critical(self, "Error de base de datos", f"Error al actualizar solicitud: {err}")
             finally:
@@ -1160,10 +980,10 @@ class ComprasWindow(QMainWindow):
                 cursor.execute("DELETE FROM solicitud_compra WHERE sol_id = %s", (record[0],))
                 
                 self.db_connection.commit()
+                self.solicitudes_model.quitarFila(row)
                 cursor.close()
                 
                 QMessageBox.information(self, "Éxito", "Solicitud eliminada correctamente")
-                self.loadSolicitudes()
             except mysql.connector.Error as err:
                 QMessageBox.critical(self, "Error de base de datos", f"Error al eliminar solicitud: {err}")
             finally:
@@ -1183,10 +1003,11 @@ class ComprasWindow(QMainWindow):
             cursor.execute("UPDATE solicitud_compra SET sol_estado = 'Aprobada' WHERE sol_id = %s", 
                          (self.selected_solicitud_id,))
             self.db_connection.commit()
+            self.solicitudes_model.releerFila(cursor, "sol_id", self.selected_solicitud_id,
+                                          self.solicitudes_model.buscarFila(self.selected_solicitud_id))
             cursor.close()
             
             QMessageBox.information(self, "Éxito", "Solicitud aprobada correctamente")
-            self.loadSolicitudes()
         except mysql.connector.Error as err:
             QMessageBox.critical(self, "Error de base de datos", f"Error al aprobar solicitud: {err}")
         finally:
@@ -1205,10 +1026,11 @@ class ComprasWindow(QMainWindow):
             cursor.execute("UPDATE solicitud_compra SET sol_estado = 'Rechazada' WHERE sol_id = %s", 
                          (self.selected_solicitud_id,))
             self.db_connection.commit()
+            self.solicitudes_model.releerFila(cursor, "sol_id", self.selected_solicitud_id,
+                                          self.solicitudes_model.buscarFila(self.selected_solicitud_id))
             cursor.close()
             
             QMessageBox.information(self, "Éxito", "Solicitud rechazada")
-            self.loadSolicitudes()
         except mysql.connector.Error as err:
             QMessageBox.critical(self, "Error de base de datos", f"Error al rechazar solicitud: {err}")
         finally:
@@ -1221,11 +1043,8 @@ class ComprasWindow(QMainWindow):
             return
             
         # Verificar que la solicitud esté aprobada
-        solicitud_actual = None
-        for sol in self.solicitudes_data:
-            if sol[0] == self.selected_solicitud_id:
-                solicitud_actual = sol
-                break
+        fila = self.solicitudes_model.buscarFila(self.selected_solicitud_id)
+        solicitud_actual = self.solicitudes_data[fila] if fila >= 0 else None
                 
         if not solicitud_actual or solicitud_actual[4] != 'Aprobada':
             QMessageBox.warning(self, "Advertencia", "La solicitud debe estar aprobada para generar una compra")
@@ -1254,10 +1073,10 @@ class ComprasWindow(QMainWindow):
                     data["solicitud_id"], data["monto_total"], data["estado"]
                 ))
                 self.db_connection.commit()
+                self.compras_model.releerFila(cursor, "com_id", cursor.lastrowid)
                 cursor.close()
                 
                 QMessageBox.information(self, "Éxito", "Compra generada correctamente")
-                self.loadCompras()
             except mysql.connector.Error as err:
                 QMessageBox.critical(self, "Error de base de datos", f"Error al generar compra: {err}")
             finally:
@@ -1271,7 +1090,7 @@ class ComprasWindow(QMainWindow):
             return
         try:
             cursor = self.db_connection.cursor()
-            cursor.execute("SELECT sol_id, sol_descripcion FROM solicitud_compra WHERE sol_estado = 'Aprobada'")
+            cursor.execute(SQL_SOLICITUDES_APROBADAS)
             solicitudes_aprobadas = cursor.fetchall()
             cursor.close()
         except mysql.connector.Error as err:
@@ -1298,10 +1117,10 @@ class ComprasWindow(QMainWindow):
                     data["solicitud_id"], data["monto_total"], data["estado"]
                 ))
                 self.db_connection.commit()
+                self.compras_model.releerFila(cursor, "com_id", cursor.lastrowid)
                 cursor.close()
                 
                 QMessageBox.information(self, "Éxito", "Compra creada correctamente")
-                self.loadCompras()
             except mysql.connector.Error as err:
                 QMessageBox.critical(self, "Error de base de datos", f"Error al crear compra: {err}")
             finally:
@@ -1316,7 +1135,7 @@ class ComprasWindow(QMainWindow):
             return
         try:
             cursor = self.db_connection.cursor()
-            cursor.execute("SELECT sol_id, sol_descripcion FROM solicitud_compra WHERE sol_estado = 'Aprobada'")
+            cursor.execute(SQL_SOLICITUDES_APROBADAS)
             solicitudes_aprobadas = cursor.fetchall()
             cursor.close()
         except mysql.connector.Error as err:
@@ -1345,10 +1164,10 @@ class ComprasWindow(QMainWindow):
                     data["monto_total"], data["estado"], record[0]
                 ))
                 self.db_connection.commit()
+                self.compras_model.releerFila(cursor, "com_id", record[0], row)
                 cursor.close()
                 
                 QMessageBox.information(self, "Éxito", "Compra actualizada correctamente")
-                self.loadCompras()
             except mysql.connector.Error as err:
                 QMessageBox.critical(self, "Error de base de datos", f"Error al actualizar compra: {err}")
             finally:
@@ -1376,10 +1195,10 @@ class ComprasWindow(QMainWindow):
                 cursor.execute("DELETE FROM compra WHERE com_id = %s", (record[0],))
                 
                 self.db_connection.commit()
+                self.compras_model.quitarFila(row)
                 cursor.close()
                 
                 QMessageBox.information(self, "Éxito", "Compra eliminada correctamente")
-                self.loadCompras()
             except mysql.connector.Error as err:
                 QMessageBox.critical(self, "Error de base de datos", f"Error al eliminar compra: {err}")
             finally:
@@ -1392,7 +1211,7 @@ class ComprasWindow(QMainWindow):
             QMessageBox.warning(self, "Advertencia", "Seleccione una solicitud primero")
             return
             
-        dialog = DetalleDialog(self, inventario_items=self.inventario_items, tipo="solicitud")
+        dialog = DetalleDialog(self, catalogo=self.catalogo, tipo="solicitud")
         if dialog.exec_() == QDialog.Accepted:
             data = dialog.getDetalleData()
             
@@ -1406,10 +1225,10 @@ class ComprasWindow(QMainWindow):
                 """
                 cursor.execute(query, (self.selected_solicitud_id, data["inventario_id"], data["cantidad"]))
                 self.db_connection.commit()
+                self.detalle_solicitud_model.releerFila(cursor, "ds_id", cursor.lastrowid)
                 cursor.close()
                 
                 QMessageBox.information(self, "Éxito", "Producto agregado al detalle")
-                self.loadDetalleSolicitud(self.selected_solicitud_id)
             except mysql.connector.Error as err:
                 QMessageBox.critical(self, "Error de base de datos", f"Error al agregar detalle: {err}")
             finally:
@@ -1421,7 +1240,7 @@ class ComprasWindow(QMainWindow):
             QMessageBox.warning(self, "Advertencia", "Seleccione una compra primero")
             return
             
-        dialog = DetalleDialog(self, inventario_items=self.inventario_items, tipo="compra")
+        dialog = DetalleDialog(self, catalogo=self.catalogo, tipo="compra")
         if dialog.exec_() == QDialog.Accepted:
             data = dialog.getDetalleData()
             
@@ -1435,10 +1254,10 @@ class ComprasWindow(QMainWindow):
                 """
                 cursor.execute(query, (self.selected_compra_id, data["inventario_id"], data["cantidad"]))
                 self.db_connection.commit()
+                self.detalle_compra_model.releerFila(cursor, "dc_id", cursor.lastrowid)
                 cursor.close()
                 
                 QMessageBox.information(self, "Éxito", "Producto agregado al detalle")
-                self.loadDetalleCompra(self.selected_compra_id)
             except mysql.connector.Error as err:
                 QMessageBox.critical(self, "Error de base de datos", f"Error al agregar detalle: {err}")
             finally:
@@ -1447,7 +1266,7 @@ class ComprasWindow(QMainWindow):
 
     def editDetalleSolicitud(self, row):
         record = self.detalle_solicitud_data[row]
-        dialog = DetalleDialog(self, record, self.inventario_items, "solicitud")
+        dialog = DetalleDialog(self, record, self.catalogo, "solicitud")
         if dialog.exec_() == QDialog.Accepted:
             data = dialog.getDetalleData()
             
@@ -1462,10 +1281,10 @@ class ComprasWindow(QMainWindow):
                 """
                 cursor.execute(query, (data["inventario_id"], data["cantidad"], record[0]))
                 self.db_connection.commit()
+                self.detalle_solicitud_model.releerFila(cursor, "ds_id", record[0], row)
                 cursor.close()
                 
                 QMessageBox.information(self, "Éxito", "Detalle actualizado correctamente")
-                self.loadDetalleSolicitud(self.selected_solicitud_id)
             except mysql.connector.Error as err:
                 QMessageBox.critical(self, "Error de base de datos", f"Error al actualizar detalle: {err}")
             finally:
@@ -1474,7 +1293,7 @@ class ComprasWindow(QMainWindow):
 
     def editDetalleCompra(self, row):
         record = self.detalle_compra_data[row]
-        dialog = DetalleDialog(self, record, self.inventario_items, "compra")
+        dialog = DetalleDialog(self, record, self.catalogo, "compra")
         if dialog.exec_() == QDialog.Accepted:
             data = dialog.getDetalleData()
             
@@ -1489,10 +1308,10 @@ class ComprasWindow(QMainWindow):
                 """
                 cursor.execute(query, (data["inventario_id"], data["cantidad"], record[0]))
                 self.db_connection.commit()
+                self.detalle_compra_model.releerFila(cursor, "dc_id", record[0], row)
                 cursor.close()
                 
                 QMessageBox.information(self, "Éxito", "Detalle actualizado correctamente")
-                self.loadDetalleCompra(self.selected_compra_id)
             except mysql.connector.Error as err:
                 QMessageBox.critical(self, "Error de base de datos", f"Error al actualizar detalle: {err}")
             finally:
@@ -1515,10 +1334,10 @@ class ComprasWindow(QMainWindow):
                 cursor = self.db_connection.cursor()
                 cursor.execute("DELETE FROM detalle_solicitud WHERE ds_id = %s", (record[0],))
                 self.db_connection.commit()
+                self.detalle_solicitud_model.quitarFila(row)
                 cursor.close()
                 
                 QMessageBox.information(self, "Éxito", "Producto eliminado del detalle")
-                self.loadDetalleSolicitud(self.selected_solicitud_id)
             except mysql.connector.Error as err:
                 QMessageBox.critical(self, "Error de base de datos", f"Error al eliminar detalle: {err}")
             finally:
@@ -1541,10 +1360,10 @@ class ComprasWindow(QMainWindow):
                 cursor = self.db_connection.cursor()
                 cursor.execute("DELETE FROM detalle_compra WHERE dc_id = %s", (record[0],))
                 self.db_connection.commit()
+                self.detalle_compra_model.quitarFila(row)
                 cursor.close()
                 
                 QMessageBox.information(self, "Éxito", "Producto eliminado del detalle")
-                self.loadDetalleCompra(self.selected_compra_id)
             except mysql.connector.Error as err:
                 QMessageBox.critical(self, "Error de base de datos", f"Error al eliminar detalle: {err}")
             finally:
@@ -1572,30 +1391,28 @@ class ComprasWindow(QMainWindow):
             if not self.connectToDatabase():
                 return
             try:
-                cursor = self.db_connection.cursor()
-                
-                # Actualizar estado de la compra
-                cursor.execute("UPDATE compra SET com_estado = 'Completada' WHERE com_id = %s", 
-                             (self.selected_compra_id,))
-                
-                # Actualizar inventario con las cantidades compradas
-                for detalle in self.detalle_compra_data:
-                    inv_id = detalle[2]
-                    cantidad_comprada = detalle[3]
-                    
-                    cursor.execute("""
-                        UPDATE inventario 
-                        SET inv_cantidad = inv_cantidad + %s 
-                        WHERE inv_id = %s
-                    """, (cantidad_comprada, inv_id))
-                
+                # Estado de la compra e inventario de todos los productos en una sola transaccion
+                resultado = completarOrden(self.db_connection, "compra", self.selected_compra_id)
+                if not resultado.aplicada:
+                    self.db_connection.rollback()
+                    QMessageBox.warning(self, "Advertencia", describirFallidos(resultado))
+                    return
                 self.db_connection.commit()
+                
+                # Solo se relee la compra completada para mostrar su estado nuevo
+                cursor = self.db_connection.cursor()
+                self.compras_model.releerFila(cursor, "com_id", self.selected_compra_id,
+                                              self.compras_model.buscarFila(self.selected_compra_id))
                 cursor.close()
                 
-                QMessageBox.information(self, "Éxito", "Compra completada e inventario actualizado")
-                self.loadCompras()
-                self.loadInventarioItems()  # Recargar inventario actualizado
+                QMessageBox.information(self, "Éxito", f"Compra completada e inventario actualizado "
+                                        f"({len(resultado.resultados)} productos)")
+                self.catalogo.actualizarExistencias(resultado.resultados)  # Solo los productos movidos
             except mysql.connector.Error as err:
+                try:
+                    self.db_connection.rollback()
+                except mysql.connector.Error:
+                    pass
                 QMessageBox.critical(self, "Error de base de datos", f"Error al completar compra: {err}")
             finally:
                 if self.db_connection:
@@ -0,0 +1,328 @@
+# Capa de acceso a datos compartida por todos los modulos del ERP.
+# En lugar de abrir una conexion nueva a MySQL en cada carga/alta/edicion/baja,
+# todas las ventanas piden una conexion a un pool unico del proceso y al
+# llamar a close() la conexion regresa al pool en vez de cerrarse.
+#
+# Sentencias preparadas: cursor(prepared=True) manda la consulta con el protocolo
+# binario y conserva la sentencia preparada en el servidor. Cada conexion del
+# pool guarda hasta DB_PREPARADAS sentencias por texto de SQL (las menos usadas
+# se liberan primero), asi las consultas de cada click (detalle de una compra o
+# venta, evaluaciones de un usuario) no se vuelven a analizar cada vez. Para
+# conservarlas el pool ya no reinicia la sesion al regresar la conexion (eso
+# las liberaba); close() solo hace rollback de la transaccion abierta.
+#
+# Variables de entorno (.env):
+# DB_HOST, DB_DATABASE, DB_USER, DB_PASSWORD -> datos de conexion
+# DB_POOL_SIZE     -> numero de conexiones del pool (por defecto 5, maximo 32)
+# DB_POOL_TIMEOUT  -> segundos a esperar por una conexion libre (por defecto 10)
+# DB_PING_ATTEMPTS -> intentos de reconexion al revisar una conexion (por defecto 3)
+# DB_PREPARADAS    -> sentencias preparadas por conexion (por defecto 32, 0 desactiva)
+#
+# Hilos de trabajo (ejecutores de las ventanas, sincronizacion, exportar,
+# importar, precarga): toman su conexion con conexionSegundoPlano(), que entre
+# todos los hilos del proceso deja usar a lo mas tamanoPool() - 1 conexiones.
+# Asi siempre queda una libre para el hilo de la interfaz y obtenerConexion()
+# no se queda esperando DB_POOL_TIMEOUT con la ventana congelada.
+#
+# Cada cursor de ConexionPool.cursor() pasa por medicion.CursorMedido (tiempos,
+# filas y metodo que hizo la consulta); ERP_MEDIR=0 lo desactiva.
+import os
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from contextlib import contextmanager
+import mysql.connector
+from mysql.connector import pooling
+from dotenv import load_dotenv
+import medicion
+
+load_dotenv()
+
+POOL_NAME = "gp_logistics_pool"
+
+_pool = None
+_pool_lock = threading.Lock()
+_fabrica = None
+_cupo = None
+_stats_lock = threading.Lock()
+_estadisticas = {
+    "checkouts": 0,
+    "reconexiones": 0,
+    "espera_total": 0.0,
+    "espera_max": 0.0,
+    "uso_total": 0.0,
+    "uso_max": 0.0,
+    "preparadas_aciertos": 0,
+    "preparadas_fallos": 0,
+    "preparadas_liberadas": 0,
+}
+# conexion de mysql.connector -> SentenciasPreparadas; se olvida cuando el pool descarta la conexion
+_preparadas = weakref.WeakKeyDictionary()
+
+def _entero(nombre, defecto):
+    try:
+        return int(os.environ.get(nombre, defecto))
+    except (TypeError, ValueError):
+        return defecto
+
+def _configuracion():
+    return {
+        "host": os.environ.get("DB_HOST"),
+        "database": os.environ.get("DB_DATABASE"),
+        "user": os.environ.get("DB_USER"),
+        "password": os.environ.get("DB_PASSWORD"),
+    }
+
+def tamanoPool():
+    # mysql.connector no permite pools de mas de 32 conexiones
+    return max(1, min(_entero("DB_POOL_SIZE", 5), pooling.CNX_POOL_MAXSIZE))
+
+def obtenerPool():
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = pooling.MySQLConnectionPool(
+                pool_name=POOL_NAME,
+                pool_size=tamanoPool(),
+                # Reiniciar la sesion liberaria las sentencias preparadas; ver ConexionPool.close
+                pool_reset_session=False,
+                **_configuracion()
+            )
+        return _pool
+
+def reiniciarPool():
+    # Descarta el pool actual (por ejemplo si el servidor se reinicio);
+    # el siguiente checkout crea uno nuevo con conexiones frescas.
+    global _pool
+    with _pool_lock:
+        _pool = None
+
+def usarFabrica(fabrica):
+    # Reemplaza el pool de MySQL por otra fuente de conexiones, por ejemplo la base
+    # en memoria de benchmark.py; con None se regresa al pool normal.
+    global _fabrica
+    _fabrica = fabrica
+
+def _contar(campo):
+    with _stats_lock:
+        _estadisticas[campo] += 1
+
+def _registrar(campo_total, campo_max, segundos):
+    with _stats_lock:
+        _estadisticas[campo_total] += segundos
+        if segundos > _estadisticas[campo_max]:
+            _estadisticas[campo_max] = segundos
+
+def estadisticasPool():
+    """Retorna una copia de los contadores de uso del pool."""
+    with _stats_lock:
+        stats = dict(_estadisticas)
+    stats["tamano"] = tamanoPool()
+    stats["espera_promedio"] = stats["espera_total"] / stats["checkouts"] if stats["checkouts"] else 0.0
+    stats["uso_promedio"] = stats["uso_total"] / stats["checkouts"] if stats["checkouts"] else 0.0
+    preparadas = stats["preparadas_aciertos"] + stats["preparadas_fallos"]
+    stats["preparadas_tasa"] = stats["preparadas_aciertos"] / preparadas if preparadas else 0.0
+    return stats
+
+class SentenciasPreparadas:
+    # Cursores preparados de una conexion, uno por texto de SQL, en orden de uso (LRU).
+    # mysql.connector solo vuelve a preparar si execute recibe otro objeto de texto,
+    # por eso se ejecuta siempre con el texto guardado aqui.
+    def __init__(self, conexion, capacidad):
+        self.conexion = conexion
+        self.capacidad = capacidad
+        # Id de la sesion en el servidor; si ping() reconecto, las sentencias ya no existen
+        self.sesion = conexion.connection_id
+        self._cursores = OrderedDict()  # (sql, dictionary) -> (sql, cursor preparado)
+
+    def __len__(self):
+        return len(self._cursores)
+
+    def obtener(self, sql, dictionary=False):
+        """Retorna (sql, cursor preparado) para sql, preparandolo la primera vez."""
+        clave = (sql, dictionary)
+        entrada = self._cursores.get(clave)
+        if entrada is not None:
+            self._cursores.move_to_end(clave)
+            _contar("preparadas_aciertos")
+            return entrada
+        _contar("preparadas_fallos")
+        entrada = (sql, self.conexion.cursor(prepared=True, dictionary=dictionary))
+        self._cursores[clave] = entrada
+        if len(self._cursores) > self.capacidad:
+            _, (_, cursor) = self._cursores.popitem(last=False)
+            try:
+                cursor.close()  # libera la sentencia en el servidor
+            except mysql.connector.Error:
+                pass
+            _contar("preparadas_liberadas")
+        return entrada
+
+class CursorPreparado:
+    # Cursor de ConexionPool.cursor(prepared=True): cada execute usa la sentencia
+    # preparada de la conexion para ese texto; el resto (fetchall, description,
+    # lastrowid...) es el del cursor preparado. Los resultados se deben leer antes
+    # del siguiente execute, como con cualquier cursor sin buffer.
+    def __init__(self, sentencias, dictionary=False):
+        self._sentencias = sentencias
+        self._dictionary = dictionary
+        self._cursor = None
+
+    def __getattr__(self, nombre):
+        if self._cursor is None:
+            raise AttributeError(nombre)
+        return getattr(self._cursor, nombre)
+
+    def execute(self, query, params=()):
+        sql, self._cursor = self._sentencias.obtener(query, self._dictionary)
+        self._cursor.execute(sql, tuple(params or ()))
+
+    def close(self):
+        # El cursor preparado se queda en la conexion; solo se descartan filas sin leer
+        if self._cursor is not None and self._sentencias.conexion.unread_result:
+            try:
+                self._cursor.fetchall()
+            except mysql.connector.Error:
+                pass
+        self._cursor = None
+
+def _sentenciasPreparadas(conexion):
+    capacidad = _entero("DB_PREPARADAS", 32)
+    if capacidad <= 0:
+        return None
+    # La conexion del pool (PooledMySQLConnection) cambia en cada checkout; las
+    # sentencias viven en la conexion de mysql.connector que envuelve
+    real = getattr(conexion, "_cnx", conexion)
+    with _pool_lock:
+        sentencias = _preparadas.get(real)
+        if sentencias is None or sentencias.sesion != real.connection_id:
+            sentencias = _preparadas[real] = SentenciasPreparadas(real, capacidad)
+    return sentencias
+
+class ConexionPool:
+    # Envoltura ligera de la conexion del pool: se comporta igual que una
+    # conexion de mysql.connector, pero mide cuanto tiempo estuvo prestada.
+    def __init__(self, conexion, espera, sentencias=None):
+        self._conexion = conexion
+        self.espera = espera
+        self._espera_pendiente = espera
+        self.sentencias = sentencias  # SentenciasPreparadas o None (base en memoria o DB_PREPARADAS=0)
+        self._inicio = time.perf_counter()
+        self._cerrada = False
+
+    def __getattr__(self, nombre):
+        return getattr(self._conexion, nombre)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def cursor(self, *args, prepared=False, **kwargs):
+        if prepared and self.sentencias is not None:
+            cursor = CursorPreparado(self.sentencias, kwargs.get("dictionary", False))
+        else:
+            cursor = self._conexion.cursor(*args, **kwargs)
+        return medicion.CursorMedido(cursor, self) if medicion.ACTIVA else cursor
+
+    def tomarEspera(self):
+        """Retorna la espera por la conexion la primera vez (se atribuye a la primera consulta) y despues 0."""
+        espera, self._espera_pendiente = self._espera_pendiente, 0.0
+        return espera
+
+    def close(self):
+        if self._cerrada:
+            return
+        self._cerrada = True
+        _registrar("uso_total", "uso_max", time.perf_counter() - self._inicio)
+        try:
+            # Sin el reinicio de sesion del pool, una transaccion sin commit (o la
+            # instantanea de una lectura) seguiria abierta para el siguiente que la pida
+            if getattr(self._conexion, "in_transaction", False):
+                self._conexion.rollback()
+        except mysql.connector.Error:
+            pass
+        try:
+            # Regresa la conexion al pool
+            self._conexion.close()
+        except mysql.connector.Error:
+            pass
+
+def _descartar(conexion):
+    # Una conexion que no responde no debe volver al pool tal cual
+    try:
+        conexion.close()
+    except mysql.connector.Error:
+        pass
+
+def obtenerConexion(timeout=None):
+    """Retorna una conexion revisada del pool, esperando si todas estan ocupadas."""
+    if _fabrica is not None:
+        with _stats_lock:
+            _estadisticas["checkouts"] += 1
+        return ConexionPool(_fabrica(), 0.0)
+    if timeout is None:
+        timeout = _entero("DB_POOL_TIMEOUT", 10)
+    intentos_ping = max(1, _entero("DB_PING_ATTEMPTS", 3))
+    inicio = time.perf_counter()
+    limite = inicio + timeout
+    reintentado = False
+
+    while True:
+        try:
+            conexion = obtenerPool().get_connection()
+        except pooling.PoolError:
+            # Pool agotado, esperamos a que otra ventana devuelva su conexion
+            if time.perf_counter() >= limite:
+                raise
+            time.sleep(0.05)
+            continue
+        except (mysql.connector.InterfaceError, mysql.connector.OperationalError):
+            # El servidor no respondio al crear el pool, se intenta una vez desde cero
+            if reintentado:
+                raise
+            reintentado = True
+            reiniciarPool()
+            continue
+
+        try:
+            # Health check: si la conexion se cayo se reconecta antes de entregarla
+            conexion.ping(reconnect=True, attempts=intentos_ping, delay=1)
+        except (mysql.connector.InterfaceError, mysql.connector.OperationalError):
+            _descartar(conexion)
+            if reintentado:
+                raise
+            reintentado = True
+            with _stats_lock:
+                _estadisticas["reconexiones"] += 1
+            reiniciarPool()
+            continue
+
+        espera = time.perf_counter() - inicio
+        with _stats_lock:
+            _estadisticas["checkouts"] += 1
+        _registrar("espera_total", "espera_max", espera)
+        return ConexionPool(conexion, espera, _sentenciasPreparadas(conexion))
+
+def _cupoSegundoPlano():
+    global _cupo
+    with _pool_lock:
+        if _cupo is None:
+            _cupo = threading.BoundedSemaphore(max(1, tamanoPool() - 1))
+        return _cupo
+
+@contextmanager
+def conexionSegundoPlano():
+    """Conexion para un hilo de trabajo; espera (sin limite) a que haya cupo entre todos los hilos."""
+    cupo = _cupoSegundoPlano()
+    cupo.acquire()
+    try:
+        conexion = obtenerConexion()
+        try:
+            yield conexion
+        finally:
+            conexion.close()
+    finally:
+        cupo.release()
@@ -0,0 +1,113 @@
+# Ejecucion de consultas en segundo plano.
+# Las consultas corren en un QThreadPool con su propia conexion del pool y el
+# resultado regresa al hilo de la interfaz por una señal, donde se actualizan
+# los modelos y graficas. Asi la ventana no se congela ("No responde") mientras
+# MySQL contesta.
+#
+# Uso:
+#   def consultar(cursor):          # corre en el hilo de trabajo, solo BD
+#       cursor.execute(...)
+#       return cursor.fetchall()
+#   self.ejecutor.ejecutar(consultar, self.mostrarDatos, self.mostrarError, grupo="modulo")
+#
+# Las solicitudes del mismo grupo se reemplazan: si llega una nueva antes de que
+# termine la anterior, la anterior ya no se entrega (o ni se ejecuta si seguia en cola).
+import threading
+import traceback
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+import mysql.connector
+from conexion import conexionSegundoPlano, tamanoPool
+
+class _TareaConsulta(QRunnable):
+    def __init__(self, ejecutor, id_solicitud, grupo, funcion):
+        super().__init__()
+        self.ejecutor = ejecutor
+        self.id_solicitud = id_solicitud
+        self.grupo = grupo
+        self.funcion = funcion
+
+    def run(self):
+        # Si ya hay una solicitud mas nueva del mismo grupo no vale la pena consultar
+        if self.ejecutor.esObsoleta(self.id_solicitud, self.grupo):
+            self.ejecutor._listo.emit(self.id_solicitud, None)
+            return
+        try:
+            # El cupo de conexiones es de todo el proceso, no de este ejecutor
+            with conexionSegundoPlano() as conexion:
+                cursor = conexion.cursor()
+                resultado = self.funcion(cursor)
+                cursor.close()
+        except mysql.connector.Error as err:
+            self.ejecutor._fallo.emit(self.id_solicitud, str(err))
+            return
+        except Exception as err:
+            traceback.print_exc()
+            self.ejecutor._fallo.emit(self.id_solicitud, str(err))
+            return
+        self.ejecutor._listo.emit(self.id_solicitud, resultado)
+
+class EjecutorConsultas(QObject):
+    _listo = pyqtSignal(int, object)
+    _fallo = pyqtSignal(int, str)
+
+    def __init__(self, parent=None, max_hilos=None):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        # Mas hilos que el cupo de conexiones de segundo plano solo esperarian en conexionSegundoPlano()
+        self.pool.setMaxThreadCount(max_hilos or max(1, tamanoPool() - 1))
+        self._lock = threading.Lock()
+        self._ultimo_id = 0
+        self._vigentes = {}    # grupo -> id de la solicitud mas reciente
+        self._pendientes = {}  # id -> (grupo, al_terminar, al_fallar)
+        self._listo.connect(self._entregar)
+        self._fallo.connect(self._reportar)
+
+    def ejecutar(self, funcion, al_terminar, al_fallar=None, grupo=None):
+        """Ejecuta funcion(cursor) en segundo plano y retorna el id de la solicitud."""
+        with self._lock:
+            self._ultimo_id += 1
+            id_solicitud = self._ultimo_id
+            if grupo is not None:
+                self._vigentes[grupo] = id_solicitud
+        self._pendientes[id_solicitud] = (grupo, al_terminar, al_fallar)
+        self.pool.start(_TareaConsulta(self, id_solicitud, grupo, funcion))
+        return id_solicitud
+
+    def cancelar(self, grupo):
+        # Ninguna solicitud pendiente del grupo se entregara
+        with self._lock:
+            self._vigentes[grupo] = None
+
+    def esObsoleta(self, id_solicitud, grupo):
+        if grupo is None:
+            return False
+        with self._lock:
+            return self._vigentes.get(grupo) != id_solicitud
+
+    def ocupado(self, grupo):
+        """Retorna True si la solicitud vigente del grupo no ha terminado."""
+        with self._lock:
+            vigente = self._vigentes.get(grupo)
+        return vigente is not None and vigente in self._pendientes
+
+    def enCurso(self):
+        """Retorna True si hay solicitudes cuyo resultado no se ha entregado."""
+        return bool(self._pendientes)
+
+    def esperar(self, milisegundos=-1):
+        return self.pool.waitForDone(milisegundos)
+
+    def _entregar(self, id_solicitud, resultado):
+        grupo, al_terminar, _ = self._pendientes.pop(id_solicitud, (None, None, None))
+        if al_terminar is None or self.esObsoleta(id_solicitud, grupo):
+            return
+        al_terminar(resultado)
+
+    def _reportar(self, id_solicitud, mensaje):
+        grupo, _, al_fallar = self._pendientes.pop(id_solicitud, (None, None, None))
+        if self.esObsoleta(id_solicitud, grupo):
+            return
+        if al_fallar is not None:
+            al_fallar(mensaje)
+        else:
+            print(f"Error en consulta en segundo plano: {mensaje}")
@@ -0,0 +1,329 @@
+# Exportacion de tablas y reportes a CSV, XLSX o Parquet.
+# Cada tabla tiene "Exportar..." en su menu contextual (y GestionWindow un boton
+# en la toolbar). Se exportan todas las filas de la consulta de la tabla, con el
+# orden y los filtros elegidos, no solo las paginas que ya se leyeron.
+#
+# Las filas no se juntan en una lista: la consulta corre en un hilo de trabajo
+# con un cursor sin buffer (el resultado se queda en el servidor) y se leen
+# con fetchmany de TAMANO_LOTE en TAMANO_LOTE directo al archivo, asi la memoria
+# no crece con el tamaño de la exportacion. Los valores se escriben tal como
+# vienen de MySQL (montos, fechas), sin el formato de las celdas.
+#
+# XLSX necesita openpyxl y Parquet pyarrow (opcionales):
+#   pip install openpyxl
+#   pip install pyarrow
+import csv
+import datetime
+import os
+import re
+import threading
+import traceback
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, Qt, pyqtSignal
+from PyQt5.QtWidgets import QAction, QFileDialog, QMessageBox, QProgressDialog, QTableView
+import mysql.connector
+from conexion import conexionSegundoPlano
+
+# Filas por fetchmany (y por escritura al archivo)
+TAMANO_LOTE = 2000
+# Filas de datos por hoja de XLSX (Excel admite 1,048,576 con el encabezado)
+MAX_FILAS_XLSX = 1048575
+
+# Filtro del dialogo de guardar -> formato
+FORMATOS = {
+    "CSV (*.csv)": "csv",
+    "Excel (*.xlsx)": "xlsx",
+    "Parquet (*.parquet)": "parquet",
+}
+
+_TABLA = re.compile(r"\bFROM\s+(\w+)", re.IGNORECASE)
+# Exportaciones en curso; se conservan aqui hasta que terminan aunque se cierre la ventana
+_activas = set()
+
+class EscritorCsv:
+    def __init__(self, ruta, titulos):
+        # utf-8-sig para que Excel reconozca los acentos al abrir el archivo
+        self._archivo = open(ruta, "w", newline="", encoding="utf-8-sig")
+        self._csv = csv.writer(self._archivo)
+        self._csv.writerow(titulos)
+
+    def escribir(self, filas):
+        self._csv.writerows(filas)
+
+    def cerrar(self):
+        self._archivo.close()
+
+class EscritorXlsx:
+    def __init__(self, ruta, titulos):
+        try:
+            from openpyxl import Workbook
+        except ImportError:
+            raise RuntimeError("Para exportar a XLSX instale openpyxl (pip install openpyxl)")
+        self._ruta = ruta
+        self._titulos = titulos
+        # write_only: cada fila se pasa a un archivo temporal al agregarla
+        self._libro = Workbook(write_only=True)
+        self._hoja = None
+        self._filas_hoja = MAX_FILAS_XLSX
+
+    def escribir(self, filas):
+        for fila in filas:
+            if self._filas_hoja >= MAX_FILAS_XLSX:
+                # La hoja se lleno (o es la primera fila): sigue en una hoja nueva
+                self._hoja = self._libro.create_sheet()
+                self._hoja.append(self._titulos)
+                self._filas_hoja = 0
+            self._hoja.append(fila)
+            self._filas_hoja += 1
+
+    def cerrar(self):
+        if self._hoja is None:
+            self._libro.create_sheet().append(self._titulos)
+        self._libro.save(self._ruta)
+
+class EscritorParquet:
+    def __init__(self, ruta, titulos):
+        try:
+            import pyarrow
+            import pyarrow.parquet
+        except ImportError:
+            raise RuntimeError("Para exportar a Parquet instale pyarrow (pip install pyarrow)")
+        self._pa = pyarrow
+        self._pq = pyarrow.parquet
+        self._ruta = ruta
+        self._titulos = titulos
+        self._esquema = None
+        self._texto = []     # columnas que se guardan como texto
+        self._escritor = None  # ParquetWriter, se crea con los tipos del primer lote
+
+    def _tipo(self, valores):
+        pa = self._pa
+        tipo = pa.array(valores).type
+        if pa.types.is_null(tipo):
+            return pa.string()  # primer lote sin valores
+        if pa.types.is_decimal(tipo):
+            # La precision se infiere del primer lote; la escala es la de la columna DECIMAL
+            return pa.decimal128(38, tipo.scale)
+        return tipo
+
+    def escribir(self, filas):
+        pa = self._pa
+        columnas = [list(valores) for valores in zip(*filas)]
+        if self._escritor is None:
+            tipos = [self._tipo(valores) for valores in columnas]
+            self._texto = [pa.types.is_string(tipo) for tipo in tipos]
+            self._esquema = pa.schema([pa.field(titulo, tipo) for titulo, tipo in zip(self._titulos, tipos)])
+            self._escritor = self._pq.ParquetWriter(self._ruta, self._esquema)
+        arreglos = []
+        for valores, campo, texto in zip(columnas, self._esquema, self._texto):
+            if texto:
+                valores = [None if valor is None else str(valor) for valor in valores]
+            arreglos.append(pa.array(valores, type=campo.type))
+        self._escritor.write_batch(pa.RecordBatch.from_arrays(arreglos, schema=self._esquema))
+
+    def cerrar(self):
+        if self._escritor is not None:
+            self._escritor.close()
+            return
+        pa = self._pa
+        vacia = pa.table({titulo: pa.array([], type=pa.string()) for titulo in self._titulos})
+        self._pq.write_table(vacia, self._ruta)
+
+ESCRITORES = {"csv": EscritorCsv, "xlsx": EscritorXlsx, "parquet": EscritorParquet}
+
+def lotesCursor(cursor, consulta):
+    """Ejecuta consulta completa (sin LIMIT, en su orden) y genera sus filas por lotes de fetchmany."""
+    query, params = consulta.sql(None, None)
+    cursor.execute(query, params)
+    while True:
+        filas = cursor.fetchmany(TAMANO_LOTE)
+        if not filas:
+            return
+        yield filas
+
+def lotesLista(filas):
+    """Genera por lotes las filas que ya estan en memoria (tablas cargadas con refreshData)."""
+    for inicio in range(0, len(filas), TAMANO_LOTE):
+        yield filas[inicio:inicio + TAMANO_LOTE]
+
+def exportar(ruta, formato, titulos, posiciones, lotes, progreso=None, cancelado=None):
+    """Escribe los lotes de filas (solo las posiciones indicadas) en ruta.
+
+    Retorna el numero de filas escritas, o None si cancelado() se volvio verdadero;
+    si se cancela o falla no queda el archivo a medias.
+    """
+    escritor = ESCRITORES[formato](ruta, titulos)
+    total = 0
+    completo = False
+    try:
+        for filas in lotes:
+            if cancelado is not None and cancelado():
+                return None
+            escritor.escribir([[fila[posicion] for posicion in posiciones] for fila in filas])
+            total += len(filas)
+            if progreso is not None:
+                progreso(total)
+        escritor.cerrar()
+        completo = True
+    finally:
+        if not completo:
+            try:
+                escritor.cerrar()
+            except Exception:
+                pass
+            if os.path.exists(ruta):
+                os.remove(ruta)
+    return total
+
+def _cortarResultado(conexion):
+    # Leer el resto de un resultado sin buffer tardaria lo mismo que exportarlo:
+    # se cierra el socket y el pool vuelve a conectar la conexion al prestarla
+    desconectar = getattr(conexion, "disconnect", None)
+    if desconectar is not None:
+        try:
+            desconectar()
+        except mysql.connector.Error:
+            pass
+
+class _TareaExportacion(QRunnable):
+    def __init__(self, exportacion):
+        super().__init__()
+        self.exportacion = exportacion
+
+    def run(self):
+        e = self.exportacion
+        try:
+            if e.consulta is None:
+                total = exportar(e.ruta, e.formato, e.titulos, e.posiciones, lotesLista(e.filas),
+                                 e._avance.emit, e.cancelacion.is_set)
+            else:
+                with conexionSegundoPlano() as conexion:
+                    leido = False
+                    try:
+                        cursor = conexion.cursor()
+                        total = exportar(e.ruta, e.formato, e.titulos, e.posiciones, lotesCursor(cursor, e.consulta),
+                                         e._avance.emit, e.cancelacion.is_set)
+                        leido = total is not None
+                        if leido:
+                            cursor.close()
+                    finally:
+                        if not leido:
+                            _cortarResultado(conexion)
+        except (mysql.connector.Error, RuntimeError) as err:
+            # RuntimeError: falta la libreria del formato
+            e._fallo.emit(str(err))
+            return
+        except Exception as err:
+            traceback.print_exc()
+            e._fallo.emit(str(err))
+            return
+        if total is None:
+            e._cancelada.emit()
+        else:
+            e._terminada.emit(total)
+
+class Exportacion(QObject):
+    # Una exportacion en segundo plano; las señales llegan al hilo de la interfaz
+    progreso = pyqtSignal(int)    # filas escritas hasta ahora
+    terminada = pyqtSignal(int)   # filas escritas
+    cancelada = pyqtSignal()
+    fallo = pyqtSignal(str)
+    _avance = pyqtSignal(int)
+    _terminada = pyqtSignal(int)
+    _cancelada = pyqtSignal()
+    _fallo = pyqtSignal(str)
+
+    def __init__(self, ruta, formato, titulos, posiciones, consulta=None, filas=None):
+        super().__init__()
+        self.ruta = ruta
+        self.formato = formato
+        self.titulos = titulos
+        self.posiciones = posiciones
+        self.consulta = consulta  # ConsultaPaginada; sin consulta se exportan filas
+        self.filas = filas
+        self.cancelacion = threading.Event()
+        self._avance.connect(self.progreso)
+        self._terminada.connect(lambda total: self._fin(self.terminada, total))
+        self._cancelada.connect(lambda: self._fin(self.cancelada))
+        self._fallo.connect(lambda mensaje: self._fin(self.fallo, mensaje))
+
+    def iniciar(self):
+        _activas.add(self)
+        # Pool global de Qt: una exportacion larga no ocupa los hilos de las cargas de la ventana
+        QThreadPool.globalInstance().start(_TareaExportacion(self))
+
+    def cancelar(self):
+        self.cancelacion.set()
+
+    def _fin(self, senal, *args):
+        _activas.discard(self)
+        senal.emit(*args)
+
+def formatoArchivo(ruta, filtro):
+    """Retorna el formato por la extension de ruta o, si no tiene, por el filtro elegido; y la ruta con extension."""
+    extension = os.path.splitext(ruta)[1].lower().lstrip(".")
+    if extension in ESCRITORES:
+        return extension, ruta
+    formato = FORMATOS.get(filtro, "csv")
+    return formato, f"{ruta}.{formato}"
+
+def nombreArchivo(consulta, nombre=None):
+    """Nombre sugerido: la tabla de la consulta (o nombre) y la fecha de hoy."""
+    if nombre is None and consulta is not None:
+        encontrada = _TABLA.search(consulta.select)
+        nombre = encontrada.group(1) if encontrada else None
+    return f"{nombre or 'tabla'}_{datetime.date.today():%Y%m%d}"
+
+def exportarVista(vista, nombre=None):
+    """Pide el archivo y exporta en segundo plano todas las filas de la tabla de vista."""
+    modelo = vista.model()
+    consulta = modelo.consulta
+    columnas = modelo.columnasDatos()
+    if consulta is None and modelo.rowCount() == 0:
+        QMessageBox.information(vista, "Exportar", "La tabla no tiene datos para exportar.")
+        return None
+    ruta, filtro = QFileDialog.getSaveFileName(vista, "Exportar tabla", nombreArchivo(consulta, nombre),
+                                               ";;".join(FORMATOS))
+    if not ruta:
+        return None
+    formato, ruta = formatoArchivo(ruta, filtro)
+    # Sin consulta (filas de refreshData) se exporta una copia de las filas en memoria
+    filas = None if consulta is not None else modelo.copiaFilas()
+    ventana = vista.window()
+    exportacion = Exportacion(ruta, formato, [titulo for titulo, _ in columnas],
+                              [posicion for _, posicion in columnas], consulta, filas)
+
+    dialogo = QProgressDialog(f"Exportando a {os.path.basename(ruta)}...", "Cancelar", 0, 0, ventana)
+    dialogo.setWindowTitle("Exportar")
+    dialogo.setAttribute(Qt.WA_DeleteOnClose)
+    dialogo.setMinimumDuration(0)
+    dialogo.setAutoClose(False)
+    dialogo.setAutoReset(False)
+    dialogo.canceled.connect(exportacion.cancelar)
+    exportacion.progreso.connect(lambda total: dialogo.setLabelText(f"{total:,} filas exportadas..."))
+
+    def terminar(total):
+        dialogo.close()
+        QMessageBox.information(ventana, "Exportar", f"Se exportaron {total:,} filas a {ruta}")
+
+    def fallar(mensaje):
+        dialogo.close()
+        QMessageBox.critical(ventana, "Error al exportar", f"No se pudo exportar la tabla: {mensaje}")
+
+    exportacion.terminada.connect(terminar)
+    exportacion.fallo.connect(fallar)
+    exportacion.cancelada.connect(dialogo.close)
+    exportacion.iniciar()
+    dialogo.show()
+    return exportacion
+
+def activarExportacion(vista, nombre=None):
+    """Agrega "Exportar..." al menu contextual de la tabla."""
+    accion = QAction("Exportar...", vista)
+    accion.triggered.connect(lambda: exportarVista(vista, nombre))
+    vista.addAction(accion)
+    vista.setContextMenuPolicy(Qt.ActionsContextMenu)
+
+def activarExportaciones(ventana):
+    """Activa la exportacion en todas las tablas de ventana."""
+    for vista in ventana.findChildren(QTableView):
+        activarExportacion(vista)
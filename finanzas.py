@@ -4,81 +4,40 @@ from PyQt5.QtWidgets import (QMainWindow, QPushButton, QVBoxLayout, QHBoxLayout,
                             QLineEdit, QDateEdit, QComboBox, QMessageBox, QLabel, QSplitter,
                             QDialogButtonBox, QApplication, QFrame, QGridLayout, QSizePolicy, 
                             QStackedWidget)
-from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QDate, QSize
-from PyQt5.QtGui import QPixmap, QIcon, QFont, QColor
+from PyQt5.QtCore import Qt, QModelIndex, QDate, QSize
+from PyQt5.QtGui import QIcon, QFont, QColor
 from PyQt5.QtSql import QSqlDatabase, QSqlQuery, QSqlTableModel, QSqlQueryModel
 import mysql.connector
 from datetime import datetime
-import os
-from dotenv import load_dotenv
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.figure import Figure
-
-class FinanzasTableModel(QAbstractTableModel):
-    def __init__(self, data=None):
-        super().__init__()
-        self._data = data if data is not None else []
-        # Cabeceras de cada tabla.
-        self._headers = ["ID", "Usuario ID", "Fecha", "Descripción", "Monto", "Tipo", "Acciones"]
-        
-    def data(self, index, role):
-        if not index.isValid() or not (0 <= index.row() < len(self._data)):
-            return None
-            
-        if role == Qt.DisplayRole:
-            # para no mostrar valores en la columna de las acciones (6 en este caso)
-            if index.column() == 6:
-                return None
-                
-            value = self._data[index.row()][index.column()]
-            
-            # Darle el formato correcto a las fechas
-            if index.column() == 2 and isinstance(value, datetime):
-                return value.strftime("%Y-%m-%d")
-                
-            # Formato correcto a los ingresos
-            if index.column() == 4:
-                return f"${value:,.2f}"
-                
-            return str(value)
-            
-        elif role == Qt.TextAlignmentRole:
-            # Alinear los valores de la columna de monto a la derecha
-            if index.column() == 4:
-                return Qt.AlignRight | Qt.AlignVCenter
-        """
-        elif role == Qt.BackgroundRole:
-            # Colorear las filas en base a el tipo de transaccion
-            if self._data[index.row()][5] == 'ingreso':
-                return QColor(240, 255, 240)  # Light green for income
-            else:
-                return QColor(255, 240, 240)  # Light red for expenses
-        """     
-        return None
-        
-    def rowCount(self, parent=None):
-        return len(self._data)
-        
-    def columnCount(self, parent=None):
-        return 7  # 6 columnas de datos + 1 columna de acciones
-        
-    def headerData(self, section, orientation, role):
-        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
-            return self._headers[section]
-        return None
-        
-    def setData(self, index, value, role=Qt.EditRole):
-        if role == Qt.EditRole:
-            self._data[index.row()][index.column()] = value
-            self.dataChanged.emit(index, index)
-            return True
-        return False
-        
-    def refreshData(self, data):
-        self.beginResetModel()
-        self._data = data
-        self.endResetModel()
+from conexion import obtenerConexion
+import imagenes
+from paginacion import ConsultaPaginada, leerConsulta
+from tablas import (TablaModel, Columna, ACCIONES, DERECHA, fecha, moneda,
+                    filtroIgual, filtroFecha, filtroTexto, tablaConFiltros)
+from ejecutor import EjecutorConsultas
+from sincronizacion import Sincronizador
+from agregados import consultarResumenFinanzas, consultarTotalesTipo
+from acciones import BotonesDelegate, Boton
+from graficas import Grafica
+from importar import importarArchivo
+
+# Consultas de lectura de la ventana; migrar.py --verificar corre EXPLAIN sobre estas mismas
+CONSULTA_FINANZAS = ConsultaPaginada("SELECT * FROM finanza", [("fin_fecha", 2, True), ("fin_id", 0, True)])
+SQL_RANGO_FECHAS = """
+    SELECT fin_id, fin_usu_id, fin_fecha, fin_desc, fin_monto, fin_tipo
+    FROM finanza
+    WHERE fin_fecha BETWEEN %s AND %s
+    ORDER BY fin_fecha DESC
+"""
+
+class FinanzasTableModel(TablaModel):
+    # 6 columnas de datos + 1 columna de acciones; el monto alineado a la derecha
+    columnas = [Columna("ID", campo="fin_id"),
+                Columna("Usuario ID", campo="fin_usu_id", nulos=True, filtro=filtroIgual("fin_usu_id")),
+                Columna("Fecha", fecha, campo="fin_fecha", filtro=filtroFecha("fin_fecha")),
+                Columna("Descripción", filtro=filtroTexto("fin_desc")),
+                Columna("Monto", moneda, DERECHA, campo="fin_monto"),
+                Columna("Tipo", filtro=filtroIgual("fin_tipo")), ACCIONES]
 
 # Dialog de editar/insertar datos a la  base de datos para finanzas
 class FinanzasDialog(QDialog):
@@ -179,63 +138,27 @@ class FinanzasDialog(QDialog):
             "tipo": self.type_combo.currentText()
         }
 
-class FinanceChart(FigureCanvas):
-    def __init__(self, parent=None, width=5, height=4, dpi=100):
-        self.fig = Figure(figsize=(width, height), dpi=dpi)
-        self.axes = self.fig.add_subplot(111)
-        super().__init__(self.fig)
-        self.setParent(parent)
-        
+class FinanceChart(Grafica):
     def plot_income_expense(self, income_data, expense_data):
-        self.axes.clear()
-        
-        # Extract dates and amounts
-        #income_dates = [datetime.strptime(date, "%Y-%m-%d").date() for date, _ in income_data]
-        income_dates = [date for date, _ in income_data]
-        income_amounts = [amount for _, amount in income_data]
-        
-        #expense_dates = [datetime.strptime(date, "%Y-%m-%d").date() for date, _ in expense_data]
-        expense_dates = [date for date, _ in expense_data]
-        expense_amounts = [amount for _, amount in expense_data]
-        
-        # Plot data
-        self.axes.plot(income_dates, income_amounts, 'go-', label='Ingresos')
-        self.axes.plot(expense_dates, expense_amounts, 'ro-', label='Gastos')
+        # Las lineas se crean la primera vez; despues solo se cambian sus datos
+        self.serie("ingresos", [date for date, _ in income_data], [amount for _, amount in income_data],
+                   'go-', 'Ingresos')
+        self.serie("gastos", [date for date, _ in expense_data], [amount for _, amount in expense_data],
+                   'ro-', 'Gastos')
         
         # Format plot
-        self.axes.set_title('Ingresos vs Gastos')
-        self.axes.set_xlabel('Fecha')
-        self.axes.set_ylabel('Monto ($)')
-        self.axes.legend()
-        self.axes.grid(True, linestyle='--', alpha=0.7)
+        self.rotular('Ingresos vs Gastos', 'Fecha', 'Monto ($)')
+        self.leyenda()
         
         # Format y-axis as currency
         self.axes.yaxis.set_major_formatter('${x:,.2f}')
         
-        # Rotate date labels for better readability
-        plt.setp(self.axes.get_xticklabels(), rotation=45, ha='right')
-        
-        self.fig.tight_layout()
-        self.draw()
+        self.actualizar()
         
     def plot_summary_pie(self, income_total, expense_total):
-        self.axes.clear()
-        
-        # Data
-        labels = ['Ingresos', 'Gastos']
-        sizes = [income_total, expense_total]
-        colors = ['#4CAF50', '#F44336']
-        explode = (0.1, 0)  # explode the 1st slice (Ingresos)
-        
-        # Plot
-        self.axes.pie(sizes, explode=explode, labels=labels, colors=colors,
-                autopct='%1.1f%%', shadow=True, startangle=90)
-        self.axes.axis('equal')  # Equal aspect ratio ensures that pie is drawn as a circle
-        
-        self.axes.set_title('Distribución de Finanzas')
-        
-        self.fig.tight_layout()
-        self.draw()
+        self.pastel(['Ingresos', 'Gastos'], [income_total, expense_total], ['#4CAF50', '#F44336'],
+                    'Distribución de Finanzas')
+        self.actualizar()
 
 
 class FinanzasWindow(QMainWindow):
@@ -247,7 +170,12 @@ class FinanzasWindow(QMainWindow):
         self.loginWindow = loginWindow
         self.db_connection = None
         self.finance_data = []
+        # Loads run in the background so the window never freezes
+        self.ejecutor = EjecutorConsultas(self)
+        # Refresco periodico con solo las filas que cambiaron; la primera marca se toma en segundo plano
+        self.sincronizador = Sincronizador(self)
         self.initUI(usu_id)
+        self.sincronizador.registrar(self.table_model, self.table_view, self.loadResumen)
         self.loadDataMain()
         
     def initUI(self,usu_id):
@@ -335,11 +263,10 @@ class FinanzasWindow(QMainWindow):
         
         # Agregamos el logo a la toolbar
         logo_label = QLabel()
-        logo_pixmap = QPixmap("Logo-Grupo-Porteo.png")
+        logo_pixmap = imagenes.pixmap("Logo-Grupo-Porteo.png", 40)
         if logo_pixmap.isNull():
             print("Error: No se pudo cargar Logo-Grupo-Porteo.png")
         else:
-            logo_pixmap = logo_pixmap.scaled(40, 40, Qt.KeepAspectRatio, Qt.SmoothTransformation)
             logo_label.setPixmap(logo_pixmap)
         self.toolbar.addWidget(logo_label)
         
@@ -416,8 +343,12 @@ class FinanzasWindow(QMainWindow):
         # Create model for table
         self.table_model = FinanzasTableModel()
         self.table_view.setModel(self.table_model)
+        # Action buttons in the last column, painted by a delegate instead of one widget per row
+        self.table_view.setItemDelegateForColumn(6, BotonesDelegate(self.table_view, [
+            Boton("Editar", self.editFinanceRecord),
+            Boton("Eliminar", self.deleteFinanceRecord, eliminar=True)]))
         
-        splitter.addWidget(self.table_view)
+        splitter.addWidget(tablaConFiltros(self.table_view))
 
         # Create charts frame
         charts_frame = QFrame()
@@ -460,6 +391,11 @@ class FinanzasWindow(QMainWindow):
         #self.toolbar.addAction(new_action)
         button_panel.addWidget(new_action)
         
+        # Carga masiva desde CSV o XLSX (estados de cuenta)
+        import_action = QPushButton(QIcon.fromTheme("document-import"), "Importar", self)
+        import_action.clicked.connect(lambda: importarArchivo(self, "finanza", usu_id, self.loadDataMain))
+        button_panel.addWidget(import_action)
+        
         refresh_action = QPushButton(QIcon.fromTheme("view-refresh"), "Actualizar", self)
         refresh_action.clicked.connect(self.loadDataMain)
         #refresh_action = QAction(QIcon.fromTheme("view-refresh"), "Actualizar", self)
@@ -534,6 +470,9 @@ class FinanzasWindow(QMainWindow):
         # Modelo para la tabla de consultas
         self.query_model = FinanzasTableModel()
         self.query_table_view.setModel(self.query_model)
+        self.query_table_view.setItemDelegateForColumn(6, BotonesDelegate(self.query_table_view, [
+            Boton("Editar", self.editFinanceRecord),
+            Boton("Eliminar", self.deleteFinanceRecord, eliminar=True)]))
 
         queries_layout.addWidget(self.query_table_view)
 
@@ -548,84 +487,48 @@ class FinanzasWindow(QMainWindow):
         
     def connectToDatabase(self):
         try:
-            load_dotenv()
-            self.db_connection = mysql.connector.connect(
-                host=os.environ.get("DB_HOST"),
-                database=os.environ.get("DB_DATABASE"),
-                user=os.environ.get("DB_USER"),
-                password=os.environ.get("DB_PASSWORD")
-            )
+            # Conexion prestada del pool compartido, close() la regresa al pool
+            self.db_connection = obtenerConexion()
             return True
         except mysql.connector.Error as err:
             QMessageBox.critical(self, "Error de base de datos", f"No se pudo conectar: {err}")
             return False
             
     def loadDataMain(self):
-        if not self.connectToDatabase():
-            return
-            
-        try:
-            cursor = self.db_connection.cursor()
-            
-            # Get all finance records
-            cursor.execute("SELECT * FROM finanza ORDER BY fin_fecha DESC")
-            self.finance_data = cursor.fetchall()
-            
-            # Update table model
-            self.table_model.refreshData(self.finance_data)
-            
-            # Configure the action buttons in the last column
-            for row in range(len(self.finance_data)):
-                # Create a widget to hold the buttons
-                widget = QWidget()
-                layout = QHBoxLayout(widget)
-                layout.setContentsMargins(4, 4, 4, 4)
-                
-                # Edit button
-                edit_btn = QPushButton("Editar")
-                edit_btn.setFixedWidth(90)
-                edit_btn.setFixedHeight(30)
-                edit_btn.clicked.connect(lambda _, r=row: self.editFinanceRecord(r))
-                layout.addWidget(edit_btn)
-                
-                # Delete button
-                delete_btn = QPushButton("Eliminar")
-                delete_btn.setObjectName("deleteBtn")
-                delete_btn.setFixedWidth(90)
-                delete_btn.setFixedHeight(30)
-                delete_btn.clicked.connect(lambda _, r=row: self.deleteFinanceRecord(r))
-                layout.addWidget(delete_btn)
-                
-                layout.setAlignment(Qt.AlignCenter)
-                widget.setLayout(layout)
-                
-                # Set the widget as the cell's widget
-                self.table_view.setIndexWidget(self.table_model.index(row, 6), widget)
+        # Finance records page by page (keyset on fecha, id), with the order and filters chosen in the table
+        consulta = self.table_model.consultaVista(CONSULTA_FINANZAS)
+        
+        # The queries run in the background, showDataMain gets the results on the GUI thread
+        def consultar(cursor):
+            finance_data = leerConsulta(consulta, cursor)
                 
-            # Load data for charts
-            cursor.execute("SELECT fin_fecha, SUM(fin_monto) FROM finanza WHERE fin_tipo = 'ingreso' GROUP BY fin_fecha ORDER BY fin_fecha")
-            income_data = cursor.fetchall()
-            
-            cursor.execute("SELECT fin_fecha, SUM(fin_monto) FROM finanza WHERE fin_tipo = 'gasto' GROUP BY fin_fecha ORDER BY fin_fecha")
-            expense_data = cursor.fetchall()
-            
-            cursor.execute("SELECT SUM(fin_monto) FROM finanza WHERE fin_tipo = 'ingreso'")
-            income_total = cursor.fetchone()[0] or 0
-            
-            cursor.execute("SELECT SUM(fin_monto) FROM finanza WHERE fin_tipo = 'gasto'")
-            expense_total = cursor.fetchone()[0] or 0
-            
-            # Update charts
-            self.time_chart.plot_income_expense(income_data, expense_data)
-            self.summary_chart.plot_summary_pie(income_total, expense_total)
-            
-            cursor.close()
-            
-        except mysql.connector.Error as err:
-            QMessageBox.critical(self, "Error de base de datos", f"Error al cargar datos: {err}")
-        finally:
-            if self.db_connection:
-                self.db_connection.close()
+            # Load data for charts (one pass over finanza for both types and the totals)
+            resumen = consultarResumenFinanzas(cursor)
+            
+            return finance_data, resumen
+        
+        self.ejecutor.ejecutar(
+            consultar, self.showDataMain,
+            lambda err: QMessageBox.critical(self, "Error de base de datos", f"Error al cargar datos: {err}"),
+            grupo="main")
+        
+    def showDataMain(self, resultado):
+        finance_data, resumen = resultado
+        self.finance_data = self.table_model.mostrarConsulta(finance_data)
+        self.showResumen(resumen)
+        
+    def loadResumen(self):
+        # Despues de un alta, cambio o baja la tabla ya se actualizo fila por fila;
+        # solo las graficas se recalculan, en segundo plano
+        self.ejecutor.ejecutar(
+            consultarResumenFinanzas, self.showResumen,
+            lambda err: QMessageBox.critical(self, "Error de base de datos", f"Error al cargar datos: {err}"),
+            grupo="resumen")
+        
+    def showResumen(self, resumen):
+        # Update charts
+        self.time_chart.plot_income_expense(resumen.ingresos_diarios, resumen.gastos_diarios)
+        self.summary_chart.plot_summary_pie(resumen.total_ingresos, resumen.total_gastos)
 
     def loadQueryData(self):
         if not self.connectToDatabase():
@@ -644,46 +547,11 @@ class FinanzasWindow(QMainWindow):
                     f"Inicio: {start_date}\n"
                     f"Fin: {end_date}"
                 )
-            cursor.execute("""
-                SELECT fin_id, fin_usu_id, fin_fecha, fin_desc, fin_monto, fin_tipo 
-                FROM finanza 
-                WHERE fin_fecha BETWEEN %s AND %s
-                ORDER BY fin_fecha DESC
-            """, (start_date, end_date))
+            cursor.execute(SQL_RANGO_FECHAS, (start_date, end_date))
             
             query_data = cursor.fetchall()
             self.query_model.refreshData(query_data)
             
-            # Configuramos los botones de accion en la ultima columna
-            for row in range(len(query_data)):
-                # Create a widget to hold the buttons
-                widget = QWidget()
-                layout = QHBoxLayout(widget)
-                layout.setContentsMargins(4, 4, 4, 4)
-                
-                # Edit button
-                edit_btn = QPushButton("Editar")
-                edit_btn.setFixedWidth(90)
-                edit_btn.setFixedHeight(30)
-                edit_btn.clicked.connect(lambda _, r=row: self.editFinanceRecord(r))
-                layout.addWidget(edit_btn)
-                
-                # Delete button
-                delete_btn = QPushButton("Eliminar")
-                delete_btn.setObjectName("deleteBtn")
-                delete_btn.setFixedWidth(90)
-                delete_btn.setFixedHeight(30)
-                delete_btn.clicked.connect(lambda _, r=row: self.deleteFinanceRecord(r))
-                layout.addWidget(delete_btn)
-                
-                layout.setAlignment(Qt.AlignCenter)
-                widget.setLayout(layout)
-                
-                # Set the widget as the cell's widget
-                #self.table_view.setIndexWidget(self.table_model.index(row, 6), widget)
-                #self.query_model.setIndexWidget(self.query_model.index(row, 6), widget)
-                self.query_table_view.setIndexWidget(self.query_model.index(row, 6), widget)
-
             cursor.close()
             
         except mysql.connector.Error as err:
@@ -699,23 +567,11 @@ class FinanzasWindow(QMainWindow):
         try:
             cursor = self.db_connection.cursor()
             
-            # Consulta para el total
-            cursor.execute("""
-                SELECT SUM(fin_monto) FROM finanza WHERE fin_tipo = %s
-            """, (tipo,))
-            
-            total = cursor.fetchone()[0] or 0
-            
-            # Consulta para el total en el rango de fechas seleccionado
+            # Total general y total en el rango de fechas seleccionado, en una sola consulta
             start_date = self.start_date_edit.date().toString("yyyy-MM-dd")
             end_date = self.end_date_edit.date().toString("yyyy-MM-dd")
             
-            cursor.execute("""
-                SELECT SUM(fin_monto) FROM finanza 
-                WHERE fin_tipo = %s AND fin_fecha BETWEEN %s AND %s
-            """, (tipo, start_date, end_date))
-            
-            total_periodo = cursor.fetchone()[0] or 0
+            total, total_periodo = consultarTotalesTipo(cursor, tipo, start_date, end_date)
             
             cursor.close()
             
@@ -766,10 +622,12 @@ class FinanzasWindow(QMainWindow):
                 ))
                 
                 self.db_connection.commit()
+                # Solo se agrega la fila nueva, sin volver a cargar la tabla
+                self.table_model.releerFila(cursor, "fin_id", cursor.lastrowid)
                 cursor.close()
                 
                 QMessageBox.information(self, "Éxito", "Registro agregado correctamente")
-                self.loadDataMain()
+                self.loadResumen()
                 
             except mysql.connector.Error as err:
                 QMessageBox.critical(self, "Error de base de datos", f"Error al agregar registro: {err}")
@@ -804,10 +662,11 @@ class FinanzasWindow(QMainWindow):
                 ))
                 
                 self.db_connection.commit()
+                self.table_model.releerFila(cursor, "fin_id", record[0], row)
                 cursor.close()
                 
                 QMessageBox.information(self, "Éxito", "Registro actualizado correctamente")
-                self.loadDataMain()
+                self.loadResumen()
                 
             except mysql.connector.Error as err:
                 QMessageBox.critical(self, "Error de base de datos", f"Error al actualizar registro: {err}")
@@ -837,10 +696,11 @@ class FinanzasWindow(QMainWindow):
                 cursor.execute(query, (record[0],))
                 
                 self.db_connection.commit()
+                self.table_model.quitarFila(row)
                 cursor.close()
                 
                 QMessageBox.information(self, "Éxito", "Registro eliminado correctamente")
-                self.loadDataMain()
+                self.loadResumen()
                 
             except mysql.connector.Error as err:
                 QMessageBox.critical(self, "Error de base de datos", f"Error al eliminar registro: {err}")
@@ -0,0 +1,271 @@
+# Generador de datos sinteticos para pruebas de carga.
+# ERP_inserts.sql solo trae ~10 filas por tabla; con eso no se nota lo que cuesta
+# cada pantalla cuando las tablas tienen millones de filas. Este script llena
+# todas las tablas con datos consistentes (cada llave foranea apunta a una fila
+# que existe) usando llaves explicitas a partir del MAX(id) actual de cada tabla.
+#
+# Uso:
+#   python3 generar_datos.py                      -> escala 1 (~1 millon de finanzas, ~5 millones en total)
+#   python3 generar_datos.py --escala 0.01        -> ~1% de eso, para probar rapido
+#   python3 generar_datos.py --filas finanza=3000000 --filas venta=0
+#   python3 generar_datos.py --semilla 7          -> mismos datos en cada corrida
+#
+# Los usuarios generados tienen el correo usuarioN@generado.com y la contraseña
+# "generado"; solo se debe usar en bases de prueba.
+import argparse
+import datetime
+import random
+import sys
+import time
+import mysql.connector
+from conexion import obtenerConexion
+
+# Filas por tabla con --escala 1, en orden de insercion (los padres antes que los hijos)
+CONTEOS_BASE = {
+    "usuario": 2000,
+    "almacen": 100,
+    "inventario": 20000,
+    "finanza": 1000000,
+    "recursoshumanos": 2000,
+    "evaluacion_desempeno": 10000,
+    "logistica": 500000,
+    "solicitud_compra": 100000,
+    "detalle_solicitud": 250000,
+    "compra": 200000,
+    "detalle_compra": 600000,
+    "venta": 500000,
+    "detalle_venta": 1500000,
+    "mantenimiento": 100000,
+    "incidencia": 200000,
+}
+
+# tabla -> (llave primaria, columnas sin la llave)
+COLUMNAS = {
+    "usuario": ("usu_id", ("usu_nombre", "usu_correo", "usu_contra", "usu_puesto",
+                           "usu_fecha_contratacion", "usu_salario", "usu_mod")),
+    "almacen": ("alm_id", ("alm_nombre", "alm_ubicacion")),
+    "inventario": ("inv_id", ("inv_alm_id", "inv_producto", "inv_cantidad")),
+    "finanza": ("fin_id", ("fin_usu_id", "fin_fecha", "fin_desc", "fin_monto", "fin_tipo")),
+    "recursoshumanos": ("reh_id", ("reh_usu_id", "reh_estado", "reh_tipo_contrato",
+                                   "reh_beneficios", "reh_observaciones")),
+    "evaluacion_desempeno": ("eva_id", ("eva_usu_id", "eva_fecha", "eva_puntaje", "eva_comentarios")),
+    "logistica": ("log_id", ("log_usu_id", "log_origen", "log_destino", "log_fecha_salida",
+                             "log_fecha_llegada", "log_estado")),
+    "solicitud_compra": ("sol_id", ("sol_usu_id", "sol_fecha", "sol_descripcion", "sol_estado")),
+    "detalle_solicitud": ("ds_id", ("sol_id", "inv_id", "cantidad")),
+    "compra": ("com_id", ("com_proveedor", "com_usu_id", "com_fecha_compra", "com_sol_id",
+                          "com_monto_total", "com_estado")),
+    "detalle_compra": ("dc_id", ("com_id", "inv_id", "cantidad")),
+    "venta": ("ven_id", ("ven_cliente", "ven_usu_id", "ven_fecha_venta", "ven_monto_total", "ven_estado")),
+    "detalle_venta": ("dv_id", ("ven_id", "inv_id", "cantidad")),
+    "mantenimiento": ("man_id", ("man_vehiculo_id", "man_usu_id", "man_fecha_programada",
+                                 "man_descripcion", "man_costo", "man_estado")),
+    "incidencia": ("inc_id", ("inc_usu_id", "inc_fecha", "inc_descripcion", "inc_estado")),
+}
+
+# tabla -> {columna: tabla padre}
+LLAVES_FORANEAS = {
+    "inventario": {"inv_alm_id": "almacen"},
+    "finanza": {"fin_usu_id": "usuario"},
+    "recursoshumanos": {"reh_usu_id": "usuario"},
+    "evaluacion_desempeno": {"eva_usu_id": "usuario"},
+    "logistica": {"log_usu_id": "usuario"},
+    "solicitud_compra": {"sol_usu_id": "usuario"},
+    "detalle_solicitud": {"sol_id": "solicitud_compra", "inv_id": "inventario"},
+    "compra": {"com_usu_id": "usuario", "com_sol_id": "solicitud_compra"},
+    "detalle_compra": {"com_id": "compra", "inv_id": "inventario"},
+    "venta": {"ven_usu_id": "usuario"},
+    "detalle_venta": {"ven_id": "venta", "inv_id": "inventario"},
+    "mantenimiento": {"man_usu_id": "usuario"},
+    "incidencia": {"inc_usu_id": "usuario"},
+}
+
+MODULOS = ("Finanzas", "Recursos Humanos", "Logistica", "Compras", "Ventas", "Mantenimiento", "Gestion")
+PUESTOS = ("Analista", "Coordinador", "Especialista", "Supervisor", "Gerente", "Auxiliar", "Técnico")
+NOMBRES = ("Ana", "Carlos", "Laura", "Pedro", "Sofia", "Javier", "Elena", "Miguel", "Lucia", "Diego")
+APELLIDOS = ("Garcia", "Hernandez", "Lopez", "Martinez", "Gonzalez", "Perez", "Sanchez", "Ramirez")
+CIUDADES = ("Ciudad de México", "Guadalajara", "Monterrey", "Puebla", "Tijuana", "León", "Querétaro",
+            "Oaxaca", "Mérida", "Villahermosa", "Chihuahua", "Morelia", "Culiacán", "Saltillo")
+PRODUCTOS = ("Laptop", "Monitor", "Teclado", "Mouse", "Impresora", "Toner", "Silla", "Escritorio",
+             "Cable HDMI", "Adaptador USB-C", "Tarima", "Caja de cartón", "Montacargas", "Llanta")
+CONCEPTOS_INGRESO = ("Ingreso por venta", "Ingreso por servicio", "Reembolso", "Ajuste contable")
+CONCEPTOS_GASTO = ("Pago de factura", "Pago de nómina", "Compra de material", "Pago de alquiler",
+                   "Pago de publicidad", "Combustible")
+MANTENIMIENTOS = ("Cambio de aceite", "Rotación de neumáticos", "Cambio de frenos",
+                  "Revisión de suspensión", "Mantenimiento preventivo general")
+INCIDENCIAS = ("Falla en el motor", "Llanta ponchada", "Golpe en la carrocería", "Falla eléctrica")
+
+# Fechas de los ultimos 6 años hasta hoy, asi los filtros del mes actual tienen datos
+DIAS = 6 * 365
+FECHA_INICIO = datetime.date.today() - datetime.timedelta(days=DIAS - 1)
+
+def calcularConteos(escala=1.0, filas=None):
+    """Retorna {tabla: filas a generar} segun la escala y los valores de --filas."""
+    # Al menos una fila por tabla para que las pantallas de detalle tengan algo que abrir
+    conteos = {tabla: max(1, int(round(base * escala))) if escala > 0 else 0
+               for tabla, base in CONTEOS_BASE.items()}
+    for tabla, cantidad in (filas or {}).items():
+        if tabla not in CONTEOS_BASE:
+            raise ValueError(f"Tabla desconocida: {tabla}")
+        conteos[tabla] = int(cantidad)
+    return conteos
+
+class _Llaves:
+    # Elige llaves foraneas al azar entre las filas generadas de la tabla padre,
+    # o entre las que ya existian si no se genero ninguna.
+    def __init__(self, rnd, primera, ultima, existentes):
+        self.rnd = rnd
+        self.primera = primera
+        self.ultima = ultima
+        self.existentes = existentes
+
+    def elegir(self):
+        if self.ultima >= self.primera:
+            return self.rnd.randint(self.primera, self.ultima)
+        if self.existentes:
+            return self.rnd.choice(self.existentes)
+        return None
+
+def _fecha(rnd):
+    return FECHA_INICIO + datetime.timedelta(days=rnd.randrange(DIAS))
+
+def _monto(rnd, minimo, maximo):
+    return round(rnd.uniform(minimo, maximo), 2)
+
+def _fila(tabla, i, rnd, fk):
+    """Retorna la fila (sin la llave) numero i de la tabla."""
+    if tabla == "usuario":
+        return (f"{rnd.choice(NOMBRES)} {rnd.choice(APELLIDOS)}", f"usuario{i}@generado.com", "generado",
+                rnd.choice(PUESTOS), _fecha(rnd), _monto(rnd, 8000, 90000), rnd.choice(MODULOS))
+    if tabla == "almacen":
+        ciudad = rnd.choice(CIUDADES)
+        return (f"Almacén {ciudad} {i}", f"Zona Industrial #{rnd.randint(1, 999)}, {ciudad}")
+    if tabla == "inventario":
+        return (fk["inv_alm_id"].elegir(), f"{rnd.choice(PRODUCTOS)} {i}", rnd.randint(0, 500))
+    if tabla == "finanza":
+        tipo = rnd.choice(("ingreso", "gasto"))
+        concepto = rnd.choice(CONCEPTOS_INGRESO if tipo == "ingreso" else CONCEPTOS_GASTO)
+        return (fk["fin_usu_id"].elegir(), _fecha(rnd), f"{concepto} #{i}", _monto(rnd, 10, 20000), tipo)
+    if tabla == "recursoshumanos":
+        return (fk["reh_usu_id"].elegir(), rnd.choice(("Activo", "Activo", "Activo", "Inactivo", "Baja")),
+                rnd.choice(("Tiempo completo", "Medio tiempo", "Temporal")),
+                "Seguro médico, vacaciones pagadas", "Registro generado")
+    if tabla == "evaluacion_desempeno":
+        return (fk["eva_usu_id"].elegir(), _fecha(rnd), rnd.randint(1, 10), "Evaluación generada")
+    if tabla == "logistica":
+        salida = _fecha(rnd)
+        estado = rnd.choice(("Planificado", "En proceso", "Completado"))
+        llegada = salida + datetime.timedelta(days=rnd.randint(1, 7)) if estado != "Planificado" or rnd.random() < 0.5 else None
+        # Algunos envios sin usuario, como los que quedan al borrar un usuario
+        usuario = fk["log_usu_id"].elegir() if rnd.random() > 0.02 else None
+        return (usuario, rnd.choice(CIUDADES), rnd.choice(CIUDADES), salida, llegada, estado)
+    if tabla == "solicitud_compra":
+        return (fk["sol_usu_id"].elegir(), _fecha(rnd), f"Solicitud de {rnd.choice(PRODUCTOS).lower()} #{i}",
+                rnd.choice(("Pendiente", "Aprobada", "Rechazada")))
+    if tabla in ("detalle_solicitud", "detalle_compra", "detalle_venta"):
+        padre = {"detalle_solicitud": "sol_id", "detalle_compra": "com_id", "detalle_venta": "ven_id"}[tabla]
+        return (fk[padre].elegir(), fk["inv_id"].elegir(), rnd.randint(1, 50))
+    if tabla == "compra":
+        return (rnd.randint(100, 199), fk["com_usu_id"].elegir(), _fecha(rnd), fk["com_sol_id"].elegir(),
+                _monto(rnd, 100, 50000), rnd.choice(("Pendiente", "Completada")))
+    if tabla == "venta":
+        return (rnd.randint(200, 999), fk["ven_usu_id"].elegir(), _fecha(rnd), _monto(rnd, 50, 30000),
+                rnd.choice(("Pendiente", "Completada")))
+    if tabla == "mantenimiento":
+        return (rnd.randint(300, 399), fk["man_usu_id"].elegir(), _fecha(rnd), rnd.choice(MANTENIMIENTOS),
+                _monto(rnd, 50, 5000), rnd.choice(("Pendiente", "Completado")))
+    if tabla == "incidencia":
+        return (fk["inc_usu_id"].elegir(), _fecha(rnd), rnd.choice(INCIDENCIAS),
+                rnd.choice(("Reportada", "En revisión", "Resuelta")))
+    raise ValueError(f"Tabla desconocida: {tabla}")
+
+def poblar(conexion, conteos, semilla=None, lote=5000, rapido=False, progreso=print):
+    """Inserta las filas de conteos en la base de la conexion y retorna {tabla: (primer id, ultimo id)}.
+
+    rapido=True desactiva las revisiones de llaves foraneas y unicas de MySQL durante
+    la carga (los datos ya son consistentes por construccion).
+    """
+    rnd = random.Random(semilla)
+    cursor = conexion.cursor()
+    rangos = {}
+    if rapido:
+        cursor.execute("SET SESSION foreign_key_checks = 0, unique_checks = 0")
+    try:
+        for tabla in CONTEOS_BASE:
+            cantidad = conteos.get(tabla, 0)
+            llave, columnas = COLUMNAS[tabla]
+            cursor.execute(f"SELECT COALESCE(MAX({llave}), 0) FROM {tabla}")
+            primera = cursor.fetchone()[0] + 1
+            rangos[tabla] = (primera, primera + cantidad - 1)
+
+            fk = {}
+            for columna, padre in LLAVES_FORANEAS.get(tabla, {}).items():
+                inicio, fin = rangos[padre]
+                existentes = []
+                if fin < inicio and cantidad:
+                    cursor.execute(f"SELECT {COLUMNAS[padre][0]} FROM {padre}")
+                    existentes = [fila[0] for fila in cursor.fetchall()]
+                fk[columna] = _Llaves(rnd, inicio, fin, existentes)
+            if not cantidad:
+                continue
+
+            query = (f"INSERT INTO {tabla} ({llave}, {', '.join(columnas)}) "
+                     f"VALUES ({', '.join(['%s'] * (len(columnas) + 1))})")
+            inicio_tabla = time.perf_counter()
+            filas = []
+            for i in range(primera, primera + cantidad):
+                filas.append((i,) + _fila(tabla, i, rnd, fk))
+                if len(filas) >= lote:
+                    cursor.executemany(query, filas)
+                    conexion.commit()
+                    filas = []
+            if filas:
+                cursor.executemany(query, filas)
+                conexion.commit()
+            segundos = time.perf_counter() - inicio_tabla
+            if progreso:
+                progreso(f"{tabla:<22} {cantidad:>10} filas en {segundos:7.1f} s")
+    finally:
+        if rapido:
+            cursor.execute("SET SESSION foreign_key_checks = 1, unique_checks = 1")
+        cursor.close()
+    return rangos
+
+def _leerFilas(valores):
+    filas = {}
+    for valor in valores or []:
+        tabla, _, cantidad = valor.partition("=")
+        if not cantidad.isdigit():
+            raise argparse.ArgumentTypeError(f"--filas espera tabla=N, se recibio {valor!r}")
+        filas[tabla] = int(cantidad)
+    return filas
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Llena la base de datos con datos sinteticos para pruebas de carga")
+    parser.add_argument("--escala", type=float, default=1.0, help="multiplica las filas por tabla (por defecto 1)")
+    parser.add_argument("--filas", action="append", metavar="TABLA=N", help="filas de una tabla en particular")
+    parser.add_argument("--semilla", type=int, default=None, help="semilla para generar siempre los mismos datos")
+    parser.add_argument("--lote", type=int, default=5000, help="filas por INSERT (por defecto 5000)")
+    args = parser.parse_args(argv)
+
+    try:
+        conteos = calcularConteos(args.escala, _leerFilas(args.filas))
+    except (ValueError, argparse.ArgumentTypeError) as err:
+        parser.error(str(err))
+
+    print(f"Generando {sum(conteos.values())} filas...")
+    inicio = time.perf_counter()
+    try:
+        conexion = obtenerConexion()
+        try:
+            poblar(conexion, conteos, args.semilla, args.lote, rapido=True)
+        finally:
+            conexion.close()
+    except mysql.connector.Error as err:
+        print(f"Error de base de datos: {err}")
+        return 2
+    print(f"Listo en {time.perf_counter() - inicio:.1f} s")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
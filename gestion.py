@@ -2,116 +2,128 @@ import sys
 from PyQt5.QtWidgets import (QMainWindow, QPushButton, QVBoxLayout, QHBoxLayout, QWidget, 
                             QTableView, QHeaderView, QToolBar, QAction, QLabel, QSplitter,
                             QApplication, QFrame, QGridLayout, QSizePolicy, QStackedWidget,
-                            QMessageBox, QDateEdit, QFormLayout, QComboBox)
-from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QDate, QSize
-from PyQt5.QtGui import QPixmap, QIcon, QFont, QColor
+                            QMessageBox, QDateEdit, QFormLayout, QComboBox, QLineEdit)
+from PyQt5.QtCore import Qt, QModelIndex, QDate, QSize, QTimer
+from PyQt5.QtGui import QIcon, QFont, QColor
 import mysql.connector
 from datetime import datetime
-import os
-from dotenv import load_dotenv
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.figure import Figure
+from conexion import obtenerConexion
+import imagenes
+from paginacion import ConsultaPaginada, leerConsulta, leerLista
+from tablas import TablaModel, Columna, DERECHA, ESPERA_FILTRO, fecha, moneda, recortado
+from ejecutor import EjecutorConsultas
+from agregados import consultarResumenMensual
+from graficas import Grafica
+from sincronizacion import Sincronizador
+from busqueda import CAMPOS_TEXTO, LIMITE, buscar, terminosBusqueda
+from resumenes import consultarComprasMes, consultarVentasMes, consultarEstados
+from exportar import exportarVista
+
+# Catalogos chicos que se leen completos (almacenes: decenas de filas; evaluaciones:
+# unas cuantas por empleado); como ConsultaPaginada el sincronizador puede
+# aplicarles solo las filas que cambiaron
+CONSULTA_EVALUACIONES = ConsultaPaginada("""
+    SELECT eva_id, eva_usu_id, eva_fecha, eva_puntaje, eva_comentarios
+    FROM evaluacion_desempeno
+""", [("eva_fecha", 2, True), ("eva_id", 0, True)])
+CONSULTA_ALMACENES = ConsultaPaginada("SELECT alm_id, alm_nombre, alm_ubicacion FROM almacen",
+                                      [("alm_id", 0, False)])
+# Tablas grandes que se leen por paginas conforme se hace scroll; el orden keyset
+# de cada una tiene indice (llave primaria, 001 o 006_indices_paginacion.sql)
+CONSULTA_RRHH = ConsultaPaginada("""
+    SELECT reh_id, reh_usu_id, reh_estado, reh_tipo_contrato, reh_beneficios, reh_observaciones
+    FROM recursoshumanos
+""", [("reh_id", 0, False)])
+CONSULTA_INVENTARIO = ConsultaPaginada("SELECT inv_id, inv_alm_id, inv_producto, inv_cantidad FROM inventario",
+                                       [("inv_id", 0, False)])
+CONSULTA_SOLICITUDES = ConsultaPaginada("""
+    SELECT sol_id, sol_usu_id, sol_fecha, sol_descripcion, sol_estado
+    FROM solicitud_compra
+""", [("sol_fecha", 2, True), ("sol_id", 0, True)])
+CONSULTA_DETALLE_COMPRA = ConsultaPaginada("SELECT dc_id, com_id, inv_id, cantidad FROM detalle_compra",
+                                           [("dc_id", 0, False)])
+CONSULTA_DETALLE_SOLICITUD = ConsultaPaginada("SELECT ds_id, sol_id, inv_id, cantidad FROM detalle_solicitud",
+                                              [("ds_id", 0, False)])
+CONSULTA_DETALLE_VENTA = ConsultaPaginada("SELECT dv_id, ven_id, inv_id, cantidad FROM detalle_venta",
+                                          [("dv_id", 0, False)])
+CONSULTA_MANTENIMIENTO = ConsultaPaginada("""
+    SELECT man_id, man_vehiculo_id, man_usu_id, man_fecha_programada,
+           man_descripcion, man_costo, man_estado
+    FROM mantenimiento
+""", [("man_fecha_programada", 3, True), ("man_id", 0, True)])
+CONSULTA_INCIDENCIAS = ConsultaPaginada("""
+    SELECT inc_id, inc_usu_id, inc_fecha, inc_descripcion, inc_estado
+    FROM incidencia
+""", [("inc_fecha", 2, True), ("inc_id", 0, True)])
+CONSULTA_USUARIOS = ConsultaPaginada("""
+    SELECT usu_id, usu_nombre, usu_correo, usu_puesto, usu_fecha_contratacion, usu_salario, usu_mod
+    FROM usuario
+""", [("usu_id", 0, False)])
+CONSULTA_LOGISTICA = ConsultaPaginada("""
+    SELECT log_id, log_usu_id, log_origen, log_destino, log_fecha_salida, log_fecha_llegada, log_estado
+    FROM logistica
+""", [("log_fecha_salida", 4, True), ("log_id", 0, True)])
+CONSULTA_COMPRAS = ConsultaPaginada("""
+    SELECT com_id, com_proveedor, com_usu_id, com_fecha_compra, com_sol_id, com_monto_total, com_estado
+    FROM compra
+""", [("com_fecha_compra", 3, True), ("com_id", 0, True)])
+CONSULTA_VENTAS = ConsultaPaginada("""
+    SELECT ven_id, ven_cliente, ven_usu_id, ven_fecha_venta, ven_monto_total, ven_estado
+    FROM venta
+""", [("ven_fecha_venta", 3, True), ("ven_id", 0, True)])
+SQL_GRAFICA_RRHH = """
+    SELECT u.usu_mod, COUNT(*)
+    FROM usuario u
+    GROUP BY u.usu_mod
+    ORDER BY COUNT(*) DESC
+"""
+
+def consultaFinanzas(fecha_inicio, fecha_fin, tipo_filtro):
+    """Retorna la consulta de finanzas del rango de fechas; tipo_filtro es el texto del combo."""
+    filtro = "fin_fecha BETWEEN %s AND %s"
+    if tipo_filtro == "Ingresos":
+        filtro += " AND fin_tipo = 'ingreso'"
+    elif tipo_filtro == "Gastos":
+        filtro += " AND fin_tipo = 'gasto'"
+    return ConsultaPaginada("SELECT fin_id, fin_usu_id, fin_fecha, fin_desc, fin_monto, fin_tipo FROM finanza",
+                            [("fin_fecha", 2, True), ("fin_id", 0, True)], filtro, (fecha_inicio, fecha_fin))
+
+def columnaPorTitulo(titulo):
+    """Columna de las tablas de gestion: fechas, montos y cantidades se reconocen por el titulo."""
+    nombre = titulo.lower()
+    if any(palabra in nombre for palabra in ('monto', 'salario', 'costo')):
+        # Formato para valores monetarios, alineados a la derecha
+        return Columna(titulo, moneda, DERECHA)
+    if 'cantidad' in nombre:
+        return Columna(titulo, alineacion=DERECHA)
+    if 'fecha' in nombre:
+        return Columna(titulo, fecha)
+    return Columna(titulo)
 
 # Modelo base para todas las tablas
-class GenericTableModel(QAbstractTableModel):
+class GenericTableModel(TablaModel):
     def __init__(self, data=None, headers=None):
-        super().__init__()
-        self._data = data if data is not None else []
-        self._headers = headers if headers is not None else []
-        
-    def data(self, index, role):
-        if not index.isValid() or not (0 <= index.row() < len(self._data)):
-            return None
-            
-        if role == Qt.DisplayRole:
-            value = self._data[index.row()][index.column()]
-            
-            # Formato para fechas
-            if isinstance(value, datetime):
-                return value.strftime("%Y-%m-%d")
-                
-            # Formato para valores monetarios
-            if isinstance(value, float) and any(h.lower().find('monto') >= 0 or h.lower().find('salario') >= 0 for h in self._headers):
-                if index.column() < len(self._headers) and (
-                    'monto' in self._headers[index.column()].lower() or 
-                    'salario' in self._headers[index.column()].lower() or
-                    'costo' in self._headers[index.column()].lower()):
-                    return f"${value:,.2f}"
-                
-            return str(value)
-            
-        elif role == Qt.TextAlignmentRole:
-            # Alinear valores monetarios a la derecha
-            if index.column() < len(self._headers) and (
-                'monto' in self._headers[index.column()].lower() or 
-                'salario' in self._headers[index.column()].lower() or
-                'costo' in self._headers[index.column()].lower() or
-                'cantidad' in self._headers[index.column()].lower()):
-                return Qt.AlignRight | Qt.AlignVCenter
-                
-        return None
-        
-    def rowCount(self, parent=None):
-        return len(self._data)
-        
-    def columnCount(self, parent=None):
-        return len(self._headers) if self._headers else 0
-        
-    def headerData(self, section, orientation, role):
-        if orientation == Qt.Horizontal and role == Qt.DisplayRole and section < len(self._headers):
-            return self._headers[section]
-        return None
-        
-    def refreshData(self, data):
-        self.beginResetModel()
-        self._data = data
-        self.endResetModel()
-
+        super().__init__(data, [columnaPorTitulo(titulo) for titulo in headers or []])
 
 # Gráfico genérico para visualizaciones
-class GenericChart(FigureCanvas):
-    def __init__(self, parent=None, width=5, height=4, dpi=100):
-        self.fig = Figure(figsize=(width, height), dpi=dpi)
-        self.axes = self.fig.add_subplot(111)
-        super().__init__(self.fig)
-        self.setParent(parent)
-        
+class GenericChart(Grafica):
     def plot_bar_chart(self, labels, values, title, xlabel, ylabel, color='#c1272d'):
-        self.axes.clear()
-        self.axes.bar(labels, values, color=color)
-        self.axes.set_title(title)
-        self.axes.set_xlabel(xlabel)
-        self.axes.set_ylabel(ylabel)
-        self.axes.grid(True, linestyle='--', alpha=0.7, axis='y')
-        
-        # Rotar etiquetas para mejor legibilidad
-        plt.setp(self.axes.get_xticklabels(), rotation=45, ha='right')
+        # Si las etiquetas no cambiaron solo se actualiza la altura de las barras
+        self.barras(labels, [(ylabel, values, color)])
+        self.rotular(title, xlabel, ylabel)
         
         # Formato para valores monetarios si es necesario
         if any(isinstance(v, float) for v in values) and ('monto' in ylabel.lower() or 'costo' in ylabel.lower()):
             self.axes.yaxis.set_major_formatter('${x:,.0f}')
             
-        self.fig.tight_layout()
-        self.draw()
+        self.actualizar()
         
     def plot_pie_chart(self, labels, values, title):
-        self.axes.clear()
-        
         # Colores para el gráfico de pastel
         colors = ['#c1272d', '#4CAF50', '#2196F3', '#FF9800', '#9C27B0', '#607D8B', '#795548', '#E91E63']
         
-        # Explotar la primera rebanada
-        explode = [0.1] + [0] * (len(labels) - 1) if len(labels) > 0 else []
-        
-        self.axes.pie(values, explode=explode, labels=labels, colors=colors,
-                autopct='%1.1f%%', shadow=True, startangle=90)
-        self.axes.axis('equal')  # Asegura que el pastel sea un círculo
-        
-        self.axes.set_title(title)
-        
-        self.fig.tight_layout()
-        self.draw()
+        self.pastel(labels, values, colors, title)
+        self.actualizar()
 
 
 class GestionWindow(QMainWindow):
@@ -122,7 +134,12 @@ class GestionWindow(QMainWindow):
             return
         self.loginWindow = loginWindow
         self.db_connection = None
+        # Las cargas de cada modulo corren en segundo plano
+        self.ejecutor = EjecutorConsultas(self)
+        # Refresco periodico con solo las filas que cambiaron; la primera marca se toma en segundo plano
+        self.sincronizador = Sincronizador(self)
         self.initUI()
+        self.registrarSincronizacion()
         
     def initUI(self):
         # Propiedades de la ventana
@@ -209,7 +226,7 @@ class GestionWindow(QMainWindow):
                 border-radius: 4px;
             }
             /* Manteniendo la configuración de los ComboBox y DateEdit del primer estilo */
-            QComboBox, QDateEdit {
+            QComboBox, QDateEdit, QLineEdit {
                 padding: 6px;
                 border: 1px solid #ddd;
                 border-radius: 4px;
@@ -233,9 +250,8 @@ class GestionWindow(QMainWindow):
         
         # Logo en la toolbar
         logo_label = QLabel()
-        logo_pixmap = QPixmap("Logo-Grupo-Porteo.png")
+        logo_pixmap = imagenes.pixmap("Logo-Grupo-Porteo.png", 40)
         if not logo_pixmap.isNull():
-            logo_pixmap = logo_pixmap.scaled(40, 40, Qt.KeepAspectRatio, Qt.SmoothTransformation)
             logo_label.setPixmap(logo_pixmap)
         self.toolbar.addWidget(logo_label)
         
@@ -283,6 +299,25 @@ class GestionWindow(QMainWindow):
             self.btn_compras, self.btn_ventas, self.btn_mantenimiento
         ]
         
+        # Busqueda de texto en todos los modulos; se busca cuando se deja de escribir
+        self.busqueda_input = QLineEdit()
+        self.busqueda_input.setPlaceholderText("Buscar en descripciones...")
+        self.busqueda_input.setClearButtonEnabled(True)
+        self.busqueda_input.setFixedWidth(250)
+        self.busqueda_timer = QTimer(self)
+        self.busqueda_timer.setSingleShot(True)
+        self.busqueda_timer.setInterval(ESPERA_FILTRO)
+        self.busqueda_timer.timeout.connect(self.buscarTexto)
+        self.busqueda_input.textChanged.connect(lambda: self.busqueda_timer.start())
+        self.toolbar.addWidget(self.busqueda_input)
+        
+        # Exporta la tabla seleccionada del modulo (sin foco, para no quitarselo a la tabla)
+        self.exportar_btn = QPushButton("Exportar")
+        self.exportar_btn.setCursor(Qt.PointingHandCursor)
+        self.exportar_btn.setFocusPolicy(Qt.NoFocus)
+        self.exportar_btn.clicked.connect(self.exportarTabla)
+        self.toolbar.addWidget(self.exportar_btn)
+        
         # Spacer para el botón de cerrar sesión
         spacer = QWidget()
         spacer.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
@@ -305,6 +340,7 @@ class GestionWindow(QMainWindow):
         self.setupComprasView()
         self.setupVentasView()
         self.setupMantenimientoView()
+        self.setupBusquedaView()
         
         # Widget central
         central_widget = QWidget()
@@ -900,8 +936,43 @@ class GestionWindow(QMainWindow):
         
         self.stacked_widget.addWidget(mantenimiento_widget)
         
+    def setupBusquedaView(self):
+        # Resultados de la busqueda de la toolbar, del mas relevante al menos relevante
+        busqueda_widget = QWidget()
+        layout = QVBoxLayout(busqueda_widget)
+        
+        title_label = QLabel("Resultados de búsqueda")
+        title_label.setObjectName("moduleTitle")
+        title_label.setAlignment(Qt.AlignCenter)
+        layout.addWidget(title_label)
+        
+        self.busqueda_table = QTableView()
+        self.busqueda_table.setAlternatingRowColors(True)
+        self.busqueda_table.setSelectionBehavior(QTableView.SelectRows)
+        self.busqueda_table.setEditTriggers(QTableView.NoEditTriggers)
+        self.busqueda_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.busqueda_table.verticalHeader().setVisible(False)
+        
+        self.busqueda_model = TablaModel(columnas=[
+            Columna("Módulo"), Columna("Tabla"), Columna("ID", alineacion=DERECHA),
+            Columna("Texto", recortado(100)), Columna("Relevancia", lambda valor: f"{valor:.2f}", DERECHA)
+        ])
+        self.busqueda_table.setModel(self.busqueda_model)
+        layout.addWidget(self.busqueda_table)
+        
+        # Las paginas siguientes se piden solo si el usuario las quiere ver
+        self.busqueda_mas_btn = QPushButton("Más resultados")
+        self.busqueda_mas_btn.setEnabled(False)
+        self.busqueda_mas_btn.clicked.connect(lambda: self.buscarTexto(self.busqueda_pagina + 1))
+        layout.addWidget(self.busqueda_mas_btn, alignment=Qt.AlignRight)
+        
+        self.busqueda_pagina = 0
+        self.busqueda_resultados = []
+        self.stacked_widget.addWidget(busqueda_widget)
+        
     def cambiarModulo(self, index, button):
         # Cambiar al módulo seleccionado
+        self.modulo_actual = index
         self.stacked_widget.setCurrentIndex(index)
         
         # Actualizar estilo de botones
@@ -912,7 +983,8 @@ class GestionWindow(QMainWindow):
         button.setObjectName("activeModule")
         button.setStyleSheet("")
         
-        # Cargar datos del módulo seleccionado
+        # Cargar datos del módulo seleccionado; todas las cargas usan el grupo "modulo"
+        # del ejecutor, asi la carga del modulo anterior que siga en curso se descarta
         if index == 0:  # Finanzas
             self.cargarDatosFinanzas()
         elif index == 1:  # RRHH
@@ -946,458 +1018,362 @@ class GestionWindow(QMainWindow):
     def cambiarTablaMantenimiento(self, index):
         self.mantenimiento_stacked.setCurrentIndex(index)
         
+    def registrarSincronizacion(self):
+        # Cada tabla se sincroniza solo mientras esta visible; su grafica se recalcula si recibio cambios
+        self._graficas = ["grafica finanzas"]
+        graficas = {
+            "finanzas": self.actualizarGraficaFinanzas,
+            "rrhh": self.actualizarGrafica(self.consultarGraficaRRHH, self.mostrarGraficaRRHH),
+            "logistica": self.actualizarGrafica(self.consultarGraficaLogistica, self.mostrarGraficaLogistica),
+            "compras": self.actualizarGrafica(self.consultarGraficaCompras, self.mostrarGraficaCompras),
+            "ventas": self.actualizarGrafica(self.consultarGraficaVentas, self.mostrarGraficaVentas),
+            "mantenimiento": self.actualizarGrafica(self.consultarGraficaMantenimiento, self.mostrarGraficaMantenimiento),
+        }
+        tablas = [
+            (self.finanzas_model, self.finanzas_table, "finanzas"),
+            (self.usuarios_model, self.usuarios_table, "rrhh"),
+            (self.rrhh_data_model, self.rrhh_data_table, None),
+            (self.evaluaciones_model, self.evaluaciones_table, None),
+            (self.logistica_model, self.logistica_table, "logistica"),
+            (self.almacenes_model, self.almacenes_table, None),
+            (self.inventario_model, self.inventario_table, None),
+            (self.solicitudes_model, self.solicitudes_table, None),
+            (self.compras_model, self.compras_table, "compras"),
+            (self.detalle_compra_model, self.detalle_compra_table, None),
+            (self.detalle_solicitud_model, self.detalle_solicitud_table, None),
+            (self.ventas_model, self.ventas_table, "ventas"),
+            (self.detalle_venta_model, self.detalle_venta_table, None),
+            (self.mantenimiento_model, self.mantenimiento_table, "mantenimiento"),
+            (self.incidencias_model, self.incidencias_table, None),
+        ]
+        for modelo, vista, grafica in tablas:
+            self.sincronizador.registrar(modelo, vista, graficas.get(grafica))
+            
+    def buscarTexto(self, pagina=0):
+        texto = self.busqueda_input.text().strip()
+        if not terminosBusqueda(texto):
+            # Sin palabras que buscar se regresa al modulo que estaba abierto
+            self.ejecutor.cancelar("busqueda")
+            self.stacked_widget.setCurrentIndex(self.modulo_actual)
+            return
+        self.ejecutor.ejecutar(lambda cursor: buscar(cursor, texto, pagina=pagina),
+                               lambda resultados: self.mostrarResultadosBusqueda(pagina, resultados),
+                               self.mostrarErrorCarga("la búsqueda"), grupo="busqueda")
+        
+    def mostrarResultadosBusqueda(self, pagina, resultados):
+        filas = [(CAMPOS_TEXTO[tabla][2], tabla, llave, texto, relevancia)
+                 for tabla, llave, texto, relevancia in resultados]
+        if pagina > 0:
+            filas = self.busqueda_resultados + filas
+        self.busqueda_resultados = filas
+        self.busqueda_model.refreshData(filas)
+        self.busqueda_pagina = pagina
+        self.busqueda_mas_btn.setEnabled(len(resultados) == LIMITE)
+        self.stacked_widget.setCurrentIndex(self.stacked_widget.count() - 1)
+            
+    def actualizarGrafica(self, consultar, mostrar):
+        """Retorna la funcion que vuelve a leer y dibujar una grafica en segundo plano."""
+        # Un grupo por grafica: una sincronizacion puede actualizar varias
+        grupo = f"grafica {mostrar.__name__}"
+        self._graficas.append(grupo)
+        return lambda: self.ejecutor.ejecutar(consultar, mostrar, print, grupo=grupo)
+            
     def connectToDatabase(self):
         try:
-            load_dotenv()
-            self.db_connection = mysql.connector.connect(
-                host=os.environ.get("DB_HOST"),
-                database=os.environ.get("DB_DATABASE"),
-                user=os.environ.get("DB_USER"),
-                password=os.environ.get("DB_PASSWORD")
-            )
+            # Conexion prestada del pool compartido, close() la regresa al pool
+            self.db_connection = obtenerConexion()
             return True
         except mysql.connector.Error as err:
             QMessageBox.critical(self, "Error de base de datos", f"No se pudo conectar: {err}")
             return False
             
-    def cargarDatosFinanzas(self):
-        if not self.connectToDatabase():
-            return
-            
-        try:
-            cursor = self.db_connection.cursor()
-            
-            # Obtener filtros
-            tipo_filtro = self.finanzas_tipo_combo.currentText()
-            fecha_inicio = self.finanzas_fecha_inicio.date().toString("yyyy-MM-dd")
-            fecha_fin = self.finanzas_fecha_fin.date().toString("yyyy-MM-dd")
-            
-            # Construir consulta según filtros
-            query = "SELECT fin_id, fin_usu_id, fin_fecha, fin_desc, fin_monto, fin_tipo FROM finanza WHERE 1=1"
-            params = []
-            
-            if tipo_filtro == "Ingresos":
-                query += " AND fin_tipo = 'ingreso'"
-            elif tipo_filtro == "Gastos":
-                query += " AND fin_tipo = 'gasto'"
-                
-            query += " AND fin_fecha BETWEEN %s AND %s ORDER BY fin_fecha DESC"
-            params.extend([fecha_inicio, fecha_fin])
-            
-            cursor.execute(query, params)
-            finanzas_data = cursor.fetchall()
-            
-            # Actualizar modelo de tabla
-            self.finanzas_model.refreshData(finanzas_data)
-            
-            # Cargar datos para gráficos
-            cursor.execute("""
-                SELECT DATE_FORMAT(fin_fecha, '%Y-%m') as mes, SUM(fin_monto) 
-                FROM finanza 
-                WHERE fin_tipo = 'ingreso' AND fin_fecha BETWEEN %s AND %s 
-                GROUP BY mes 
-                ORDER BY mes
-            """, (fecha_inicio, fecha_fin))
-            income_data = cursor.fetchall()
-            
-            cursor.execute("""
-                SELECT DATE_FORMAT(fin_fecha, '%Y-%m') as mes, SUM(fin_monto) 
-                FROM finanza 
-                WHERE fin_tipo = 'gasto' AND fin_fecha BETWEEN %s AND %s 
-                GROUP BY mes 
-                ORDER BY mes
-            """, (fecha_inicio, fecha_fin))
-            expense_data = cursor.fetchall()
+    def mostrarErrorCarga(self, modulo):
+        """Retorna la funcion que muestra el error de carga de un modulo."""
+        return lambda err: QMessageBox.critical(self, "Error de base de datos", f"Error al cargar datos de {modulo}: {err}")
             
-            # Datos para gráfico de barras
-            meses = []
-            ingresos = []
-            gastos = []
-            
-            # Crear diccionarios para facilitar la búsqueda
-            income_dict = {mes: monto for mes, monto in income_data}
-            expense_dict = {mes: monto for mes, monto in expense_data}
-            
-            # Unir todos los meses únicos
-            all_months = sorted(set(list(income_dict.keys()) + list(expense_dict.keys())))
-            
-            for mes in all_months:
-                meses.append(mes)
-                ingresos.append(income_dict.get(mes, 0))
-                gastos.append(expense_dict.get(mes, 0))
-            
-            # Actualizar gráfico de barras
-            if meses:
-                # Crear datos para gráfico de barras comparativo
-                import numpy as np
-                x = np.arange(len(meses))
-                width = 0.35
-                
-                self.finanzas_bar_chart.axes.clear()
-                self.finanzas_bar_chart.axes.bar(x - width/2, ingresos, width, label='Ingresos', color='#4CAF50')
-                self.finanzas_bar_chart.axes.bar(x + width/2, gastos, width, label='Gastos', color='#F44336')
-                
-                self.finanzas_bar_chart.axes.set_title('Ingresos vs Gastos por Mes')
-                self.finanzas_bar_chart.axes.set_xlabel('Mes')
-                self.finanzas_bar_chart.axes.set_ylabel('Monto ($)')
-                self.finanzas_bar_chart.axes.set_xticks(x)
-                self.finanzas_bar_chart.axes.set_xticklabels(meses)
-                self.finanzas_bar_chart.axes.legend()
-                
-                # Formato para valores monetarios
-                self.finanzas_bar_chart.axes.yaxis.set_major_formatter('${x:,.0f}')
-                
-                # Rotar etiquetas para mejor legibilidad
-                plt.setp(self.finanzas_bar_chart.axes.get_xticklabels(), rotation=45, ha='right')
-                
-                self.finanzas_bar_chart.fig.tight_layout()
-                self.finanzas_bar_chart.draw()
-            
-            # Datos para gráfico de pastel
-            cursor.execute("""
-                SELECT SUM(fin_monto) FROM finanza 
-                WHERE fin_tipo = 'ingreso' AND fin_fecha BETWEEN %s AND %s
-            """, (fecha_inicio, fecha_fin))
-            total_ingresos = cursor.fetchone()[0] or 0
+    def cargarDatosFinanzas(self):
+        # Obtener filtros
+        tipo_filtro = self.finanzas_tipo_combo.currentText()
+        fecha_inicio = self.finanzas_fecha_inicio.date().toString("yyyy-MM-dd")
+        fecha_fin = self.finanzas_fecha_fin.date().toString("yyyy-MM-dd")
+        
+        # Filtro según la seleccion
+        consulta = consultaFinanzas(fecha_inicio, fecha_fin, tipo_filtro)
+        
+        # Las consultas corren en segundo plano, mostrarDatosFinanzas recibe los resultados
+        def consultar(cursor):
+            # Tabla de finanzas, se carga por paginas conforme se hace scroll
+            finanzas = leerConsulta(consulta, cursor)
             
-            cursor.execute("""
-                SELECT SUM(fin_monto) FROM finanza 
-                WHERE fin_tipo = 'gasto' AND fin_fecha BETWEEN %s AND %s
-            """, (fecha_inicio, fecha_fin))
-            total_gastos = cursor.fetchone()[0] or 0
+            # Datos por mes para los gráficos de barras y pastel (tablas de resumen)
+            resumen = consultarResumenMensual(cursor, fecha_inicio, fecha_fin)
             
-            # Actualizar gráfico de pastel
-            self.finanzas_pie_chart.plot_pie_chart(
-                ['Ingresos', 'Gastos'],
-                [total_ingresos, total_gastos],
-                'Distribución de Finanzas'
-            )
+            return finanzas, resumen
+        
+        self.ejecutor.ejecutar(consultar, self.mostrarDatosFinanzas, self.mostrarErrorCarga("finanzas"), grupo="modulo")
+        
+    def mostrarDatosFinanzas(self, resultado):
+        finanzas, resumen = resultado
+        
+        # Actualizar modelo de tabla
+        self.finanzas_model.mostrarConsulta(finanzas)
+        self.mostrarGraficaFinanzas(resumen)
+        
+    def actualizarGraficaFinanzas(self):
+        # Las fechas se leen aqui, en el hilo de la interfaz
+        fecha_inicio = self.finanzas_fecha_inicio.date().toString("yyyy-MM-dd")
+        fecha_fin = self.finanzas_fecha_fin.date().toString("yyyy-MM-dd")
+        self.ejecutor.ejecutar(lambda cursor: consultarResumenMensual(cursor, fecha_inicio, fecha_fin),
+                               self.mostrarGraficaFinanzas, print, grupo="grafica finanzas")
+        
+    def mostrarGraficaFinanzas(self, resumen):
+        income_data = resumen.ingresos_mensuales
+        expense_data = resumen.gastos_mensuales
+        total_ingresos = resumen.total_ingresos
+        total_gastos = resumen.total_gastos
+        
+        # Datos para gráfico de barras
+        meses = []
+        ingresos = []
+        gastos = []
+        
+        # Crear diccionarios para facilitar la búsqueda
+        income_dict = {mes: monto for mes, monto in income_data}
+        expense_dict = {mes: monto for mes, monto in expense_data}
+        
+        # Unir todos los meses únicos
+        all_months = sorted(set(list(income_dict.keys()) + list(expense_dict.keys())))
+        
+        for mes in all_months:
+            meses.append(mes)
+            ingresos.append(income_dict.get(mes, 0))
+            gastos.append(expense_dict.get(mes, 0))
+        
+        # Actualizar gráfico de barras
+        if meses:
+            self.finanzas_bar_chart.barras(meses, [('Ingresos', ingresos, '#4CAF50'), ('Gastos', gastos, '#F44336')],
+                                           ancho=0.7)
+            self.finanzas_bar_chart.rotular('Ingresos vs Gastos por Mes', 'Mes', 'Monto ($)')
+            self.finanzas_bar_chart.leyenda()
             
-            cursor.close()
+            # Formato para valores monetarios
+            self.finanzas_bar_chart.axes.yaxis.set_major_formatter('${x:,.0f}')
             
-        except mysql.connector.Error as err:
-            QMessageBox.critical(self, "Error de base de datos", f"Error al cargar datos de finanzas: {err}")
-        finally:
-            if self.db_connection:
-                self.db_connection.close()
+            self.finanzas_bar_chart.actualizar()
+        
+        # Actualizar gráfico de pastel
+        self.finanzas_pie_chart.plot_pie_chart(
+            ['Ingresos', 'Gastos'],
+            [total_ingresos, total_gastos],
+            'Distribución de Finanzas'
+        )
                 
     def cargarDatosRRHH(self):
-        if not self.connectToDatabase():
-            return
-            
-        try:
-            cursor = self.db_connection.cursor()
-            
+        def consultar(cursor):
             # Cargar datos de usuarios
-            cursor.execute("""
-                SELECT usu_id, usu_nombre, usu_correo, usu_puesto, 
-                       usu_fecha_contratacion, usu_salario, usu_mod 
-                FROM usuario 
-                ORDER BY usu_id
-            """)
-            usuarios_data = cursor.fetchall()
-            self.usuarios_model.refreshData(usuarios_data)
+            usuarios = leerConsulta(CONSULTA_USUARIOS, cursor)
             
             # Cargar datos de RRHH
-            cursor.execute("""
-                SELECT reh_id, reh_usu_id, reh_estado, reh_tipo_contrato, 
-                       reh_beneficios, reh_observaciones 
-                FROM recursoshumanos 
-                ORDER BY reh_id
-            """)
-            rrhh_data = cursor.fetchall()
-            self.rrhh_data_model.refreshData(rrhh_data)
+            rrhh_data = leerConsulta(CONSULTA_RRHH, cursor)
             
             # Cargar datos de evaluaciones
-            cursor.execute("""
-                SELECT eva_id, eva_usu_id, eva_fecha, eva_puntaje, eva_comentarios 
-                FROM evaluacion_desempeno 
-                ORDER BY eva_fecha DESC
-            """)
-            evaluaciones_data = cursor.fetchall()
-            self.evaluaciones_model.refreshData(evaluaciones_data)
-            
-            # Datos para gráfico
-            cursor.execute("""
-                SELECT u.usu_mod, COUNT(*) 
-                FROM usuario u 
-                GROUP BY u.usu_mod 
-                ORDER BY COUNT(*) DESC
-            """)
-            modulos_data = cursor.fetchall()
-            
-            if modulos_data:
-                modulos = [mod for mod, _ in modulos_data]
-                cantidades = [cant for _, cant in modulos_data]
-                
-                self.rrhh_chart.plot_bar_chart(
-                    modulos, 
-                    cantidades, 
-                    'Distribución de Personal por Módulo',
-                    'Módulo',
-                    'Cantidad de Empleados',
-                    '#3f51b5'  # Color azul para RRHH
-                )
+            evaluaciones_data = leerLista(CONSULTA_EVALUACIONES, cursor)
             
-            cursor.close()
+            return usuarios, rrhh_data, evaluaciones_data, self.consultarGraficaRRHH(cursor)
+        
+        self.ejecutor.ejecutar(consultar, self.mostrarDatosRRHH, self.mostrarErrorCarga("RRHH"), grupo="modulo")
+        
+    def mostrarDatosRRHH(self, resultado):
+        usuarios, rrhh_data, evaluaciones_data, modulos_data = resultado
+        self.usuarios_model.mostrarConsulta(usuarios)
+        self.rrhh_data_model.mostrarConsulta(rrhh_data)
+        self.evaluaciones_model.mostrarLista(evaluaciones_data, CONSULTA_EVALUACIONES)
+        self.mostrarGraficaRRHH(modulos_data)
+        
+    def consultarGraficaRRHH(self, cursor):
+        cursor.execute(SQL_GRAFICA_RRHH)
+        return cursor.fetchall()
+        
+    def mostrarGraficaRRHH(self, modulos_data):
+        if modulos_data:
+            modulos = [mod for mod, _ in modulos_data]
+            cantidades = [cant for _, cant in modulos_data]
             
-        except mysql.connector.Error as err:
-            QMessageBox.critical(self, "Error de base de datos", f"Error al cargar datos de RRHH: {err}")
-        finally:
-            if self.db_connection:
-                self.db_connection.close()
+            self.rrhh_chart.plot_bar_chart(
+                modulos, 
+                cantidades, 
+                'Distribución de Personal por Módulo',
+                'Módulo',
+                'Cantidad de Empleados',
+                '#3f51b5'  # Color azul para RRHH
+            )
                 
     def cargarDatosLogistica(self):
-        if not self.connectToDatabase():
-            return
-            
-        try:
-            cursor = self.db_connection.cursor()
-            
+        def consultar(cursor):
             # Cargar datos de logística
-            cursor.execute("""
-                SELECT log_id, log_usu_id, log_origen, log_destino, 
-                       log_fecha_salida, log_fecha_llegada, log_estado 
-                FROM logistica 
-                ORDER BY log_fecha_salida DESC
-            """)
-            logistica_data = cursor.fetchall()
-            self.logistica_model.refreshData(logistica_data)
+            logistica = leerConsulta(CONSULTA_LOGISTICA, cursor)
             
             # Cargar datos de almacenes
-            cursor.execute("""
-                SELECT alm_id, alm_nombre, alm_ubicacion 
-                FROM almacen 
-                ORDER BY alm_id
-            """)
-            almacenes_data = cursor.fetchall()
-            self.almacenes_model.refreshData(almacenes_data)
+            almacenes_data = leerLista(CONSULTA_ALMACENES, cursor)
             
             # Cargar datos de inventario
-            cursor.execute("""
-                SELECT inv_id, inv_alm_id, inv_producto, inv_cantidad 
-                FROM inventario 
-                ORDER BY inv_id
-            """)
-            inventario_data = cursor.fetchall()
-            self.inventario_model.refreshData(inventario_data)
-            
-            # Datos para gráfico
-            cursor.execute("""
-                SELECT log_estado, COUNT(*) 
-                FROM logistica 
-                GROUP BY log_estado
-            """)
-            estado_data = cursor.fetchall()
-            
-            if estado_data:
-                estados = [estado for estado, _ in estado_data]
-                cantidades = [cant for _, cant in estado_data]
-                
-                self.logistica_chart.plot_bar_chart(
-                    estados, 
-                    cantidades, 
-                    'Estado de Envíos',
-                    'Estado',
-                    'Cantidad',
-                    '#009688'  # Color verde-azulado para Logística
-                )
+            inventario_data = leerConsulta(CONSULTA_INVENTARIO, cursor)
             
-            cursor.close()
+            return logistica, almacenes_data, inventario_data, self.consultarGraficaLogistica(cursor)
+        
+        self.ejecutor.ejecutar(consultar, self.mostrarDatosLogistica, self.mostrarErrorCarga("logística"), grupo="modulo")
+        
+    def mostrarDatosLogistica(self, resultado):
+        logistica, almacenes_data, inventario_data, estado_data = resultado
+        self.logistica_model.mostrarConsulta(logistica)
+        self.almacenes_model.mostrarLista(almacenes_data, CONSULTA_ALMACENES)
+        self.inventario_model.mostrarConsulta(inventario_data)
+        self.mostrarGraficaLogistica(estado_data)
+        
+    def consultarGraficaLogistica(self, cursor):
+        # Las graficas leen las tablas de resumen, su costo no crece con la historia
+        return consultarEstados(cursor, "resumen_logistica_estado")
+        
+    def mostrarGraficaLogistica(self, estado_data):
+        if estado_data:
+            estados = [estado for estado, _ in estado_data]
+            cantidades = [cant for _, cant in estado_data]
             
-        except mysql.connector.Error as err:
-            QMessageBox.critical(self, "Error de base de datos", f"Error al cargar datos de logística: {err}")
-        finally:
-            if self.db_connection:
-                self.db_connection.close()
+            self.logistica_chart.plot_bar_chart(
+                estados, 
+                cantidades, 
+                'Estado de Envíos',
+                'Estado',
+                'Cantidad',
+                '#009688'  # Color verde-azulado para Logística
+            )
                 
     def cargarDatosCompras(self):
-        if not self.connectToDatabase():
-            return
-            
-        try:
-            cursor = self.db_connection.cursor()
-            
+        def consultar(cursor):
             # Cargar datos de solicitudes
-            cursor.execute("""
-                SELECT sol_id, sol_usu_id, sol_fecha, sol_descripcion, sol_estado 
-                FROM solicitud_compra 
-                ORDER BY sol_fecha DESC
-            """)
-            solicitudes_data = cursor.fetchall()
-            self.solicitudes_model.refreshData(solicitudes_data)
+            solicitudes_data = leerConsulta(CONSULTA_SOLICITUDES, cursor)
             
             # Cargar datos de compras
-            cursor.execute("""
-                SELECT com_id, com_proveedor, com_usu_id, com_fecha_compra, 
-                       com_sol_id, com_monto_total, com_estado 
-                FROM compra 
-                ORDER BY com_fecha_compra DESC
-            """)
-            compras_data = cursor.fetchall()
-            self.compras_model.refreshData(compras_data)
+            compras = leerConsulta(CONSULTA_COMPRAS, cursor)
             
             # Cargar datos de detalle de compra
-            cursor.execute("""
-                SELECT dc_id, com_id, inv_id, cantidad 
-                FROM detalle_compra 
-                ORDER BY dc_id
-            """)
-            detalle_compra_data = cursor.fetchall()
-            self.detalle_compra_model.refreshData(detalle_compra_data)
+            detalle_compra_data = leerConsulta(CONSULTA_DETALLE_COMPRA, cursor)
             
             # Cargar datos de detalle de solicitud
-            cursor.execute("""
-                SELECT ds_id, sol_id, inv_id, cantidad 
-                FROM detalle_solicitud 
-                ORDER BY ds_id
-            """)
-            detalle_solicitud_data = cursor.fetchall()
-            self.detalle_solicitud_model.refreshData(detalle_solicitud_data)
+            detalle_solicitud_data = leerConsulta(CONSULTA_DETALLE_SOLICITUD, cursor)
             
-            # Datos para gráfico
-            cursor.execute("""
-                SELECT DATE_FORMAT(com_fecha_compra, '%Y-%m') as mes, SUM(com_monto_total) 
-                FROM compra 
-                GROUP BY mes 
-                ORDER BY mes
-            """)
-            compras_por_mes = cursor.fetchall()
+            compras_por_mes = self.consultarGraficaCompras(cursor)
+            return solicitudes_data, compras, detalle_compra_data, detalle_solicitud_data, compras_por_mes
+        
+        self.ejecutor.ejecutar(consultar, self.mostrarDatosCompras, self.mostrarErrorCarga("compras"), grupo="modulo")
+        
+    def mostrarDatosCompras(self, resultado):
+        solicitudes_data, compras, detalle_compra_data, detalle_solicitud_data, compras_por_mes = resultado
+        self.solicitudes_model.mostrarConsulta(solicitudes_data)
+        self.compras_model.mostrarConsulta(compras)
+        self.detalle_compra_model.mostrarConsulta(detalle_compra_data)
+        self.detalle_solicitud_model.mostrarConsulta(detalle_solicitud_data)
+        self.mostrarGraficaCompras(compras_por_mes)
+        
+    def consultarGraficaCompras(self, cursor):
+        return consultarComprasMes(cursor)
+        
+    def mostrarGraficaCompras(self, compras_por_mes):
+        if compras_por_mes:
+            meses = [mes for mes, _ in compras_por_mes]
+            montos = [monto for _, monto in compras_por_mes]
             
-            if compras_por_mes:
-                meses = [mes for mes, _ in compras_por_mes]
-                montos = [monto for _, monto in compras_por_mes]
-                
-                self.compras_chart.plot_bar_chart(
-                    meses, 
-                    montos, 
-                    'Compras por Mes',
-                    'Mes',
-                    'Monto Total ($)',
-                    '#ff9800'  # Color naranja para Compras
-                )
-            
-            cursor.close()
-            
-        except mysql.connector.Error as err:
-            QMessageBox.critical(self, "Error de base de datos", f"Error al cargar datos de compras: {err}")
-        finally:
-            if self.db_connection:
-                self.db_connection.close()
-    
-
+            self.compras_chart.plot_bar_chart(
+                meses, 
+                montos, 
+                'Compras por Mes',
+                'Mes',
+                'Monto Total ($)',
+                '#ff9800'  # Color naranja para Compras
+            )
                 
     def cargarDatosVentas(self):
-        if not self.connectToDatabase():
-            return
-            
-        try:
-            cursor = self.db_connection.cursor()
-            
+        def consultar(cursor):
             # Cargar datos de ventas
-            cursor.execute("""
-                SELECT ven_id, ven_cliente, ven_usu_id, ven_fecha_venta, 
-                       ven_monto_total, ven_estado 
-                FROM venta 
-                ORDER BY ven_fecha_venta DESC
-            """)
-            ventas_data = cursor.fetchall()
-            self.ventas_model.refreshData(ventas_data)
+            ventas = leerConsulta(CONSULTA_VENTAS, cursor)
             
             # Cargar datos de detalle de venta
-            cursor.execute("""
-                SELECT dv_id, ven_id, inv_id, cantidad 
-                FROM detalle_venta 
-                ORDER BY dv_id
-            """)
-            detalle_venta_data = cursor.fetchall()
-            self.detalle_venta_model.refreshData(detalle_venta_data)
-            
-            # Datos para gráfico
-            cursor.execute("""
-                SELECT DATE_FORMAT(ven_fecha_venta, '%Y-%m') as mes, SUM(ven_monto_total) 
-                FROM venta 
-                GROUP BY mes 
-                ORDER BY mes
-            """)
-            ventas_por_mes = cursor.fetchall()
-            
-            if ventas_por_mes:
-                meses = [mes for mes, _ in ventas_por_mes]
-                montos = [monto for _, monto in ventas_por_mes]
-                
-                self.ventas_chart.plot_bar_chart(
-                    meses, 
-                    montos, 
-                    'Ventas por Mes',
-                    'Mes',
-                    'Monto Total ($)',
-                    '#4CAF50'  # Color verde para Ventas
-                )
+            detalle_venta_data = leerConsulta(CONSULTA_DETALLE_VENTA, cursor)
             
-            cursor.close()
+            return ventas, detalle_venta_data, self.consultarGraficaVentas(cursor)
+        
+        self.ejecutor.ejecutar(consultar, self.mostrarDatosVentas, self.mostrarErrorCarga("ventas"), grupo="modulo")
+        
+    def mostrarDatosVentas(self, resultado):
+        ventas, detalle_venta_data, ventas_por_mes = resultado
+        self.ventas_model.mostrarConsulta(ventas)
+        self.detalle_venta_model.mostrarConsulta(detalle_venta_data)
+        self.mostrarGraficaVentas(ventas_por_mes)
+        
+    def consultarGraficaVentas(self, cursor):
+        return consultarVentasMes(cursor)
+        
+    def mostrarGraficaVentas(self, ventas_por_mes):
+        if ventas_por_mes:
+            meses = [mes for mes, _ in ventas_por_mes]
+            montos = [monto for _, monto in ventas_por_mes]
             
-        except mysql.connector.Error as err:
-            QMessageBox.critical(self, "Error de base de datos", f"Error al cargar datos de ventas: {err}")
-        finally:
-            if self.db_connection:
-                self.db_connection.close()
+            self.ventas_chart.plot_bar_chart(
+                meses, 
+                montos, 
+                'Ventas por Mes',
+                'Mes',
+                'Monto Total ($)',
+                '#4CAF50'  # Color verde para Ventas
+            )
                 
     def cargarDatosMantenimiento(self):
-        if not self.connectToDatabase():
-            return
-            
-        try:
-            cursor = self.db_connection.cursor()
-            
+        def consultar(cursor):
             # Cargar datos de mantenimiento
-            cursor.execute("""
-                SELECT man_id, man_vehiculo_id, man_usu_id, man_fecha_programada, 
-                       man_descripcion, man_costo, man_estado 
-                FROM mantenimiento 
-                ORDER BY man_fecha_programada DESC
-            """)
-            mantenimiento_data = cursor.fetchall()
-            self.mantenimiento_model.refreshData(mantenimiento_data)
+            mantenimiento_data = leerConsulta(CONSULTA_MANTENIMIENTO, cursor)
             
             # Cargar datos de incidencias
-            cursor.execute("""
-                SELECT inc_id, inc_usu_id, inc_fecha, inc_descripcion, inc_estado 
-                FROM incidencia 
-                ORDER BY inc_fecha DESC
-            """)
-            incidencias_data = cursor.fetchall()
-            self.incidencias_model.refreshData(incidencias_data)
+            incidencias_data = leerConsulta(CONSULTA_INCIDENCIAS, cursor)
             
-            # Datos para gráfico
-            cursor.execute("""
-                SELECT man_estado, COUNT(*) 
-                FROM mantenimiento 
-                GROUP BY man_estado
-            """)
-            estado_data = cursor.fetchall()
+            return mantenimiento_data, incidencias_data, self.consultarGraficaMantenimiento(cursor)
+        
+        self.ejecutor.ejecutar(consultar, self.mostrarDatosMantenimiento, self.mostrarErrorCarga("mantenimiento"), grupo="modulo")
+        
+    def mostrarDatosMantenimiento(self, resultado):
+        mantenimiento_data, incidencias_data, estado_data = resultado
+        self.mantenimiento_model.mostrarConsulta(mantenimiento_data)
+        self.incidencias_model.mostrarConsulta(incidencias_data)
+        self.mostrarGraficaMantenimiento(estado_data)
+        
+    def consultarGraficaMantenimiento(self, cursor):
+        return consultarEstados(cursor, "resumen_mantenimiento_estado")
+        
+    def mostrarGraficaMantenimiento(self, estado_data):
+        if estado_data:
+            estados = [estado for estado, _ in estado_data]
+            cantidades = [cant for _, cant in estado_data]
             
-            if estado_data:
-                estados = [estado for estado, _ in estado_data]
-                cantidades = [cant for _, cant in estado_data]
+            self.mantenimiento_chart.plot_bar_chart(
+                estados, 
+                cantidades, 
+                'Estado de Mantenimientos',
+                'Estado',
+                'Cantidad',
+                '#673ab7'  # Color púrpura para Mantenimiento
+            )
                 
-                self.mantenimiento_chart.plot_bar_chart(
-                    estados, 
-                    cantidades, 
-                    'Estado de Mantenimientos',
-                    'Estado',
-                    'Cantidad',
-                    '#673ab7'  # Color púrpura para Mantenimiento
-                )
-            
-            cursor.close()
-            
-        except mysql.connector.Error as err:
-            QMessageBox.critical(self, "Error de base de datos", f"Error al cargar datos de mantenimiento: {err}")
-        finally:
-            if self.db_connection:
-                self.db_connection.close()
+    def exportarTabla(self):
+        # La tabla con el foco en la vista del modulo; si ninguna lo tiene, la primera
+        vistas = [vista for vista in self.stacked_widget.currentWidget().findChildren(QTableView) if vista.isVisible()]
+        if not vistas:
+            return
+        vista = next((vista for vista in vistas if vista.hasFocus()), vistas[0])
+        exportarVista(vista)
                 
     def logout(self):
+        self.ejecutor.cancelar("modulo")
+        self.ejecutor.cancelar("busqueda")
+        for grupo in self._graficas:
+            self.ejecutor.cancelar(grupo)
         self.close()
         self.loginWindow.show()
\ No newline at end of file
@@ -0,0 +1,183 @@
+# Graficas de matplotlib que se actualizan en su lugar.
+# Antes cada recarga hacia axes.clear(), volvia a crear todas las lineas y
+# barras y corria fig.tight_layout() y draw(); con varios años de datos
+# diarios eso tomaba segundos. Aqui:
+#   - las lineas (Line2D) y las barras se crean una vez y despues solo se les
+#     cambian los datos (set_data / set_height); las barras se recrean solo si
+#     cambian las etiquetas del eje x
+#   - las series de tiempo se reducen con LTTB a un punto por pixel del eje; la
+#     serie completa se guarda y se vuelve a reducir al cambiar el tamaño
+#   - tight_layout solo corre cuando cambian titulos, etiquetas o el tamaño
+#   - se usa draw_idle(): Qt junta varias actualizaciones en un solo repintado
+# Con un pastel de totales en cero se muestra "Sin datos" en lugar de fallar.
+import warnings
+import numpy as np
+from matplotlib import dates as mdates
+from matplotlib.artist import setp
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.figure import Figure
+
+def lttb(x, y, umbral):
+    """Reduce la serie (x, y) a umbral puntos con Largest-Triangle-Three-Buckets.
+
+    Conserva el primer y el ultimo punto y, de cada grupo, el que forma el
+    triangulo mas grande con sus vecinos (asi no se pierden picos). Retorna (x, y).
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    n = len(x)
+    if umbral >= n or umbral < 3:
+        return x, y
+
+    # umbral - 2 grupos entre el primer y el ultimo punto
+    limites = np.linspace(1, n - 1, umbral - 1).astype(np.int64)
+    indices = np.empty(umbral, dtype=np.int64)
+    indices[0] = 0
+    indices[-1] = n - 1
+    anterior = 0
+    for i in range(umbral - 2):
+        inicio, fin = limites[i], limites[i + 1]
+        siguiente_fin = limites[i + 2] if i + 2 < len(limites) else n
+        promedio_x = x[fin:siguiente_fin].mean()
+        promedio_y = y[fin:siguiente_fin].mean()
+        areas = np.abs((x[anterior] - promedio_x) * (y[inicio:fin] - y[anterior])
+                       - (x[anterior] - x[inicio:fin]) * (promedio_y - y[anterior]))
+        anterior = inicio + int(areas.argmax())
+        indices[i + 1] = anterior
+    return x[indices], y[indices]
+
+def _numeros(valores):
+    # Los montos llegan como Decimal desde MySQL; los artistas necesitan float
+    return [float(v) if v is not None else 0.0 for v in valores]
+
+class Grafica(FigureCanvas):
+    def __init__(self, parent=None, width=5, height=4, dpi=100):
+        self.fig = Figure(figsize=(width, height), dpi=dpi)
+        self.axes = self.fig.add_subplot(111)
+        super().__init__(self.fig)
+        self.setParent(parent)
+        self._tipo = None        # "series", "barras" o "pastel"; si cambia se limpia el eje
+        self._series = {}        # nombre -> (Line2D, x completo, y completo)
+        self._barras = {}        # nombre -> BarContainer
+        self._etiquetas = None   # etiquetas del eje x de las barras
+        self._pastel = None      # (etiquetas, valores) del pastel dibujado
+        self._acomodar = True    # tight_layout pendiente
+        self.mpl_connect("resize_event", self._redimensionado)
+
+    def _preparar(self, tipo):
+        """Limpia el eje solo si la grafica cambia de tipo; retorna True si lo limpio."""
+        if self._tipo == tipo:
+            return False
+        self.axes.clear()
+        self._tipo = tipo
+        self._series = {}
+        self._barras = {}
+        self._etiquetas = None
+        self._pastel = None
+        self._acomodar = True
+        return True
+
+    def rotular(self, titulo, xlabel=None, ylabel=None):
+        """Pone titulo y etiquetas de los ejes; solo pide tight_layout si cambiaron."""
+        if self.axes.get_title() != titulo:
+            self.axes.set_title(titulo)
+            self._acomodar = True
+        if xlabel is not None and self.axes.get_xlabel() != xlabel:
+            self.axes.set_xlabel(xlabel)
+            self._acomodar = True
+        if ylabel is not None and self.axes.get_ylabel() != ylabel:
+            self.axes.set_ylabel(ylabel)
+            self._acomodar = True
+
+    def leyenda(self):
+        if self.axes.get_legend() is None:
+            self.axes.legend()
+            self._acomodar = True
+
+    def puntosVisibles(self):
+        """Retorna cuantos puntos caben en el ancho del eje (uno por pixel)."""
+        return max(3, int(self.axes.bbox.width))
+
+    def serie(self, nombre, fechas, valores, estilo, etiqueta=None):
+        """Crea o actualiza la linea nombre con la serie de tiempo [fechas], [valores]."""
+        if self._preparar("series"):
+            self.axes.xaxis_date()
+            self.axes.grid(True, linestyle='--', alpha=0.7)
+            # Las marcas nuevas del eje copian el formato de la primera
+            setp(self.axes.get_xticklabels(), rotation=45, ha='right')
+        x = mdates.date2num(list(fechas)) if len(fechas) else np.empty(0)
+        y = np.asarray(_numeros(valores), dtype=float)
+        if nombre in self._series:
+            linea = self._series[nombre][0]
+        else:
+            linea, = self.axes.plot([], [], estilo, label=etiqueta)
+        self._series[nombre] = (linea, x, y)
+        linea.set_data(*lttb(x, y, self.puntosVisibles()))
+
+    def barras(self, etiquetas, series, ancho=0.8):
+        """Crea o actualiza barras; series es [(nombre, valores, color)], con varias se agrupan."""
+        if self._preparar("barras"):
+            self.axes.grid(True, linestyle='--', alpha=0.7, axis='y')
+        etiquetas = [str(e) for e in etiquetas]
+        nombres = [nombre for nombre, _, _ in series]
+        if etiquetas != self._etiquetas or nombres != list(self._barras):
+            for contenedor in self._barras.values():
+                contenedor.remove()
+            self._barras = {}
+            x = np.arange(len(etiquetas))
+            ancho_serie = ancho / len(series)
+            for i, (nombre, valores, color) in enumerate(series):
+                desplazamiento = (i - (len(series) - 1) / 2) * ancho_serie
+                self._barras[nombre] = self.axes.bar(x + desplazamiento, _numeros(valores), ancho_serie,
+                                                     label=nombre, color=color)
+            self.axes.set_xticks(x)
+            self.axes.set_xticklabels(etiquetas)
+            # Rotar etiquetas para mejor legibilidad
+            setp(self.axes.get_xticklabels(), rotation=45, ha='right')
+            self._etiquetas = etiquetas
+            self._acomodar = True
+        else:
+            for nombre, valores, _ in series:
+                for rectangulo, valor in zip(self._barras[nombre], _numeros(valores)):
+                    rectangulo.set_height(valor)
+
+    def pastel(self, etiquetas, valores, colores, titulo):
+        """Dibuja el pastel solo si cambiaron los datos; con total cero muestra "Sin datos"."""
+        valores = _numeros(valores)
+        if self._tipo == "pastel" and self._pastel == (list(etiquetas), valores):
+            return
+        self._tipo = None
+        self._preparar("pastel")
+        self._pastel = (list(etiquetas), valores)
+        if sum(valores) > 0:
+            # Explotar la primera rebanada
+            explode = [0.1] + [0] * (len(valores) - 1)
+            self.axes.pie(valores, explode=explode, labels=etiquetas, colors=colores,
+                          autopct='%1.1f%%', shadow=True, startangle=90)
+            self.axes.axis('equal')  # Asegura que el pastel sea un círculo
+        else:
+            self.axes.set(frame_on=False, xticks=[], yticks=[])
+            self.axes.text(0.5, 0.5, "Sin datos", ha='center', va='center', transform=self.axes.transAxes)
+        self.axes.set_title(titulo)
+
+    def actualizar(self):
+        """Reajusta los limites y pide un repintado."""
+        if self._tipo != "pastel":
+            self.axes.relim()
+            self.axes.autoscale_view()
+        if self._acomodar:
+            self._ajustarMargenes()
+        self.draw_idle()
+
+    def _ajustarMargenes(self):
+        self._acomodar = False
+        with warnings.catch_warnings():
+            # Mientras el widget aun no tiene su tamaño final tight_layout no cabe; se reintenta al redimensionar
+            warnings.simplefilter("ignore", UserWarning)
+            self.fig.tight_layout()
+
+    def _redimensionado(self, evento):
+        # Con otro ancho caben otros puntos: se reducen de nuevo las series completas
+        for linea, x, y in self._series.values():
+            linea.set_data(*lttb(x, y, self.puntosVisibles()))
+        self._ajustarMargenes()
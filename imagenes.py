@@ -0,0 +1,61 @@
+# Imagenes de la interfaz (logos de las toolbars y del inicio de sesion).
+# Logo-Grupo-Porteo.png mide 3132x2178 (~27 MB ya decodificado) y cada ventana lo
+# leia del disco con QPixmap(...) para reducirlo a 40x40, otra vez en cada cierre
+# y apertura de sesion. Aqui cada archivo se decodifica una vez por proceso a una
+# copia base de BASE pixeles de lado mayor, y cada tamaño que piden las ventanas
+# se guarda ya reducido en QPixmapCache.
+#
+# Las rutas son relativas a la carpeta del programa, no al directorio actual.
+import os
+from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QImageReader, QPixmap, QPixmapCache
+
+CARPETA = os.path.dirname(os.path.abspath(__file__))
+# Lado mayor de la copia base de la que salen los tamaños reducidos
+BASE = 256
+
+# Imagenes cuya copia base es la imagen completa (ya no hay mas resolucion que leer)
+_completas = set()
+
+def ruta(nombre):
+    """Retorna la ruta del archivo nombre en la carpeta del programa."""
+    return os.path.join(CARPETA, nombre)
+
+def _cubre(base, ancho, alto):
+    return base.size().scaled(ancho, alto, Qt.KeepAspectRatio).width() <= base.width()
+
+def _base(nombre, ancho, alto):
+    clave = f"imagenes:{nombre}:base"
+    base = QPixmapCache.find(clave)
+    if base is not None and (nombre in _completas or _cubre(base, ancho, alto)):
+        return base
+    lector = QImageReader(ruta(nombre))
+    lector.setAutoTransform(True)
+    tamano = lector.size()
+    lado = max(BASE, ancho, alto)
+    reducir = tamano.isValid() and max(tamano.width(), tamano.height()) > lado
+    if reducir:
+        # El lector reduce al decodificar: no se guarda la imagen completa
+        lector.setScaledSize(tamano.scaled(lado, lado, Qt.KeepAspectRatio))
+    imagen = lector.read()
+    if imagen.isNull():
+        return QPixmap()
+    base = QPixmap.fromImage(imagen)
+    if not reducir:
+        _completas.add(nombre)
+    QPixmapCache.insert(clave, base)
+    return base
+
+def pixmap(nombre, ancho, alto=None):
+    """Retorna la imagen nombre reducida a ancho x alto (conserva la proporcion); nula si no se pudo leer."""
+    alto = alto or ancho
+    clave = f"imagenes:{nombre}:{ancho}x{alto}"
+    imagen = QPixmapCache.find(clave)
+    if imagen is not None:
+        return imagen
+    base = _base(nombre, ancho, alto)
+    if base.isNull():
+        return base
+    imagen = base.scaled(ancho, alto, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+    QPixmapCache.insert(clave, imagen)
+    return imagen
@@ -0,0 +1,495 @@
+# Importacion masiva de finanzas, inventario, usuarios y envios desde CSV o XLSX.
+# Los dialogos de alta insertan (y hacen commit de) un registro a la vez; un
+# estado de cuenta de fin de mes son miles de filas. Aqui el archivo se lee por
+# lotes de LOTE filas y cada lote:
+#   - se valida columna por columna (tipos, largo de los textos, valores de los
+#     ENUM); las filas con algun error se reportan y no se insertan
+#   - revisa las llaves foraneas y los correos repetidos con una consulta por lote
+#   - se inserta con un solo executemany (mysql.connector lo manda como un INSERT
+#     de varias filas) y un commit por lote
+# Con simular=True (--simular) se hace todo menos insertar: sirve para revisar el
+# archivo antes de cargarlo. Los errores se pueden guardar en un CSV con el numero
+# de fila del archivo, la columna, el valor y el motivo.
+#
+# Los encabezados del archivo pueden ser los nombres de las columnas de MySQL
+# (fin_fecha) o los titulos de las tablas (Fecha); las demas columnas se ignoran,
+# asi un archivo exportado (exportar.py) se puede volver a importar.
+#
+# Uso:
+#   python3 importar.py finanza estado_cuenta.csv --usuario 3 --simular --errores errores.csv
+#   python3 importar.py usuario usuarios.xlsx
+#
+# XLSX necesita openpyxl (pip install openpyxl).
+import argparse
+import csv
+import datetime
+import os
+import re
+import sys
+import traceback
+import unicodedata
+from decimal import Decimal, InvalidOperation
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, Qt, pyqtSignal
+from PyQt5.QtWidgets import QApplication, QFileDialog, QMessageBox
+import mysql.connector
+from conexion import conexionSegundoPlano, obtenerConexion
+
+# Filas por lote (validacion, executemany y commit)
+LOTE = 1000
+
+_CORREO = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+
+# Conversiones de una celda al valor de la columna; lanzan ValueError con el motivo
+
+def _vacio(valor):
+    return valor is None or (isinstance(valor, str) and not valor.strip())
+
+def texto(largo, nulo=False):
+    def convertir(valor):
+        if _vacio(valor):
+            if nulo:
+                return None
+            raise ValueError("no puede estar vacio")
+        valor = str(valor).strip()
+        if len(valor) > largo:
+            raise ValueError(f"mas de {largo} caracteres")
+        return valor
+    return convertir
+
+def entero(minimo=None):
+    def convertir(valor):
+        if _vacio(valor):
+            raise ValueError("no puede estar vacio")
+        try:
+            numero = Decimal(str(valor).strip())
+        except InvalidOperation:
+            raise ValueError("no es un numero entero")
+        if numero != numero.to_integral_value():
+            raise ValueError("no es un numero entero")
+        numero = int(numero)
+        if minimo is not None and numero < minimo:
+            raise ValueError(f"debe ser al menos {minimo}")
+        return numero
+    return convertir
+
+def decimal(digitos, decimales):
+    # DECIMAL(digitos, decimales) de MySQL; acepta "$1,234.50"
+    limite = Decimal(10) ** (digitos - decimales)
+    def convertir(valor):
+        if _vacio(valor):
+            raise ValueError("no puede estar vacio")
+        try:
+            numero = Decimal(str(valor).strip().replace("$", "").replace(",", ""))
+        except InvalidOperation:
+            raise ValueError("no es un monto")
+        if not numero.is_finite():
+            raise ValueError("no es un monto")
+        if numero < 0:
+            raise ValueError("no puede ser negativo")
+        if numero.as_tuple().exponent < -decimales and numero != round(numero, decimales):
+            raise ValueError(f"mas de {decimales} decimales")
+        if numero >= limite:
+            raise ValueError("monto demasiado grande")
+        return round(numero, decimales)
+    return convertir
+
+def opcion(*valores):
+    # ENUM de MySQL; no distingue mayusculas y regresa el valor como esta en el ENUM
+    validos = {valor.lower(): valor for valor in valores}
+    def convertir(valor):
+        if _vacio(valor):
+            raise ValueError("no puede estar vacio")
+        encontrado = validos.get(str(valor).strip().lower())
+        if encontrado is None:
+            raise ValueError(f"debe ser {', '.join(valores)}")
+        return encontrado
+    return convertir
+
+def fecha(nulo=False):
+    def convertir(valor):
+        if isinstance(valor, datetime.datetime):
+            return valor.date()
+        if isinstance(valor, datetime.date):
+            return valor
+        if _vacio(valor):
+            if nulo:
+                return None
+            raise ValueError("no puede estar vacia")
+        valor = str(valor).strip()
+        for formato in ("%Y-%m-%d", "%d/%m/%Y", "%d-%m-%Y"):
+            try:
+                return datetime.datetime.strptime(valor, formato).date()
+            except ValueError:
+                pass
+        raise ValueError("fecha invalida (AAAA-MM-DD o DD/MM/AAAA)")
+    return convertir
+
+def correo(valor):
+    valor = texto(100)(valor)
+    if not _CORREO.match(valor):
+        raise ValueError("correo invalido")
+    return valor.lower()
+
+# tabla -> [(columna, titulo, conversion, obligatoria)]; el orden es el del INSERT.
+# Los ENUM son los de ERP_GP_logistics.sql
+IMPORTACIONES = {
+    "finanza": [
+        ("fin_fecha", "Fecha", fecha(), True),
+        ("fin_desc", "Descripción", texto(255, nulo=True), False),
+        ("fin_monto", "Monto", decimal(10, 2), True),
+        ("fin_tipo", "Tipo", opcion("ingreso", "gasto"), True),
+    ],
+    "inventario": [
+        ("inv_alm_id", "Almacén ID", entero(1), True),
+        ("inv_producto", "Producto", texto(100), True),
+        ("inv_cantidad", "Cantidad", entero(0), True),
+    ],
+    "usuario": [
+        ("usu_nombre", "Nombre", texto(100), True),
+        ("usu_correo", "Correo", correo, True),
+        ("usu_contra", "Contraseña", texto(255), True),
+        ("usu_puesto", "Puesto", texto(50), True),
+        ("usu_fecha_contratacion", "Fecha Contratacion", fecha(), True),
+        ("usu_salario", "Salario", decimal(10, 2), True),
+        ("usu_mod", "Módulo", opcion("Finanzas", "Recursos Humanos", "Logistica", "Compras",
+                                     "Ventas", "Mantenimiento", "Gestion"), True),
+    ],
+    "logistica": [
+        ("log_origen", "Origen", texto(100), True),
+        ("log_destino", "Destino", texto(100), True),
+        ("log_fecha_salida", "Fecha Salida", fecha(), True),
+        ("log_fecha_llegada", "Fecha Llegada", fecha(nulo=True), False),
+        ("log_estado", "Estado", opcion("Planificado", "En proceso", "Completado"), True),
+    ],
+}
+
+# tabla -> columna que toma el usu_id de quien importa
+COLUMNA_USUARIO = {"finanza": "fin_usu_id", "logistica": "log_usu_id"}
+
+class ResultadoImportacion:
+    def __init__(self, tabla, simulacion):
+        self.tabla = tabla
+        self.simulacion = simulacion
+        self.leidas = 0
+        self.validas = 0
+        self.insertadas = 0
+        self.errores = []  # (fila del archivo, columna, valor, motivo)
+        self.fallo = None  # error de la base que detuvo la carga
+
+    def filasConError(self):
+        return len({fila for fila, _, _, _ in self.errores})
+
+    def resumen(self):
+        lineas = [f"Filas leidas: {self.leidas}",
+                  f"Filas validas: {self.validas}",
+                  f"Filas con errores: {self.filasConError()}"]
+        if self.simulacion:
+            lineas.append("Simulacion: no se inserto ninguna fila")
+        else:
+            lineas.append(f"Filas insertadas: {self.insertadas}")
+        if self.fallo:
+            lineas.append(f"La carga se detuvo: {self.fallo}")
+        return "\n".join(lineas)
+
+def _normalizar(titulo):
+    # Sin acentos ni mayusculas: "Descripcion" y "descripción" son la misma columna
+    titulo = unicodedata.normalize("NFKD", str(titulo or "")).encode("ascii", "ignore").decode()
+    return " ".join(titulo.lower().split())
+
+def ubicarColumnas(tabla, encabezados):
+    """Retorna {columna: indice en la fila} segun los encabezados; ValueError si falta una obligatoria."""
+    indices = {_normalizar(encabezado): i for i, encabezado in reversed(list(enumerate(encabezados)))}
+    ubicacion = {}
+    faltantes = []
+    for columna, titulo, _, obligatoria in IMPORTACIONES[tabla]:
+        indice = indices.get(_normalizar(columna), indices.get(_normalizar(titulo)))
+        if indice is not None:
+            ubicacion[columna] = indice
+        elif obligatoria:
+            faltantes.append(titulo)
+    if faltantes:
+        raise ValueError(f"Faltan las columnas: {', '.join(faltantes)}")
+    return ubicacion
+
+def _lotes(filas, lote):
+    actual = []
+    for fila in filas:
+        # Las filas vacias (al final de las hojas de calculo) no cuentan
+        if all(_vacio(valor) for valor in fila[1]):
+            continue
+        actual.append(fila)
+        if len(actual) >= lote:
+            yield actual
+            actual = []
+    if actual:
+        yield actual
+
+def leerArchivo(ruta, lote=LOTE):
+    """Retorna (encabezados, generador de lotes de [(fila del archivo, valores)]) de un CSV o XLSX."""
+    if os.path.splitext(ruta)[1].lower() == ".xlsx":
+        try:
+            from openpyxl import load_workbook
+        except ImportError:
+            raise RuntimeError("Para importar XLSX instale openpyxl (pip install openpyxl)")
+        # read_only: las filas se leen del archivo conforme se piden
+        libro = load_workbook(ruta, read_only=True, data_only=True)
+        filas = enumerate(libro.worksheets[0].iter_rows(values_only=True), 1)
+        cerrar = libro.close
+    else:
+        archivo = open(ruta, newline="", encoding="utf-8-sig")
+        muestra = archivo.read(4096)
+        archivo.seek(0)
+        try:
+            dialecto = csv.Sniffer().sniff(muestra, delimiters=",;\t")
+        except csv.Error:
+            dialecto = csv.excel
+        filas = enumerate(csv.reader(archivo, dialecto), 1)
+        cerrar = archivo.close
+    try:
+        _, encabezados = next(filas)
+    except StopIteration:
+        cerrar()
+        raise ValueError("El archivo esta vacio")
+
+    def generar():
+        try:
+            yield from _lotes(filas, lote)
+        finally:
+            cerrar()
+
+    return list(encabezados), generar()
+
+def validarLote(tabla, ubicacion, lote, resultado):
+    """Convierte el lote columna por columna; retorna {columna: valores} y el conjunto de indices con errores."""
+    columnas = {}
+    malas = set()
+    for columna, titulo, convertir, _ in IMPORTACIONES[tabla]:
+        indice = ubicacion.get(columna)
+        crudos = [valores[indice] if indice is not None and indice < len(valores) else None
+                  for _, valores in lote]
+        convertidos = []
+        for i, valor in enumerate(crudos):
+            try:
+                convertidos.append(convertir(valor))
+            except ValueError as err:
+                convertidos.append(None)
+                malas.add(i)
+                resultado.errores.append((lote[i][0], titulo, valor, str(err)))
+        columnas[columna] = convertidos
+    return columnas, malas
+
+def _buscarExistentes(cursor, sql, valores):
+    # sql con un "IN ({})" para la lista de valores
+    valores = list(valores)
+    if not valores:
+        return set()
+    cursor.execute(sql.format(", ".join(["%s"] * len(valores))), valores)
+    return {fila[0] for fila in cursor.fetchall()}
+
+def _revisarAlmacenes(cursor, lote, columnas, malas, resultado, estado):
+    almacenes = estado.setdefault("almacenes", set())
+    ids = columnas["inv_alm_id"]
+    nuevos = {ids[i] for i in range(len(lote)) if i not in malas} - almacenes
+    almacenes |= _buscarExistentes(cursor, "SELECT alm_id FROM almacen WHERE alm_id IN ({})", nuevos)
+    for i, alm_id in enumerate(ids):
+        if i not in malas and alm_id not in almacenes:
+            malas.add(i)
+            resultado.errores.append((lote[i][0], "Almacén ID", alm_id, "el almacen no existe"))
+
+def _revisarCorreos(cursor, lote, columnas, malas, resultado, estado):
+    # usu_correo es UNIQUE: ni repetido en el archivo ni ya registrado
+    vistos = estado.setdefault("correos", set())
+    correos = columnas["usu_correo"]
+    candidatos = {correos[i] for i in range(len(lote)) if i not in malas}
+    registrados = _buscarExistentes(cursor, "SELECT usu_correo FROM usuario WHERE usu_correo IN ({})", candidatos)
+    registrados = {valor.lower() for valor in registrados}
+    for i, valor in enumerate(correos):
+        if i in malas:
+            continue
+        if valor in registrados:
+            motivo = "el correo ya esta registrado"
+        elif valor in vistos:
+            motivo = "correo repetido en el archivo"
+        else:
+            vistos.add(valor)
+            continue
+        malas.add(i)
+        resultado.errores.append((lote[i][0], "Correo", valor, motivo))
+
+# tabla -> revision del lote contra la base
+REVISIONES = {"inventario": _revisarAlmacenes, "usuario": _revisarCorreos}
+
+def importar(conexion, tabla, ruta, usu_id=None, simular=False, lote=LOTE, progreso=None, cancelado=None):
+    """Importa (o con simular solo valida) el archivo en tabla y retorna un ResultadoImportacion.
+
+    progreso(filas leidas) se llama despues de cada lote; si cancelado() se vuelve
+    verdadero se deja de leer (los lotes anteriores ya tienen commit).
+    """
+    resultado = ResultadoImportacion(tabla, simular)
+    campos = IMPORTACIONES[tabla]
+    columna_usuario = COLUMNA_USUARIO.get(tabla)
+    if columna_usuario and usu_id is None:
+        raise ValueError(f"Para importar {tabla} se necesita el usuario que registra las filas")
+    encabezados, lotes = leerArchivo(ruta, lote)
+    ubicacion = ubicarColumnas(tabla, encabezados)
+    nombres = [columna for columna, _, _, _ in campos] + ([columna_usuario] if columna_usuario else [])
+    query = f"INSERT INTO {tabla} ({', '.join(nombres)}) VALUES ({', '.join(['%s'] * len(nombres))})"
+    revisar = REVISIONES.get(tabla)
+    estado = {}
+    cursor = conexion.cursor()
+    try:
+        for actual in lotes:
+            if cancelado is not None and cancelado():
+                break
+            resultado.leidas += len(actual)
+            columnas, malas = validarLote(tabla, ubicacion, actual, resultado)
+            if revisar is not None:
+                revisar(cursor, actual, columnas, malas, resultado, estado)
+            filas = [tuple(columnas[columna][i] for columna, _, _, _ in campos) + ((usu_id,) if columna_usuario else ())
+                     for i in range(len(actual)) if i not in malas]
+            resultado.validas += len(filas)
+            if filas and not simular:
+                try:
+                    cursor.executemany(query, filas)
+                    conexion.commit()
+                except mysql.connector.Error as err:
+                    conexion.rollback()
+                    resultado.fallo = f"fila {actual[0][0]}: {err}"
+                    break
+                resultado.insertadas += len(filas)
+            if progreso is not None:
+                progreso(resultado.leidas)
+    finally:
+        cursor.close()
+    return resultado
+
+def guardarErrores(ruta, resultado):
+    """Escribe los errores del resultado en un CSV (fila, columna, valor, error)."""
+    with open(ruta, "w", newline="", encoding="utf-8-sig") as archivo:
+        escritor = csv.writer(archivo)
+        escritor.writerow(["Fila", "Columna", "Valor", "Error"])
+        escritor.writerows(sorted(resultado.errores, key=lambda error: error[0]))
+
+class _TareaImportacion(QRunnable):
+    # importar() con su propia conexion del pool, en el pool global de Qt
+    def __init__(self, importacion, simular):
+        super().__init__()
+        self.importacion = importacion
+        self.simular = simular
+
+    def run(self):
+        i = self.importacion
+        try:
+            with conexionSegundoPlano() as conexion:
+                resultado = importar(conexion, i.tabla, i.ruta, i.usu_id, self.simular)
+        except (mysql.connector.Error, ValueError, RuntimeError, OSError) as err:
+            i.fallo.emit(str(err))
+            return
+        except Exception as err:
+            traceback.print_exc()
+            i.fallo.emit(str(err))
+            return
+        i.terminada.emit(resultado)
+
+class Importacion(QObject):
+    # Importacion desde la interfaz: primero simula y muestra el reporte; si el
+    # usuario confirma, importa las filas validas
+    terminada = pyqtSignal(object)  # ResultadoImportacion
+    fallo = pyqtSignal(str)
+
+    def __init__(self, ventana, tabla, ruta, usu_id=None, al_importar=None):
+        super().__init__(ventana)
+        self.ventana = ventana
+        self.tabla = tabla
+        self.ruta = ruta
+        self.usu_id = usu_id
+        self.al_importar = al_importar
+        self.terminada.connect(self._terminar)
+        self.fallo.connect(self._fallar)
+
+    def iniciar(self, simular=True):
+        QApplication.setOverrideCursor(Qt.WaitCursor)
+        QThreadPool.globalInstance().start(_TareaImportacion(self, simular))
+
+    def _fallar(self, mensaje):
+        QApplication.restoreOverrideCursor()
+        QMessageBox.critical(self.ventana, "Error al importar", f"No se pudo importar el archivo: {mensaje}")
+        self.deleteLater()
+
+    def _terminar(self, resultado):
+        QApplication.restoreOverrideCursor()
+        if resultado.simulacion:
+            if self._confirmar(resultado):
+                self.iniciar(simular=False)
+            else:
+                self.deleteLater()
+            return
+        if resultado.insertadas and self.al_importar is not None:
+            self.al_importar()
+        mostrar = QMessageBox.warning if resultado.errores or resultado.fallo else QMessageBox.information
+        mostrar(self.ventana, "Importar", resultado.resumen())
+        self.deleteLater()
+
+    def _confirmar(self, simulacion):
+        # Reporte de la simulacion; los errores se pueden guardar antes de decidir
+        while True:
+            caja = QMessageBox(QMessageBox.Question if simulacion.validas else QMessageBox.Warning,
+                               "Importar", simulacion.resumen(), parent=self.ventana)
+            importar_btn = None
+            if simulacion.validas:
+                importar_btn = caja.addButton(f"Importar {simulacion.validas} filas", QMessageBox.AcceptRole)
+            errores_btn = caja.addButton("Guardar errores...", QMessageBox.ActionRole) if simulacion.errores else None
+            caja.addButton("Cancelar", QMessageBox.RejectRole)
+            caja.exec_()
+            elegido = caja.clickedButton()
+            if errores_btn is not None and elegido is errores_btn:
+                destino, _ = QFileDialog.getSaveFileName(self.ventana, "Guardar errores",
+                                                         "errores_importacion.csv", "CSV (*.csv)")
+                if destino:
+                    guardarErrores(destino, simulacion)
+                continue
+            return importar_btn is not None and elegido is importar_btn
+
+def importarArchivo(ventana, tabla, usu_id=None, al_importar=None):
+    """Pide el archivo y lo importa en segundo plano (simulacion, reporte y confirmacion).
+
+    al_importar() se llama en el hilo de la interfaz si se insertaron filas.
+    """
+    ruta, _ = QFileDialog.getOpenFileName(ventana, "Importar archivo", "",
+                                          "Archivos de datos (*.csv *.xlsx);;CSV (*.csv);;Excel (*.xlsx)")
+    if not ruta:
+        return None
+    importacion = Importacion(ventana, tabla, ruta, usu_id, al_importar)
+    importacion.iniciar()
+    return importacion
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Importa finanzas, inventario, usuarios o envios desde CSV o XLSX")
+    parser.add_argument("tabla", choices=sorted(IMPORTACIONES))
+    parser.add_argument("archivo", help="archivo .csv o .xlsx con encabezados")
+    parser.add_argument("--usuario", type=int, help="usu_id que registra las finanzas o los envios")
+    parser.add_argument("--simular", action="store_true", help="solo valida el archivo, no inserta")
+    parser.add_argument("--errores", metavar="CSV", help="guarda los errores por fila en este archivo")
+    parser.add_argument("--lote", type=int, default=LOTE, help=f"filas por lote (por defecto {LOTE})")
+    args = parser.parse_args(argv)
+    try:
+        conexion = obtenerConexion()
+        try:
+            resultado = importar(conexion, args.tabla, args.archivo, args.usuario, args.simular, max(1, args.lote),
+                                 progreso=lambda filas: print(f"{filas} filas leidas...", file=sys.stderr))
+        finally:
+            conexion.close()
+    except (ValueError, RuntimeError, OSError) as err:
+        print(f"Error: {err}")
+        return 2
+    except mysql.connector.Error as err:
+        print(f"Error de base de datos: {err}")
+        return 2
+    print(resultado.resumen())
+    if args.errores and resultado.errores:
+        guardarErrores(args.errores, resultado)
+        print(f"Errores guardados en {args.errores}")
+    return 1 if resultado.errores or resultado.fallo else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
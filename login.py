@@ -6,17 +6,17 @@ import sys
 from PyQt5.QtWidgets import (QApplication, QWidget, QVBoxLayout, QHBoxLayout,
                             QLabel, QLineEdit, QPushButton, QMessageBox, QCheckBox, QDialog)
 from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QFont, QIcon, QPixmap
+from PyQt5.QtGui import QFont, QIcon
 import mysql.connector
-from dotenv import load_dotenv
-import os
-from finanzas import *
-from recursoshumanos import *
-from logistica import *
-from compras import *
-from ventas import *
-from mantenimiento import *
-from gestion import *
+from conexion import obtenerConexion
+import arranque
+import imagenes
+# Las ventanas de cada modulo se importan hasta que se necesitan (ver modulos.py)
+from modulos import MODULOS, crearVentana, precargarPorCorreo
+
+# Consultas del inicio de sesion; migrar.py --verificar corre EXPLAIN sobre estas mismas
+SQL_CONTRASENA = "SELECT usu_contra, usu_mod FROM usuario WHERE usu_correo = %s"
+SQL_USUARIO = "SELECT usu_id from usuario WHERE usu_correo = %s and usu_contra = %s"
 
 class LoginWindow(QWidget):
     def __init__(self):
@@ -82,7 +82,7 @@ class LoginWindow(QWidget):
         header_layout = QHBoxLayout()
         logo_label = QLabel()
         logo_label.setAlignment(Qt.AlignCenter)
-        logo_pixmap = QPixmap("Logo-Grupo-Porteo.png").scaled(100, 100, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        logo_pixmap = imagenes.pixmap("Logo-Grupo-Porteo.png", 100)
         logo_label.setPixmap(logo_pixmap)
         header_layout.addWidget(logo_label, alignment=Qt.AlignCenter)
         main_layout.addLayout(header_layout)
@@ -107,6 +107,8 @@ class LoginWindow(QWidget):
         self.correo_input = QLineEdit()
         self.correo_input.setPlaceholderText("Ingrese su Correo")
         self.correo_input.setMinimumHeight(40)
+        # Al terminar de escribir el correo se precarga el modulo de ese usuario
+        self.correo_input.editingFinished.connect(lambda: precargarPorCorreo(self.correo_input.text().strip()))
         main_layout.addWidget(self.correo_input)
 
         main_layout.addSpacing(10)
@@ -159,6 +161,7 @@ class LoginWindow(QWidget):
         self.setLayout(main_layout)
 
     def login(self):
+        arranque.marca("clic_login")
         correo = self.correo_input.text()
         contra = self.contra_input.text()
 
@@ -167,20 +170,13 @@ class LoginWindow(QWidget):
             return
 
         try:
-            conn = mysql.connector.connect(
-                host=os.environ.get("DB_HOST"),
-                database=os.environ.get("DB_DATABASE"),
-                user=os.environ.get("DB_USER"),
-                password=os.environ.get("DB_PASSWORD")
-            )
+            conn = obtenerConexion()
             cursor = conn.cursor(dictionary=True)
             
-            query = f"SELECT usu_contra, usu_mod FROM usuario WHERE usu_correo = %s"
-            cursor.execute(query, (correo,))
+            cursor.execute(SQL_CONTRASENA, (correo,))
             resultado = cursor.fetchone()
             # Guardamos el id_usu en una variable para poder hacer requests con el usuario 
-            query = f"SELECT usu_id from usuario WHERE usu_correo = %s and usu_contra = %s"
-            cursor.execute(query, (correo, contra))
+            cursor.execute(SQL_USUARIO, (correo, contra))
             usu_id = cursor.fetchone()
             
             if resultado and resultado["usu_contra"] == contra:
@@ -189,39 +185,17 @@ class LoginWindow(QWidget):
                     self.correo_input.clear()
                     self.contra_input.clear()
                 #QMessageBox.information(self, "Inicio de sesión exitoso", f"Bienvenido, {correo}!")
-                if resultado["usu_mod"] == "Finanzas":
-                    print("interfaz de Finanzas")
-                    #print("Creando instancia de FinanzasWindow...")
-                    self.finanzas_window = FinanzasWindow(self, usu_id['usu_id'])
-                    #print("Aplicando atributos...")
-                    self.finanzas_window.setAttribute(Qt.WA_DeleteOnClose, False)  # Evita que se elimine automáticamente
-                    #print("Mostrando ventana...")
-                    self.finanzas_window.show()
-                elif resultado["usu_mod"] == "Recursos Humanos":
-                    print("interfaz de Recursos Humanos")
-                    self.RRHH_window = RRHHWindow(self, usu_id['usu_id'])
-                    self.RRHH_window.show()
-                elif resultado["usu_mod"] == "Logistica":
-                    print("interfaz de Logistica")
-                    self.Logistica_window = LogisticaWindow(self, usu_id['usu_id'])
-                    self.Logistica_window.show()
-                elif resultado["usu_mod"] == "Compras":
-                    self.Compras_window = ComprasWindow(self, usu_id['usu_id'])
-                    self.Compras_window.show()
-                    print("interfaz de Compras")
-                elif resultado["usu_mod"] == "Ventas":
-                    self.Ventas_window = VentasWindow(self, usu_id['usu_id'])
-                    self.Ventas_window.show()
-                    print("interfaz de Ventas")
-                elif resultado["usu_mod"] == "Mantenimiento":
-                    self.Mantenimiento_window = MantenimientoWindow(self, usu_id['usu_id'])
-                    self.Mantenimiento_window.show()
-                    print("interfaz de Mantenimiento")
-                elif resultado["usu_mod"] == "Gestion":
-                    print("interfaz de Gestion")
-                    self.gestion_window = GestionWindow(self)
-                    self.gestion_window.show()
-                self.hide()
+                usu_mod = resultado["usu_mod"]
+                if usu_mod not in MODULOS:
+                    QMessageBox.warning(self, "Inicio de sesión fallido", "El usuario no tiene un módulo asignado")
+                else:
+                    print(f"interfaz de {usu_mod}")
+                    # Importa y construye solo la ventana del modulo del usuario
+                    self.ventana_modulo = crearVentana(usu_mod, self, usu_id['usu_id'])
+                    self.ventana_modulo.show()
+                    self.hide()
+                    # Con --profile-startup: hasta el primer pintado y la primera tabla con filas
+                    arranque.medirVentanaModulo(self.ventana_modulo, usu_mod)
                 #self.show()
             else:
                 QMessageBox.warning(self, "Inicio de sesión fallido", "Correo o contraseña incorrectos")
@@ -361,12 +335,7 @@ class DialogOlvideContra(QDialog):
             return
 
         try:
-            conn = mysql.connector.connect(
-                host=os.environ.get("DB_HOST"),
-                database=os.environ.get("DB_DATABASE"),
-                user=os.environ.get("DB_USER"),
-                password=os.environ.get("DB_PASSWORD")
-            )
+            conn = obtenerConexion()
             cursor = conn.cursor(dictionary=True)
 
             if (nueva_contra==nueva_contra2):
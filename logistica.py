@@ -4,164 +4,64 @@ from PyQt5.QtWidgets import (QMainWindow, QPushButton, QVBoxLayout, QHBoxLayout,
                             QLineEdit, QDateEdit, QComboBox, QMessageBox, QLabel, QSplitter,
                             QDialogButtonBox, QApplication, QFrame, QGridLayout, QSizePolicy, 
                             QStackedWidget, QSpinBox)
-from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QDate, QSize
-from PyQt5.QtGui import QPixmap, QIcon, QFont, QColor, QStandardItemModel, QStandardItem
+from PyQt5.QtCore import Qt, QModelIndex, QDate, QSize
+from PyQt5.QtGui import QIcon, QFont, QColor
 from PyQt5.QtSql import QSqlDatabase, QSqlQuery, QSqlTableModel, QSqlQueryModel
 import mysql.connector
 from datetime import datetime
-import os
-from dotenv import load_dotenv
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.figure import Figure
-
-class LogisticaTableModel(QAbstractTableModel):
-    def __init__(self, data=None):
-        super().__init__()
-        self._data = data if data is not None else []
-        self._headers = ["ID", "Usuario ID", "Origen", "Destino", "Fecha Salida", "Fecha Llegada", "Estado", "Acciones"]
-
-    def data(self, index, role):
-        if not index.isValid() or not (0 <= index.row() < len(self._data)):
-            return None
-
-        if role == Qt.DisplayRole:
-            # Ocultar la columna de "Acciones"
-            if index.column() == 7:
-                return None
-            value = self._data[index.row()][index.column()]
-            # Formato para fechas
-            if index.column() in [4, 5] and isinstance(value, datetime):
-                return value.strftime("%Y-%m-%d")
-            return str(value)
-
-        elif role == Qt.TextAlignmentRole:
-            return Qt.AlignCenter
-
-        elif role == Qt.BackgroundRole:
-            estado = self._data[index.row()][6]
-            return {
-                'Planificado': QColor(240, 248, 255),  # Azul claro
-                'En proceso': QColor(255, 255, 224),    # Amarillo claro
-                'Completado': QColor(240, 255, 240)     # Verde claro
-            }.get(estado, QColor(255, 255, 255))
-
-        return None
-
-    def rowCount(self, parent=None):
-        return len(self._data)
-
-    def columnCount(self, parent=None):
-        return len(self._headers)
-
-    def headerData(self, section, orientation, role):
-        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
-            return self._headers[section]
-        return None
-
-    def setData(self, index, value, role=Qt.EditRole):
-        if role == Qt.EditRole and index.isValid() and 0 <= index.row() < len(self._data):
-            self._data[index.row()][index.column()] = value
-            self.dataChanged.emit(index, index)
-            return True
-        return False
-
-    def refreshData(self, data):
-        self.beginResetModel()
-        self._data = data
-        self.endResetModel()
-
-class AlmacenTableModel(QAbstractTableModel):
-    def __init__(self, data=None):
-        super().__init__()
-        self._data = data if data is not None else []
-        self._headers = ["ID", "Nombre", "Ubicación", "Acciones"]
-
-    def data(self, index, role):
-        if not index.isValid() or not (0 <= index.row() < len(self._data)):
-            return None
-
-        if role == Qt.DisplayRole:
-            # No mostrar contenido en la columna "Acciones"
-            if index.column() == 3:
-                return None
-            return str(self._data[index.row()][index.column()])
-
-        elif role == Qt.TextAlignmentRole:
-            return Qt.AlignCenter
-
-        return None
-
-    def rowCount(self, parent=None):
-        return len(self._data)
-
-    def columnCount(self, parent=None):
-        return len(self._headers)
-
-    def headerData(self, section, orientation, role):
-        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
-            return self._headers[section]
-        return None
-
-    def setData(self, index, value, role=Qt.EditRole):
-        if role == Qt.EditRole and index.isValid() and 0 <= index.row() < len(self._data):
-            self._data[index.row()][index.column()] = value
-            self.dataChanged.emit(index, index)
-            return True
-        return False
-
-    def refreshData(self, data):
-        self.beginResetModel()
-        self._data = data
-        self.endResetModel()
-
-class InventarioTableModel(QAbstractTableModel):
-    def __init__(self, data=None):
-        super().__init__()
-        self._data = data if data is not None else []
-        self._headers = ["ID", "Almacén ID", "Producto", "Cantidad", "Acciones"]
-
-    def data(self, index, role):
-        if not index.isValid() or not (0 <= index.row() < len(self._data)):
-            return None
-
-        if role == Qt.DisplayRole:
-            # No mostrar nada en la columna de "Acciones"
-            if index.column() == 4:
-                return None
-            value = self._data[index.row()][index.column()]
-            # Formatear la cantidad agregando "unidades"
-            if index.column() == 3:
-                return f"{value} unidades"
-            return str(value)
-
-        elif role == Qt.TextAlignmentRole:
-            return Qt.AlignCenter
-
-        return None
-
-    def rowCount(self, parent=None):
-        return len(self._data)
-
-    def columnCount(self, parent=None):
-        return len(self._headers)
-
-    def headerData(self, section, orientation, role):
-        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
-            return self._headers[section]
-        return None
-
-    def setData(self, index, value, role=Qt.EditRole):
-        if role == Qt.EditRole and index.isValid() and 0 <= index.row() < len(self._data):
-            self._data[index.row()][index.column()] = value
-            self.dataChanged.emit(index, index)
-            return True
-        return False
-
-    def refreshData(self, data):
-        self.beginResetModel()
-        self._data = data
-        self.endResetModel()
+from conexion import obtenerConexion
+import imagenes
+from paginacion import ConsultaPaginada, leerConsulta, leerLista
+from ejecutor import EjecutorConsultas
+from tablas import (TablaModel, ReporteModel, Columna, ColorPorValor, ACCIONES, CENTRO, fecha, unidades,
+                    filtroIgual, filtroFecha, filtroPrefijo, tablaConFiltros)
+from sincronizacion import Sincronizador
+from acciones import BotonesDelegate, Boton
+from importar import importarArchivo
+
+# Consultas de lectura de la ventana; migrar.py --verificar corre EXPLAIN sobre estas mismas
+CONSULTA_LOGISTICA = ConsultaPaginada("SELECT * FROM logistica", [("log_usu_id", 1, True, True), ("log_id", 0, True)])
+CONSULTA_ALMACENES = ConsultaPaginada("SELECT * FROM almacen", [("alm_nombre", 1, True), ("alm_id", 0, True)])
+SQL_INVENTARIO_ALMACEN = "SELECT COUNT(*) FROM inventario WHERE inv_alm_id = %s"
+SQL_PEDIDOS_EN_PROCESO = "SELECT * FROM logistica WHERE log_estado = 'En proceso'"
+SQL_REPORTE_MENSUAL = """
+    SELECT log_origen, log_destino, log_fecha_salida
+    FROM logistica
+    WHERE log_fecha_salida BETWEEN %s AND %s
+    ORDER BY log_fecha_salida
+"""
+
+def consultaInventario(alm_id):
+    """Retorna la consulta del inventario de un almacen."""
+    return ConsultaPaginada("SELECT * FROM inventario", [("inv_producto", 2, True), ("inv_id", 0, True)],
+                            "inv_alm_id = %s", (alm_id,))
+
+class LogisticaTableModel(TablaModel):
+    columnas = [Columna("ID", campo="log_id"),
+                Columna("Usuario ID", campo="log_usu_id", nulos=True, filtro=filtroIgual("log_usu_id")),
+                Columna("Origen"), Columna("Destino"),
+                Columna("Fecha Salida", fecha, campo="log_fecha_salida", filtro=filtroFecha("log_fecha_salida")),
+                Columna("Fecha Llegada", fecha),
+                Columna("Estado", campo="log_estado", filtro=filtroIgual("log_estado")), ACCIONES]
+    alineacion = CENTRO
+    color = ColorPorValor(6, {
+        'Planificado': QColor(240, 248, 255),  # Azul claro
+        'En proceso': QColor(255, 255, 224),   # Amarillo claro
+        'Completado': QColor(240, 255, 240)    # Verde claro
+    })
+
+class AlmacenTableModel(TablaModel):
+    columnas = [Columna("ID", campo="alm_id"),
+                Columna("Nombre", campo="alm_nombre", filtro=filtroPrefijo("alm_nombre")),
+                Columna("Ubicación", campo="alm_ubicacion", filtro=filtroPrefijo("alm_ubicacion")), ACCIONES]
+    alineacion = CENTRO
+
+class InventarioTableModel(TablaModel):
+    # La cantidad se muestra con "unidades"
+    columnas = [Columna("ID", campo="inv_id"), Columna("Almacén ID"),
+                Columna("Producto", campo="inv_producto", filtro=filtroPrefijo("inv_producto")),
+                Columna("Cantidad", unidades, campo="inv_cantidad"), ACCIONES]
+    alineacion = CENTRO
 
 class LogisticaDialog(QDialog):
     def __init__(self, parent=None, log_data=None):
@@ -484,7 +384,14 @@ class LogisticaWindow(QMainWindow):
         self.almacen_data = []
         self.inventario_data = []
         self.latestAlmacenRow = 0
+        # Refresco periodico con solo las filas que cambiaron; la primera marca se toma en segundo plano
+        self.sincronizador = Sincronizador(self)
+        # Las cargas de las tablas corren en segundo plano, la ventana no se congela
+        self.ejecutor = EjecutorConsultas(self)
         self.initUI(usu_id)
+        self.sincronizador.registrar(self.log_table_model, self.table_view_log)
+        self.sincronizador.registrar(self.almacen_table_model, self.table_view_almacen)
+        self.sincronizador.registrar(self.inventario_table_model, self.table_view_inventario)
         self.loadDataMain(usu_id)
         
     def initUI(self, usu_id):
@@ -571,11 +478,10 @@ class LogisticaWindow(QMainWindow):
         
         # Agregar el logo a la toolbar
         logo_label = QLabel()
-        logo_pixmap = QPixmap("Logo-Grupo-Porteo.png")
+        logo_pixmap = imagenes.pixmap("Logo-Grupo-Porteo.png", 40)
         if logo_pixmap.isNull():
             print("Error: No se pudo cargar Logo-Grupo-Porteo.png")
         else:
-            logo_pixmap = logo_pixmap.scaled(40, 40, Qt.KeepAspectRatio, Qt.SmoothTransformation)
             logo_label.setPixmap(logo_pixmap)
         self.toolbar.addWidget(logo_label)
         
@@ -635,13 +541,17 @@ class LogisticaWindow(QMainWindow):
 
         self.log_table_model = LogisticaTableModel()
         self.table_view_log.setModel(self.log_table_model)
+        # Botones de la ultima columna, los pinta un delegate en lugar de crear widgets por fila
+        self.table_view_log.setItemDelegateForColumn(7, BotonesDelegate(self.table_view_log, [
+            Boton("Editar", lambda r: self.editLogRecord(r, usu_id)),
+            Boton("Eliminar", lambda r: self.deleteLogRecord(r, usu_id), eliminar=True)]))
 
         # Configurar ancho de columnas
         header_log = self.table_view_log.horizontalHeader()
         header_log.setSectionResizeMode(7, QHeaderView.Fixed)
         header_log.resizeSection(7, 300)
 
-        log_layout.addWidget(self.table_view_log)
+        log_layout.addWidget(tablaConFiltros(self.table_view_log))
 
         # Panel de botones para Logística
         log_button_panel = QHBoxLayout()
@@ -649,6 +559,11 @@ class LogisticaWindow(QMainWindow):
         btn_new_log.clicked.connect(lambda: self.addLogRecord(usu_id))
         log_button_panel.addWidget(btn_new_log)
 
+        # Carga masiva de envios desde CSV o XLSX
+        btn_import_log = QPushButton("Importar", self)
+        btn_import_log.clicked.connect(lambda: importarArchivo(self, "logistica", usu_id, lambda: self.loadDataMain(usu_id)))
+        log_button_panel.addWidget(btn_import_log)
+
         btn_refresh_log = QPushButton("Actualizar", self)
         btn_refresh_log.clicked.connect(lambda: self.loadDataMain(usu_id))
         log_button_panel.addWidget(btn_refresh_log)
@@ -676,13 +591,17 @@ class LogisticaWindow(QMainWindow):
 
         self.almacen_table_model = AlmacenTableModel()
         self.table_view_almacen.setModel(self.almacen_table_model)
+        self.table_view_almacen.setItemDelegateForColumn(3, BotonesDelegate(self.table_view_almacen, [
+            Boton("Editar", lambda r: self.editAlmacenRecord(r, usu_id)),
+            Boton("Eliminar", lambda r: self.deleteAlmacenRecord(r, usu_id), eliminar=True),
+            Boton("Inventario", lambda r: self.toggleInventarioView(r, usu_id), ancho=100)]))
 
         # Configurar ancho de columnas
         header_alm = self.table_view_almacen.horizontalHeader()
         header_alm.setSectionResizeMode(3, QHeaderView.Fixed)
         header_alm.resizeSection(3, 300)
 
-        splitter_alm.addWidget(self.table_view_almacen)
+        splitter_alm.addWidget(tablaConFiltros(self.table_view_almacen))
 
         # Tabla de Inventario (oculta inicialmente)
         self.table_view_inventario = QTableView()
@@ -696,8 +615,11 @@ class LogisticaWindow(QMainWindow):
 
         self.inventario_table_model = InventarioTableModel()
         self.table_view_inventario.setModel(self.inventario_table_model)
+        self.table_view_inventario.setItemDelegateForColumn(4, BotonesDelegate(self.table_view_inventario, [
+            Boton("Editar", lambda r: self.editInventarioRecord(r, usu_id)),
+            Boton("Eliminar", lambda r: self.deleteInventarioRecord(r, usu_id), eliminar=True)]))
 
-        splitter_alm.addWidget(self.table_view_inventario)
+        splitter_alm.addWidget(tablaConFiltros(self.table_view_inventario))
         self.table_view_inventario.hide()
 
         splitter_alm.setSizes([450, 550])
@@ -720,6 +642,12 @@ class LogisticaWindow(QMainWindow):
         btn_toggle_inv.clicked.connect(lambda: self.addInventarioRecord(usu_id))
         alm_button_panel.addWidget(btn_toggle_inv)
 
+        # Carga masiva de inventario (la columna Almacén ID indica el almacen de cada fila)
+        btn_import_inv = QPushButton("Importar Inventario", self)
+        btn_import_inv.clicked.connect(lambda: importarArchivo(self, "inventario", usu_id,
+                                                               lambda: self.recargarInventario(usu_id)))
+        alm_button_panel.addWidget(btn_import_inv)
+
         alm_button_panel.addStretch()
         alm_layout.addLayout(alm_button_panel)
 
@@ -783,8 +711,9 @@ class LogisticaWindow(QMainWindow):
         self.table_reporte = QTableView()
         self.table_reporte.setStyleSheet("border: none;") # Estilo consistente
         self.table_reporte.setAlternatingRowColors(True)
-        self.model_reporte = QStandardItemModel()
-        self.model_reporte.setHorizontalHeaderLabels(["Origen", "Destino", "Fecha Salida"])
+        # Viajes del mes con el numero de viajes de cada dia y del mes
+        self.model_reporte = ReporteModel([Columna("Origen"), Columna("Destino"), Columna("Fecha Salida", fecha)],
+                                          grupo=2)
         self.table_reporte.setModel(self.model_reporte)
         monthly_report_frame_layout.addWidget(self.table_reporte)
 
@@ -803,172 +732,50 @@ class LogisticaWindow(QMainWindow):
 
     def connectToDatabase(self):
         try:
-            load_dotenv()
-            self.db_connection = mysql.connector.connect(
-                host=os.environ.get("DB_HOST"),
-                database=os.environ.get("DB_DATABASE"),
-                user=os.environ.get("DB_USER"),
-                password=os.environ.get("DB_PASSWORD")
-            )
+            # Conexion prestada del pool compartido, close() la regresa al pool
+            self.db_connection = obtenerConexion()
             return True
         except mysql.connector.Error as err:
             QMessageBox.critical(self, "Error de base de datos", f"No se pudo conectar: {err}")
             return False
         
+    def mostrarErrorCarga(self, que):
+        """Retorna la funcion que muestra el error de una carga en segundo plano."""
+        return lambda err: QMessageBox.critical(self, "Error de base de datos", f"Error al cargar {que}: {err}")
+
     def loadDataMain(self, usu_id):
-        if not self.connectToDatabase():
-            return
-        try:
-            cursor = self.db_connection.cursor()
-            
-            # Get all finance records
-            cursor.execute("SELECT * FROM logistica ORDER BY log_usu_id DESC")
-            self.log_data = cursor.fetchall()
-            
-            # Actualizamos los datos de la tabla
-            self.log_table_model.refreshData(self.log_data)
-            # Configurar las funciones en la ultima columna
-            for row in range(len(self.log_data)):
-                # Create a widget to hold the buttons
-                widget = QWidget()
-                layout = QHBoxLayout(widget)
-                layout.setContentsMargins(4, 4, 4, 4)
-                
-                # Boton de editar
-                edit_btn = QPushButton("Editar")
-                edit_btn.setFixedWidth(90)
-                edit_btn.setFixedHeight(30)
-                edit_btn.clicked.connect(lambda _, r=row: self.editLogRecord(r, usu_id))
-                layout.addWidget(edit_btn)
-                
-                # Boton de eliminar
-                delete_btn = QPushButton("Eliminar")
-                delete_btn.setObjectName("deleteBtn")
-                delete_btn.setFixedWidth(90)
-                delete_btn.setFixedHeight(30)
-                delete_btn.clicked.connect(lambda _, r=row: self.deleteLogRecord(r, usu_id))
-                layout.addWidget(delete_btn)
-                
-                layout.setAlignment(Qt.AlignCenter)
-                widget.setLayout(layout)
-                
-                # Configurar el widget en la tabla, en la columna 7
-                self.table_view_log.setIndexWidget(self.log_table_model.index(row, 7), widget)
-                
-            cursor.close()
-            
-        except mysql.connector.Error as err:
-            QMessageBox.critical(self, "Error de base de datos", f"Error al cargar datos: {err}")
-        finally:
-            if self.db_connection:
-                self.db_connection.close()
+        # Cargamos los registros por paginas (keyset sobre usuario, id), en segundo plano
+        self.ejecutor.ejecutar(lambda cursor: leerConsulta(CONSULTA_LOGISTICA, cursor), self.mostrarDataMain,
+                               self.mostrarErrorCarga("datos"), grupo="logistica")
+
+    def mostrarDataMain(self, log_data):
+        self.log_data = self.log_table_model.mostrarConsulta(log_data)
     
     def loadInventarioData(self, row_alm, usu_id):
         record = self.almacen_data[row_alm]# usamos almacen_data por que queremos recuperar
-        if not self.connectToDatabase():
-            return
-            
-        try:
-            cursor = self.db_connection.cursor()
-            
-            # Get all finance records
-            query = """SELECT * FROM inventario WHERE inv_alm_id=%s ORDER BY inv_producto DESC"""
-            cursor.execute(query, (record[0], ))
-            self.inventario_data = cursor.fetchall()
-            
-            # Actualizamos los datos de la tabla
-            self.inventario_table_model.refreshData(self.inventario_data)
-            # Configurar las funciones en la ultima columna
-            for row in range(len(self.inventario_data)):
-                # Create a widget to hold the buttons
-                widget = QWidget()
-                layout = QHBoxLayout(widget)
-                layout.setContentsMargins(4, 4, 4, 4)
-                
-                # Boton de editar
-                edit_btn = QPushButton("Editar")
-                edit_btn.setFixedWidth(90)
-                edit_btn.setFixedHeight(30)
-                edit_btn.clicked.connect(lambda _, r=row: self.editInventarioRecord(r, usu_id))
-                layout.addWidget(edit_btn)
-                
-                # Boton de eliminar
-                delete_btn = QPushButton("Eliminar")
-                delete_btn.setObjectName("deleteBtn")
-                delete_btn.setFixedWidth(90)
-                delete_btn.setFixedHeight(30)
-                delete_btn.clicked.connect(lambda _, r=row: self.deleteInventarioRecord(r, usu_id))
-                layout.addWidget(delete_btn)
-                
-                layout.setAlignment(Qt.AlignCenter)
-                widget.setLayout(layout)
-                
-                # Configurar el widget en la tabla, en la columna 4
-                self.table_view_inventario.setIndexWidget(self.inventario_table_model.index(row, 4), widget)
-                
-            cursor.close()
-            
-        except mysql.connector.Error as err:
-            QMessageBox.critical(self, "Error de base de datos", f"Error al cargar datos: {err}")
-        finally:
-            if self.db_connection:
-                self.db_connection.close()
+        # Inventario del almacen; el modelo guarda la consulta para releer filas sueltas
+        consulta = consultaInventario(record[0])
+        # Otro almacen antes de que termine el anterior: solo se muestra el ultimo
+        self.ejecutor.ejecutar(lambda cursor: leerLista(consulta, cursor),
+                               lambda filas: self.mostrarInventarioData(filas, consulta),
+                               self.mostrarErrorCarga("datos"), grupo="inventario")
+
+    def mostrarInventarioData(self, filas, consulta):
+        self.inventario_data = self.inventario_table_model.mostrarLista(filas, consulta)
+
+    def recargarInventario(self, usu_id):
+        # Solo si el inventario de algun almacen esta a la vista
+        if self.table_view_inventario.isVisible():
+            self.loadInventarioData(self.latestAlmacenRow, usu_id)
 
     def loadAlmacenData(self, usu_id):
-        if not self.connectToDatabase():
-            return
-        try:
-            cursor = self.db_connection.cursor()
-            
-            # Get all finance records
-            cursor.execute("SELECT * FROM almacen ORDER BY alm_nombre DESC")
-            self.almacen_data = cursor.fetchall()
-            
-            # Actualizamos los datos de la tabla
-            self.almacen_table_model.refreshData(self.almacen_data)
-            # Configurar las funciones en la ultima columna
-            for row in range(len(self.almacen_data)):
-                # Create a widget to hold the buttons
-                widget = QWidget()
-                layout = QHBoxLayout(widget)
-                layout.setContentsMargins(4, 4, 4, 4)
-                
-                # Boton de editar
-                edit_btn = QPushButton("Editar")
-                edit_btn.setFixedWidth(90)
-                edit_btn.setFixedHeight(30)
-                edit_btn.clicked.connect(lambda _, r=row: self.editAlmacenRecord(r, usu_id))
-                layout.addWidget(edit_btn)
-                
-                # Boton de eliminar
-                delete_btn = QPushButton("Eliminar")
-                delete_btn.setObjectName("deleteBtn")
-                delete_btn.setFixedWidth(90)
-                delete_btn.setFixedHeight(30)
-                delete_btn.clicked.connect(lambda _, r=row: self.deleteAlmacenRecord(r, usu_id))
-                layout.addWidget(delete_btn)
-                
-                # inventario button
-                inventario_btn = QPushButton("Inventario")
-                inventario_btn.setObjectName("inventarioBtn")
-                inventario_btn.setFixedWidth(100)
-                inventario_btn.setFixedHeight(30)
-                inventario_btn.clicked.connect(lambda _, r=row: self.toggleInventarioView(r, usu_id))
-                layout.addWidget(inventario_btn)
-                
-                layout.setAlignment(Qt.AlignCenter)
-                widget.setLayout(layout)
-                
-                # Configurar el widget en la tabla, en la columna 3
-                self.table_view_almacen.setIndexWidget(self.almacen_table_model.index(row, 3), widget)
-                
-            cursor.close()
-            
-        except mysql.connector.Error as err:
-            QMessageBox.critical(self, "Error de base de datos", f"Error al cargar datos: {err}")
-        finally:
-            if self.db_connection:
-                self.db_connection.close()
+        # Todos los almacenes; el modelo guarda la consulta para releer filas sueltas
+        self.ejecutor.ejecutar(lambda cursor: leerLista(CONSULTA_ALMACENES, cursor),
+                               lambda filas: self.mostrarAlmacenData(filas, CONSULTA_ALMACENES),
+                               self.mostrarErrorCarga("datos"), grupo="almacen")
+
+    def mostrarAlmacenData(self, filas, consulta):
+        self.almacen_data = self.almacen_table_model.mostrarLista(filas, consulta)
     
     def addLogRecord(self, usu_id):
         dialog = LogisticaDialog(self)
@@ -996,10 +803,11 @@ class LogisticaWindow(QMainWindow):
                 ))
                 
                 self.db_connection.commit()
+                # Solo se agrega la fila nueva, sin volver a cargar la tabla
+                self.log_table_model.releerFila(cursor, "log_id", cursor.lastrowid)
                 cursor.close()
                 
                 QMessageBox.information(self, "Éxito", "Registro agregado correctamente")
-                self.loadDataMain(usu_id)
                 
             except mysql.connector.Error as err:
                 QMessageBox.critical(self, "Error de base de datos", f"Error al agregar registro: {err}")
@@ -1029,10 +837,10 @@ class LogisticaWindow(QMainWindow):
                 ))
                 
                 self.db_connection.commit()
+                self.almacen_table_model.releerFila(cursor, "alm_id", cursor.lastrowid)
                 cursor.close()
                 
                 QMessageBox.information(self, "Éxito", "Registro agregado correctamente")
-                self.loadAlmacenData(usu_id)
                 
             except mysql.connector.Error as err:
                 QMessageBox.critical(self, "Error de base de datos", f"Error al agregar registro: {err}")
@@ -1072,12 +880,13 @@ class LogisticaWindow(QMainWindow):
                 ))
                 
                 self.db_connection.commit()
+                if self.table_view_inventario.isVisible():
+                    # Si es de otro almacen el filtro de la consulta la deja fuera
+                    self.inventario_table_model.releerFila(cursor, "inv_id", cursor.lastrowid)
                 cursor.close()
                 
                 QMessageBox.information(self, "Éxito", "Registro agregado correctamente")
-                if self.table_view_inventario.isVisible():
-                    self.loadInventarioData(self.latestAlmacenRow,usu_id)
-                else:
+                if not self.table_view_inventario.isVisible():
                     self.table_view_inventario.show()
                     self.loadInventarioData(self.latestAlmacenRow,usu_id)
 
@@ -1118,10 +927,10 @@ class LogisticaWindow(QMainWindow):
                 ))
                 
                 self.db_connection.commit()
+                self.log_table_model.releerFila(cursor, "log_id", record[0], row)
                 cursor.close()
                 
                 QMessageBox.information(self, "Éxito", "Registro actualizado correctamente")
-                self.loadDataMain(usu_id)
                 
             except mysql.connector.Error as err:
                 QMessageBox.critical(self, "Error de base de datos", f"Error al actualizar registro: {err}")
@@ -1154,10 +963,10 @@ class LogisticaWindow(QMainWindow):
                 ))
                 
                 self.db_connection.commit()
+                self.almacen_table_model.releerFila(cursor, "alm_id", record[0], row)
                 cursor.close()
                 
                 QMessageBox.information(self, "Éxito", "Almacén actualizado correctamente")
-                self.loadAlmacenData(usu_id)
                 
             except mysql.connector.Error as err:
                 QMessageBox.critical(self, "Error de base de datos", f"Error al actualizar almacén: {err}")
@@ -1191,10 +1000,10 @@ class LogisticaWindow(QMainWindow):
                 ))
                 
                 self.db_connection.commit()
+                self.inventario_table_model.releerFila(cursor, "inv_id", record[0], row)
                 cursor.close()
                 
                 QMessageBox.information(self, "Éxito", "Inventario actualizado correctamente")
-                self.loadInventarioData(usu_id)
                 
             except mysql.connector.Error as err:
                 QMessageBox.critical(self, "Error de base de datos", f"Error al actualizar inventario: {err}")
@@ -1223,10 +1032,10 @@ class LogisticaWindow(QMainWindow):
                 cursor.execute(query, (record[0],))
                 
                 self.db_connection.commit()
+                self.log_table_model.quitarFila(row)
                 cursor.close()
                 
                 QMessageBox.information(self, "Éxito", "Registro eliminado correctamente")
-                self.loadDataMain(usu_id)
                 
             except mysql.connector.Error as err:
                 QMessageBox.critical(self, "Error de base de datos", f"Error al eliminar registro: {err}")
@@ -1253,7 +1062,7 @@ class LogisticaWindow(QMainWindow):
                 cursor = self.db_connection.cursor()
                 
                 # Verificar si tiene inventario asociado
-                cursor.execute("SELECT COUNT(*) FROM inventario WHERE inv_alm_id = %s", (record[0],))
+                cursor.execute(SQL_INVENTARIO_ALMACEN, (record[0],))
                 count = cursor.fetchone()[0]
                 
                 if count > 0:
@@ -1265,10 +1074,10 @@ class LogisticaWindow(QMainWindow):
                 cursor.execute(query, (record[0],))
                 
                 self.db_connection.commit()
+                self.almacen_table_model.quitarFila(row)
                 cursor.close()
                 
                 QMessageBox.information(self, "Éxito", "Almacén eliminado correctamente")
-                self.loadAlmacenData(usu_id)
                 
             except mysql.connector.Error as err:
                 QMessageBox.critical(self, "Error de base de datos", f"Error al eliminar almacén: {err}")
@@ -1297,10 +1106,10 @@ class LogisticaWindow(QMainWindow):
                 cursor.execute(query, (record[0],))
                 
                 self.db_connection.commit()
+                self.inventario_table_model.quitarFila(row)
                 cursor.close()
                 
                 QMessageBox.information(self, "Éxito", "Registro eliminado correctamente")
-                self.loadInventarioData(self.latestAlmacenRow, usu_id)
                 
             except mysql.connector.Error as err:
                 QMessageBox.critical(self, "Error de base de datos", f"Error al eliminar registro: {err}")
@@ -1322,71 +1131,35 @@ class LogisticaWindow(QMainWindow):
         self.generarReporteMensual(usu_id)
 
     def cargarPedidosEnProceso(self, usu_id):
-        if not self.connectToDatabase():
-            return
-            
-        try:
-            cursor = self.db_connection.cursor()
-            cursor.execute("SELECT * FROM logistica WHERE log_estado = 'En proceso'")
-            datos = cursor.fetchall()
-            
-            # Usamos el mismo modelo pero solo con las columnas necesarias
-            self.model_pedidos.refreshData(datos)
-            
-            # Ocultar columnas no relevantes
-            for col in [0, 1, 5, 6]:  # Ocultar ID, usuario_id, fecha llegada, estado
-                self.table_pedidos.setColumnHidden(col, True)
-                
-            cursor.close()
-            
-        except mysql.connector.Error as err:
-            QMessageBox.critical(self, "Error de base de datos", f"Error al cargar pedidos: {err}")
-        finally:
-            if self.db_connection:
-                self.db_connection.close()
+        def consultar(cursor):
+            cursor.execute(SQL_PEDIDOS_EN_PROCESO)
+            return cursor.fetchall()
 
-    def generarReporteMensual(self, usu_id):
-        if not self.connectToDatabase():
-            return
+        self.ejecutor.ejecutar(consultar, self.mostrarPedidosEnProceso, self.mostrarErrorCarga("pedidos"),
+                               grupo="pedidos")
+
+    def mostrarPedidosEnProceso(self, datos):
+        # Usamos el mismo modelo pero solo con las columnas necesarias
+        self.model_pedidos.refreshData(datos)
         
-        try:
-            fecha_seleccionada = self.date_edit_mes.date()
-            inicio_mes = QDate(fecha_seleccionada.year(), fecha_seleccionada.month(), 1)
-            fin_mes = inicio_mes.addMonths(1).addDays(-1)
-            
-            cursor = self.db_connection.cursor()
-            query = """
-            SELECT log_origen, log_destino, log_fecha_salida 
-            FROM logistica 
-            WHERE log_fecha_salida BETWEEN %s AND %s
-            """
-            cursor.execute(query, (
-                inicio_mes.toString("yyyy-MM-dd"),
-                fin_mes.toString("yyyy-MM-dd")
-            ))
-            
-            resultados = cursor.fetchall()
-            
-            # Limpiar modelo existente
-            self.model_reporte.clear()
-            self.model_reporte.setHorizontalHeaderLabels(["Origen", "Destino", "Fecha Salida"])
-            
-            # Llenar con nuevos datos
-            for row in resultados:
-                items = [
-                    QStandardItem(str(row[0])),
-                    QStandardItem(str(row[1])),
-                    QStandardItem(row[2].strftime("%Y-%m-%d") if isinstance(row[2], datetime) else str(row[2]))
-                ]
-                self.model_reporte.appendRow(items)
-                
-            cursor.close()
-            
-        except mysql.connector.Error as err:
-            QMessageBox.critical(self, "Error de base de datos", f"Error al generar reporte: {err}")
-        finally:
-            if self.db_connection:
-                self.db_connection.close()
+        # Ocultar columnas no relevantes
+        for col in [0, 1, 5, 6]:  # Ocultar ID, usuario_id, fecha llegada, estado
+            self.table_pedidos.setColumnHidden(col, True)
+
+    def generarReporteMensual(self, usu_id):
+        fecha_seleccionada = self.date_edit_mes.date()
+        inicio_mes = QDate(fecha_seleccionada.year(), fecha_seleccionada.month(), 1)
+        fin_mes = inicio_mes.addMonths(1).addDays(-1)
+        parametros = (inicio_mes.toString("yyyy-MM-dd"), fin_mes.toString("yyyy-MM-dd"))
+
+        def consultar(cursor):
+            cursor.execute(SQL_REPORTE_MENSUAL, parametros)
+            return cursor.fetchall()
+
+        # El modelo guarda las columnas tal cual; el texto se arma al pintar cada celda
+        self.ejecutor.ejecutar(consultar, self.model_reporte.cargar,
+                               lambda err: QMessageBox.critical(self, "Error de base de datos", f"Error al generar reporte: {err}"),
+                               grupo="reporte")
 
     def logout(self):
         self.close()
@@ -4,120 +4,43 @@ from PyQt5.QtWidgets import (QMainWindow, QPushButton, QVBoxLayout, QHBoxLayout,
                             QLineEdit, QDateEdit, QComboBox, QMessageBox, QLabel, QSplitter,
                             QDialogButtonBox, QApplication, QFrame, QGridLayout, QSizePolicy, 
                             QStackedWidget, QSpinBox)
-from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QDate, QSize
-from PyQt5.QtGui import QPixmap, QIcon, QFont, QColor
+from PyQt5.QtCore import Qt, QModelIndex, QDate, QSize
+from PyQt5.QtGui import QIcon, QFont, QColor
 from PyQt5.QtSql import QSqlDatabase, QSqlQuery, QSqlTableModel, QSqlQueryModel
 import mysql.connector
 from datetime import datetime
-import os
-from dotenv import load_dotenv
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.figure import Figure
-
-class MantenimientoTableModel(QAbstractTableModel):
-    def __init__(self, data=None):
-        super().__init__()
-        self._data = data if data is not None else []
-        # Cabeceras de cada tabla.
-        self._headers = ["ID", "ID del Vehiculo", "ID del Usuario", "Fecha Programada", "Descripcion", "Costo", "Estado", "Acciones"]
-        #                 0          1              2                3                 4          5         6          7
-    def data(self, index, role):
-        if not index.isValid() or not (0 <= index.row() < len(self._data)):
-            return None
-            
-        if role == Qt.DisplayRole:
-            # para no mostrar valores en la columna de las acciones (7 en este caso)
-            if index.column() == 7:
-                return None
-                
-            value = self._data[index.row()][index.column()]
-            
-            # Darle el formato correcto a las fechas
-            if index.column() == 3 and isinstance(value, datetime):
-                return value.strftime("%Y-%m-%d")
-                
-            # Formato correcto al costo
-            if index.column() == 5:
-                return f"${value:,.2f}"
-                
-            return str(value)
-            
-        elif role == Qt.TextAlignmentRole:
-            # Alinear los valores de la columna de costo a la derecha
-            if index.column() == 5:
-                return Qt.AlignRight | Qt.AlignVCenter
-        return None
-        
-    def rowCount(self, parent=None):
-        return len(self._data)
-        
-    def columnCount(self, parent=None):
-        return 8  # 7 columnas de datos + 1 columna de acciones (Quitando contraseña)
-        
-    def headerData(self, section, orientation, role):
-        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
-            return self._headers[section]
-        return None
-        
-    def setData(self, index, value, role=Qt.EditRole):
-        if role == Qt.EditRole:
-            self._data[index.row()][index.column()] = value
-            self.dataChanged.emit(index, index)
-            return True
-        return False
-        
-    def refreshData(self, data):
-        self.beginResetModel()
-        self._data = data
-        self.endResetModel()
-
-class IncidenciaTableModel(QAbstractTableModel):
-    def __init__(self, data=None):
-        super().__init__()
-        self._data = data if data is not None else []
-        # Cabeceras de cada tabla.
-        self._headers = ["ID", "ID del Usuario", "Fecha", "Descripcion", "Estado", "Acciones"]
-        #                 0           1             2           3            4         5
-    def data(self, index, role):
-        if not index.isValid() or not (0 <= index.row() < len(self._data)):
-            return None
-            
-        if role == Qt.DisplayRole:
-            # para no mostrar valores en la columna de las acciones (7 en este caso)
-            if index.column() == 5:
-                return None
-                
-            value = self._data[index.row()][index.column()]
-            
-            # Darle el formato correcto a las fechas
-            if index.column() == 2 and isinstance(value, datetime):
-                return value.strftime("%Y-%m-%d")
-
-            return str(value)
-        
-    def rowCount(self, parent=None):
-        return len(self._data)
-        
-    def columnCount(self, parent=None):
-        return 6  # 5 columnas de datos + 1 columna de acciones
-        
-    def headerData(self, section, orientation, role):
-        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
-            return self._headers[section]
-        return None
-        
-    def setData(self, index, value, role=Qt.EditRole):
-        if role == Qt.EditRole:
-            self._data[index.row()][index.column()] = value
-            self.dataChanged.emit(index, index)
-            return True
-        return False
-        
-    def refreshData(self, data):
-        self.beginResetModel()
-        self._data = data
-        self.endResetModel()
+from conexion import obtenerConexion
+import imagenes
+from paginacion import ConsultaPaginada, leerConsulta, leerLista
+from ejecutor import EjecutorConsultas
+from tablas import (TablaModel, Columna, ACCIONES, DERECHA, fecha, moneda, filtroIgual, filtroFecha,
+                    filtroTexto, tablaConFiltros)
+from sincronizacion import Sincronizador
+from acciones import BotonesDelegate, Boton
+
+# Consultas de lectura de la ventana; migrar.py --verificar corre EXPLAIN sobre estas mismas
+CONSULTA_MANTENIMIENTO = ConsultaPaginada("SELECT * FROM mantenimiento", [("man_costo", 5, True, True), ("man_id", 0, True)])
+
+def consultaIncidencias(usu_id):
+    """Retorna la consulta de las incidencias de un usuario."""
+    return ConsultaPaginada("SELECT * FROM incidencia", [("inc_fecha", 2, True), ("inc_id", 0, True)],
+                            "inc_usu_id = %s", (usu_id,))
+
+class MantenimientoTableModel(TablaModel):
+    # 7 columnas de datos + 1 columna de acciones; el costo alineado a la derecha
+    columnas = [Columna("ID", campo="man_id"),
+                Columna("ID del Vehiculo", campo="man_vehiculo_id", nulos=True, filtro=filtroIgual("man_vehiculo_id")),
+                Columna("ID del Usuario", campo="man_usu_id", nulos=True, filtro=filtroIgual("man_usu_id")),
+                Columna("Fecha Programada", fecha, campo="man_fecha_programada", filtro=filtroFecha("man_fecha_programada")),
+                Columna("Descripcion", filtro=filtroTexto("man_descripcion")),
+                Columna("Costo", moneda, DERECHA, campo="man_costo", nulos=True),
+                Columna("Estado", campo="man_estado", filtro=filtroIgual("man_estado")), ACCIONES]
+
+class IncidenciaTableModel(TablaModel):
+    columnas = [Columna("ID", campo="inc_id"), Columna("ID del Usuario"),
+                Columna("Fecha", fecha, campo="inc_fecha", filtro=filtroFecha("inc_fecha")),
+                Columna("Descripcion", filtro=filtroTexto("inc_descripcion")),
+                Columna("Estado", campo="inc_estado", filtro=filtroIgual("inc_estado")), ACCIONES]
 
 # Dialog de editar/insertar datos a la  base de datos para el mantenimiento
 class MantenimientoDialog(QDialog):
@@ -321,7 +244,13 @@ class MantenimientoWindow(QMainWindow):
         self.rrhh_data = []
         self.incidencia_data = []
         self.latestUsuRow=0
+        # Refresco periodico con solo las filas que cambiaron; la primera marca se toma en segundo plano
+        self.sincronizador = Sincronizador(self)
+        # Las cargas de las tablas corren en segundo plano, la ventana no se congela
+        self.ejecutor = EjecutorConsultas(self)
         self.initUI(usu_id)
+        self.sincronizador.registrar(self.table_model, self.table_view_mantenimiento)
+        self.sincronizador.registrar(self.evaluacions_table_model, self.table_view_incidencia)
         self.loadDataMain(usu_id)
         
     def initUI(self, usu_id):
@@ -409,11 +338,10 @@ class MantenimientoWindow(QMainWindow):
         
         # Agregamos el logo a la toolbar
         logo_label = QLabel()
-        logo_pixmap = QPixmap("Logo-Grupo-Porteo.png")
+        logo_pixmap = imagenes.pixmap("Logo-Grupo-Porteo.png", 40)
         if logo_pixmap.isNull():
             print("Error: No se pudo cargar Logo-Grupo-Porteo.png")
         else:
-            logo_pixmap = logo_pixmap.scaled(40, 40, Qt.KeepAspectRatio, Qt.SmoothTransformation)
             logo_label.setPixmap(logo_pixmap)
         self.toolbar.addWidget(logo_label)
         
@@ -471,6 +399,10 @@ class MantenimientoWindow(QMainWindow):
         # Modelo de insercion para la tabla de mantenimiento
         self.table_model = MantenimientoTableModel()
         self.table_view_mantenimiento.setModel(self.table_model)
+        # Botones de la ultima columna, los pinta un delegate en lugar de crear widgets por fila
+        self.table_view_mantenimiento.setItemDelegateForColumn(7, BotonesDelegate(self.table_view_mantenimiento, [
+            Boton("Editar", lambda r: self.editMantenimientoRecord(r, usu_id)),
+            Boton("Eliminar", lambda r: self.deleteMantenimientoRecord(r, usu_id), eliminar=True)]))
 
         # Configurar el ancho de las columnas
         header = self.table_view_mantenimiento.horizontalHeader()
@@ -478,7 +410,7 @@ class MantenimientoWindow(QMainWindow):
         header.setSectionResizeMode(7, QHeaderView.Fixed)  # Fijamos el ancho de la columna 7
         header.resizeSection(7, 300)
         
-        splitter.addWidget(self.table_view_mantenimiento)
+        splitter.addWidget(tablaConFiltros(self.table_view_mantenimiento))
 
         # añadir tablas (una izq y otra derecha) de:
         """
@@ -527,6 +459,9 @@ class MantenimientoWindow(QMainWindow):
 
         self.evaluacions_table_model = IncidenciaTableModel()
         self.table_view_incidencia.setModel(self.evaluacions_table_model)
+        self.table_view_incidencia.setItemDelegateForColumn(5, BotonesDelegate(self.table_view_incidencia, [
+            Boton("Editar", lambda r: self.editEvalRecord(r, usu_id)),
+            Boton("Eliminar", lambda r: self.deleteEvalRecord(r, usu_id), eliminar=True)]))
 
         # Configurar el ancho de las columnas
         header = self.table_view_incidencia.horizontalHeader()
@@ -534,7 +469,7 @@ class MantenimientoWindow(QMainWindow):
         header.setSectionResizeMode(4, QHeaderView.Fixed)  # Fijamos el ancho de la columna 4
         header.resizeSection(4, 300)
 
-        incidencia_layout.addWidget(self.table_view_incidencia)
+        incidencia_layout.addWidget(tablaConFiltros(self.table_view_incidencia))
 
         button_panel = QHBoxLayout()
 
@@ -559,114 +494,34 @@ class MantenimientoWindow(QMainWindow):
         
     def connectToDatabase(self):
         try:
-            load_dotenv()
-            self.db_connection = mysql.connector.connect(
-                host=os.environ.get("DB_HOST"),
-                database=os.environ.get("DB_DATABASE"),
-                user=os.environ.get("DB_USER"),
-                password=os.environ.get("DB_PASSWORD")
-            )
+            # Conexion prestada del pool compartido, close() la regresa al pool
+            self.db_connection = obtenerConexion()
             return True
         except mysql.connector.Error as err:
             QMessageBox.critical(self, "Error de base de datos", f"No se pudo conectar: {err}")
             return False
             
+    def mostrarErrorCarga(self, que):
+        """Retorna la funcion que muestra el error de una carga en segundo plano."""
+        return lambda err: QMessageBox.critical(self, "Error de base de datos", f"Error al cargar {que}: {err}")
+
     def loadDataMain(self, usu_id):
-        if not self.connectToDatabase():
-            return
-            
-        try:
-            cursor = self.db_connection.cursor()
-            
-            # Get all finance records
-            cursor.execute("SELECT * FROM mantenimiento ORDER BY man_costo DESC")
-            self.mantenimiento_data = cursor.fetchall()
-            
-            # Actualizamos los datos de la tabla
-            self.table_model.refreshData(self.mantenimiento_data)
-            # Configurar las funciones en la ultima columna
-            for row in range(len(self.mantenimiento_data)):
-                # Create a widget to hold the buttons
-                widget = QWidget()
-                layout = QHBoxLayout(widget)
-                layout.setContentsMargins(4, 4, 4, 4)
-                
-                # Boton de editar
-                edit_btn = QPushButton("Editar")
-                edit_btn.setFixedWidth(90)
-                edit_btn.setFixedHeight(30)
-                edit_btn.clicked.connect(lambda _, r=row: self.editMantenimientoRecord(r, usu_id))
-                layout.addWidget(edit_btn)
-                
-                # Boton de eliminar
-                delete_btn = QPushButton("Eliminar")
-                delete_btn.setObjectName("deleteBtn")
-                delete_btn.setFixedWidth(90)
-                delete_btn.setFixedHeight(30)
-                delete_btn.clicked.connect(lambda _, r=row: self.deleteMantenimientoRecord(r, usu_id))
-                layout.addWidget(delete_btn)
-                
-                layout.setAlignment(Qt.AlignCenter)
-                widget.setLayout(layout)
-                
-                # Configurar el widget en la tabla, en la columna 7 (excluyendo contraseña)
-                self.table_view_mantenimiento.setIndexWidget(self.table_model.index(row, 7), widget)
-                
-            cursor.close()
-            
-        except mysql.connector.Error as err:
-            QMessageBox.critical(self, "Error de base de datos", f"Error al cargar datos: {err}")
-        finally:
-            if self.db_connection:
-                self.db_connection.close()
+        # Los mantenimientos se cargan por paginas (keyset sobre costo, id), en segundo plano
+        self.ejecutor.ejecutar(lambda cursor: leerConsulta(CONSULTA_MANTENIMIENTO, cursor), self.mostrarDataMain,
+                               self.mostrarErrorCarga("datos"), grupo="mantenimiento")
+
+    def mostrarDataMain(self, mantenimiento_data):
+        self.mantenimiento_data = self.table_model.mostrarConsulta(mantenimiento_data)
 
     def loadDataIncidencia(self, usu_id):
-        if not self.connectToDatabase():
-            return
-            
-        try:
-            cursor = self.db_connection.cursor()
-            query = """SELECT * FROM incidencia WHERE inc_usu_id=%s ORDER BY inc_fecha DESC"""
-            
-            cursor.execute(query, (usu_id, ))
-            self.incidencia_data = cursor.fetchall()
-            # Actualizamos los datos de la tabla
-            self.evaluacions_table_model.refreshData(self.incidencia_data)
-            # Configurar las funciones en la ultima columna
-            for row in range(len(self.incidencia_data)):
-                # Create a widget to hold the buttons
-                widget = QWidget()
-                layout = QHBoxLayout(widget)
-                layout.setContentsMargins(4, 4, 4, 4)
-                
-                # Boton de editar
-                edit_btn = QPushButton("Editar")
-                edit_btn.setFixedWidth(90)
-                edit_btn.setFixedHeight(30)
-                edit_btn.clicked.connect(lambda _, r=row: self.editEvalRecord(r, usu_id))
-                layout.addWidget(edit_btn)
-                
-                # Boton de eliminar
-                delete_btn = QPushButton("Eliminar")
-                delete_btn.setObjectName("deleteBtn")
-                delete_btn.setFixedWidth(90)
-                delete_btn.setFixedHeight(30)
-                delete_btn.clicked.connect(lambda _, r=row: self.deleteEvalRecord(r, usu_id))
-                layout.addWidget(delete_btn)
-                
-                layout.setAlignment(Qt.AlignCenter)
-                widget.setLayout(layout)
-                
-                # Configurar el widget en la tabla, en la columna 5
-                self.table_view_incidencia.setIndexWidget(self.evaluacions_table_model.index(row, 5), widget)
-                
-            cursor.close()
-            
-        except mysql.connector.Error as err:
-            QMessageBox.critical(self, "Error de base de datos", f"Error al cargar datos: {err}")
-        finally:
-            if self.db_connection:
-                self.db_connection.close()
+        # Incidencias del usuario; el modelo guarda la consulta para releer filas sueltas
+        consulta = consultaIncidencias(usu_id)
+        self.ejecutor.ejecutar(lambda cursor: leerLista(consulta, cursor),
+                               lambda filas: self.mostrarDataIncidencia(filas, consulta),
+                               self.mostrarErrorCarga("datos"), grupo="incidencia")
+
+    def mostrarDataIncidencia(self, filas, consulta):
+        self.incidencia_data = self.evaluacions_table_model.mostrarLista(filas, consulta)
 
     def addMantenimientoRecord(self, usu_id):
         dialog = MantenimientoDialog(self)
@@ -693,10 +548,11 @@ class MantenimientoWindow(QMainWindow):
                 ))
                 
                 self.db_connection.commit()
+                # Solo se agrega la fila nueva, sin volver a cargar la tabla
+                self.table_model.releerFila(cursor, "man_id", cursor.lastrowid)
                 cursor.close()
                 
                 QMessageBox.information(self, "Éxito", "Registro agregado correctamente")
-                self.loadDataMain(usu_id)
                 
             except mysql.connector.Error as err:
                 QMessageBox.critical(self, "Error de base de datos", f"Error al agregar registro: {err}")
@@ -727,11 +583,10 @@ class MantenimientoWindow(QMainWindow):
                 ))
                 
                 self.db_connection.commit()
+                self.evaluacions_table_model.releerFila(cursor, "inc_id", cursor.lastrowid)
                 cursor.close()
                 
                 QMessageBox.information(self, "Éxito", "Registro agregado correctamente")
-
-                self.loadDataIncidencia(usu_id)
                 
             except mysql.connector.Error as err:
                 QMessageBox.critical(self, "Error de base de datos", f"Error al agregar registro: {err}")
@@ -769,10 +624,10 @@ class MantenimientoWindow(QMainWindow):
                 ))
                 
                 self.db_connection.commit()
+                self.table_model.releerFila(cursor, "man_id", record[0], row)
                 cursor.close()
                 
                 QMessageBox.information(self, "Éxito", "Registro actualizado correctamente")
-                self.loadDataMain(usu_id)
                 
             except mysql.connector.Error as err:
                 QMessageBox.critical(self, "Error de base de datos", f"Error al actualizar registro: {err}")
@@ -807,10 +662,10 @@ class MantenimientoWindow(QMainWindow):
                 ))
                 
                 self.db_connection.commit()
+                self.evaluacions_table_model.releerFila(cursor, "inc_id", record[0], row)
                 cursor.close()
                 
                 QMessageBox.information(self, "Éxito", "Registro actualizado correctamente")
-                self.loadDataIncidencia(usu_id)
                 
             except mysql.connector.Error as err:
                 QMessageBox.critical(self, "Error de base de datos", f"Error al actualizar registro: {err}")
@@ -837,14 +692,14 @@ class MantenimientoWindow(QMainWindow):
             try:
                 cursor = self.db_connection.cursor()
                 
-                query = "DELETE FROM mantenimiento WHERE inc_id = %s"
+                query = "DELETE FROM mantenimiento WHERE man_id = %s"
                 cursor.execute(query, (record[0],))
                 
                 self.db_connection.commit()
+                self.table_model.quitarFila(row)
                 cursor.close()
                 
                 QMessageBox.information(self, "Éxito", "Registro eliminado correctamente")
-                self.loadDataMain(usu_id)
                 
             except mysql.connector.Error as err:
                 QMessageBox.critical(self, "Error de base de datos", f"Error al eliminar registro: {err}")
@@ -875,10 +730,10 @@ class MantenimientoWindow(QMainWindow):
                 cursor.execute(query, (record[0],))
                 
                 self.db_connection.commit()
+                self.evaluacions_table_model.quitarFila(row)
                 cursor.close()
                 
                 QMessageBox.information(self, "Éxito", "Registro eliminado correctamente")
-                self.loadDataIncidencia(usu_id)
                 
             except mysql.connector.Error as err:
                 QMessageBox.critical(self, "Error de base de datos", f"Error al eliminar registro: {err}")
@@ -0,0 +1,295 @@
+# Medicion de las consultas de los modulos.
+# ConexionPool.cursor() envuelve cada cursor en un CursorMedido que registra, por
+# consulta: la huella del SQL (sin valores), el metodo que la hizo (por ejemplo
+# GestionWindow.cargarDatosCompras, tambien desde las funciones que corren en el
+# ejecutor), la espera por la conexion del pool, el tiempo de execute, el de los
+# fetch, las filas y los bytes aproximados que se leyeron (estimados con una
+# muestra de las filas de cada lote).
+#
+# Por cada metodo y cada huella se guardan los totales y las ultimas MUESTRAS
+# duraciones para los percentiles (p50, p95, p99). Las consultas que tardan mas
+# de ERP_LENTAS_MS se agregan al archivo ERP_LOG_LENTAS y al salir del programa
+# (ERP_logistics.py) se imprime el resumen de los metodos que mas tiempo pasaron
+# en la base.
+#
+# Variables de entorno (.env):
+# ERP_MEDIR=0         -> desactiva la medicion (por defecto activa)
+# ERP_LENTAS_MS=500   -> milisegundos a partir de los que una consulta se registra como lenta
+# ERP_LOG_LENTAS      -> archivo de las consultas lentas (por defecto consultas_lentas.log)
+import datetime
+import os
+import re
+import sys
+import threading
+import time
+from collections import deque
+from functools import lru_cache
+from dotenv import load_dotenv
+
+load_dotenv()
+
+def _activo(nombre, defecto="1"):
+    return os.environ.get(nombre, defecto).strip().lower() not in ("0", "false", "no")
+
+def _numero(nombre, defecto):
+    try:
+        return float(os.environ.get(nombre, defecto))
+    except ValueError:
+        return defecto
+
+ACTIVA = _activo("ERP_MEDIR")
+LENTAS_MS = _numero("ERP_LENTAS_MS", 500)
+LOG_LENTAS = os.environ.get("ERP_LOG_LENTAS", "consultas_lentas.log")
+# Duraciones que se guardan por metodo y por huella para los percentiles
+MUESTRAS = 500
+# Filas de cada lote leido que se recorren para estimar los bytes
+FILAS_BYTES = 20
+
+# Modulos de acceso a datos: la consulta se atribuye al primer metodo fuera de ellos
+_INTERNOS = {"conexion", "medicion", "paginacion", "ejecutor", "tablas", "bdmemoria", "agregados",
+             "resumenes", "busqueda", "catalogo", "movimientos", "sincronizacion", "exportar", "importar"}
+
+_CADENA = re.compile(r"'(?:[^'\\]|\\.|'')*'|\"(?:[^\"\\]|\\.)*\"")
+_NUMERO = re.compile(r"\b\d+(?:\.\d+)?\b")
+_LISTA = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_ESPACIOS = re.compile(r"\s+")
+
+@lru_cache(maxsize=2048)
+def huella(sql):
+    """Retorna el SQL sin valores ni espacios de mas: las consultas iguales con otros valores tienen la misma huella."""
+    sql = _CADENA.sub("?", sql)
+    sql = _NUMERO.sub("?", sql.replace("%s", "?"))
+    sql = _LISTA.sub("(...)", sql)
+    return _ESPACIOS.sub(" ", sql).strip()
+
+def _nombre(marco, modulo):
+    codigo = marco.f_code
+    # co_qualname (Python 3.11+) trae la clase: "GestionWindow.cargarDatosCompras.<locals>.consultar"
+    nombre = getattr(codigo, "co_qualname", codigo.co_name).split(".<locals>")[0]
+    return nombre if "." in nombre else f"{modulo}.{nombre}"
+
+def metodoLlamador():
+    """Retorna el metodo de la ventana (o el script) que hizo la consulta en curso."""
+    marco = sys._getframe(2)
+    ultimo = None
+    while marco is not None:
+        modulo = marco.f_globals.get("__name__", "")
+        if modulo not in _INTERNOS:
+            return _nombre(marco, modulo)
+        if modulo not in ("conexion", "medicion"):
+            # Sin metodo de una ventana (paginas al hacer scroll, sincronizacion): el mas externo
+            ultimo = (marco, modulo)
+        marco = marco.f_back
+    return _nombre(*ultimo) if ultimo else "?"
+
+def _bytes(filas):
+    # Aproximado: largo de textos y binarios, 8 por cualquier otro valor. Solo se
+    # recorren FILAS_BYTES filas repartidas en el lote y se extrapola al total
+    paso = max(1, len(filas) // FILAS_BYTES)
+    muestra = filas[::paso]
+    total = 0
+    for fila in muestra:
+        for valor in (fila.values() if isinstance(fila, dict) else fila):
+            if valor is None:
+                continue
+            total += len(valor) if isinstance(valor, (str, bytes, bytearray)) else 8
+    return total * len(filas) // len(muestra) if muestra else 0
+
+class _Estadistica:
+    __slots__ = ("llamadas", "conexion", "ejecucion", "lectura", "filas", "bytes", "duraciones")
+
+    def __init__(self):
+        self.llamadas = 0
+        self.conexion = 0.0
+        self.ejecucion = 0.0
+        self.lectura = 0.0
+        self.filas = 0
+        self.bytes = 0
+        self.duraciones = deque(maxlen=MUESTRAS)
+
+    def agregar(self, medicion):
+        self.llamadas += 1
+        self.conexion += medicion.conexion
+        self.ejecucion += medicion.ejecucion
+        self.lectura += medicion.lectura
+        self.filas += medicion.filas
+        self.bytes += medicion.bytes
+        self.duraciones.append(medicion.ejecucion + medicion.lectura)
+
+    def percentiles(self, *cuales):
+        ordenadas = sorted(self.duraciones)
+        if not ordenadas:
+            return [0.0] * len(cuales)
+        return [ordenadas[min(len(ordenadas) - 1, int(p / 100 * len(ordenadas)))] for p in cuales]
+
+    def dict(self):
+        p50, p95, p99 = self.percentiles(50, 95, 99)
+        return {
+            "llamadas": self.llamadas,
+            "total_ms": (self.ejecucion + self.lectura) * 1000,
+            "conexion_ms": self.conexion * 1000,
+            "ejecucion_ms": self.ejecucion * 1000,
+            "lectura_ms": self.lectura * 1000,
+            "p50_ms": p50 * 1000,
+            "p95_ms": p95 * 1000,
+            "p99_ms": p99 * 1000,
+            "filas": self.filas,
+            "bytes": self.bytes,
+        }
+
+_lock = threading.Lock()
+_por_metodo = {}    # metodo -> _Estadistica
+_por_consulta = {}  # (metodo, huella) -> _Estadistica
+_log_lock = threading.Lock()
+
+class _Medicion:
+    __slots__ = ("sql", "metodo", "conexion", "ejecucion", "lectura", "filas", "bytes")
+
+    def __init__(self, sql, metodo, conexion):
+        self.sql = sql
+        self.metodo = metodo
+        self.conexion = conexion
+        self.ejecucion = 0.0
+        self.lectura = 0.0
+        self.filas = 0
+        self.bytes = 0
+
+def registrar(medicion):
+    """Agrega una consulta terminada a las estadisticas (y al log si fue lenta)."""
+    clave = (medicion.metodo, huella(medicion.sql))
+    with _lock:
+        estadistica = _por_metodo.get(medicion.metodo)
+        if estadistica is None:
+            estadistica = _por_metodo[medicion.metodo] = _Estadistica()
+        estadistica.agregar(medicion)
+        estadistica = _por_consulta.get(clave)
+        if estadistica is None:
+            estadistica = _por_consulta[clave] = _Estadistica()
+        estadistica.agregar(medicion)
+    milisegundos = (medicion.ejecucion + medicion.lectura) * 1000
+    if LOG_LENTAS and milisegundos >= LENTAS_MS:
+        linea = (f"{datetime.datetime.now().isoformat(timespec='seconds')} {milisegundos:9.1f} ms "
+                 f"filas={medicion.filas} {medicion.metodo} {clave[1]}\n")
+        try:
+            with _log_lock, open(LOG_LENTAS, "a", encoding="utf-8") as archivo:
+                archivo.write(linea)
+        except OSError as err:
+            print(f"No se pudo escribir el log de consultas lentas: {err}")
+
+class CursorMedido:
+    # Envuelve un cursor: mide execute y los fetch; lo demas (description,
+    # lastrowid, rowcount...) es el del cursor. La consulta se registra al
+    # ejecutar la siguiente, al cerrar el cursor o cuando se lee la ultima fila.
+    def __init__(self, cursor, conexion):
+        self._cursor = cursor
+        self._conexion = conexion
+        self._actual = None
+
+    def __getattr__(self, nombre):
+        return getattr(self._cursor, nombre)
+
+    def _iniciar(self, query):
+        self._terminar()
+        espera = self._conexion.tomarEspera() if hasattr(self._conexion, "tomarEspera") else 0.0
+        self._actual = _Medicion(query, metodoLlamador(), espera)
+        return self._actual
+
+    def _terminar(self):
+        medicion, self._actual = self._actual, None
+        if medicion is not None:
+            registrar(medicion)
+
+    def execute(self, query, params=None):
+        medicion = self._iniciar(query)
+        inicio = time.perf_counter()
+        try:
+            return self._cursor.execute(query, params)
+        finally:
+            medicion.ejecucion = time.perf_counter() - inicio
+            if not getattr(self._cursor, "with_rows", True):
+                # INSERT, UPDATE, DELETE: las filas son las afectadas
+                medicion.filas = max(0, self._cursor.rowcount or 0)
+                self._terminar()
+
+    def executemany(self, query, filas):
+        medicion = self._iniciar(query)
+        inicio = time.perf_counter()
+        try:
+            return self._cursor.executemany(query, filas)
+        finally:
+            medicion.ejecucion = time.perf_counter() - inicio
+            medicion.filas = max(0, self._cursor.rowcount or 0)
+            self._terminar()
+
+    def _leer(self, filas, inicio, todas):
+        # filas: lista leida con fetchmany/fetchall; todas: ya no quedan filas por leer
+        medicion = self._actual
+        if medicion is None:
+            return
+        medicion.lectura += time.perf_counter() - inicio
+        medicion.filas += len(filas)
+        medicion.bytes += _bytes(filas)
+        if todas:
+            self._terminar()
+
+    def fetchone(self):
+        inicio = time.perf_counter()
+        fila = self._cursor.fetchone()
+        self._leer(() if fila is None else (fila,), inicio, fila is None)
+        return fila
+
+    def fetchmany(self, size=1):
+        inicio = time.perf_counter()
+        filas = self._cursor.fetchmany(size)
+        self._leer(filas, inicio, not filas)
+        return filas
+
+    def fetchall(self):
+        inicio = time.perf_counter()
+        filas = self._cursor.fetchall()
+        self._leer(filas, inicio, True)
+        return filas
+
+    def close(self):
+        self._terminar()
+        return self._cursor.close()
+
+    def __del__(self):
+        # Cursores que nunca se cerraron
+        try:
+            self._terminar()
+        except Exception:
+            pass
+
+def resumen(por="metodo", limite=None):
+    """Retorna [{metodo, [huella,] llamadas, total_ms, p50_ms...}] del mas costoso al menos costoso."""
+    with _lock:
+        if por == "metodo":
+            filas = [dict(metodo=metodo, **estadistica.dict()) for metodo, estadistica in _por_metodo.items()]
+        else:
+            filas = [dict(metodo=metodo, huella=sql, **estadistica.dict())
+                     for (metodo, sql), estadistica in _por_consulta.items()]
+    filas.sort(key=lambda fila: fila["total_ms"], reverse=True)
+    return filas[:limite] if limite else filas
+
+def reiniciar():
+    with _lock:
+        _por_metodo.clear()
+        _por_consulta.clear()
+
+def imprimirResumen(limite=15, salida=None):
+    salida = salida or sys.stdout
+    metodos = resumen("metodo", limite)
+    if not metodos:
+        return
+    print("\nConsultas por metodo (ms):", file=salida)
+    print(f"{'metodo':<48} {'llamadas':>8} {'total':>9} {'p50':>7} {'p95':>7} {'p99':>7} "
+          f"{'conexion':>8} {'filas':>9} {'KB':>8}", file=salida)
+    for fila in metodos:
+        print(f"{fila['metodo'][:48]:<48} {fila['llamadas']:>8} {fila['total_ms']:>9.1f} {fila['p50_ms']:>7.1f} "
+              f"{fila['p95_ms']:>7.1f} {fila['p99_ms']:>7.1f} {fila['conexion_ms']:>8.1f} {fila['filas']:>9} "
+              f"{fila['bytes'] / 1024:>8.1f}", file=salida)
+    print("\nConsultas mas costosas:", file=salida)
+    for fila in resumen("consulta", limite):
+        print(f"{fila['total_ms']:>9.1f} ms {fila['llamadas']:>6}x p95 {fila['p95_ms']:>7.1f}  "
+              f"{fila['metodo']}: {fila['huella'][:120]}", file=salida)
@@ -0,0 +1,54 @@
+-- Indices para las consultas de filtro y orden de los modulos.
+-- ERP_GP_logistics.sql solo define llaves primarias y foraneas; cada indice de
+-- aqui corresponde a consultas concretas de los archivos .py (indicadas arriba de
+-- cada uno). InnoDB agrega la llave primaria al final de cada indice secundario,
+-- por eso (fin_fecha) ya sirve para "ORDER BY fin_fecha DESC, fin_id DESC".
+-- La lista de consultas que se revisan con EXPLAIN esta en migrar.py.
+
+-- finanzas.py loadDataMain (pagina por fin_fecha, fin_id), loadQueryData (rango de fechas)
+-- gestion.py cargarDatosFinanzas sin filtro de tipo
+CREATE INDEX idx_finanza_fecha ON finanza (fin_fecha);
+
+-- gestion.py cargarDatosFinanzas con filtro de tipo (tipo fijo, rango y orden por fecha)
+CREATE INDEX idx_finanza_tipo_fecha ON finanza (fin_tipo, fin_fecha);
+
+-- agregados.py consultarResumenFinanzas y consultarTotalesTipo: indice cubriente,
+-- las sumas se calculan sin leer las filas de la tabla
+CREATE INDEX idx_finanza_fecha_tipo_monto ON finanza (fin_fecha, fin_tipo, fin_monto);
+
+-- recursoshumanos.py loadDataMain (pagina por usu_nombre, usu_id)
+CREATE INDEX idx_usuario_nombre ON usuario (usu_nombre);
+
+-- gestion.py cargarDatosRRHH (grafica de usuarios por modulo)
+CREATE INDEX idx_usuario_mod ON usuario (usu_mod);
+
+-- recursoshumanos.py loadDataEvaluation (evaluaciones de un usuario por fecha)
+CREATE INDEX idx_evaluacion_usuario_fecha ON evaluacion_desempeno (eva_usu_id, eva_fecha);
+
+-- logistica.py cargarPedidosEnProceso, gestion.py cargarDatosLogistica (grafica por estado)
+CREATE INDEX idx_logistica_estado ON logistica (log_estado);
+
+-- logistica.py generarReporteMensual, gestion.py cargarDatosLogistica (pagina por fecha de salida)
+CREATE INDEX idx_logistica_fecha_salida ON logistica (log_fecha_salida);
+
+-- logistica.py loadInventarioData y deleteAlmacenRecord (inventario de un almacen)
+CREATE INDEX idx_inventario_almacen_producto ON inventario (inv_alm_id, inv_producto);
+
+-- compras.py addCompra y editCompra (solicitudes aprobadas)
+CREATE INDEX idx_solicitud_estado_fecha ON solicitud_compra (sol_estado, sol_fecha);
+
+-- compras.py loadCompras, gestion.py cargarDatosCompras (pagina por fecha de compra)
+CREATE INDEX idx_compra_fecha ON compra (com_fecha_compra);
+
+-- ventas.py loadVentas, generarReporteMensual, gestion.py cargarDatosVentas (pagina por fecha)
+CREATE INDEX idx_venta_fecha ON venta (ven_fecha_venta);
+
+-- ventas.py loadCotizacionesPendientes y loadVentasCompletadas; tambien cubre la grafica
+-- de ventas por mes de gestion.py sin leer la tabla
+CREATE INDEX idx_venta_estado_fecha_monto ON venta (ven_estado, ven_fecha_venta, ven_monto_total);
+
+-- gestion.py cargarDatosMantenimiento (grafica por estado)
+CREATE INDEX idx_mantenimiento_estado ON mantenimiento (man_estado);
+
+-- mantenimiento.py loadDataIncidencia (incidencias de un usuario por fecha)
+CREATE INDEX idx_incidencia_usuario_fecha ON incidencia (inc_usu_id, inc_fecha);
@@ -0,0 +1,169 @@
+-- Control de cambios para refrescar las tablas sin releerlas completas.
+-- Cada tabla de negocio recibe:
+--   <prefijo>_version     numero de version de la fila, sube en cada UPDATE
+--   <prefijo>_modificado  momento del ultimo INSERT o UPDATE (TIMESTAMP(6), con
+--                         indice para "filas cambiadas desde ...")
+-- Los DELETE dejan una lapida en registro_borrado (tabla, llave, momento), asi
+-- sincronizacion.py puede pedir "lo que cambio o se borro desde el cursor X".
+-- Las lapidas viejas se purgan con: python3 sincronizacion.py --purgar
+--
+-- Las dos columnas y el indice se agregan en un solo ALTER por tabla (una sola
+-- reconstruccion de la tabla). Los triggers son de una sentencia, sin DELIMITER.
+
+CREATE TABLE IF NOT EXISTS registro_borrado (
+    bor_id BIGINT PRIMARY KEY AUTO_INCREMENT,
+    bor_tabla VARCHAR(64) NOT NULL,
+    bor_llave INT NOT NULL,
+    bor_fecha TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6),
+    INDEX idx_borrado_tabla_fecha (bor_tabla, bor_fecha)
+);
+
+-- usuario
+ALTER TABLE usuario
+    ADD COLUMN usu_version INT UNSIGNED NOT NULL DEFAULT 1,
+    ADD COLUMN usu_modificado TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6),
+    ADD INDEX idx_usuario_modificado (usu_modificado);
+CREATE TRIGGER trg_usuario_version BEFORE UPDATE ON usuario FOR EACH ROW
+    SET NEW.usu_version = OLD.usu_version + 1, NEW.usu_modificado = CURRENT_TIMESTAMP(6);
+CREATE TRIGGER trg_usuario_borrado AFTER DELETE ON usuario FOR EACH ROW
+    INSERT INTO registro_borrado (bor_tabla, bor_llave) VALUES ('usuario', OLD.usu_id);
+
+-- finanza
+ALTER TABLE finanza
+    ADD COLUMN fin_version INT UNSIGNED NOT NULL DEFAULT 1,
+    ADD COLUMN fin_modificado TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6),
+    ADD INDEX idx_finanza_modificado (fin_modificado);
+CREATE TRIGGER trg_finanza_version BEFORE UPDATE ON finanza FOR EACH ROW
+    SET NEW.fin_version = OLD.fin_version + 1, NEW.fin_modificado = CURRENT_TIMESTAMP(6);
+CREATE TRIGGER trg_finanza_borrado AFTER DELETE ON finanza FOR EACH ROW
+    INSERT INTO registro_borrado (bor_tabla, bor_llave) VALUES ('finanza', OLD.fin_id);
+
+-- recursoshumanos
+ALTER TABLE recursoshumanos
+    ADD COLUMN reh_version INT UNSIGNED NOT NULL DEFAULT 1,
+    ADD COLUMN reh_modificado TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6),
+    ADD INDEX idx_recursoshumanos_modificado (reh_modificado);
+CREATE TRIGGER trg_recursoshumanos_version BEFORE UPDATE ON recursoshumanos FOR EACH ROW
+    SET NEW.reh_version = OLD.reh_version + 1, NEW.reh_modificado = CURRENT_TIMESTAMP(6);
+CREATE TRIGGER trg_recursoshumanos_borrado AFTER DELETE ON recursoshumanos FOR EACH ROW
+    INSERT INTO registro_borrado (bor_tabla, bor_llave) VALUES ('recursoshumanos', OLD.reh_id);
+
+-- evaluacion_desempeno
+ALTER TABLE evaluacion_desempeno
+    ADD COLUMN eva_version INT UNSIGNED NOT NULL DEFAULT 1,
+    ADD COLUMN eva_modificado TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6),
+    ADD INDEX idx_evaluacion_desempeno_modificado (eva_modificado);
+CREATE TRIGGER trg_evaluacion_desempeno_version BEFORE UPDATE ON evaluacion_desempeno FOR EACH ROW
+    SET NEW.eva_version = OLD.eva_version + 1, NEW.eva_modificado = CURRENT_TIMESTAMP(6);
+CREATE TRIGGER trg_evaluacion_desempeno_borrado AFTER DELETE ON evaluacion_desempeno FOR EACH ROW
+    INSERT INTO registro_borrado (bor_tabla, bor_llave) VALUES ('evaluacion_desempeno', OLD.eva_id);
+
+-- logistica
+ALTER TABLE logistica
+    ADD COLUMN log_version INT UNSIGNED NOT NULL DEFAULT 1,
+    ADD COLUMN log_modificado TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6),
+    ADD INDEX idx_logistica_modificado (log_modificado);
+CREATE TRIGGER trg_logistica_version BEFORE UPDATE ON logistica FOR EACH ROW
+    SET NEW.log_version = OLD.log_version + 1, NEW.log_modificado = CURRENT_TIMESTAMP(6);
+CREATE TRIGGER trg_logistica_borrado AFTER DELETE ON logistica FOR EACH ROW
+    INSERT INTO registro_borrado (bor_tabla, bor_llave) VALUES ('logistica', OLD.log_id);
+
+-- almacen
+ALTER TABLE almacen
+    ADD COLUMN alm_version INT UNSIGNED NOT NULL DEFAULT 1,
+    ADD COLUMN alm_modificado TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6),
+    ADD INDEX idx_almacen_modificado (alm_modificado);
+CREATE TRIGGER trg_almacen_version BEFORE UPDATE ON almacen FOR EACH ROW
+    SET NEW.alm_version = OLD.alm_version + 1, NEW.alm_modificado = CURRENT_TIMESTAMP(6);
+CREATE TRIGGER trg_almacen_borrado AFTER DELETE ON almacen FOR EACH ROW
+    INSERT INTO registro_borrado (bor_tabla, bor_llave) VALUES ('almacen', OLD.alm_id);
+
+-- inventario
+ALTER TABLE inventario
+    ADD COLUMN inv_version INT UNSIGNED NOT NULL DEFAULT 1,
+    ADD COLUMN inv_modificado TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6),
+    ADD INDEX idx_inventario_modificado (inv_modificado);
+CREATE TRIGGER trg_inventario_version BEFORE UPDATE ON inventario FOR EACH ROW
+    SET NEW.inv_version = OLD.inv_version + 1, NEW.inv_modificado = CURRENT_TIMESTAMP(6);
+CREATE TRIGGER trg_inventario_borrado AFTER DELETE ON inventario FOR EACH ROW
+    INSERT INTO registro_borrado (bor_tabla, bor_llave) VALUES ('inventario', OLD.inv_id);
+
+-- solicitud_compra
+ALTER TABLE solicitud_compra
+    ADD COLUMN sol_version INT UNSIGNED NOT NULL DEFAULT 1,
+    ADD COLUMN sol_modificado TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6),
+    ADD INDEX idx_solicitud_compra_modificado (sol_modificado);
+CREATE TRIGGER trg_solicitud_compra_version BEFORE UPDATE ON solicitud_compra FOR EACH ROW
+    SET NEW.sol_version = OLD.sol_version + 1, NEW.sol_modificado = CURRENT_TIMESTAMP(6);
+CREATE TRIGGER trg_solicitud_compra_borrado AFTER DELETE ON solicitud_compra FOR EACH ROW
+    INSERT INTO registro_borrado (bor_tabla, bor_llave) VALUES ('solicitud_compra', OLD.sol_id);
+
+-- compra
+ALTER TABLE compra
+    ADD COLUMN com_version INT UNSIGNED NOT NULL DEFAULT 1,
+    ADD COLUMN com_modificado TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6),
+    ADD INDEX idx_compra_modificado (com_modificado);
+CREATE TRIGGER trg_compra_version BEFORE UPDATE ON compra FOR EACH ROW
+    SET NEW.com_version = OLD.com_version + 1, NEW.com_modificado = CURRENT_TIMESTAMP(6);
+CREATE TRIGGER trg_compra_borrado AFTER DELETE ON compra FOR EACH ROW
+    INSERT INTO registro_borrado (bor_tabla, bor_llave) VALUES ('compra', OLD.com_id);
+
+-- venta
+ALTER TABLE venta
+    ADD COLUMN ven_version INT UNSIGNED NOT NULL DEFAULT 1,
+    ADD COLUMN ven_modificado TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6),
+    ADD INDEX idx_venta_modificado (ven_modificado);
+CREATE TRIGGER trg_venta_version BEFORE UPDATE ON venta FOR EACH ROW
+    SET NEW.ven_version = OLD.ven_version + 1, NEW.ven_modificado = CURRENT_TIMESTAMP(6);
+CREATE TRIGGER trg_venta_borrado AFTER DELETE ON venta FOR EACH ROW
+    INSERT INTO registro_borrado (bor_tabla, bor_llave) VALUES ('venta', OLD.ven_id);
+
+-- mantenimiento
+ALTER TABLE mantenimiento
+    ADD COLUMN man_version INT UNSIGNED NOT NULL DEFAULT 1,
+    ADD COLUMN man_modificado TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6),
+    ADD INDEX idx_mantenimiento_modificado (man_modificado);
+CREATE TRIGGER trg_mantenimiento_version BEFORE UPDATE ON mantenimiento FOR EACH ROW
+    SET NEW.man_version = OLD.man_version + 1, NEW.man_modificado = CURRENT_TIMESTAMP(6);
+CREATE TRIGGER trg_mantenimiento_borrado AFTER DELETE ON mantenimiento FOR EACH ROW
+    INSERT INTO registro_borrado (bor_tabla, bor_llave) VALUES ('mantenimiento', OLD.man_id);
+
+-- incidencia
+ALTER TABLE incidencia
+    ADD COLUMN inc_version INT UNSIGNED NOT NULL DEFAULT 1,
+    ADD COLUMN inc_modificado TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6),
+    ADD INDEX idx_incidencia_modificado (inc_modificado);
+CREATE TRIGGER trg_incidencia_version BEFORE UPDATE ON incidencia FOR EACH ROW
+    SET NEW.inc_version = OLD.inc_version + 1, NEW.inc_modificado = CURRENT_TIMESTAMP(6);
+CREATE TRIGGER trg_incidencia_borrado AFTER DELETE ON incidencia FOR EACH ROW
+    INSERT INTO registro_borrado (bor_tabla, bor_llave) VALUES ('incidencia', OLD.inc_id);
+
+-- detalle_venta
+ALTER TABLE detalle_venta
+    ADD COLUMN dv_version INT UNSIGNED NOT NULL DEFAULT 1,
+    ADD COLUMN dv_modificado TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6),
+    ADD INDEX idx_detalle_venta_modificado (dv_modificado);
+CREATE TRIGGER trg_detalle_venta_version BEFORE UPDATE ON detalle_venta FOR EACH ROW
+    SET NEW.dv_version = OLD.dv_version + 1, NEW.dv_modificado = CURRENT_TIMESTAMP(6);
+CREATE TRIGGER trg_detalle_venta_borrado AFTER DELETE ON detalle_venta FOR EACH ROW
+    INSERT INTO registro_borrado (bor_tabla, bor_llave) VALUES ('detalle_venta', OLD.dv_id);
+
+-- detalle_compra
+ALTER TABLE detalle_compra
+    ADD COLUMN dc_version INT UNSIGNED NOT NULL DEFAULT 1,
+    ADD COLUMN dc_modificado TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6),
+    ADD INDEX idx_detalle_compra_modificado (dc_modificado);
+CREATE TRIGGER trg_detalle_compra_version BEFORE UPDATE ON detalle_compra FOR EACH ROW
+    SET NEW.dc_version = OLD.dc_version + 1, NEW.dc_modificado = CURRENT_TIMESTAMP(6);
+CREATE TRIGGER trg_detalle_compra_borrado AFTER DELETE ON detalle_compra FOR EACH ROW
+    INSERT INTO registro_borrado (bor_tabla, bor_llave) VALUES ('detalle_compra', OLD.dc_id);
+
+-- detalle_solicitud
+ALTER TABLE detalle_solicitud
+    ADD COLUMN ds_version INT UNSIGNED NOT NULL DEFAULT 1,
+    ADD COLUMN ds_modificado TIMESTAMP(6) NOT NULL DEFAULT CURRENT_TIMESTAMP(6),
+    ADD INDEX idx_detalle_solicitud_modificado (ds_modificado);
+CREATE TRIGGER trg_detalle_solicitud_version BEFORE UPDATE ON detalle_solicitud FOR EACH ROW
+    SET NEW.ds_version = OLD.ds_version + 1, NEW.ds_modificado = CURRENT_TIMESTAMP(6);
+CREATE TRIGGER trg_detalle_solicitud_borrado AFTER DELETE ON detalle_solicitud FOR EACH ROW
+    INSERT INTO registro_borrado (bor_tabla, bor_llave) VALUES ('detalle_solicitud', OLD.ds_id);
@@ -0,0 +1,17 @@
+-- Indices para ordenar las tablas paginadas por columna (click en el encabezado).
+-- tablas.TablaModel ordena con "ORDER BY campo, llave" en la misma direccion;
+-- como InnoDB agrega la llave primaria a cada indice secundario, un indice sobre
+-- campo basta para que MySQL recorra el indice en lugar de ordenar la tabla.
+-- Las demas columnas ordenables ya tienen indice (001, llaves foraneas o UNIQUE).
+
+-- finanzas.py FinanzasTableModel, columna Monto
+CREATE INDEX idx_finanza_monto ON finanza (fin_monto);
+
+-- compras.py CompraTableModel, columna Monto Total
+CREATE INDEX idx_compra_monto ON compra (com_monto_total);
+
+-- compras.py CompraTableModel, filtro por Estado con el orden por fecha de la ventana
+CREATE INDEX idx_compra_estado_fecha ON compra (com_estado, com_fecha_compra);
+
+-- ventas.py VentaTableModel, columna Monto Total
+CREATE INDEX idx_venta_monto ON venta (ven_monto_total);
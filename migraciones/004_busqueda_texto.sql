@@ -0,0 +1,17 @@
+-- Indices FULLTEXT para la busqueda de texto (busqueda.py).
+-- Los filtros de texto de las tablas y la busqueda de GestionWindow usan
+-- MATCH(columna) AGAINST (... IN BOOLEAN MODE) en lugar de LIKE '%texto%', que
+-- no puede usar un indice. La columna de cada indice debe coincidir con
+-- busqueda.CAMPOS_TEXTO.
+
+CREATE FULLTEXT INDEX ft_finanza_desc ON finanza (fin_desc);
+
+CREATE FULLTEXT INDEX ft_solicitud_descripcion ON solicitud_compra (sol_descripcion);
+
+CREATE FULLTEXT INDEX ft_mantenimiento_descripcion ON mantenimiento (man_descripcion);
+
+CREATE FULLTEXT INDEX ft_incidencia_descripcion ON incidencia (inc_descripcion);
+
+CREATE FULLTEXT INDEX ft_rrhh_observaciones ON recursoshumanos (reh_observaciones);
+
+CREATE FULLTEXT INDEX ft_evaluacion_comentarios ON evaluacion_desempeno (eva_comentarios);
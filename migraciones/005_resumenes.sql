@@ -0,0 +1,143 @@
+-- Tablas de resumen para las graficas de GestionWindow (resumenes.py).
+-- Cada resumen guarda el monto y el numero de filas de un grupo (mes, tipo,
+-- estado) y se mantiene al dia con triggers sobre su tabla de origen: el INSERT
+-- suma la fila, el DELETE la resta y el UPDATE resta la fila anterior y suma la
+-- nueva (en el mismo INSERT ... ON DUPLICATE KEY UPDATE, que tambien sirve si el
+-- grupo no cambio). Los triggers son de una sentencia, sin DELIMITER; conviven
+-- con los de 002_control_cambios.sql (MySQL 5.7.2+ permite varios por evento).
+--
+-- Al final se llenan los resumenes con los datos existentes. El DELETE previo
+-- permite volver a correr el archivo si se interrumpio a la mitad; despues se
+-- pueden recalcular con: python3 resumenes.py --reconstruir
+
+-- finanza
+CREATE TABLE IF NOT EXISTS resumen_finanza_mes (
+    rfm_mes CHAR(7) NOT NULL,
+    rfm_tipo VARCHAR(16) NOT NULL,
+    rfm_monto DECIMAL(15, 2) NOT NULL,
+    rfm_num INT NOT NULL,
+    PRIMARY KEY (rfm_mes, rfm_tipo)
+);
+
+CREATE TRIGGER trg_finanza_resumen_alta AFTER INSERT ON finanza FOR EACH ROW
+    INSERT INTO resumen_finanza_mes (rfm_mes, rfm_tipo, rfm_monto, rfm_num)
+    VALUES (DATE_FORMAT(NEW.fin_fecha, '%Y-%m'), NEW.fin_tipo, NEW.fin_monto, 1)
+    ON DUPLICATE KEY UPDATE rfm_monto = rfm_monto + VALUES(rfm_monto), rfm_num = rfm_num + VALUES(rfm_num);
+CREATE TRIGGER trg_finanza_resumen_cambio AFTER UPDATE ON finanza FOR EACH ROW
+    INSERT INTO resumen_finanza_mes (rfm_mes, rfm_tipo, rfm_monto, rfm_num)
+    VALUES (DATE_FORMAT(OLD.fin_fecha, '%Y-%m'), OLD.fin_tipo, -OLD.fin_monto, -1),
+           (DATE_FORMAT(NEW.fin_fecha, '%Y-%m'), NEW.fin_tipo, NEW.fin_monto, 1)
+    ON DUPLICATE KEY UPDATE rfm_monto = rfm_monto + VALUES(rfm_monto), rfm_num = rfm_num + VALUES(rfm_num);
+CREATE TRIGGER trg_finanza_resumen_baja AFTER DELETE ON finanza FOR EACH ROW
+    INSERT INTO resumen_finanza_mes (rfm_mes, rfm_tipo, rfm_monto, rfm_num)
+    VALUES (DATE_FORMAT(OLD.fin_fecha, '%Y-%m'), OLD.fin_tipo, -OLD.fin_monto, -1)
+    ON DUPLICATE KEY UPDATE rfm_monto = rfm_monto + VALUES(rfm_monto), rfm_num = rfm_num + VALUES(rfm_num);
+
+-- compra
+CREATE TABLE IF NOT EXISTS resumen_compra_mes (
+    rcm_mes CHAR(7) NOT NULL,
+    rcm_monto DECIMAL(15, 2) NOT NULL,
+    rcm_num INT NOT NULL,
+    PRIMARY KEY (rcm_mes)
+);
+
+CREATE TRIGGER trg_compra_resumen_alta AFTER INSERT ON compra FOR EACH ROW
+    INSERT INTO resumen_compra_mes (rcm_mes, rcm_monto, rcm_num)
+    VALUES (DATE_FORMAT(NEW.com_fecha_compra, '%Y-%m'), NEW.com_monto_total, 1)
+    ON DUPLICATE KEY UPDATE rcm_monto = rcm_monto + VALUES(rcm_monto), rcm_num = rcm_num + VALUES(rcm_num);
+CREATE TRIGGER trg_compra_resumen_cambio AFTER UPDATE ON compra FOR EACH ROW
+    INSERT INTO resumen_compra_mes (rcm_mes, rcm_monto, rcm_num)
+    VALUES (DATE_FORMAT(OLD.com_fecha_compra, '%Y-%m'), -OLD.com_monto_total, -1),
+           (DATE_FORMAT(NEW.com_fecha_compra, '%Y-%m'), NEW.com_monto_total, 1)
+    ON DUPLICATE KEY UPDATE rcm_monto = rcm_monto + VALUES(rcm_monto), rcm_num = rcm_num + VALUES(rcm_num);
+CREATE TRIGGER trg_compra_resumen_baja AFTER DELETE ON compra FOR EACH ROW
+    INSERT INTO resumen_compra_mes (rcm_mes, rcm_monto, rcm_num)
+    VALUES (DATE_FORMAT(OLD.com_fecha_compra, '%Y-%m'), -OLD.com_monto_total, -1)
+    ON DUPLICATE KEY UPDATE rcm_monto = rcm_monto + VALUES(rcm_monto), rcm_num = rcm_num + VALUES(rcm_num);
+
+-- venta
+CREATE TABLE IF NOT EXISTS resumen_venta_mes (
+    rvm_mes CHAR(7) NOT NULL,
+    rvm_estado VARCHAR(16) NOT NULL,
+    rvm_monto DECIMAL(15, 2) NOT NULL,
+    rvm_num INT NOT NULL,
+    PRIMARY KEY (rvm_mes, rvm_estado)
+);
+
+CREATE TRIGGER trg_venta_resumen_alta AFTER INSERT ON venta FOR EACH ROW
+    INSERT INTO resumen_venta_mes (rvm_mes, rvm_estado, rvm_monto, rvm_num)
+    VALUES (DATE_FORMAT(NEW.ven_fecha_venta, '%Y-%m'), NEW.ven_estado, NEW.ven_monto_total, 1)
+    ON DUPLICATE KEY UPDATE rvm_monto = rvm_monto + VALUES(rvm_monto), rvm_num = rvm_num + VALUES(rvm_num);
+CREATE TRIGGER trg_venta_resumen_cambio AFTER UPDATE ON venta FOR EACH ROW
+    INSERT INTO resumen_venta_mes (rvm_mes, rvm_estado, rvm_monto, rvm_num)
+    VALUES (DATE_FORMAT(OLD.ven_fecha_venta, '%Y-%m'), OLD.ven_estado, -OLD.ven_monto_total, -1),
+           (DATE_FORMAT(NEW.ven_fecha_venta, '%Y-%m'), NEW.ven_estado, NEW.ven_monto_total, 1)
+    ON DUPLICATE KEY UPDATE rvm_monto = rvm_monto + VALUES(rvm_monto), rvm_num = rvm_num + VALUES(rvm_num);
+CREATE TRIGGER trg_venta_resumen_baja AFTER DELETE ON venta FOR EACH ROW
+    INSERT INTO resumen_venta_mes (rvm_mes, rvm_estado, rvm_monto, rvm_num)
+    VALUES (DATE_FORMAT(OLD.ven_fecha_venta, '%Y-%m'), OLD.ven_estado, -OLD.ven_monto_total, -1)
+    ON DUPLICATE KEY UPDATE rvm_monto = rvm_monto + VALUES(rvm_monto), rvm_num = rvm_num + VALUES(rvm_num);
+
+-- logistica
+CREATE TABLE IF NOT EXISTS resumen_logistica_estado (
+    rle_estado VARCHAR(16) NOT NULL,
+    rle_num INT NOT NULL,
+    PRIMARY KEY (rle_estado)
+);
+
+CREATE TRIGGER trg_logistica_resumen_alta AFTER INSERT ON logistica FOR EACH ROW
+    INSERT INTO resumen_logistica_estado (rle_estado, rle_num)
+    VALUES (NEW.log_estado, 1)
+    ON DUPLICATE KEY UPDATE rle_num = rle_num + VALUES(rle_num);
+CREATE TRIGGER trg_logistica_resumen_cambio AFTER UPDATE ON logistica FOR EACH ROW
+    INSERT INTO resumen_logistica_estado (rle_estado, rle_num)
+    VALUES (OLD.log_estado, -1),
+           (NEW.log_estado, 1)
+    ON DUPLICATE KEY UPDATE rle_num = rle_num + VALUES(rle_num);
+CREATE TRIGGER trg_logistica_resumen_baja AFTER DELETE ON logistica FOR EACH ROW
+    INSERT INTO resumen_logistica_estado (rle_estado, rle_num)
+    VALUES (OLD.log_estado, -1)
+    ON DUPLICATE KEY UPDATE rle_num = rle_num + VALUES(rle_num);
+
+-- mantenimiento
+CREATE TABLE IF NOT EXISTS resumen_mantenimiento_estado (
+    rme_estado VARCHAR(16) NOT NULL,
+    rme_num INT NOT NULL,
+    PRIMARY KEY (rme_estado)
+);
+
+CREATE TRIGGER trg_mantenimiento_resumen_alta AFTER INSERT ON mantenimiento FOR EACH ROW
+    INSERT INTO resumen_mantenimiento_estado (rme_estado, rme_num)
+    VALUES (NEW.man_estado, 1)
+    ON DUPLICATE KEY UPDATE rme_num = rme_num + VALUES(rme_num);
+CREATE TRIGGER trg_mantenimiento_resumen_cambio AFTER UPDATE ON mantenimiento FOR EACH ROW
+    INSERT INTO resumen_mantenimiento_estado (rme_estado, rme_num)
+    VALUES (OLD.man_estado, -1),
+           (NEW.man_estado, 1)
+    ON DUPLICATE KEY UPDATE rme_num = rme_num + VALUES(rme_num);
+CREATE TRIGGER trg_mantenimiento_resumen_baja AFTER DELETE ON mantenimiento FOR EACH ROW
+    INSERT INTO resumen_mantenimiento_estado (rme_estado, rme_num)
+    VALUES (OLD.man_estado, -1)
+    ON DUPLICATE KEY UPDATE rme_num = rme_num + VALUES(rme_num);
+
+-- Datos existentes
+DELETE FROM resumen_finanza_mes;
+INSERT INTO resumen_finanza_mes (rfm_mes, rfm_tipo, rfm_monto, rfm_num)
+    SELECT DATE_FORMAT(fin_fecha, '%Y-%m'), fin_tipo, SUM(fin_monto), COUNT(*) FROM finanza
+    GROUP BY 1, 2;
+DELETE FROM resumen_compra_mes;
+INSERT INTO resumen_compra_mes (rcm_mes, rcm_monto, rcm_num)
+    SELECT DATE_FORMAT(com_fecha_compra, '%Y-%m'), SUM(com_monto_total), COUNT(*) FROM compra
+    GROUP BY 1;
+DELETE FROM resumen_venta_mes;
+INSERT INTO resumen_venta_mes (rvm_mes, rvm_estado, rvm_monto, rvm_num)
+    SELECT DATE_FORMAT(ven_fecha_venta, '%Y-%m'), ven_estado, SUM(ven_monto_total), COUNT(*) FROM venta
+    GROUP BY 1, 2;
+DELETE FROM resumen_logistica_estado;
+INSERT INTO resumen_logistica_estado (rle_estado, rle_num)
+    SELECT log_estado, COUNT(*) FROM logistica
+    GROUP BY 1;
+DELETE FROM resumen_mantenimiento_estado;
+INSERT INTO resumen_mantenimiento_estado (rme_estado, rme_num)
+    SELECT man_estado, COUNT(*) FROM mantenimiento
+    GROUP BY 1;
@@ -0,0 +1,25 @@
+-- Indices para leer por paginas las tablas que antes se cargaban completas.
+-- Cada ConsultaPaginada ordena con "ORDER BY campo, llave"; como InnoDB agrega la
+-- llave primaria a cada indice secundario, un indice sobre campo basta para que
+-- la primera pagina y las siguientes (WHERE campo < ...) recorran el indice en
+-- lugar de ordenar la tabla. Las consultas ordenadas solo por la llave primaria
+-- (detalle_*, inventario en gestion) no necesitan indice nuevo.
+
+-- compras.py loadSolicitudes y gestion.py CONSULTA_SOLICITUDES, orden por fecha
+CREATE INDEX idx_solicitud_fecha ON solicitud_compra (sol_fecha);
+
+-- mantenimiento.py loadDataMain, orden por costo
+CREATE INDEX idx_mantenimiento_costo ON mantenimiento (man_costo);
+
+-- gestion.py CONSULTA_MANTENIMIENTO, orden por fecha programada
+CREATE INDEX idx_mantenimiento_fecha ON mantenimiento (man_fecha_programada);
+
+-- gestion.py CONSULTA_INCIDENCIAS, orden por fecha
+CREATE INDEX idx_incidencia_fecha ON incidencia (inc_fecha);
+
+-- recursoshumanos.py loadRHData, orden por estado y usuario
+CREATE INDEX idx_recursoshumanos_estado_usuario ON recursoshumanos (reh_estado, reh_usu_id);
+
+-- catalogo.py leerInventario: todo el catalogo ordenado por producto; el indice
+-- cubre las columnas que se leen y MySQL no necesita tocar la tabla
+CREATE INDEX idx_inventario_catalogo ON inventario (inv_producto, inv_alm_id, inv_cantidad);
@@ -0,0 +1,376 @@
+# Migraciones versionadas de la base de datos.
+# Cada archivo de migraciones/ se llama NNN_descripcion.sql y se aplica una sola
+# vez, en orden de version; las versiones aplicadas se guardan en la tabla
+# schema_migracion junto con un checksum del archivo.
+#
+# Uso:
+#   python3 migrar.py               -> aplica las migraciones pendientes
+#   python3 migrar.py --estado      -> muestra que migraciones estan aplicadas
+#   python3 migrar.py --verificar   -> corre EXPLAIN sobre las consultas de los modulos y
+#                                      termina con error si alguna recorre toda una tabla
+#                                      (salvo los catalogos chicos de CATALOGOS)
+#
+# La verificacion tiene sentido sobre una base con muchos datos: con tablas de
+# pocas filas MySQL prefiere leer la tabla completa aunque exista el indice, por
+# eso solo se reportan los recorridos completos que estiman --min-filas o mas.
+import argparse
+import hashlib
+import os
+import re
+import sys
+import mysql.connector
+from conexion import obtenerConexion
+from paginacion import TAMANO_PAGINA
+from agregados import consultarResumenFinanzas, consultarResumenMensual, consultarTotalesTipo
+from sincronizacion import TABLAS, tablaConsulta
+from busqueda import CAMPOS_TEXTO, condicionTexto, consultaBusqueda
+from resumenes import consultarComprasMes, consultarVentasMes, consultarEstados
+
+DIRECTORIO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "migraciones")
+NOMBRE_LOCK = "gp_logistics_migraciones"
+ER_DUP_KEYNAME = 1061
+ER_DUP_FIELDNAME = 1060
+ER_TRG_ALREADY_EXISTS = 1359
+# Errores de objetos que ya existen: una ejecucion anterior se interrumpio a la mitad
+YA_EXISTE = (ER_DUP_KEYNAME, ER_DUP_FIELDNAME, ER_TRG_ALREADY_EXISTS)
+# Catalogos chicos que las ventanas leen completos: tabla -> filas maximas esperadas.
+# Con generar_datos.py a escala 1 tienen 100, 2000 y 10000 filas. Recorrer uno de
+# ellos completo se reporta sin fallar mientras EXPLAIN estime a lo mas ese numero
+# de filas; cualquier otra tabla se lee por paginas o con un filtro indexado.
+CATALOGOS = {
+    "almacen": 1000,
+    "usuario": 10000,
+    "evaluacion_desempeno": 50000,
+}
+
+def listarMigraciones():
+    """Retorna [(version, nombre, ruta)] de los archivos de migraciones/ ordenados por version."""
+    migraciones = []
+    for nombre in os.listdir(DIRECTORIO):
+        coincidencia = re.match(r"^(\d+)_.+\.sql$", nombre)
+        if coincidencia:
+            migraciones.append((int(coincidencia.group(1)), nombre, os.path.join(DIRECTORIO, nombre)))
+    migraciones.sort()
+    versiones = [m[0] for m in migraciones]
+    if len(versiones) != len(set(versiones)):
+        raise ValueError("Hay dos archivos de migracion con la misma version")
+    return migraciones
+
+def leerSentencias(texto):
+    """Separa un script .sql en sentencias, respetando DELIMITER para triggers y procedimientos."""
+    sentencias = []
+    actual = []
+    delimitador = ";"
+    for linea in texto.splitlines():
+        limpia = linea.strip()
+        if not actual and (not limpia or limpia.startswith("--") or limpia.startswith("#")):
+            continue
+        if limpia.upper().startswith("DELIMITER "):
+            delimitador = limpia.split(None, 1)[1]
+            continue
+        actual.append(linea)
+        if limpia.endswith(delimitador):
+            sentencia = "\n".join(actual).rstrip()[:-len(delimitador)].strip()
+            if sentencia:
+                sentencias.append(sentencia)
+            actual = []
+    resto = "\n".join(actual).strip()
+    if resto:
+        sentencias.append(resto)
+    return sentencias
+
+def _checksum(texto):
+    return hashlib.sha1(texto.encode("utf-8")).hexdigest()
+
+def _crearTablaVersiones(cursor):
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS schema_migracion (
+            mig_version INT PRIMARY KEY,
+            mig_nombre VARCHAR(255) NOT NULL,
+            mig_checksum CHAR(40) NOT NULL,
+            mig_fecha_aplicada DATETIME NOT NULL DEFAULT CURRENT_TIMESTAMP
+        )
+    """)
+
+def versionesAplicadas(cursor):
+    """Retorna {version: (nombre, checksum)} de las migraciones ya aplicadas."""
+    _crearTablaVersiones(cursor)
+    cursor.execute("SELECT mig_version, mig_nombre, mig_checksum FROM schema_migracion")
+    return {version: (nombre, checksum) for version, nombre, checksum in cursor.fetchall()}
+
+def aplicarMigraciones():
+    """Aplica las migraciones pendientes y retorna la lista de nombres aplicados."""
+    conexion = obtenerConexion()
+    aplicadas = []
+    try:
+        cursor = conexion.cursor()
+        # Evita que dos instancias apliquen la misma migracion al mismo tiempo
+        cursor.execute("SELECT GET_LOCK(%s, 30)", (NOMBRE_LOCK,))
+        if cursor.fetchone()[0] != 1:
+            raise RuntimeError("Otra instancia esta aplicando migraciones")
+        try:
+            registradas = versionesAplicadas(cursor)
+            for version, nombre, ruta in listarMigraciones():
+                with open(ruta, encoding="utf-8") as archivo:
+                    texto = archivo.read()
+                if version in registradas:
+                    if registradas[version][1] != _checksum(texto):
+                        print(f"Aviso: {nombre} cambio despues de aplicarse, no se vuelve a ejecutar")
+                    continue
+
+                print(f"Aplicando {nombre}...")
+                for sentencia in leerSentencias(texto):
+                    try:
+                        cursor.execute(sentencia)
+                    except mysql.connector.Error as err:
+                        # Las sentencias DDL hacen commit implicito; si una ejecucion anterior
+                        # se interrumpio a la mitad, los indices, columnas y triggers que ya
+                        # existen se saltan
+                        if err.errno not in YA_EXISTE:
+                            raise
+                        print(f"  (ya existia) {err.msg}")
+                    if cursor.with_rows:
+                        cursor.fetchall()
+                cursor.execute(
+                    "INSERT INTO schema_migracion (mig_version, mig_nombre, mig_checksum) VALUES (%s, %s, %s)",
+                    (version, nombre, _checksum(texto)))
+                conexion.commit()
+                aplicadas.append(nombre)
+        finally:
+            cursor.execute("SELECT RELEASE_LOCK(%s)", (NOMBRE_LOCK,))
+            cursor.fetchall()
+            cursor.close()
+    finally:
+        conexion.close()
+    return aplicadas
+
+def mostrarEstado():
+    conexion = obtenerConexion()
+    try:
+        cursor = conexion.cursor()
+        registradas = versionesAplicadas(cursor)
+        cursor.close()
+    finally:
+        conexion.close()
+    for version, nombre, _ in listarMigraciones():
+        print(f"{'aplicada ' if version in registradas else 'pendiente'}  {nombre}")
+
+class _CursorCaptura:
+    # Cursor falso que solo guarda la consulta; asi la verificacion usa exactamente
+    # el SQL que generan las funciones de agregados.py, resumenes.py y catalogo.py
+    def __init__(self):
+        self.consultas = []
+
+    def execute(self, query, params=()):
+        self.consultas.append((query, tuple(params)))
+
+    def fetchall(self):
+        return []
+
+    def fetchone(self):
+        return (None, None)
+
+def _capturar(funcion, *args):
+    cursor = _CursorCaptura()
+    funcion(cursor, *args)
+    return cursor.consultas
+
+def _paginas(consulta, llave):
+    """Retorna la primera pagina y la pagina que sigue a llave de una ConsultaPaginada."""
+    return [consulta.sql(None, TAMANO_PAGINA), consulta.sql(llave, TAMANO_PAGINA)]
+
+def consultasVerificadas():
+    """Retorna [(nombre, sql, params, limite)] de las consultas de lectura de los modulos.
+
+    limite es el maximo de filas de CATALOGOS para las listas completas de un catalogo
+    chico (un recorrido completo de hasta limite filas no hace fallar la verificacion);
+    None en las demas consultas.
+    """
+    consultas = []
+
+    def agregar(nombre, sql, params=(), limite=None):
+        consultas.append((nombre, sql, tuple(params), limite))
+
+    def agregarPaginada(nombre, consulta, llave):
+        for i, (sql, params) in enumerate(_paginas(consulta, llave)):
+            agregar(f"{nombre} (pagina {i + 1})", sql, params)
+
+    def agregarLista(nombre, consulta):
+        # Listas que se cargan completas con cargarLista (sin LIMIT)
+        sql, params = consulta.sql(None, None)
+        agregar(nombre, sql, params, CATALOGOS.get(tablaConsulta(consulta)))
+
+    # Las ventanas se importan aqui y no al inicio: aplicar migraciones no necesita PyQt ni matplotlib
+    import compras, finanzas, gestion, login, logistica, mantenimiento, recursoshumanos, ventas
+    from catalogo import leerInventario
+
+    inicio, fin = "2024-01-01", "2024-01-31"
+
+    # Finanzas
+    agregarPaginada("finanzas.loadDataMain", finanzas.CONSULTA_FINANZAS, ("2024-06-01", 1000))
+    agregar("finanzas.loadQueryData", finanzas.SQL_RANGO_FECHAS, (inicio, fin))
+    for sql, params in _capturar(consultarResumenFinanzas):
+        agregar("agregados.consultarResumenFinanzas", sql, params)
+    for sql, params in _capturar(consultarResumenFinanzas, inicio, fin):
+        agregar("agregados.consultarResumenFinanzas (rango)", sql, params)
+    # Resumenes (necesitan 005_resumenes.sql): un rango con meses completos y orillas incompletas
+    for sql, params in _capturar(consultarResumenMensual, "2024-01-15", "2024-06-10"):
+        agregar("agregados.consultarResumenMensual", sql, params)
+    for sql, params in _capturar(consultarTotalesTipo, "ingreso", inicio, fin):
+        agregar("agregados.consultarTotalesTipo", sql, params)
+    agregarPaginada("gestion.cargarDatosFinanzas", gestion.consultaFinanzas(inicio, fin, "Todos"),
+                    ("2024-01-15", 1000))
+    agregarPaginada("gestion.cargarDatosFinanzas (ingresos)", gestion.consultaFinanzas(inicio, fin, "Ingresos"),
+                    ("2024-01-15", 1000))
+
+    # Recursos humanos
+    agregarPaginada("recursoshumanos.loadDataMain", recursoshumanos.CONSULTA_USUARIOS, ("M", 1000))
+    agregarLista("recursoshumanos.loadDataEvaluation", recursoshumanos.consultaEvaluaciones(1))
+    agregarPaginada("recursoshumanos.loadRHData", recursoshumanos.CONSULTA_RRHH, ("Activo", 5, 1000))
+    agregarPaginada("gestion.cargarDatosRRHH", gestion.CONSULTA_USUARIOS, (1000,))
+    agregarPaginada("gestion.cargarDatosRRHH (rrhh)", gestion.CONSULTA_RRHH, (1000,))
+    agregarLista("gestion.cargarDatosRRHH (evaluaciones)", gestion.CONSULTA_EVALUACIONES)
+    agregar("gestion.cargarDatosRRHH (grafica)", gestion.SQL_GRAFICA_RRHH)
+    agregar("login.login", login.SQL_CONTRASENA, ("correo@ejemplo.com",))
+    agregar("login.login (usuario)", login.SQL_USUARIO, ("correo@ejemplo.com", "contra"))
+
+    # Logistica
+    agregarPaginada("logistica.loadDataMain", logistica.CONSULTA_LOGISTICA, (5, 1000))
+    agregarLista("logistica.loadInventarioData", logistica.consultaInventario(1))
+    agregarLista("logistica.loadAlmacenData", logistica.CONSULTA_ALMACENES)
+    agregar("logistica.deleteAlmacenRecord", logistica.SQL_INVENTARIO_ALMACEN, (1,))
+    agregar("logistica.cargarPedidosEnProceso", logistica.SQL_PEDIDOS_EN_PROCESO)
+    agregar("logistica.generarReporteMensual", logistica.SQL_REPORTE_MENSUAL, (inicio, fin))
+    agregarPaginada("gestion.cargarDatosLogistica", gestion.CONSULTA_LOGISTICA, ("2024-01-15", 1000))
+    agregarLista("gestion.cargarDatosLogistica (almacenes)", gestion.CONSULTA_ALMACENES)
+    agregarPaginada("gestion.cargarDatosLogistica (inventario)", gestion.CONSULTA_INVENTARIO, (1000,))
+    for sql, params in _capturar(consultarEstados, "resumen_logistica_estado"):
+        agregar("gestion.cargarDatosLogistica (grafica)", sql, params)
+
+    # Compras
+    for sql, params in _capturar(leerInventario):
+        agregar("compras.loadInventarioItems", sql, params)
+    agregarPaginada("compras.loadSolicitudes", compras.CONSULTA_SOLICITUDES, ("2024-01-15", 1000))
+    agregarPaginada("compras.loadCompras", compras.CONSULTA_COMPRAS, ("2024-01-15", 1000))
+    agregarLista("compras.loadDetalleSolicitud", compras.consultaDetalleSolicitud(1))
+    agregarLista("compras.loadDetalleCompra", compras.consultaDetalleCompra(1))
+    agregar("compras.addCompra", compras.SQL_SOLICITUDES_APROBADAS)
+    agregarPaginada("gestion.cargarDatosCompras (solicitudes)", gestion.CONSULTA_SOLICITUDES, ("2024-01-15", 1000))
+    agregarPaginada("gestion.cargarDatosCompras", gestion.CONSULTA_COMPRAS, ("2024-01-15", 1000))
+    agregarPaginada("gestion.cargarDatosCompras (detalle compra)", gestion.CONSULTA_DETALLE_COMPRA, (1000,))
+    agregarPaginada("gestion.cargarDatosCompras (detalle solicitud)", gestion.CONSULTA_DETALLE_SOLICITUD, (1000,))
+    for sql, params in _capturar(consultarComprasMes):
+        agregar("gestion.cargarDatosCompras (grafica)", sql, params)
+
+    # Ventas
+    agregarPaginada("ventas.loadVentas", ventas.CONSULTA_VENTAS, ("2024-01-15", 1000))
+    agregarLista("ventas.loadDetalleVenta", ventas.consultaDetalleVenta(1))
+    agregar("ventas.loadCotizacionesPendientes", ventas.SQL_COTIZACIONES_PENDIENTES)
+    agregar("ventas.loadVentasCompletadas", ventas.SQL_VENTAS_COMPLETADAS)
+    agregar("ventas.generarReporteMensual", ventas.SQL_REPORTE_MENSUAL, (inicio, fin))
+    agregarPaginada("gestion.cargarDatosVentas", gestion.CONSULTA_VENTAS, ("2024-01-15", 1000))
+    agregarPaginada("gestion.cargarDatosVentas (detalle)", gestion.CONSULTA_DETALLE_VENTA, (1000,))
+    for sql, params in _capturar(consultarVentasMes):
+        agregar("gestion.cargarDatosVentas (grafica)", sql, params)
+
+    # Mantenimiento
+    agregarPaginada("mantenimiento.loadDataMain", mantenimiento.CONSULTA_MANTENIMIENTO, (500, 1000))
+    agregarLista("mantenimiento.loadDataIncidencia", mantenimiento.consultaIncidencias(1))
+    agregarPaginada("gestion.cargarDatosMantenimiento", gestion.CONSULTA_MANTENIMIENTO, ("2024-01-15", 1000))
+    agregarPaginada("gestion.cargarDatosMantenimiento (incidencias)", gestion.CONSULTA_INCIDENCIAS, ("2024-01-15", 1000))
+    for sql, params in _capturar(consultarEstados, "resumen_mantenimiento_estado"):
+        agregar("gestion.cargarDatosMantenimiento (grafica)", sql, params)
+
+    # Orden por columna de las tablas paginadas (tablas.TablaModel, necesita 003_indices_orden_columnas.sql)
+    ordenables = [
+        ("finanzas", finanzas.CONSULTA_FINANZAS, [("fin_usu_id", True), ("fin_fecha", False), ("fin_monto", False)]),
+        ("recursoshumanos", recursoshumanos.CONSULTA_USUARIOS, [("usu_nombre", False), ("usu_correo", False), ("usu_mod", True)]),
+        ("logistica", logistica.CONSULTA_LOGISTICA, [("log_usu_id", True), ("log_fecha_salida", False), ("log_estado", False)]),
+        ("compras", compras.CONSULTA_COMPRAS, [("com_usu_id", True), ("com_fecha_compra", False), ("com_sol_id", True),
+                                               ("com_monto_total", False)]),
+        ("ventas", ventas.CONSULTA_VENTAS, [("ven_usu_id", True), ("ven_fecha_venta", False), ("ven_monto_total", False)]),
+    ]
+    for modulo, consulta, campos in ordenables:
+        # El mismo orden que arma TablaModel.consultaVista: el campo y la llave primaria al final
+        llave, posicion = consulta.orden[-1][:2]
+        for campo, nulos in campos:
+            # Los valores de la llave keyset solo importan para el plan, no para el resultado
+            agregarPaginada(f"{modulo} (orden {campo})",
+                            consulta.variante([(campo, 1, True, nulos), (llave, posicion, True)]), (1, 1000))
+    agregarPaginada("compras (filtro com_estado)",
+                    compras.CONSULTA_COMPRAS.variante(condiciones=[("com_estado = %s", ("Pendiente",))]),
+                    ("2024-01-15", 1000))
+
+    # Sincronizacion (necesita 002_control_cambios.sql)
+    for tabla, (prefijo, llave) in TABLAS.items():
+        agregar(f"sincronizacion.leerCambios ({tabla})",
+                f"SELECT {llave} FROM {tabla} WHERE {prefijo}_modificado >= %s LIMIT %s", ("2024-01-15", 201))
+    agregar("sincronizacion.leerCambios (borrados)",
+            "SELECT bor_llave FROM registro_borrado WHERE bor_tabla = %s AND bor_fecha >= %s", ("finanza", "2024-01-15"))
+
+    # Busqueda de texto (necesita 004_busqueda_texto.sql); sin el indice FULLTEXT MySQL no acepta el MATCH
+    for tabla in CAMPOS_TEXTO:
+        agregar(f"busqueda.buscar ({tabla})", *consultaBusqueda(tabla, "+mant*", 50))
+    condicion, valores = condicionTexto("fin_desc", "pago interno")
+    agregarPaginada("finanzas (filtro fin_desc)",
+                    finanzas.CONSULTA_FINANZAS.variante(condiciones=[(condicion, valores)]), ("2024-01-15", 1000))
+
+    return consultas
+
+def verificarConsultas(min_filas=1000):
+    """Corre EXPLAIN sobre las consultas de los modulos y retorna el numero de recorridos completos."""
+    conexion = obtenerConexion()
+    fallas = 0
+    try:
+        cursor = conexion.cursor(dictionary=True)
+        for nombre, sql, params, limite in consultasVerificadas():
+            cursor.execute("EXPLAIN " + sql, params)
+            for plan in cursor.fetchall():
+                tabla = plan.get("table") or ""
+                if tabla.startswith("<"):
+                    continue  # tablas derivadas o temporales
+                filas = plan.get("rows") or 0
+                if plan.get("type") == "ALL" and filas >= min_filas:
+                    if limite is not None and filas <= limite:
+                        estado = "LEE TODO (catalogo)"
+                    else:
+                        estado = "FALLA"
+                        fallas += 1
+                else:
+                    estado = "ok"
+                print(f"{estado:<20} {nombre:<55} {tabla:<22} tipo={plan.get('type')} "
+                      f"indice={plan.get('key')} filas~{filas}")
+        cursor.close()
+    finally:
+        conexion.close()
+    return fallas
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Migraciones de la base de datos de GP Logistics")
+    parser.add_argument("--estado", action="store_true", help="muestra las migraciones aplicadas y pendientes")
+    parser.add_argument("--verificar", action="store_true",
+                        help="corre EXPLAIN sobre las consultas y falla si alguna recorre toda una tabla")
+    parser.add_argument("--min-filas", type=int, default=1000,
+                        help="filas estimadas a partir de las cuales un recorrido completo es falla (por defecto 1000)")
+    args = parser.parse_args(argv)
+
+    try:
+        if args.estado:
+            mostrarEstado()
+            return 0
+        if args.verificar:
+            fallas = verificarConsultas(args.min_filas)
+            if fallas:
+                print(f"\n{fallas} consulta(s) recorren una tabla completa")
+                return 1
+            print("\nNinguna consulta recorre una tabla completa")
+            return 0
+        aplicadas = aplicarMigraciones()
+        print(f"{len(aplicadas)} migracion(es) aplicada(s)" if aplicadas else "La base de datos esta al dia")
+        return 0
+    except mysql.connector.Error as err:
+        print(f"Error de base de datos: {err}")
+        return 2
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+# Registro de los modulos del ERP por usu_mod.
+# login.py ya no importa todas las ventanas al arrancar (finanzas y gestion
+# traen matplotlib y numpy); cada modulo se importa solo cuando el usuario que
+# inicia sesion lo necesita. Mientras se escribe la contraseña se puede precargar
+# en segundo plano el modulo del correo capturado, asi el import ya esta hecho
+# cuando se presiona "Iniciar sesión".
+#
+# ERP_PRECARGA=0 en el .env desactiva la precarga.
+import importlib
+import os
+import threading
+import mysql.connector
+from conexion import conexionSegundoPlano
+from exportar import activarExportaciones
+
+# usu_mod -> (modulo, clase de la ventana, si el constructor recibe usu_id)
+MODULOS = {
+    "Finanzas": ("finanzas", "FinanzasWindow", True),
+    "Recursos Humanos": ("recursoshumanos", "RRHHWindow", True),
+    "Logistica": ("logistica", "LogisticaWindow", True),
+    "Compras": ("compras", "ComprasWindow", True),
+    "Ventas": ("ventas", "VentasWindow", True),
+    "Mantenimiento": ("mantenimiento", "MantenimientoWindow", True),
+    "Gestion": ("gestion", "GestionWindow", False),
+}
+
+_precargados = set()
+_lock = threading.Lock()
+
+def claseVentana(usu_mod):
+    """Importa el modulo de usu_mod y retorna la clase de su ventana."""
+    modulo, clase, _ = MODULOS[usu_mod]
+    return getattr(importlib.import_module(modulo), clase)
+
+def crearVentana(usu_mod, loginWindow, usu_id):
+    """Retorna la ventana principal del modulo de usu_mod."""
+    _, _, recibe_usuario = MODULOS[usu_mod]
+    clase = claseVentana(usu_mod)
+    if recibe_usuario:
+        ventana = clase(loginWindow, usu_id)
+    else:
+        ventana = clase(loginWindow)
+    # "Exportar..." en el menu contextual de todas las tablas del modulo
+    activarExportaciones(ventana)
+    return ventana
+
+def precargaActiva():
+    return os.environ.get("ERP_PRECARGA", "1").strip().lower() not in ("0", "false", "no")
+
+def precargar(usu_mod):
+    """Importa el modulo de usu_mod en un hilo de fondo (solo la primera vez)."""
+    if usu_mod not in MODULOS or not precargaActiva():
+        return
+    with _lock:
+        if usu_mod in _precargados:
+            return
+        _precargados.add(usu_mod)
+
+    def importar():
+        try:
+            # Solo se importa (clases, matplotlib); los widgets se crean en el hilo de la interfaz
+            claseVentana(usu_mod)
+        except Exception as err:
+            print(f"No se pudo precargar el modulo {usu_mod}: {err}")
+
+    threading.Thread(target=importar, name=f"precarga-{usu_mod}", daemon=True).start()
+
+def precargarPorCorreo(correo):
+    """Busca en segundo plano el usu_mod del correo y precarga su modulo."""
+    if not correo or not precargaActiva():
+        return
+
+    def buscar():
+        try:
+            with conexionSegundoPlano() as conexion:
+                cursor = conexion.cursor()
+                cursor.execute("SELECT usu_mod FROM usuario WHERE usu_correo = %s", (correo,))
+                fila = cursor.fetchone()
+                cursor.close()
+        except mysql.connector.Error:
+            return  # el inicio de sesion reportara el error de conexion
+        if fila and fila[0]:
+            precargar(fila[0])
+
+    threading.Thread(target=buscar, name="precarga-correo", daemon=True).start()
@@ -0,0 +1,135 @@
+# Movimientos de inventario por orden completa.
+# Completar una compra o una venta antes hacia un UPDATE inventario por cada
+# linea del detalle. Aqui toda la orden se aplica en una transaccion:
+#   1. se marca la orden como completada (solo si no lo estaba ya)
+#   2. se leen las cantidades del detalle agrupadas por producto
+#   3. se bloquean las filas de inventario con SELECT ... FOR UPDATE, siempre en
+#      orden de inv_id para que dos ordenes simultaneas no se bloqueen entre si
+#   4. se valida la existencia de cada producto (una venta no puede dejarla negativa)
+#   5. se aplica un solo UPDATE con CASE para todos los productos
+# Si algun producto no se puede mover no se aplica nada. El commit o rollback
+# lo hace quien llama, junto con el resto de su transaccion.
+from collections import OrderedDict
+
+ENTRADA = 1
+SALIDA = -1
+
+# Productos por sentencia en los IN (...) y CASE
+LOTE_PRODUCTOS = 500
+
+# tipo -> (tabla, llave, columna de estado, tabla de detalle, sentido del movimiento)
+ORDENES = {
+    "compra": ("compra", "com_id", "com_estado", "detalle_compra", ENTRADA),
+    "venta": ("venta", "ven_id", "ven_estado", "detalle_venta", SALIDA),
+}
+
+class ResultadoMovimiento:
+    def __init__(self, inv_id, cantidad):
+        self.inv_id = inv_id
+        self.cantidad = cantidad  # cantidad a mover (siempre positiva)
+        self.producto = None
+        self.anterior = None      # existencia antes del movimiento
+        self.nueva = None         # existencia despues del movimiento
+        self.motivo = None        # por que no se pudo mover, None si se pudo
+
+    @property
+    def ok(self):
+        return self.motivo is None
+
+class ResultadoOrden:
+    def __init__(self, aplicada, motivo=None, resultados=None):
+        self.aplicada = aplicada
+        self.motivo = motivo
+        self.resultados = resultados or []
+
+    def fallidos(self):
+        return [r for r in self.resultados if not r.ok]
+
+def _lotes(lista, tamano=LOTE_PRODUCTOS):
+    for inicio in range(0, len(lista), tamano):
+        yield lista[inicio:inicio + tamano]
+
+def agruparCantidades(lineas):
+    """Suma las cantidades de [(inv_id, cantidad)] por producto, ordenado por inv_id."""
+    cantidades = OrderedDict()
+    for inv_id, cantidad in sorted((l for l in lineas if l[0] is not None), key=lambda linea: linea[0]):
+        cantidades[inv_id] = cantidades.get(inv_id, 0) + int(cantidad)
+    return cantidades
+
+def aplicarMovimientos(cursor, cantidades, sentido, permitir_negativo=False):
+    """Bloquea, valida y aplica {inv_id: cantidad} en inventario; retorna (aplicado, resultados).
+
+    sentido es ENTRADA o SALIDA. No hace commit.
+    """
+    resultados = OrderedDict((inv_id, ResultadoMovimiento(inv_id, cantidad))
+                             for inv_id, cantidad in sorted(cantidades.items()))
+    ids = list(resultados)
+
+    for lote in _lotes(ids):
+        cursor.execute(
+            f"SELECT inv_id, inv_producto, inv_cantidad FROM inventario "
+            f"WHERE inv_id IN ({', '.join(['%s'] * len(lote))}) ORDER BY inv_id FOR UPDATE",
+            tuple(lote))
+        for inv_id, producto, existencia in cursor.fetchall():
+            resultado = resultados[inv_id]
+            resultado.producto = producto
+            resultado.anterior = existencia
+            resultado.nueva = existencia + sentido * resultado.cantidad
+
+    for resultado in resultados.values():
+        if resultado.anterior is None:
+            resultado.motivo = "El producto ya no existe en el inventario"
+        elif resultado.nueva < 0 and not permitir_negativo:
+            resultado.motivo = f"Existencia insuficiente ({resultado.anterior}, se requieren {resultado.cantidad})"
+
+    if any(not r.ok for r in resultados.values()):
+        return False, list(resultados.values())
+
+    for lote in _lotes(ids):
+        casos = " ".join(["WHEN %s THEN %s"] * len(lote))
+        params = []
+        for inv_id in lote:
+            params.extend((inv_id, sentido * resultados[inv_id].cantidad))
+        params.extend(lote)
+        cursor.execute(
+            f"UPDATE inventario SET inv_cantidad = inv_cantidad + CASE inv_id {casos} END "
+            f"WHERE inv_id IN ({', '.join(['%s'] * len(lote))})",
+            tuple(params))
+    return True, list(resultados.values())
+
+def completarOrden(conexion, tipo, orden_id):
+    """Completa una compra o venta y mueve su inventario en la transaccion de la conexion.
+
+    Retorna un ResultadoOrden; si aplicada es False se debe hacer rollback.
+    """
+    tabla, llave, estado, detalle, sentido = ORDENES[tipo]
+    cursor = conexion.cursor()
+    try:
+        # El UPDATE bloquea la orden: si otra ventana la completa al mismo tiempo,
+        # la segunda ve rowcount 0 y no vuelve a mover el inventario
+        cursor.execute(f"UPDATE {tabla} SET {estado} = 'Completada' WHERE {llave} = %s AND {estado} <> 'Completada'",
+                       (orden_id,))
+        if cursor.rowcount == 0:
+            return ResultadoOrden(False, f"La {tipo} ya estaba completada o ya no existe")
+
+        cursor.execute(f"SELECT inv_id, SUM(cantidad) FROM {detalle} WHERE {llave} = %s GROUP BY inv_id", (orden_id,))
+        cantidades = agruparCantidades(cursor.fetchall())
+        if not cantidades:
+            return ResultadoOrden(False, f"La {tipo} no tiene productos en el detalle")
+
+        aplicado, resultados = aplicarMovimientos(cursor, cantidades, sentido)
+        if not aplicado:
+            return ResultadoOrden(False, "No se pudo mover el inventario de algunos productos", resultados)
+        return ResultadoOrden(True, resultados=resultados)
+    finally:
+        cursor.close()
+
+def describirFallidos(resultado, maximo=15):
+    """Retorna el texto con los productos que no se pudieron mover, para un QMessageBox."""
+    lineas = [resultado.motivo]
+    fallidos = resultado.fallidos()
+    for r in fallidos[:maximo]:
+        lineas.append(f"- {r.producto or 'ID ' + str(r.inv_id)}: {r.motivo}")
+    if len(fallidos) > maximo:
+        lineas.append(f"... y {len(fallidos) - maximo} productos mas")
+    return "\n".join(lineas)
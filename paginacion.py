@@ -0,0 +1,670 @@
+# Paginacion del lado del servidor para los modelos de tabla.
+# En lugar de hacer un fetchall() de toda la tabla, el modelo pide paginas de
+# TAMANO_PAGINA filas conforme el usuario hace scroll (canFetchMore/fetchMore).
+# Las paginas se leen con keyset ("WHERE llave < ultima_llave ORDER BY llave LIMIT n")
+# en lugar de OFFSET, asi leer la pagina 500 cuesta lo mismo que leer la primera.
+# Solo se mantienen MAX_PAGINAS en memoria; si se vuelve a una pagina descartada
+# se lee de nuevo desde su llave de inicio.
+#
+# Despues de agregar, editar o borrar un registro no se recarga la tabla: el
+# modelo relee solo esa fila (releerFila) y la inserta en su lugar segun el
+# orden de la consulta, la reemplaza o la quita (quitarFila) con
+# beginInsertRows/dataChanged/beginRemoveRows, asi la vista conserva la
+# seleccion y la posicion del scroll. Con aplicarCambios() se aplica igual un
+# lote de cambios de otros usuarios leido por sincronizacion.py.
+# variante() arma la misma consulta con otro orden o condiciones extra (orden y
+# filtros de tablas.TablaModel) y cambiarConsulta() la vuelve a leer en la misma
+# secuencia de filas.
+#
+# Cada pagina en memoria se guarda por columnas (PaginaColumnas): las columnas
+# enteras y de punto flotante en un array tipado y las demas en una tupla, en
+# lugar de una tupla por fila con un objeto int/float por celda. Las filas se
+# arman al pedirlas, asi las ventanas y la sincronizacion siguen viendo tuplas.
+from array import array
+from bisect import bisect_right
+from collections import OrderedDict
+from PyQt5.QtCore import QAbstractTableModel, QModelIndex, QTimer
+import mysql.connector
+from conexion import obtenerConexion
+
+TAMANO_PAGINA = 200
+MAX_PAGINAS = 25
+
+class PaginaColumnas:
+    """Filas de una pagina guardadas por columnas; se indexa como una lista de tuplas."""
+
+    def __init__(self, filas):
+        self._total = len(filas)
+        self._columnas = [self._comprimir(valores) for valores in zip(*filas)]
+
+    @staticmethod
+    def _comprimir(valores):
+        # Solo se usa el array si todos los valores son del mismo tipo (sin NULL ni bool)
+        tipos = set(map(type, valores))
+        if tipos == {int}:
+            try:
+                return array("q", valores)
+            except OverflowError:
+                return valores
+        if tipos == {float}:
+            return array("d", valores)
+        return valores
+
+    def __len__(self):
+        return self._total
+
+    def __getitem__(self, posicion):
+        if isinstance(posicion, slice):
+            return [self[i] for i in range(*posicion.indices(self._total))]
+        if posicion < 0:
+            posicion += self._total
+        if not 0 <= posicion < self._total:
+            raise IndexError(posicion)
+        return tuple(columna[posicion] for columna in self._columnas)
+
+    def __iter__(self):
+        return zip(*self._columnas) if self._columnas else iter(())
+
+    def columna(self, posicion):
+        return self._columnas[posicion]
+
+class ConsultaPaginada:
+    # select: consulta sin WHERE ni ORDER BY, por ejemplo "SELECT * FROM finanza"
+    # orden: lista de (columna, posicion en la fila, descendente[, acepta NULL]);
+    #        la ultima columna debe ser unica (normalmente la llave primaria)
+    # filtro/parametros: condicion opcional que se agrega al WHERE
+    # El ORDER BY usa las columnas tal cual (sin IFNULL ni funciones) para que
+    # MySQL pueda recorrer el indice en orden en lugar de ordenar toda la tabla.
+    def __init__(self, select, orden, filtro="", parametros=()):
+        self.select = select
+        self.orden = [(o[0], o[1], o[2], bool(o[3]) if len(o) == 4 else False) for o in orden]
+        self.filtro = filtro
+        self.parametros = tuple(parametros)
+        self.base = self  # consulta original de la que salio una variante()
+
+    def variante(self, orden=None, condiciones=()):
+        """Retorna la consulta con otro orden y condiciones extra [(condicion, valores)] sobre el filtro."""
+        filtros = [self.filtro] if self.filtro else []
+        parametros = list(self.parametros)
+        for condicion, valores in condiciones:
+            filtros.append(condicion)
+            parametros.extend(valores)
+        filtro = " AND ".join(f"({f})" for f in filtros) if len(filtros) > 1 else "".join(filtros)
+        nueva = ConsultaPaginada(self.select, orden or self.orden, filtro, parametros)
+        nueva.base = self.base
+        return nueva
+
+    def llave(self, fila):
+        """Retorna la llave keyset de una fila."""
+        return tuple(fila[pos] for _, pos, _, _ in self.orden)
+
+    def compararLlaves(self, a, b):
+        """Compara dos llaves como el ORDER BY; retorna -1, 0 o 1."""
+        # Como en MySQL, NULL va antes que cualquier valor. Las cadenas y los ENUM se
+        # comparan con Python y no con la collation ni el orden del ENUM de la base:
+        # una fila nueva puede quedar junto a su lugar exacto hasta la siguiente recarga
+        for (_, _, descendente, _), x, y in zip(self.orden, a, b):
+            if x == y:
+                continue
+            if x is None:
+                resultado = -1
+            elif y is None:
+                resultado = 1
+            else:
+                resultado = -1 if x < y else 1
+            return -resultado if descendente else resultado
+        return 0
+
+    def sqlFila(self, columna, valor):
+        """Retorna la consulta y parametros para releer la fila columna = valor (con el mismo filtro)."""
+        return self.sqlDonde(f"{columna} = %s", (valor,))
+
+    def sqlDonde(self, condicion, valores=()):
+        """Retorna la consulta y parametros de las filas que cumplen condicion y el filtro (sin orden)."""
+        query = f"{self.select} WHERE {condicion}"
+        params = list(valores)
+        if self.filtro:
+            query += f" AND ({self.filtro})"
+            params.extend(self.parametros)
+        return query, params
+
+    def _igual(self, columna, valor):
+        if valor is None:
+            return f"{columna} IS NULL", ()
+        return f"{columna} = %s", (valor,)
+
+    def _despues(self, columna, descendente, nulos, valor):
+        # MySQL ordena NULL antes que cualquier valor: primero en ASC y al final en DESC
+        if valor is None:
+            return (None, ()) if descendente else (f"{columna} IS NOT NULL", ())
+        condicion = f"{columna} {'<' if descendente else '>'} %s"
+        if nulos and descendente:
+            condicion = f"({condicion} OR {columna} IS NULL)"
+        return condicion, (valor,)
+
+    def sql(self, despues_de, limite):
+        """Retorna la consulta y parametros de la pagina que sigue a la llave despues_de (sin LIMIT si limite es None)."""
+        condiciones = []
+        params = []
+        if self.filtro:
+            condiciones.append(f"({self.filtro})")
+            params.extend(self.parametros)
+
+        if despues_de is not None:
+            # (a, b) < (x, y)  ->  a < x OR (a = x AND b < y)
+            terminos = []
+            for i, (columna, _, descendente, nulos) in enumerate(self.orden):
+                despues, valores = self._despues(columna, descendente, nulos, despues_de[i])
+                if despues is None:
+                    continue
+                partes = []
+                for j in range(i):
+                    igual, iguales = self._igual(self.orden[j][0], despues_de[j])
+                    partes.append(igual)
+                    params.extend(iguales)
+                partes.append(despues)
+                params.extend(valores)
+                terminos.append("(" + " AND ".join(partes) + ")")
+            condiciones.append("(" + " OR ".join(terminos) + ")" if terminos else "FALSE")
+
+        query = self.select
+        if condiciones:
+            query += " WHERE " + " AND ".join(condiciones)
+        query += " ORDER BY " + ", ".join(
+            f"{columna} {'DESC' if descendente else 'ASC'}"
+            for columna, _, descendente, _ in self.orden)
+        if limite is not None:
+            query += " LIMIT %s"
+            params.append(limite)
+        return query, params
+
+class FilasPaginadas:
+    # Secuencia de filas que se comporta como la lista de cursor.fetchall()
+    # (len, indices, for) pero solo guarda en memoria las paginas recientes.
+    def __init__(self, consulta, tamano_pagina=TAMANO_PAGINA, max_paginas=MAX_PAGINAS, al_invalidar=None):
+        self.consulta = consulta
+        self.tamano_pagina = tamano_pagina
+        self.max_paginas = max(1, max_paginas)
+        self.al_invalidar = al_invalidar
+        self._limpiar()
+
+    def _limpiar(self):
+        self._paginas = OrderedDict()
+        self._llaves = [None]  # llave de inicio de cada pagina, la ultima es la de la siguiente
+        self._tamanos = []     # filas de cada pagina; cambian al insertar o quitar filas
+        self._inicios = []     # indice de la primera fila de cada pagina
+        self._total = 0
+        self._fin = False
+        self._ultima_fila = None
+        self._invalidada = False
+
+    def __len__(self):
+        return self._total
+
+    def __iter__(self):
+        for fila in range(self._total):
+            yield self[fila]
+
+    def __getitem__(self, fila):
+        if isinstance(fila, slice):
+            return [self[i] for i in range(*fila.indices(self._total))]
+        if fila < 0:
+            fila += self._total
+        if not 0 <= fila < self._total:
+            raise IndexError(fila)
+        pagina, posicion = self._ubicarIndice(fila)
+        return self._pagina(pagina)[posicion]
+
+    def _ubicarIndice(self, fila):
+        # Las paginas vacias tienen el mismo inicio que la siguiente; bisect_right se queda con la ultima
+        pagina = bisect_right(self._inicios, fila) - 1
+        return pagina, fila - self._inicios[pagina]
+
+    def _recalcularInicios(self):
+        inicio = 0
+        self._inicios = []
+        for tamano in self._tamanos:
+            self._inicios.append(inicio)
+            inicio += tamano
+
+    def hayMas(self):
+        return not self._fin
+
+    def detener(self):
+        self._fin = True
+
+    def _leer(self, despues_de, cursor=None, limite=None):
+        query, params = self.consulta.sql(despues_de, limite or self.tamano_pagina)
+        if cursor is not None:
+            cursor.execute(query, params)
+            return cursor.fetchall()
+        conexion = obtenerConexion()
+        try:
+            # Las paginas de una tabla repiten el mismo texto de SQL: sentencia preparada
+            cursor = conexion.cursor(prepared=True)
+            cursor.execute(query, params)
+            filas = cursor.fetchall()
+            cursor.close()
+            return filas
+        finally:
+            conexion.close()
+
+    def leerSiguiente(self, cursor=None):
+        """Retorna las filas de la siguiente pagina sin agregarlas todavia."""
+        return self._leer(self._llaves[-1], cursor)
+
+    def leerInicio(self, cursor=None):
+        """Retorna las filas de la primera pagina."""
+        return self._leer(None, cursor)
+
+    def agregar(self, filas):
+        if len(filas) < self.tamano_pagina:
+            self._fin = True
+        if not filas:
+            return
+        self._guardar(len(self._llaves) - 1, filas)
+        self._llaves.append(self.consulta.llave(filas[-1]))
+        self._tamanos.append(len(filas))
+        self._inicios.append(self._total)
+        self._total += len(filas)
+
+    def reiniciar(self, filas):
+        self._limpiar()
+        self.agregar(filas)
+
+    def _guardar(self, pagina, filas):
+        filas = PaginaColumnas(filas)
+        self._paginas[pagina] = filas
+        self._paginas.move_to_end(pagina)
+        self._ultima_fila = filas[-1]
+        while len(self._paginas) > self.max_paginas:
+            self._paginas.popitem(last=False)
+
+    def _pagina(self, pagina):
+        if pagina in self._paginas:
+            self._paginas.move_to_end(pagina)
+            return self._paginas[pagina]
+
+        # La pagina se descarto de memoria, se lee otra vez desde su llave
+        esperadas = self._tamanos[pagina]
+        if esperadas == 0:
+            return []
+        try:
+            filas = self._leer(self._llaves[pagina], limite=esperadas)
+        except mysql.connector.Error as err:
+            print(f"Error al recargar la pagina {pagina}: {err}")
+            filas = []
+
+        if len(filas) < esperadas:
+            # Se borraron filas desde la primera lectura: se rellena para no romper
+            # los indices de la vista y se pide al modelo que recargue la consulta
+            relleno = filas[-1] if filas else self._ultima_fila
+            filas = list(filas) + [relleno] * (esperadas - len(filas))
+            if not self._invalidada:
+                self._invalidada = True
+                if self.al_invalidar:
+                    self.al_invalidar()
+        else:
+            filas = filas[:esperadas]
+        self._guardar(pagina, filas)
+        return self._paginas[pagina]
+
+    def _posicionEn(self, filas, llave):
+        # Primera posicion cuya llave va despues de la llave buscada
+        bajo, alto = 0, len(filas)
+        while bajo < alto:
+            medio = (bajo + alto) // 2
+            if self.consulta.compararLlaves(llave, self.consulta.llave(filas[medio])) < 0:
+                alto = medio
+            else:
+                bajo = medio + 1
+        return bajo
+
+    def ubicar(self, fila):
+        """Retorna (pagina, posicion, filas) donde va una fila nueva ya guardada en la base.
+
+        Retorna None si la fila cae despues de lo ya leido. filas es la pagina
+        releida de la base (ya incluye la fila) cuando no estaba en memoria.
+        """
+        comparar = self.consulta.compararLlaves
+        llave = self.consulta.llave(fila)
+
+        # La pagina p termina en la llave _llaves[p + 1]: se busca la primera que termina en o despues de la fila
+        bajo, alto = 1, len(self._llaves)
+        while bajo < alto:
+            medio = (bajo + alto) // 2
+            if comparar(self._llaves[medio], llave) < 0:
+                bajo = medio + 1
+            else:
+                alto = medio
+        pagina = bajo - 1
+
+        if pagina == len(self._tamanos):
+            if not self._fin:
+                return None  # la leera fetchMore cuando el usuario llegue ahi
+            if not self._tamanos:
+                return 0, 0, None
+            pagina = len(self._tamanos) - 1
+
+        if pagina not in self._paginas and self._tamanos[pagina]:
+            # Releer la pagina con LIMIT de su tamaño ya traeria la fila nueva y
+            # perderia la ultima; se lee con una fila mas y se busca la nueva
+            try:
+                filas = self._leer(self._llaves[pagina], limite=self._tamanos[pagina] + 1)
+            except mysql.connector.Error as err:
+                print(f"Error al recargar la pagina {pagina}: {err}")
+                filas = []
+            for posicion, existente in enumerate(filas):
+                if comparar(self.consulta.llave(existente), llave) == 0:
+                    return pagina, posicion, filas
+            if len(filas) >= self._tamanos[pagina]:
+                self._guardar(pagina, filas[:self._tamanos[pagina]])
+
+        return pagina, self._posicionEn(self._pagina(pagina), llave), None
+
+    def indice(self, ubicacion):
+        """Retorna el indice de fila de una ubicacion de ubicar()."""
+        pagina, posicion, _ = ubicacion
+        return (self._inicios[pagina] if pagina < len(self._inicios) else self._total) + posicion
+
+    def insertarEn(self, ubicacion, fila):
+        pagina, posicion, releidas = ubicacion
+        llave = self.consulta.llave(fila)
+        if pagina == len(self._tamanos):
+            # Primera fila de una consulta que no tenia resultados
+            self._tamanos.append(0)
+            self._llaves.append(llave)
+        if releidas is not None:
+            filas = releidas
+        else:
+            filas = list(self._pagina(pagina))
+            filas.insert(posicion, fila)
+        if self._fin and pagina == len(self._tamanos) - 1 and posicion == len(filas) - 1:
+            self._llaves[-1] = llave
+        self._tamanos[pagina] += 1
+        self._total += 1
+        self._guardar(pagina, filas)
+        self._recalcularInicios()
+
+    def reemplazar(self, indice, fila):
+        pagina, posicion = self._ubicarIndice(indice)
+        if pagina not in self._paginas:
+            return  # al releer la pagina ya vendra con los datos nuevos
+        filas = list(self._pagina(pagina))
+        filas[posicion] = fila
+        self._guardar(pagina, filas)
+
+    def quitar(self, indice):
+        # La fila ya no esta en la base. La llave de fin de la pagina se conserva
+        # aunque se borre esa fila: el keyset solo compara contra ella
+        pagina, posicion = self._ubicarIndice(indice)
+        self._tamanos[pagina] -= 1
+        self._total -= 1
+        if pagina in self._paginas:
+            filas = list(self._paginas[pagina])
+            del filas[posicion]
+            if filas:
+                self._guardar(pagina, filas)
+            else:
+                self._paginas.pop(pagina)
+        self._recalcularInicios()
+
+    def todasEnMemoria(self):
+        """True si ninguna pagina leida se ha descartado de memoria."""
+        return all(pagina in self._paginas for pagina, tamano in enumerate(self._tamanos) if tamano)
+
+    def buscar(self, posicion, valor):
+        """Retorna el indice de la fila con fila[posicion] == valor en las paginas en memoria, -1 si no esta."""
+        for pagina, filas in self._paginas.items():
+            for i, actual in enumerate(filas.columna(posicion)):
+                if actual == valor:
+                    return self._inicios[pagina] + i
+        return -1
+
+def leerConsulta(consulta, cursor=None):
+    """Retorna la secuencia de filas con la primera pagina ya leida (se puede usar en un hilo de trabajo)."""
+    filas = FilasPaginadas(consulta)
+    filas.agregar(filas.leerInicio(cursor))
+    return filas
+
+def leerLista(consulta, cursor):
+    """Retorna todas las filas de la consulta, sin LIMIT (tablas chicas; se puede usar en un hilo de trabajo)."""
+    query, params = consulta.sql(None, None)
+    cursor.execute(query, params)
+    return cursor.fetchall()
+
+class PagedTableModel(QAbstractTableModel):
+    # Base de los modelos de tabla: refreshData(lista) sigue funcionando igual,
+    # cargarConsulta(ConsultaPaginada) activa la carga por paginas.
+    def __init__(self, data=None):
+        super().__init__()
+        self._data = data if data is not None else []
+        self._lista = None  # (filas, consulta) de la ultima cargarLista
+
+    @property
+    def consulta(self):
+        """ConsultaPaginada de los datos que se muestran, None si vinieron de refreshData."""
+        if isinstance(self._data, FilasPaginadas):
+            return self._data.consulta
+        if self._lista is not None and self._lista[0] is self._data:
+            return self._lista[1]
+        return None
+
+    def rowCount(self, parent=None):
+        return len(self._data)
+
+    def copiaFilas(self):
+        """Retorna una copia de la lista de filas (para usarla en otro hilo)."""
+        return list(self._data)
+
+    def refreshData(self, data):
+        self.beginResetModel()
+        self._data = data
+        self.endResetModel()
+
+    def cargarConsulta(self, consulta, cursor=None):
+        """Carga la primera pagina de la consulta y retorna la secuencia de filas."""
+        return self.mostrarConsulta(leerConsulta(consulta, cursor))
+
+    def cargarLista(self, consulta, cursor):
+        """Carga todas las filas de la consulta en una lista (tablas chicas) y la retorna."""
+        return self.mostrarLista(leerLista(consulta, cursor), consulta)
+
+    def mostrarLista(self, filas, consulta):
+        # filas viene de leerLista(consulta), por ejemplo leida en segundo plano
+        self.beginResetModel()
+        self._data = filas
+        self._lista = (filas, consulta)
+        self.endResetModel()
+        return filas
+
+    def mostrarConsulta(self, filas):
+        # filas viene de leerConsulta(), normalmente leida en segundo plano
+        filas.al_invalidar = self._programarRecarga
+        self.beginResetModel()
+        self._data = filas
+        self.endResetModel()
+        return filas
+
+    def cambiarConsulta(self, consulta):
+        """Vuelve a leer la tabla con otra consulta (otro orden o filtro) en la misma secuencia de filas."""
+        if isinstance(self._data, FilasPaginadas):
+            self._data.consulta = consulta
+        elif self.consulta is not None:
+            self._lista = (self._data, consulta)
+        else:
+            return
+        self.recargarConsulta()
+
+    def releerFila(self, cursor, columna, valor, indice=None):
+        """Lee la fila columna = valor con la consulta del modelo y la aplica sin recargar la tabla.
+
+        Sin indice la fila es nueva (por ejemplo con el lastrowid de un INSERT) y se
+        inserta en su lugar; con indice reemplaza esa fila, o la quita si ya no
+        existe o ya no cumple el filtro. Un indice -1 (de buscarFila) no hace nada.
+        Retorna el indice final de la fila o -1.
+        """
+        if self.consulta is None or (indice is not None and indice < 0):
+            return -1  # la tabla muestra otros datos o no tiene la fila; se actualizara al recargarla
+        query, params = self.consulta.sqlFila(columna, valor)
+        cursor.execute(query, params)
+        filas = cursor.fetchall()
+        if indice is None:
+            return self.insertarFila(filas[0]) if filas else -1
+        if not filas:
+            self.quitarFila(indice)
+            return -1
+        return self.reemplazarFila(indice, filas[0])
+
+    def insertarFila(self, fila):
+        """Inserta una fila en su lugar segun el orden de la consulta; retorna su indice o -1."""
+        if isinstance(self._data, FilasPaginadas):
+            ubicacion = self._data.ubicar(fila)
+            if ubicacion is None:
+                return -1  # va despues de lo leido, llegara con el scroll
+            indice = self._data.indice(ubicacion)
+            self.beginInsertRows(QModelIndex(), indice, indice)
+            self._data.insertarEn(ubicacion, fila)
+            self.endInsertRows()
+            return indice
+
+        indice = len(self._data)
+        if self.consulta is not None:
+            llave = self.consulta.llave(fila)
+            bajo, alto = 0, len(self._data)
+            while bajo < alto:
+                medio = (bajo + alto) // 2
+                if self.consulta.compararLlaves(llave, self.consulta.llave(self._data[medio])) < 0:
+                    alto = medio
+                else:
+                    bajo = medio + 1
+            indice = bajo
+        self.beginInsertRows(QModelIndex(), indice, indice)
+        self._data.insert(indice, fila)
+        self.endInsertRows()
+        return indice
+
+    def reemplazarFila(self, indice, fila):
+        """Reemplaza la fila indice y retorna su indice final.
+
+        En una lista la fila se queda donde estaba aunque cambie su llave de orden
+        (el usuario la sigue viendo donde la edito). En una consulta paginada se
+        mueve a su lugar: las paginas se releen por llave y deben seguir ordenadas.
+        """
+        if isinstance(self._data, FilasPaginadas):
+            if self.consulta.llave(fila) != self.consulta.llave(self._data[indice]):
+                self.quitarFila(indice)
+                return self.insertarFila(fila)
+            self._data.reemplazar(indice, fila)
+        else:
+            self._data[indice] = fila
+        self.dataChanged.emit(self.index(indice, 0), self.index(indice, self.columnCount() - 1))
+        return indice
+
+    def quitarFila(self, indice):
+        self.beginRemoveRows(QModelIndex(), indice, indice)
+        if isinstance(self._data, FilasPaginadas):
+            self._data.quitar(indice)
+        else:
+            del self._data[indice]
+        self.endRemoveRows()
+
+    def buscarFila(self, valor, posicion=0):
+        """Retorna el indice de la fila con fila[posicion] == valor (por defecto el id), -1 si no se muestra."""
+        if isinstance(self._data, FilasPaginadas):
+            return self._data.buscar(posicion, valor)
+        for indice, fila in enumerate(self._data):
+            if fila[posicion] == valor:
+                return indice
+        return -1
+
+    def aplicarCambios(self, cambios):
+        """Aplica un sincronizacion.Cambios (filas nuevas o modificadas y llaves quitadas).
+
+        Retorna False si los cambios no se pueden aplicar fila por fila y hay que
+        recargar la consulta: una fila cambiada puede estar en una pagina que ya
+        se descarto de memoria, o el lote es mas grande que una pagina.
+        """
+        if self.consulta is None or cambios.completa:
+            return False
+        if len(cambios.filas) + len(cambios.quitadas) > TAMANO_PAGINA:
+            return False
+        # Si hay paginas descartadas, una llave que no esta en memoria pudo estar en ellas
+        incompleta = isinstance(self._data, FilasPaginadas) and not self._data.todasEnMemoria()
+        posicion = cambios.posicion
+        for llave in cambios.quitadas:
+            indice = self.buscarFila(llave, posicion)
+            if indice >= 0:
+                self.quitarFila(indice)
+            elif incompleta:
+                return False
+        for fila in cambios.filas:
+            indice = self.buscarFila(fila[posicion], posicion)
+            if indice >= 0:
+                if tuple(self._data[indice]) != tuple(fila):
+                    self.reemplazarFila(indice, fila)
+            elif incompleta:
+                return False
+            else:
+                self.insertarFila(fila)
+        return True
+
+    def canFetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return False
+        return isinstance(self._data, FilasPaginadas) and self._data.hayMas()
+
+    def fetchMore(self, parent=QModelIndex()):
+        if not self.canFetchMore(parent):
+            return
+        try:
+            filas = self._data.leerSiguiente()
+        except mysql.connector.Error as err:
+            print(f"Error al cargar la siguiente pagina: {err}")
+            self._data.detener()
+            return
+
+        if not filas:
+            self._data.agregar(filas)
+            return
+        inicio = len(self._data)
+        self.beginInsertRows(QModelIndex(), inicio, inicio + len(filas) - 1)
+        self._data.agregar(filas)
+        self.endInsertRows()
+
+    def _programarRecarga(self):
+        QTimer.singleShot(0, self.recargarConsulta)
+
+    def recargarConsulta(self):
+        # Vuelve a la primera pagina conservando la misma secuencia de filas,
+        # asi las ventanas que guardan una referencia a ella siguen siendo validas
+        if self.consulta is not None and not isinstance(self._data, FilasPaginadas):
+            self._recargarLista()
+            return
+        if not isinstance(self._data, FilasPaginadas):
+            return
+        try:
+            primera = self._data.leerInicio()
+        except mysql.connector.Error as err:
+            print(f"Error al recargar la consulta: {err}")
+            return
+        self.beginResetModel()
+        self._data.reiniciar(primera)
+        self.endResetModel()
+
+    def _recargarLista(self):
+        # Relee la lista completa en la misma lista de Python (las ventanas guardan una referencia a ella)
+        try:
+            conexion = obtenerConexion()
+            try:
+                cursor = conexion.cursor(prepared=True)
+                filas = leerLista(self.consulta, cursor)
+                cursor.close()
+            finally:
+                conexion.close()
+        except mysql.connector.Error as err:
+            print(f"Error al recargar la consulta: {err}")
+            return
+        self.beginResetModel()
+        self._data[:] = filas
+        self.endResetModel()
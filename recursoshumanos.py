@@ -4,191 +4,62 @@ from PyQt5.QtWidgets import (QMainWindow, QPushButton, QVBoxLayout, QHBoxLayout,
                             QLineEdit, QDateEdit, QComboBox, QMessageBox, QLabel, QSplitter,
                             QDialogButtonBox, QApplication, QFrame, QGridLayout, QSizePolicy, 
                             QStackedWidget, QSpinBox)
-from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QDate, QSize
-from PyQt5.QtGui import QPixmap, QIcon, QFont, QColor
+from PyQt5.QtCore import Qt, QModelIndex, QDate, QSize
+from PyQt5.QtGui import QIcon, QFont, QColor
 from PyQt5.QtSql import QSqlDatabase, QSqlQuery, QSqlTableModel, QSqlQueryModel
 import mysql.connector
 from datetime import datetime
-import os
-from dotenv import load_dotenv
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.figure import Figure
+from conexion import obtenerConexion
+import imagenes
+from paginacion import ConsultaPaginada, leerConsulta
+from ejecutor import EjecutorConsultas
+from tablas import (TablaModel, Columna, ColorPorValor, ACCIONES, CENTRO, DERECHA, fecha, moneda,
+                    recortado, filtroIgual, filtroFecha, filtroPrefijo, filtroTexto, tablaConFiltros)
+from sincronizacion import Sincronizador
+from acciones import BotonesDelegate, Boton
+from importar import importarArchivo
 
-class UsuariosTableModel(QAbstractTableModel):
-    def __init__(self, data=None):
-        super().__init__()
-        self._data = data if data is not None else []
-        # Cabeceras de cada tabla.
-        self._headers = ["ID", "Nombre", "Correo", "Puesto", "Fecha Contratacion", "Salario", "Módulo", "Acciones"]
-        
-    def data(self, index, role):
-        if not index.isValid() or not (0 <= index.row() < len(self._data)):
-            return None
-            
-        if role == Qt.DisplayRole:
-            # para no mostrar valores en la columna de las acciones (7 en este caso)
-            if index.column() == 7:
-                return None
-                
-            value = self._data[index.row()][index.column()]
-            
-            # Darle el formato correcto a las fechas
-            if index.column() == 4 and isinstance(value, datetime):
-                return value.strftime("%Y-%m-%d")
-                
-            # Formato correcto al salario
-            if index.column() == 5:
-                return f"${value:,.2f}"
-                
-            return str(value)
-            
-        elif role == Qt.TextAlignmentRole:
-            # Alinear los valores de la columna de monto a la derecha
-            if index.column() == 5:
-                return Qt.AlignRight | Qt.AlignVCenter
-        return None
-        
-    def rowCount(self, parent=None):
-        return len(self._data)
-        
-    def columnCount(self, parent=None):
-        return 8  # 7 columnas de datos + 1 columna de acciones (Quitando contraseña)
-        
-    def headerData(self, section, orientation, role):
-        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
-            return self._headers[section]
-        return None
-        
-    def setData(self, index, value, role=Qt.EditRole):
-        if role == Qt.EditRole:
-            self._data[index.row()][index.column()] = value
-            self.dataChanged.emit(index, index)
-            return True
-        return False
-        
-    def refreshData(self, data):
-        self.beginResetModel()
-        self._data = data
-        self.endResetModel()
+# Consultas de lectura de la ventana; migrar.py --verificar corre EXPLAIN sobre estas mismas
+CONSULTA_USUARIOS = ConsultaPaginada("SELECT usu_id, usu_nombre, usu_correo, usu_puesto, usu_fecha_contratacion, usu_salario, usu_mod FROM usuario",
+                                     [("usu_nombre", 1, True), ("usu_id", 0, True)])
+CONSULTA_RRHH = ConsultaPaginada("""
+    SELECT reh_id, reh_usu_id, reh_estado, reh_tipo_contrato, reh_beneficios, reh_observaciones
+    FROM recursoshumanos
+""", [("reh_estado", 2, False), ("reh_usu_id", 1, False, True), ("reh_id", 0, False)])
 
-class EvaluacionTableModel(QAbstractTableModel):
-    def __init__(self, data=None):
-        super().__init__()
-        self._data = data if data is not None else []
-        # Cabeceras de cada tabla.
-        self._headers = ["ID", "ID del Usuario", "Fecha", "Puntaje", "Comentarios", "Acciones"]
-        
-    def data(self, index, role):
-        if not index.isValid() or not (0 <= index.row() < len(self._data)):
-            return None
-            
-        if role == Qt.DisplayRole:
-            # para no mostrar valores en la columna de las acciones (7 en este caso)
-            if index.column() == 5:
-                return None
-                
-            value = self._data[index.row()][index.column()]
-            
-            # Darle el formato correcto a las fechas
-            if index.column() == 2 and isinstance(value, datetime):
-                return value.strftime("%Y-%m-%d")
+def consultaEvaluaciones(usu_id):
+    """Retorna la consulta de las evaluaciones de un usuario."""
+    return ConsultaPaginada("SELECT * FROM evaluacion_desempeno", [("eva_fecha", 2, True), ("eva_id", 0, True)],
+                            "eva_usu_id = %s", (usu_id,))
 
-            return str(value)
-                
-            
-        elif role == Qt.TextAlignmentRole:
-            # Alinear los valores del puntaje a la derecha
-            if index.column() == 3:
-                return Qt.AlignRight | Qt.AlignVCenter
-            
-        return None
-        
-    def rowCount(self, parent=None):
-        return len(self._data)
-        
-    def columnCount(self, parent=None):
-        return 6  # 5 columnas de datos + 1 columna de acciones
-        
-    def headerData(self, section, orientation, role):
-        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
-            return self._headers[section]
-        return None
-        
-    def setData(self, index, value, role=Qt.EditRole):
-        if role == Qt.EditRole:
-            self._data[index.row()][index.column()] = value
-            self.dataChanged.emit(index, index)
-            return True
-        return False
-        
-    def refreshData(self, data):
-        self.beginResetModel()
-        self._data = data
-        self.endResetModel()
+class UsuariosTableModel(TablaModel):
+    # 7 columnas de datos + 1 columna de acciones (sin la contraseña)
+    columnas = [Columna("ID", campo="usu_id"),
+                Columna("Nombre", campo="usu_nombre", filtro=filtroPrefijo("usu_nombre")),
+                Columna("Correo", campo="usu_correo", filtro=filtroPrefijo("usu_correo")),
+                Columna("Puesto"), Columna("Fecha Contratacion", fecha), Columna("Salario", moneda, DERECHA),
+                Columna("Módulo", campo="usu_mod", nulos=True, filtro=filtroIgual("usu_mod")), ACCIONES]
 
-class RecursosHumanosTableModel(QAbstractTableModel):
-    def __init__(self, data=None):
-        super().__init__()
-        self._data = data if data is not None else []
-        # Cabeceras de cada tabla.
-        self._headers = ["ID", "Usuario ID", "Estado", "Tipo Contrato", "Beneficios", "Observaciones", "Acciones"]
-        
-    def data(self, index, role):
-        if not index.isValid() or not (0 <= index.row() < len(self._data)):
-            return None
-            
-        if role == Qt.DisplayRole:
-            # para no mostrar valores en la columna de las acciones (6 en este caso)
-            if index.column() == 6:
-                return None
-                
-            value = self._data[index.row()][index.column()]
-            
-            # Limitar la longitud de los textos largos para mejor visualización
-            if index.column() in [4, 5] and isinstance(value, str):
-                return value[:50] + "..." if len(value) > 50 else value
-                
-            return str(value)
-            
-        elif role == Qt.TextAlignmentRole:
-            # Alinear los valores al centro
-            return Qt.AlignCenter
-            
-        elif role == Qt.BackgroundRole:
-            # Colorear según el estado
-            estado = self._data[index.row()][2]
-            if estado == 'Activo':
-                return QColor(240, 255, 240)  # Verde claro
-            elif estado == 'Inactivo':
-                return QColor(255, 255, 240)  # Amarillo claro
-            else:  # Baja
-                return QColor(255, 240, 240)  # Rojo claro
-                
-        return None
-        
-    def rowCount(self, parent=None):
-        return len(self._data)
-        
-    def columnCount(self, parent=None):
-        return 7  # 6 columnas de datos + 1 columna de acciones
-        
-    def headerData(self, section, orientation, role):
-        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
-            return self._headers[section]
-        return None
-        
-    def setData(self, index, value, role=Qt.EditRole):
-        if role == Qt.EditRole:
-            self._data[index.row()][index.column()] = value
-            self.dataChanged.emit(index, index)
-            return True
-        return False
-        
-    def refreshData(self, data):
-        self.beginResetModel()
-        self._data = data
-        self.endResetModel()
+class EvaluacionTableModel(TablaModel):
+    columnas = [Columna("ID", campo="eva_id"), Columna("ID del Usuario"),
+                Columna("Fecha", fecha, campo="eva_fecha", filtro=filtroFecha("eva_fecha")),
+                Columna("Puntaje", alineacion=DERECHA, campo="eva_puntaje"),
+                Columna("Comentarios", filtro=filtroTexto("eva_comentarios")), ACCIONES]
+
+class RecursosHumanosTableModel(TablaModel):
+    # Los textos largos se recortan para mejor visualización
+    columnas = [Columna("ID", campo="reh_id"),
+                Columna("Usuario ID", campo="reh_usu_id", nulos=True, filtro=filtroIgual("reh_usu_id")),
+                Columna("Estado", campo="reh_estado", filtro=filtroIgual("reh_estado")),
+                Columna("Tipo Contrato", campo="reh_tipo_contrato", filtro=filtroIgual("reh_tipo_contrato")),
+                Columna("Beneficios", recortado(50)),
+                Columna("Observaciones", recortado(50), filtro=filtroTexto("reh_observaciones")), ACCIONES]
+    alineacion = CENTRO
+    # Colorear según el estado; cualquier otro (Baja) en rojo claro
+    color = ColorPorValor(2, {
+        'Activo': QColor(240, 255, 240),    # Verde claro
+        'Inactivo': QColor(255, 255, 240)   # Amarillo claro
+    }, QColor(255, 240, 240))
 
 # Dialog de editar/insertar datos a la  base de datos para usuario
 class UsuariosDialog(QDialog):
@@ -514,7 +385,14 @@ class RRHHWindow(QMainWindow):
         self.rrhh_data = []
         self.evaluacion_data = []
         self.latestUsuRow=0
+        # Refresco periodico con solo las filas que cambiaron; la primera marca se toma en segundo plano
+        self.sincronizador = Sincronizador(self)
+        # Las cargas de las tablas corren en segundo plano, la ventana no se congela
+        self.ejecutor = EjecutorConsultas(self)
         self.initUI(usu_id)
+        self.sincronizador.registrar(self.table_model, self.table_view_usu)
+        self.sincronizador.registrar(self.evaluacions_table_model, self.table_view_evaluacions)
+        self.sincronizador.registrar(self.rh_table_model, self.rh_table_view)
         self.loadDataMain(usu_id)
         
     def initUI(self, usu_id):
@@ -602,11 +480,10 @@ class RRHHWindow(QMainWindow):
         
         # Agregamos el logo a la toolbar
         logo_label = QLabel()
-        logo_pixmap = QPixmap("Logo-Grupo-Porteo.png")
+        logo_pixmap = imagenes.pixmap("Logo-Grupo-Porteo.png", 40)
         if logo_pixmap.isNull():
             print("Error: No se pudo cargar Logo-Grupo-Porteo.png")
         else:
-            logo_pixmap = logo_pixmap.scaled(40, 40, Qt.KeepAspectRatio, Qt.SmoothTransformation)
             logo_label.setPixmap(logo_pixmap)
         self.toolbar.addWidget(logo_label)
         
@@ -665,6 +542,11 @@ class RRHHWindow(QMainWindow):
         # Modelo de insercion para la tabla de usuarios
         self.table_model = UsuariosTableModel()
         self.table_view_usu.setModel(self.table_model)
+        # Botones de la ultima columna, los pinta un delegate en lugar de crear widgets por fila
+        self.table_view_usu.setItemDelegateForColumn(7, BotonesDelegate(self.table_view_usu, [
+            Boton("Editar", lambda r: self.editUserRecord(r, usu_id)),
+            Boton("Eliminar", lambda r: self.deleteUserRecord(r, usu_id), eliminar=True),
+            Boton("Evals", lambda r: self.toggleEvaluacionsTable(r, usu_id))]))
 
         # Configurar el ancho de las columnas
         header = self.table_view_usu.horizontalHeader()
@@ -672,7 +554,7 @@ class RRHHWindow(QMainWindow):
         header.setSectionResizeMode(7, QHeaderView.Fixed)  # Fijamos el ancho de la columna 7
         header.resizeSection(7, 300)
         
-        splitter.addWidget(self.table_view_usu)
+        splitter.addWidget(tablaConFiltros(self.table_view_usu))
 
         self.table_view_evaluacions = QTableView()
         self.table_view_evaluacions.setAlternatingRowColors(True)
@@ -685,6 +567,9 @@ class RRHHWindow(QMainWindow):
 
         self.evaluacions_table_model = EvaluacionTableModel()
         self.table_view_evaluacions.setModel(self.evaluacions_table_model)
+        self.table_view_evaluacions.setItemDelegateForColumn(5, BotonesDelegate(self.table_view_evaluacions, [
+            Boton("Editar", lambda r: self.editEvalRecord(r, usu_id)),
+            Boton("Eliminar", lambda r: self.deleteEvalRecord(r, usu_id), eliminar=True)]))
 
         # Configurar el ancho de las columnas
         header2 = self.table_view_evaluacions.horizontalHeader()
@@ -692,7 +577,7 @@ class RRHHWindow(QMainWindow):
         header2.setSectionResizeMode(4, QHeaderView.Fixed)  # Fijamos el ancho de la columna 4
         header2.resizeSection(4, 300)
 
-        splitter.addWidget(self.table_view_evaluacions)
+        splitter.addWidget(tablaConFiltros(self.table_view_evaluacions))
         self.table_view_evaluacions.hide()
         
         # Le configuramos el tamaño inicial a los componetes dentro del splitter
@@ -708,6 +593,11 @@ class RRHHWindow(QMainWindow):
         new_action.clicked.connect(lambda: self.addUserRecord(usu_id))
         button_panel.addWidget(new_action)
         
+        # Carga masiva de usuarios desde CSV o XLSX
+        import_action = QPushButton(QIcon.fromTheme("document-import"), "Importar Usuarios", self)
+        import_action.clicked.connect(lambda: importarArchivo(self, "usuario", al_importar=lambda: self.loadDataMain(usu_id)))
+        button_panel.addWidget(import_action)
+        
         refresh_action = QPushButton(QIcon.fromTheme("view-refresh"), "Actualizar Usuario", self)
         refresh_action.clicked.connect(lambda: self.loadDataMain(usu_id))
         button_panel.addWidget(refresh_action)
@@ -744,6 +634,10 @@ class RRHHWindow(QMainWindow):
         # Modelo para la tabla de RH
         self.rh_table_model = RecursosHumanosTableModel()
         self.rh_table_view.setModel(self.rh_table_model)
+        self.rh_table_view.setItemDelegateForColumn(6, BotonesDelegate(self.rh_table_view, [
+            Boton("Editar", lambda r: self.editRHRecord(r, usu_id)),
+            Boton("Cambiar Estado", lambda r: self.toggleRHStatus(r, usu_id), ancho=130),
+            Boton("Eliminar", lambda r: self.deleteRRHHRecord(r, usu_id))]))
 
         # Configurar el ancho de las columnas
         header = self.rh_table_view.horizontalHeader()
@@ -754,7 +648,7 @@ class RRHHWindow(QMainWindow):
         #header.setSectionResizeMode(6, QHeaderView.Fixed)
         #header.resizeSection(6, 600)
 
-        rh_layout.addWidget(self.rh_table_view)
+        rh_layout.addWidget(tablaConFiltros(self.rh_table_view))
 
         # Panel de botones
         button_panel = QHBoxLayout()
@@ -778,75 +672,24 @@ class RRHHWindow(QMainWindow):
         
     def connectToDatabase(self):
         try:
-            load_dotenv()
-            self.db_connection = mysql.connector.connect(
-                host=os.environ.get("DB_HOST"),
-                database=os.environ.get("DB_DATABASE"),
-                user=os.environ.get("DB_USER"),
-                password=os.environ.get("DB_PASSWORD")
-            )
+            # Conexion prestada del pool compartido, close() la regresa al pool
+            self.db_connection = obtenerConexion()
             return True
         except mysql.connector.Error as err:
             QMessageBox.critical(self, "Error de base de datos", f"No se pudo conectar: {err}")
             return False
             
+    def mostrarErrorCarga(self, que):
+        """Retorna la funcion que muestra el error de una carga en segundo plano."""
+        return lambda err: QMessageBox.critical(self, "Error de base de datos", f"Error al cargar {que}: {err}")
+
     def loadDataMain(self, usu_id):
-        if not self.connectToDatabase():
-            return
-            
-        try:
-            cursor = self.db_connection.cursor()
-            
-            # Get all finance records
-            cursor.execute("SELECT usu_id, usu_nombre, usu_correo, usu_puesto, usu_fecha_contratacion, usu_salario, usu_mod FROM usuario ORDER BY usu_nombre DESC")
-            self.user_data = cursor.fetchall()
-            
-            # Actualizamos los datos de la tabla
-            self.table_model.refreshData(self.user_data)
-            # Configurar las funciones en la ultima columna
-            for row in range(len(self.user_data)):
-                # Create a widget to hold the buttons
-                widget = QWidget()
-                layout = QHBoxLayout(widget)
-                layout.setContentsMargins(4, 4, 4, 4)
-                
-                # Boton de editar
-                edit_btn = QPushButton("Editar")
-                edit_btn.setFixedWidth(90)
-                edit_btn.setFixedHeight(30)
-                edit_btn.clicked.connect(lambda _, r=row: self.editUserRecord(r, usu_id))
-                layout.addWidget(edit_btn)
-                
-                # Boton de eliminar
-                delete_btn = QPushButton("Eliminar")
-                delete_btn.setObjectName("deleteBtn")
-                delete_btn.setFixedWidth(90)
-                delete_btn.setFixedHeight(30)
-                delete_btn.clicked.connect(lambda _, r=row: self.deleteUserRecord(r, usu_id))
-                layout.addWidget(delete_btn)
-                
-                # Evaluacion button
-                evaluation_btn = QPushButton("Evals")
-                evaluation_btn.setObjectName("evaluacionBtn")
-                evaluation_btn.setFixedWidth(90)
-                evaluation_btn.setFixedHeight(30)
-                #evaluation_btn.clicked.connect(self.toggleEvaluacionsTable)
-                evaluation_btn.clicked.connect(lambda _, r=row: self.toggleEvaluacionsTable(r, usu_id))
-                layout.addWidget(evaluation_btn)
-                
-                layout.setAlignment(Qt.AlignCenter)
-                widget.setLayout(layout)
-                
-                # Configurar el widget en la tabla, en la columna 7 (excluyendo contraseña)
-                self.table_view_usu.setIndexWidget(self.table_model.index(row, 7), widget)
-                
-            cursor.close()
-            
-        except mysql.connector.Error as err:
-            QMessageBox.critical(self, "Error de base de datos", f"Error al cargar datos: {err}")
-        finally:
-            if self.db_connection:
-                self.db_connection.close()
+        # Cargamos los usuarios por paginas (keyset sobre nombre, id), en segundo plano
+        self.ejecutor.ejecutar(lambda cursor: leerConsulta(CONSULTA_USUARIOS, cursor), self.mostrarDataMain,
+                               self.mostrarErrorCarga("datos"), grupo="usuarios")
+
+    def mostrarDataMain(self, user_data):
+        self.user_data = self.table_model.mostrarConsulta(user_data)
 
     def loadDataEvaluation(self, row_usu, usu_id):
         record = self.user_data[row_usu] # usamos user_data por que queremos recuperar
@@ -856,39 +699,10 @@ class RRHHWindow(QMainWindow):
             return
             
         try:
-            cursor = self.db_connection.cursor()
-            query = """SELECT * FROM evaluacion_desempeno WHERE eva_usu_id=%s ORDER BY eva_fecha DESC"""
-            cursor.execute(query, (record[0], ))
-            self.evaluacion_data = cursor.fetchall()
-            # Actualizamos los datos de la tabla
-            self.evaluacions_table_model.refreshData(self.evaluacion_data)
-            # Configurar las funciones en la ultima columna
-            for row in range(len(self.evaluacion_data)):
-                # Create a widget to hold the buttons
-                widget = QWidget()
-                layout = QHBoxLayout(widget)
-                layout.setContentsMargins(4, 4, 4, 4)
-                
-                # Boton de editar
-                edit_btn = QPushButton("Editar")
-                edit_btn.setFixedWidth(90)
-                edit_btn.setFixedHeight(30)
-                edit_btn.clicked.connect(lambda _, r=row: self.editEvalRecord(r, usu_id))
-                layout.addWidget(edit_btn)
-                
-                # Boton de eliminar
-                delete_btn = QPushButton("Eliminar")
-                delete_btn.setObjectName("deleteBtn")
-                delete_btn.setFixedWidth(90)
-                delete_btn.setFixedHeight(30)
-                delete_btn.clicked.connect(lambda _, r=row: self.deleteEvalRecord(r, usu_id))
-                layout.addWidget(delete_btn)
-                
-                layout.setAlignment(Qt.AlignCenter)
-                widget.setLayout(layout)
-                
-                # Configurar el widget en la tabla, en la columna 5
-                self.table_view_evaluacions.setIndexWidget(self.evaluacions_table_model.index(row, 5), widget)
+            # Se repite en cada click de la tabla de usuarios: sentencia preparada de la conexion
+            cursor = self.db_connection.cursor(prepared=True)
+            # Evaluaciones del usuario; el modelo guarda la consulta para releer filas sueltas
+            self.evaluacion_data = self.evaluacions_table_model.cargarLista(consultaEvaluaciones(record[0]), cursor)
                 
             cursor.close()
             
@@ -899,65 +713,12 @@ class RRHHWindow(QMainWindow):
                 self.db_connection.close()
 
     def loadRHData(self, usu_id):
-        if not self.connectToDatabase():
-            return
-            
-        try:
-            cursor = self.db_connection.cursor()
-            
-            # Get all RH records
-            cursor.execute("""
-                SELECT reh_id, reh_usu_id, reh_estado, reh_tipo_contrato, 
-                    reh_beneficios, reh_observaciones 
-                FROM recursoshumanos 
-                ORDER BY reh_estado, reh_usu_id
-            """)
-            self.rrhh_data = cursor.fetchall()
-            
-            # Actualizamos los datos de la tabla
-            self.rh_table_model.refreshData(self.rrhh_data)
-            
-            # Configurar las funciones en la ultima columna
-            for row in range(len(self.rrhh_data)):
-                # Create a widget to hold the buttons
-                widget = QWidget()
-                layout = QHBoxLayout(widget)
-                layout.setContentsMargins(4, 4, 4, 4)
-                
-                # Boton de editar
-                edit_btn = QPushButton("Editar")
-                edit_btn.setFixedWidth(90)
-                edit_btn.setFixedHeight(30)
-                edit_btn.clicked.connect(lambda _, r=row: self.editRHRecord(r, usu_id))
-                layout.addWidget(edit_btn)
-                
-                # Boton de cambiar estado
-                status_btn = QPushButton("Cambiar Estado")
-                status_btn.setFixedWidth(130)
-                status_btn.setFixedHeight(30)
-                status_btn.clicked.connect(lambda _, r=row: self.toggleRHStatus(r, usu_id))
-                layout.addWidget(status_btn)
+        # Los registros de RH se cargan por paginas (keyset sobre estado, usuario, id)
+        self.ejecutor.ejecutar(lambda cursor: leerConsulta(CONSULTA_RRHH, cursor), self.mostrarRHData,
+                               self.mostrarErrorCarga("datos"), grupo="rrhh")
 
-                # Boton de Eliminar
-                delete_btn = QPushButton("Eliminar")
-                delete_btn.setFixedWidth(90)
-                delete_btn.setFixedHeight(30)
-                delete_btn.clicked.connect(lambda _, r=row: self.deleteRRHHRecord(r, usu_id))
-                layout.addWidget(delete_btn)
-                
-                layout.setAlignment(Qt.AlignCenter)
-                widget.setLayout(layout)
-                
-                # Configurar el widget en la tabla
-                self.rh_table_view.setIndexWidget(self.rh_table_model.index(row, 6), widget)
-                
-            cursor.close()
-            
-        except mysql.connector.Error as err:
-            QMessageBox.critical(self, "Error de base de datos", f"Error al cargar datos: {err}")
-        finally:
-            if self.db_connection:
-                self.db_connection.close()
+    def mostrarRHData(self, rrhh_data):
+        self.rrhh_data = self.rh_table_model.mostrarConsulta(rrhh_data)
 
     def addUserRecord(self, usu_id):
         dialog = UsuariosDialog(self)
@@ -987,10 +748,11 @@ class RRHHWindow(QMainWindow):
                 ))
                 
                 self.db_connection.commit()
+                # Solo se agrega la fila nueva, sin volver a cargar la tabla
+                self.table_model.releerFila(cursor, "usu_id", cursor.lastrowid)
                 cursor.close()
                 
                 QMessageBox.information(self, "Éxito", "Registro agregado correctamente")
-                self.loadDataMain(usu_id)
                 
             except mysql.connector.Error as err:
                 QMessageBox.critical(self, "Error de base de datos", f"Error al agregar registro: {err}")
@@ -1022,12 +784,13 @@ class RRHHWindow(QMainWindow):
                 ))
                 
                 self.db_connection.commit()
+                if self.table_view_evaluacions.isVisible():
+                    # Si es de otro usuario el filtro de la consulta la deja fuera
+                    self.evaluacions_table_model.releerFila(cursor, "eva_id", cursor.lastrowid)
                 cursor.close()
                 
                 QMessageBox.information(self, "Éxito", "Registro agregado correctamente")
-                if self.table_view_evaluacions.isVisible():
-                    self.loadDataEvaluation(self.latestUsuRow,usu_id)
-                else:
+                if not self.table_view_evaluacions.isVisible():
                     self.table_view_evaluacions.show()
                     self.loadDataEvaluation(self.latestUsuRow,usu_id)
                 
@@ -1062,10 +825,10 @@ class RRHHWindow(QMainWindow):
                 ))
                 
                 self.db_connection.commit()
+                self.rh_table_model.releerFila(cursor, "reh_id", cursor.lastrowid)
                 cursor.close()
                 
                 QMessageBox.information(self, "Éxito", "Registro de RH agregado correctamente")
-                self.loadRHData(usu_id)
                 
             except mysql.connector.Error as err:
                 QMessageBox.critical(self, "Error de base de datos", f"Error al agregar registro: {err}")
@@ -1104,10 +867,10 @@ class RRHHWindow(QMainWindow):
                 ))
                 
                 self.db_connection.commit()
+                self.table_model.releerFila(cursor, "usu_id", record[0], row)
                 cursor.close()
                 
                 QMessageBox.information(self, "Éxito", "Registro actualizado correctamente")
-                self.loadDataMain(usu_id)
                 
             except mysql.connector.Error as err:
                 QMessageBox.critical(self, "Error de base de datos", f"Error al actualizar registro: {err}")
@@ -1142,10 +905,10 @@ class RRHHWindow(QMainWindow):
                 ))
                 
                 self.db_connection.commit()
+                self.evaluacions_table_model.releerFila(cursor, "eva_id", record[0], row)
                 cursor.close()
                 
                 QMessageBox.information(self, "Éxito", "Registro actualizado correctamente")
-                self.loadDataEvaluation(self.latestUsuRow, usu_id)
                 
             except mysql.connector.Error as err:
                 QMessageBox.critical(self, "Error de base de datos", f"Error al actualizar registro: {err}")
@@ -1182,10 +945,10 @@ class RRHHWindow(QMainWindow):
                 ))
                 
                 self.db_connection.commit()
+                self.rh_table_model.releerFila(cursor, "reh_id", record[0], row)
                 cursor.close()
                 
                 QMessageBox.information(self, "Éxito", "Registro de RH actualizado correctamente")
-                self.loadRHData(usu_id)
                 
             except mysql.connector.Error as err:
                 QMessageBox.critical(self, "Error de base de datos", f"Error al actualizar registro: {err}")
@@ -1216,10 +979,10 @@ class RRHHWindow(QMainWindow):
                 cursor.execute(query, (record[0],))
                 
                 self.db_connection.commit()
+                self.table_model.quitarFila(row)
                 cursor.close()
                 
                 QMessageBox.information(self, "Éxito", "Registro eliminado correctamente")
-                self.loadDataMain(usu_id)
                 
             except mysql.connector.Error as err:
                 QMessageBox.critical(self, "Error de base de datos", f"Error al eliminar registro: {err}")
@@ -1250,10 +1013,10 @@ class RRHHWindow(QMainWindow):
                 cursor.execute(query, (record[0],))
                 
                 self.db_connection.commit()
+                self.evaluacions_table_model.quitarFila(row)
                 cursor.close()
                 
                 QMessageBox.information(self, "Éxito", "Registro eliminado correctamente")
-                self.loadDataEvaluation(self.latestUsuRow, usu_id)
                 
             except mysql.connector.Error as err:
                 QMessageBox.critical(self, "Error de base de datos", f"Error al eliminar registro: {err}")
@@ -1284,10 +1047,10 @@ class RRHHWindow(QMainWindow):
                 cursor.execute(query, (record[0],))
                 
                 self.db_connection.commit()
+                self.rh_table_model.quitarFila(row)
                 cursor.close()
                 
                 QMessageBox.information(self, "Éxito", "Registro eliminado correctamente")
-                self.loadRHData(usu_id)
                 
             except mysql.connector.Error as err:
                 QMessageBox.critical(self, "Error de base de datos", f"Error al eliminar registro: {err}")
@@ -1336,10 +1099,10 @@ class RRHHWindow(QMainWindow):
                 cursor.execute(query, (new_status, record[0]))
                 
                 self.db_connection.commit()
+                self.rh_table_model.releerFila(cursor, "reh_id", record[0], row)
                 cursor.close()
                 
                 QMessageBox.information(self, "Éxito", "Estado actualizado correctamente")
-                self.loadRHData(usu_id)
                 
             except mysql.connector.Error as err:
                 QMessageBox.critical(self, "Error de base de datos", f"Error al actualizar estado: {err}")
@@ -0,0 +1,101 @@
+# Tablas de resumen para los tableros de GestionWindow.
+# Las graficas de Gestion agrupaban las tablas completas en cada cambio de modulo
+# (DATE_FORMAT(fecha, '%Y-%m') ... GROUP BY mes, que no puede usar un indice), y
+# el costo crecia con cada año de historia. La migracion 005_resumenes.sql crea
+# una tabla de resumen por grafica, con el monto y el numero de filas de cada
+# grupo, y triggers AFTER INSERT/UPDATE/DELETE que suman la fila nueva y restan
+# la anterior. Los tableros leen el resumen: una fila por mes o por estado.
+#
+# Los grupos que se quedan sin filas conservan su renglon con <prefijo>_num = 0;
+# las consultas de este modulo los descartan.
+#
+# Uso:
+#   python3 resumenes.py --reconstruir   -> vuelve a calcular los resumenes desde las tablas
+import argparse
+from conexion import obtenerConexion
+
+# resumen -> (tabla de origen, prefijo, [(columna del resumen, columna de origen)],
+#             columna del monto o None si solo se cuentan filas)
+# La columna "mes" agrupa por DATE_FORMAT(columna, '%Y-%m')
+RESUMENES = {
+    "resumen_finanza_mes": ("finanza", "rfm", [("mes", "fin_fecha"), ("tipo", "fin_tipo")], "fin_monto"),
+    "resumen_compra_mes": ("compra", "rcm", [("mes", "com_fecha_compra")], "com_monto_total"),
+    "resumen_venta_mes": ("venta", "rvm", [("mes", "ven_fecha_venta"), ("estado", "ven_estado")], "ven_monto_total"),
+    "resumen_logistica_estado": ("logistica", "rle", [("estado", "log_estado")], None),
+    "resumen_mantenimiento_estado": ("mantenimiento", "rme", [("estado", "man_estado")], None),
+}
+
+def expresionGrupo(nombre, columna, fila=None):
+    """Expresion de MySQL del grupo nombre; fila ("NEW" u "OLD") para usarla en un trigger."""
+    if fila is not None:
+        columna = f"{fila}.{columna}"
+    return f"DATE_FORMAT({columna}, '%Y-%m')" if nombre == "mes" else columna
+
+def columnasResumen(resumen):
+    """Retorna las columnas de resumen: las del grupo, el monto (si tiene) y el numero de filas."""
+    _, prefijo, grupos, monto = RESUMENES[resumen]
+    columnas = [f"{prefijo}_{nombre}" for nombre, _ in grupos]
+    if monto:
+        columnas.append(f"{prefijo}_monto")
+    return columnas + [f"{prefijo}_num"]
+
+def sentenciasReconstruir(resumen):
+    """Retorna las sentencias que vuelven a llenar resumen desde su tabla de origen."""
+    tabla, _, grupos, monto = RESUMENES[resumen]
+    expresiones = [expresionGrupo(nombre, columna) for nombre, columna in grupos]
+    if monto:
+        expresiones.append(f"SUM({monto})")
+    return [
+        f"DELETE FROM {resumen}",
+        f"INSERT INTO {resumen} ({', '.join(columnasResumen(resumen))}) "
+        f"SELECT {', '.join(expresiones)}, COUNT(*) FROM {tabla} "
+        f"GROUP BY {', '.join(str(i + 1) for i in range(len(grupos)))}",
+    ]
+
+def reconstruir(cursor, resumenes=None):
+    """Vuelve a calcular los resumenes (todos por defecto). No hace commit."""
+    for resumen in resumenes or RESUMENES:
+        for sentencia in sentenciasReconstruir(resumen):
+            cursor.execute(sentencia)
+
+def consultarComprasMes(cursor):
+    """Retorna [("YYYY-MM", monto)] de las compras de cada mes."""
+    cursor.execute("SELECT rcm_mes, rcm_monto FROM resumen_compra_mes WHERE rcm_num > 0 ORDER BY rcm_mes")
+    return cursor.fetchall()
+
+def consultarVentasMes(cursor):
+    """Retorna [("YYYY-MM", monto)] de las ventas de cada mes, de todos los estados."""
+    cursor.execute("""
+        SELECT rvm_mes, SUM(rvm_monto) FROM resumen_venta_mes
+        WHERE rvm_num > 0 GROUP BY rvm_mes ORDER BY rvm_mes
+    """)
+    return cursor.fetchall()
+
+def consultarEstados(cursor, resumen):
+    """Retorna [(estado, numero de filas)] de resumen_logistica_estado o resumen_mantenimiento_estado."""
+    prefijo = RESUMENES[resumen][1]
+    cursor.execute(f"SELECT {prefijo}_estado, {prefijo}_num FROM {resumen} WHERE {prefijo}_num > 0 "
+                   f"ORDER BY {prefijo}_estado")
+    return cursor.fetchall()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mantenimiento de las tablas de resumen")
+    parser.add_argument("--reconstruir", action="store_true",
+                        help="vuelve a calcular los resumenes desde las tablas de origen")
+    args = parser.parse_args(argv)
+    if not args.reconstruir:
+        parser.print_help()
+        return 0
+    conexion = obtenerConexion()
+    try:
+        cursor = conexion.cursor()
+        reconstruir(cursor)
+        conexion.commit()
+        cursor.close()
+    finally:
+        conexion.close()
+    print(f"{len(RESUMENES)} resumenes reconstruidos")
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
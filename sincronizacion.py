@@ -0,0 +1,247 @@
+# Refresco incremental de las tablas abiertas ("lo que cambio desde el cursor X").
+# La migracion 002_control_cambios.sql agrega a cada tabla una columna
+# <prefijo>_modificado (con indice) y una version por fila, y deja una lapida en
+# registro_borrado por cada DELETE. Con eso, en lugar de releer una tabla completa
+# cada vez, se piden solo:
+#   - las filas modificadas desde el cursor que cumplen el filtro de la consulta
+#   - las llaves modificadas que ya no lo cumplen (salen de la vista)
+#   - las llaves borradas desde el cursor
+# El cursor es la hora del servidor (NOW(6)) de la sincronizacion anterior. Se
+# piden los cambios desde MARGEN_SEGUNDOS antes del cursor: una transaccion que
+# modifico una fila antes del cursor pero hizo commit despues tambien se ve.
+# Volver a aplicar una fila que ya estaba al dia no cambia nada.
+#
+# Sincronizador revisa cada ERP_SINCRONIZAR segundos (.env, 0 desactiva) los
+# modelos registrados cuya tabla esta visible y les aplica los cambios con
+# PagedTableModel.aplicarCambios(); si no se pueden aplicar fila por fila se
+# recarga solo ese modelo.
+#
+# Uso:
+#   python3 sincronizacion.py --purgar        -> borra las lapidas de mas de RETENCION_DIAS
+import argparse
+import datetime
+import os
+import re
+from PyQt5.QtCore import QObject, QTimer
+from conexion import obtenerConexion
+from ejecutor import EjecutorConsultas
+
+# tabla -> (prefijo de las columnas de control, llave primaria)
+TABLAS = {
+    "usuario": ("usu", "usu_id"),
+    "finanza": ("fin", "fin_id"),
+    "recursoshumanos": ("reh", "reh_id"),
+    "evaluacion_desempeno": ("eva", "eva_id"),
+    "logistica": ("log", "log_id"),
+    "almacen": ("alm", "alm_id"),
+    "inventario": ("inv", "inv_id"),
+    "solicitud_compra": ("sol", "sol_id"),
+    "compra": ("com", "com_id"),
+    "venta": ("ven", "ven_id"),
+    "mantenimiento": ("man", "man_id"),
+    "incidencia": ("inc", "inc_id"),
+    "detalle_venta": ("dv", "dv_id"),
+    "detalle_compra": ("dc", "dc_id"),
+    "detalle_solicitud": ("ds", "ds_id"),
+}
+
+MARGEN_SEGUNDOS = 10
+# Las lapidas se conservan RETENCION_DIAS; un cursor mas viejo pide recargar la tabla
+RETENCION_DIAS = 7
+# Con mas filas cambiadas que esto es mas barato recargar la primera pagina
+MAX_CAMBIOS = 200
+
+_TABLA = re.compile(r"\bFROM\s+(\w+)", re.IGNORECASE)
+
+def intervaloSincronizacion():
+    """Segundos entre sincronizaciones (ERP_SINCRONIZAR, por defecto 30; 0 desactiva)."""
+    try:
+        return max(0, int(os.environ.get("ERP_SINCRONIZAR", 30)))
+    except ValueError:
+        return 30
+
+def columnaModificado(tabla):
+    return f"{TABLAS[tabla][0]}_modificado"
+
+def tablaConsulta(consulta):
+    """Retorna la tabla del FROM de una ConsultaPaginada."""
+    coincidencia = _TABLA.search(consulta.select)
+    return coincidencia.group(1).lower() if coincidencia else None
+
+def _fecha(valor):
+    # bdmemoria (sqlite) regresa NOW(6) como texto
+    if isinstance(valor, str):
+        return datetime.datetime.fromisoformat(valor)
+    return valor
+
+def marcaActual(cursor):
+    """Retorna la hora del servidor, que sirve como cursor de la siguiente sincronizacion."""
+    cursor.execute("SELECT NOW(6)")
+    return _fecha(cursor.fetchone()[0])
+
+class Cambios:
+    def __init__(self, tabla, marca, completa=False):
+        self.tabla = tabla
+        self.marca = marca        # cursor para la siguiente sincronizacion
+        self.completa = completa  # True: no se puede calcular la diferencia, hay que recargar
+        self.filas = []           # filas nuevas o modificadas que cumplen el filtro
+        self.quitadas = set()     # llaves borradas o que ya no cumplen el filtro
+        self.posicion = 0         # posicion de la llave primaria en las filas
+
+    def __bool__(self):
+        return self.completa or bool(self.filas) or bool(self.quitadas)
+
+def leerCambios(cursor, consulta, desde, marca):
+    """Retorna los Cambios de la tabla de consulta entre desde y marca (cursores de marcaActual)."""
+    tabla = tablaConsulta(consulta)
+    if tabla not in TABLAS:
+        return Cambios(tabla, marca, completa=True)
+    if marca - desde > datetime.timedelta(days=RETENCION_DIAS):
+        return Cambios(tabla, marca, completa=True)  # las lapidas de ese periodo ya se purgaron
+    llave = TABLAS[tabla][1]
+    modificado = columnaModificado(tabla)
+    inicio = desde - datetime.timedelta(seconds=MARGEN_SEGUNDOS)
+    cambios = Cambios(tabla, marca)
+
+    # Filas modificadas que cumplen el filtro (indice por <prefijo>_modificado)
+    query, params = consulta.sqlDonde(f"{modificado} >= %s", (inicio,))
+    cursor.execute(query + " LIMIT %s", params + [MAX_CAMBIOS + 1])
+    cambios.filas = cursor.fetchall()
+    if len(cambios.filas) > MAX_CAMBIOS:
+        return Cambios(tabla, marca, completa=True)
+    cambios.posicion = [columna[0] for columna in cursor.description].index(llave)
+
+    if consulta.filtro:
+        # Modificadas que ya no cumplen el filtro; solo se leen las llaves
+        cursor.execute(f"SELECT {llave} FROM {tabla} WHERE {modificado} >= %s LIMIT %s",
+                       (inicio, MAX_CAMBIOS + 1))
+        modificadas = cursor.fetchall()
+        if len(modificadas) > MAX_CAMBIOS:
+            return Cambios(tabla, marca, completa=True)
+        vigentes = {fila[cambios.posicion] for fila in cambios.filas}
+        cambios.quitadas.update(valor for valor, in modificadas if valor not in vigentes)
+
+    cursor.execute("SELECT bor_llave FROM registro_borrado WHERE bor_tabla = %s AND bor_fecha >= %s",
+                   (tabla, inicio))
+    cambios.quitadas.update(valor for valor, in cursor.fetchall())
+    return cambios
+
+def purgarBorrados(cursor, dias=RETENCION_DIAS):
+    """Borra las lapidas de mas de dias y retorna cuantas se borraron. No hace commit."""
+    cursor.execute("DELETE FROM registro_borrado WHERE bor_fecha < NOW(6) - INTERVAL %s DAY", (dias,))
+    return cursor.rowcount
+
+class _Registro:
+    def __init__(self, modelo, vista, al_cambiar):
+        self.modelo = modelo
+        self.vista = vista
+        self.al_cambiar = al_cambiar
+        self.desde = None
+
+class Sincronizador(QObject):
+    # Un sincronizador por ventana; las consultas corren en su propio ejecutor
+    def __init__(self, parent=None, intervalo=None):
+        super().__init__(parent)
+        self.ejecutor = EjecutorConsultas(self, max_hilos=1)
+        self._registros = []
+        self._marca = None
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self.sincronizar)
+        segundos = intervaloSincronizacion() if intervalo is None else intervalo
+        if segundos <= 0:
+            return
+        # La primera marca se toma en segundo plano, no en el hilo de la interfaz
+        self._timer.start(segundos * 1000)
+        QTimer.singleShot(0, self.sincronizar)
+
+    def activo(self):
+        return self._timer.isActive()
+
+    def registrar(self, modelo, vista=None, al_cambiar=None):
+        """Mantiene al dia un PagedTableModel; solo se sincroniza mientras vista este visible.
+
+        al_cambiar se llama (una vez por sincronizacion) cuando el modelo recibio cambios,
+        por ejemplo para recalcular una grafica.
+        """
+        registro = _Registro(modelo, vista, al_cambiar)
+        registro.desde = self._marca
+        # Despues de una recarga completa el modelo esta al dia desde la ultima marca
+        modelo.modelReset.connect(lambda: setattr(registro, "desde", self._marca))
+        self._registros.append(registro)
+
+    def sincronizar(self):
+        if self.ejecutor.ocupado("sincronizacion"):
+            return
+        if self._marca is None:
+            self.ejecutor.ejecutar(marcaActual, self._iniciar, self._fallo, grupo="sincronizacion")
+            return
+        pendientes = []
+        for registro in self._registros:
+            if registro.vista is not None and not registro.vista.isVisible():
+                continue  # se pone al dia cuando se vuelva a mostrar
+            consulta = registro.modelo.consulta
+            if consulta is None or registro.desde is None:
+                continue
+            pendientes.append((registro, consulta, registro.desde))
+        if not pendientes:
+            return
+
+        def consultar(cursor):
+            marca = marcaActual(cursor)
+            return marca, [leerCambios(cursor, consulta, desde, marca) for _, consulta, desde in pendientes]
+
+        self.ejecutor.ejecutar(consultar, lambda resultado: self._aplicar(pendientes, resultado),
+                               self._fallo, grupo="sincronizacion")
+
+    def _iniciar(self, marca):
+        # Los modelos registrados antes de la primera marca quedan al dia desde ella;
+        # MARGEN_SEGUNDOS cubre lo que cambio entre su carga y la marca
+        self._marca = marca
+        for registro in self._registros:
+            if registro.desde is None:
+                registro.desde = marca
+
+    def _aplicar(self, pendientes, resultado):
+        marca, lista = resultado
+        self._marca = marca
+        avisos = []
+        for (registro, consulta, desde), cambios in zip(pendientes, lista):
+            if registro.modelo.consulta is not consulta or registro.desde != desde:
+                continue  # el modelo se recargo mientras se consultaba
+            registro.desde = marca
+            if not cambios:
+                continue
+            if not registro.modelo.aplicarCambios(cambios):
+                registro.modelo.recargarConsulta()
+            if registro.al_cambiar is not None and registro.al_cambiar not in avisos:
+                avisos.append(registro.al_cambiar)
+        for aviso in avisos:
+            aviso()
+
+    def _fallo(self, mensaje):
+        # Normalmente falta aplicar la migracion 002; no se insiste en cada intervalo
+        print(f"Sincronizacion desactivada: {mensaje}")
+        self._timer.stop()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Mantenimiento del control de cambios")
+    parser.add_argument("--purgar", action="store_true", help="borra las lapidas de registro_borrado viejas")
+    parser.add_argument("--dias", type=int, default=RETENCION_DIAS,
+                        help=f"dias de lapidas que se conservan (por defecto {RETENCION_DIAS})")
+    args = parser.parse_args(argv)
+    if not args.purgar:
+        parser.print_help()
+        return 0
+    conexion = obtenerConexion()
+    try:
+        cursor = conexion.cursor()
+        borradas = purgarBorrados(cursor, args.dias)
+        conexion.commit()
+        cursor.close()
+    finally:
+        conexion.close()
+    print(f"{borradas} lapidas borradas")
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,465 @@
+# Modelo de tabla configurado con un esquema de columnas.
+# Cada ventana tenia su propio QAbstractTableModel con un data() casi igual:
+# en cada repintado y para cada celda llamaba str() o strftime y armaba de nuevo
+# el diccionario de QColor del estado. Aqui los modelos solo declaran sus
+# columnas (titulo, formato, alineacion) y, si colorean la fila, la columna y los
+# colores de cada valor:
+#
+#   class AlmacenTableModel(TablaModel):
+#       columnas = [Columna("ID"), Columna("Nombre"), Columna("Ubicación"), ACCIONES]
+#
+# Los textos y colores se calculan por bloques de TAMANO_PAGINA filas, una
+# columna a la vez, y se guardan por columna: una lista de textos por columna y
+# un array de bytes con el indice del color de cada fila. data() solo busca en
+# el bloque. Los valores de las filas no se copian aqui: quedan en las paginas
+# de PagedTableModel, que ya los guardan por columnas en arrays tipados
+# (paginacion.PaginaColumnas). Los bloques se descartan cuando esas filas
+# cambian y solo se conservan MAX_BLOQUES, como las paginas.
+#
+# Orden y filtros del lado del servidor: las columnas con campo (columna de
+# MySQL, normalmente con indice) se ordenan con un click en el encabezado y las
+# que tienen filtro aparecen en la BarraFiltros de la tabla. El modelo arma una
+# variante de la ConsultaPaginada de la ventana (ORDER BY campo, llave y las
+# condiciones con parametros) y la vuelve a leer por paginas; nada se ordena ni
+# se filtra en Python. Las columnas de texto libre se filtran con filtroTexto,
+# que busca las palabras en el indice FULLTEXT (busqueda.py).
+#
+# ReporteModel es para los reportes de solo lectura (reporte mensual de
+# Logistica y Ventas): guarda el resultado por columnas, da formato solo a las
+# celdas que se pintan y calcula los subtotales y el total en una pasada al
+# cargar, en lugar de un QStandardItem con su texto por cada celda.
+import datetime
+from array import array
+from bisect import bisect_left
+from collections import OrderedDict
+from PyQt5.QtCore import Qt, QTimer, QAbstractTableModel
+from PyQt5.QtGui import QColor, QFont
+from PyQt5.QtWidgets import QHBoxLayout, QLineEdit, QVBoxLayout, QWidget
+from paginacion import PagedTableModel, TAMANO_PAGINA
+from busqueda import condicionTexto
+
+MAX_BLOQUES = 25
+# Milisegundos sin escribir antes de aplicar un filtro
+ESPERA_FILTRO = 400
+CENTRO = Qt.AlignCenter
+DERECHA = Qt.AlignRight | Qt.AlignVCenter
+
+# Formatos de celda: reciben el valor de la columna y retornan el texto
+def texto(valor):
+    return str(valor)
+
+def fecha(valor):
+    return valor.strftime("%Y-%m-%d") if hasattr(valor, "strftime") else str(valor)
+
+def moneda(valor):
+    return f"${valor:,.2f}" if valor is not None else str(valor)
+
+def unidades(valor):
+    return f"{valor} unidades"
+
+def recortado(largo=50):
+    """Formato que limita los textos largos a largo caracteres."""
+    def formato(valor):
+        if isinstance(valor, str):
+            return valor[:largo] + "..." if len(valor) > largo else valor
+        return str(valor)
+    return formato
+
+# Filtros de columna: filtroX(campo) retorna la funcion texto -> (condicion, valores),
+# o None si el texto no sirve para ese filtro
+def filtroPrefijo(campo):
+    def filtro(valor):
+        # LIKE 'texto%' puede usar el indice de campo; ! como escape (igual en MySQL y sqlite)
+        escapado = valor.replace("!", "!!").replace("%", "!%").replace("_", "!_")
+        return f"{campo} LIKE %s ESCAPE '!'", (escapado + "%",)
+    return filtro
+
+def filtroIgual(campo):
+    return lambda valor: (f"{campo} = %s", (valor,))
+
+def filtroFecha(campo):
+    def filtro(valor):
+        # "2024", "2024-03" o "2024-03-15" -> rango de fechas
+        try:
+            numeros = [int(parte) for parte in valor.split("-")]
+            if len(numeros) == 1:
+                inicio, fin = datetime.date(numeros[0], 1, 1), datetime.date(numeros[0], 12, 31)
+            elif len(numeros) == 2:
+                inicio = datetime.date(numeros[0], numeros[1], 1)
+                siguiente = datetime.date(numeros[0] + numeros[1] // 12, numeros[1] % 12 + 1, 1)
+                fin = siguiente - datetime.timedelta(days=1)
+            elif len(numeros) == 3:
+                inicio = fin = datetime.date(*numeros)
+            else:
+                return None
+        except ValueError:
+            return None
+        return f"{campo} BETWEEN %s AND %s", (inicio, fin)
+    return filtro
+
+def filtroTexto(campo):
+    # Todas las palabras, como prefijo y en cualquier orden; campo necesita indice FULLTEXT
+    return lambda valor: condicionTexto(campo, valor)
+
+class Columna:
+    # posicion: indice del valor en la fila (por defecto el de la columna)
+    # formato: funcion valor -> texto; None deja la celda vacia (columna de acciones)
+    # campo: columna de MySQL; con campo la tabla se puede ordenar por esta columna
+    # nulos: True si campo acepta NULL (lo necesita el keyset de paginacion)
+    # filtro: filtroPrefijo(campo), filtroIgual(campo), filtroFecha(campo) o filtroTexto(campo)
+    #         para la BarraFiltros
+    def __init__(self, titulo, formato=texto, alineacion=None, posicion=None, campo=None, nulos=False, filtro=None):
+        self.titulo = titulo
+        self.formato = formato
+        self.alineacion = alineacion
+        self.posicion = posicion
+        self.campo = campo
+        self.nulos = nulos
+        self.filtro = filtro
+
+ACCIONES = Columna("Acciones", formato=None)
+
+class ColorPorValor:
+    # Color de fondo de toda la fila segun el valor de fila[posicion]
+    def __init__(self, posicion, colores, predeterminado=QColor(255, 255, 255)):
+        self.posicion = posicion
+        self.paleta = list(colores.values()) + [predeterminado]
+        self._indices = {valor: i for i, valor in enumerate(colores)}
+        self._predeterminado = len(self.paleta) - 1
+
+    def indice(self, fila):
+        return self._indices.get(fila[self.posicion], self._predeterminado)
+
+class _Bloque:
+    def __init__(self, textos, colores):
+        self.textos = textos    # una lista de textos por columna
+        self.colores = colores  # array('B') con el indice en la paleta de cada fila, o None
+
+class TablaModel(PagedTableModel):
+    columnas = []
+    color = None  # ColorPorValor o None
+    alineacion = None  # alineacion de las columnas que no definen una
+
+    def __init__(self, data=None, columnas=None):
+        super().__init__(data)
+        if columnas is not None:
+            self.columnas = columnas
+        self._headers = [columna.titulo for columna in self.columnas]
+        self._posiciones = [i if columna.posicion is None else columna.posicion
+                            for i, columna in enumerate(self.columnas)]
+        self._alineaciones = [columna.alineacion if columna.alineacion is not None else self.alineacion
+                              for columna in self.columnas]
+        self._bloques = OrderedDict()  # numero de bloque -> _Bloque
+        self._ultimo = (None, None)    # (numero, bloque) del ultimo data()
+        self._orden = None             # (columna, descendente) elegido en el encabezado
+        self._filtros = {}             # columna -> texto de la BarraFiltros
+        self.modelReset.connect(self._limpiarBloques)
+        self.layoutChanged.connect(self._limpiarBloques)
+        self.rowsInserted.connect(lambda parent, inicio, fin: self._descartarDesde(inicio))
+        self.rowsRemoved.connect(lambda parent, inicio, fin: self._descartarDesde(inicio))
+        self.dataChanged.connect(lambda inicio, fin, roles=None: self._descartar(inicio.row(), fin.row()))
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.DisplayRole:
+            bloque = self._bloque(index.row())
+            if bloque is None:
+                return None
+            return bloque.textos[index.column()][index.row() % TAMANO_PAGINA]
+        if role == Qt.TextAlignmentRole:
+            return self._alineaciones[index.column()]
+        if role == Qt.BackgroundRole and self.color is not None:
+            bloque = self._bloque(index.row())
+            if bloque is None:
+                return None
+            return self.color.paleta[bloque.colores[index.row() % TAMANO_PAGINA]]
+        return None
+
+    def rowCount(self, parent=None):
+        return len(self._data)
+
+    def columnCount(self, parent=None):
+        return len(self.columnas)
+
+    def headerData(self, section, orientation, role):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self._headers[section]
+        return None
+
+    def columnasDatos(self):
+        """Retorna [(titulo, posicion en la fila)] de las columnas con datos (sin la de acciones)."""
+        return [(columna.titulo, posicion) for columna, posicion in zip(self.columnas, self._posiciones)
+                if columna.formato is not None]
+
+    def consultaVista(self, consulta):
+        """Retorna consulta con el orden y los filtros elegidos por el usuario."""
+        condiciones = []
+        for columna, valor in self._filtros.items():
+            condicion = self.columnas[columna].filtro(valor)
+            if condicion is not None:
+                condiciones.append(condicion)
+        orden = None
+        if self._orden is not None:
+            columna, descendente = self._orden
+            definicion = self.columnas[columna]
+            llave, posicion = consulta.orden[-1][:2]
+            # La llave primaria al final desempata y mantiene el keyset; con un indice
+            # sobre campo (InnoDB le agrega la llave) MySQL recorre el indice en orden
+            orden = [(llave, posicion, descendente)]
+            if definicion.campo != llave:
+                orden.insert(0, (definicion.campo, self._posiciones[columna], descendente, definicion.nulos))
+        if orden is None and not condiciones:
+            return consulta
+        return consulta.base.variante(orden, condiciones)
+
+    def cargarConsulta(self, consulta, cursor=None):
+        return super().cargarConsulta(self.consultaVista(consulta), cursor)
+
+    def cargarLista(self, consulta, cursor):
+        return super().cargarLista(self.consultaVista(consulta), cursor)
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        # QTableView lo llama al hacer click en el encabezado (setSortingEnabled)
+        if column < 0:
+            orden = None
+        elif self.columnas[column].campo is None:
+            return
+        else:
+            orden = (column, order == Qt.DescendingOrder)
+        if orden == self._orden:
+            return
+        self._orden = orden
+        self._aplicarVista()
+
+    def filtrar(self, filtros):
+        """Aplica los textos {columna: texto} de la BarraFiltros (vacio quita el filtro) y vuelve a leer la tabla."""
+        nuevos = dict(self._filtros)
+        for columna, valor in filtros.items():
+            valor = valor.strip()
+            if valor:
+                nuevos[columna] = valor
+            else:
+                nuevos.pop(columna, None)
+        if nuevos == self._filtros:
+            return
+        self._filtros = nuevos
+        self._aplicarVista()
+
+    def _aplicarVista(self):
+        if self.consulta is None:
+            return  # se aplica en la siguiente carga
+        self.cambiarConsulta(self.consultaVista(self.consulta.base))
+
+    def _bloque(self, fila):
+        numero = fila // TAMANO_PAGINA
+        # Al pintar, las celdas seguidas casi siempre caen en el mismo bloque
+        if numero == self._ultimo[0]:
+            return self._ultimo[1]
+        bloque = self._bloques.get(numero)
+        if bloque is not None:
+            self._bloques.move_to_end(numero)
+            self._ultimo = (numero, bloque)
+            return bloque
+        inicio = numero * TAMANO_PAGINA
+        fin = min(inicio + TAMANO_PAGINA, len(self._data))
+        if inicio >= fin:
+            return None
+        filas = [self._data[i] for i in range(inicio, fin)]
+        # Una columna a la vez: el formato y la posicion se resuelven una vez por columna
+        textos = []
+        for columna, posicion in zip(self.columnas, self._posiciones):
+            formato = columna.formato
+            textos.append([None] * len(filas) if formato is None else [formato(fila[posicion]) for fila in filas])
+        colores = array("B", [self.color.indice(fila) for fila in filas]) if self.color is not None else None
+        bloque = _Bloque(textos, colores)
+        self._bloques[numero] = bloque
+        self._ultimo = (numero, bloque)
+        if len(self._bloques) > MAX_BLOQUES:
+            self._bloques.popitem(last=False)
+        return bloque
+
+    def _limpiarBloques(self):
+        self._bloques.clear()
+        self._ultimo = (None, None)
+
+    def _descartarDesde(self, fila):
+        # Insertar o quitar filas recorre los indices de todos los bloques siguientes
+        primero = fila // TAMANO_PAGINA
+        for numero in [n for n in self._bloques if n >= primero]:
+            del self._bloques[numero]
+        self._ultimo = (None, None)
+
+    def _descartar(self, inicio, fin):
+        for numero in range(inicio // TAMANO_PAGINA, fin // TAMANO_PAGINA + 1):
+            self._bloques.pop(numero, None)
+        self._ultimo = (None, None)
+
+def _sumar(valores):
+    # Los NULL (una columna de LEFT JOIN o un SUM sin filas) no cuentan en la suma
+    return sum(valor for valor in valores if valor is not None)
+
+class ReporteModel(QAbstractTableModel):
+    # columnas: [Columna]; la posicion es el indice del valor en la fila del resultado
+    # sumas: posiciones de las columnas que se suman en los subtotales y el total
+    # grupo: posicion por la que viene ordenado el resultado; al terminar cada
+    #        grupo se agrega una fila de subtotal (None: solo la fila de total)
+    FONDO_TOTAL = QColor(235, 235, 235)
+
+    def __init__(self, columnas, sumas=(), grupo=None):
+        super().__init__()
+        self.columnas = columnas
+        self.sumas = tuple(sumas)
+        self.grupo = grupo
+        self._posiciones = [i if columna.posicion is None else columna.posicion
+                            for i, columna in enumerate(columnas)]
+        self._alineaciones = [columna.alineacion for columna in columnas]
+        self._formato_grupo = next((columna.formato for columna, posicion in zip(columnas, self._posiciones)
+                                    if posicion == grupo), texto)
+        self._negrita = QFont()
+        self._negrita.setBold(True)
+        self._limpiar()
+
+    def _limpiar(self):
+        self._valores = []                # una tupla por columna del resultado
+        self._filas = 0
+        self._subtotales = array("l")     # fila de la vista de cada subtotal
+        self._grupos = []                 # (valor del grupo, filas, {posicion: suma}) de cada subtotal
+        self._total = {}
+
+    def cargar(self, filas):
+        """Muestra el resultado filas (ordenado por la columna de grupo, si hay)."""
+        self.beginResetModel()
+        self._limpiar()
+        self._filas = len(filas)
+        if filas:
+            self._valores = list(zip(*filas))
+        inicios = [0]
+        if self.grupo is not None and filas:
+            claves = self._valores[self.grupo]
+            inicios += [i for i in range(1, len(claves)) if claves[i] != claves[i - 1]]
+        inicios.append(self._filas)
+        if self.grupo is not None and filas:
+            for numero, (inicio, fin) in enumerate(zip(inicios, inicios[1:])):
+                sumas = {posicion: _sumar(self._valores[posicion][inicio:fin]) for posicion in self.sumas}
+                self._grupos.append((self._valores[self.grupo][inicio], fin - inicio, sumas))
+                # El subtotal va despues de la ultima fila del grupo
+                self._subtotales.append(fin + numero)
+            self._total = {posicion: sum(sumas[posicion] for _, _, sumas in self._grupos) for posicion in self.sumas}
+        else:
+            self._total = {posicion: _sumar(self._valores[posicion]) if filas else 0 for posicion in self.sumas}
+        self.endResetModel()
+
+    def total(self, posicion):
+        return self._total.get(posicion, 0)
+
+    def subtotales(self):
+        """Retorna [(valor del grupo, filas, {posicion: suma})] de cada grupo."""
+        return list(self._grupos)
+
+    def rowCount(self, parent=None):
+        # filas del resultado + subtotales + total
+        return self._filas + len(self._subtotales) + 1 if self._filas else 0
+
+    def columnCount(self, parent=None):
+        return len(self.columnas)
+
+    def headerData(self, section, orientation, role):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.columnas[section].titulo
+        return None
+
+    def _ubicar(self, fila):
+        # Retorna ("dato", indice), ("subtotal", grupo) o ("total", None)
+        if fila == self.rowCount() - 1:
+            return "total", None
+        antes = bisect_left(self._subtotales, fila)
+        if antes < len(self._subtotales) and self._subtotales[antes] == fila:
+            return "subtotal", antes
+        return "dato", fila - antes
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if role == Qt.TextAlignmentRole:
+            return self._alineaciones[index.column()]
+        if role not in (Qt.DisplayRole, Qt.FontRole, Qt.BackgroundRole):
+            return None
+        tipo, indice = self._ubicar(index.row())
+        if tipo != "dato":
+            if role == Qt.FontRole:
+                return self._negrita
+            if role == Qt.BackgroundRole:
+                return self.FONDO_TOTAL
+        elif role != Qt.DisplayRole:
+            return None
+        columna = self.columnas[index.column()]
+        posicion = self._posiciones[index.column()]
+        if tipo == "dato":
+            return columna.formato(self._valores[posicion][indice])
+        if tipo == "subtotal":
+            valor, filas, sumas = self._grupos[indice]
+            if index.column() == 0:
+                return f"Subtotal {self._formato_grupo(valor)} ({filas:,})"
+            return columna.formato(sumas[posicion]) if posicion in sumas else ""
+        if index.column() == 0:
+            return f"Total ({self._filas:,})"
+        return columna.formato(self._total[posicion]) if posicion in self._total else ""
+
+    # Lo que necesita exportar.py: solo las filas del resultado, sin subtotales
+    consulta = None
+
+    def columnasDatos(self):
+        return [(columna.titulo, posicion) for columna, posicion in zip(self.columnas, self._posiciones)]
+
+    def copiaFilas(self):
+        return list(zip(*self._valores))
+
+def activarOrden(vista):
+    """Ordena la tabla con click en el encabezado, sin reordenar al activarlo."""
+    vista.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder)
+    vista.setSortingEnabled(True)
+
+class BarraFiltros(QWidget):
+    # Un campo de texto por cada columna con filtro del modelo; el filtro se
+    # aplica cuando se deja de escribir ESPERA_FILTRO ms
+    def __init__(self, modelo, parent=None):
+        super().__init__(parent)
+        self.modelo = modelo
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        self._pendientes = {}
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(ESPERA_FILTRO)
+        self._timer.timeout.connect(self._aplicar)
+        for indice, columna in enumerate(modelo.columnas):
+            if columna.filtro is None:
+                continue
+            campo = QLineEdit(self)
+            campo.setPlaceholderText(f"Filtrar {columna.titulo}")
+            campo.setClearButtonEnabled(True)
+            campo.textChanged.connect(lambda valor, indice=indice: self._cambio(indice, valor))
+            layout.addWidget(campo)
+
+    def _cambio(self, indice, valor):
+        self._pendientes[indice] = valor
+        self._timer.start()
+
+    def _aplicar(self):
+        pendientes, self._pendientes = self._pendientes, {}
+        self.modelo.filtrar(pendientes)
+
+def tablaConFiltros(vista):
+    """Retorna un widget con la BarraFiltros del modelo de vista arriba de la tabla, y activa el orden."""
+    activarOrden(vista)
+    contenedor = QWidget()
+    layout = QVBoxLayout(contenedor)
+    layout.setContentsMargins(0, 0, 0, 0)
+    barra = BarraFiltros(vista.model(), contenedor)
+    if barra.layout().count():
+        layout.addWidget(barra)
+    else:
+        barra.hide()
+    layout.addWidget(vista)
+    return contenedor
@@ -4,102 +4,52 @@ from PyQt5.QtWidgets import (QMainWindow, QPushButton, QVBoxLayout, QHBoxLayout,
                             QLineEdit, QDateEdit, QComboBox, QMessageBox, QLabel, QSplitter,
                             QDialogButtonBox, QApplication, QFrame, QGridLayout, QSizePolicy, 
                             QStackedWidget, QSpinBox, QTabWidget, QTextEdit, QDoubleSpinBox)
-from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QDate, QSize, pyqtSignal
-from PyQt5.QtGui import QPixmap, QIcon, QFont, QColor, QStandardItemModel, QStandardItem
+from PyQt5.QtCore import Qt, QModelIndex, QDate, QSize, pyqtSignal
+from PyQt5.QtGui import QIcon, QFont, QColor
 from PyQt5.QtSql import QSqlDatabase, QSqlQuery, QSqlTableModel, QSqlQueryModel
 import mysql.connector
 from datetime import datetime
-import os
-from dotenv import load_dotenv
-
-class VentaTableModel(QAbstractTableModel):
-    def __init__(self, data=None):
-        super().__init__()
-        self._data = data if data is not None else []
-        self._headers = ["ID", "Cliente", "Usuario ID", "Fecha de Venta", "Monto Total", "Estado", "Acciones"]
-                        # 0,        1,         2,              3,               4,          5,         6
-    def data(self, index, role):
-        if not index.isValid() or not (0 <= index.row() < len(self._data)):
-            return None
-
-        if role == Qt.DisplayRole:
-            if index.column() == 6:  # Columna de acciones
-                return None
-            value = self._data[index.row()][index.column()]
-            if index.column() == 3 and isinstance(value, datetime):  # Fecha
-                return value.strftime("%Y-%m-%d")
-            elif index.column() == 4:  # Monto total
-                return f"${value:,.2f}"
-            return str(value)
-
-        elif role == Qt.TextAlignmentRole:
-            if index.column() == 4:  # Monto total
-                return Qt.AlignRight | Qt.AlignVCenter
-            return Qt.AlignCenter
-
-        elif role == Qt.BackgroundRole: # Estado
-            estado = self._data[index.row()][5]
-            return {
-                'Pendiente': QColor(255, 255, 224),    # Amarillo claro
-                'Completada': QColor(240, 255, 240)    # Verde claro
-            }.get(estado, QColor(255, 255, 255))
-
-        return None
-
-    def rowCount(self, parent=None):
-        return len(self._data)
-
-    def columnCount(self, parent=None):
-        return len(self._headers)
-
-    def headerData(self, section, orientation, role):
-        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
-            return self._headers[section]
-        return None
-
-    def refreshData(self, data):
-        self.beginResetModel()
-        self._data = data
-        self.endResetModel()
-
-class DetalleTableModel(QAbstractTableModel):
-    def __init__(self, data=None):
-        super().__init__()
-        self._data = data if data is not None else []
-        self._headers = ["ID", "Venta ID", "Inventario ID", "Cantidad", "Acciones"]
-
-    def data(self, index, role):
-        if not index.isValid() or not (0 <= index.row() < len(self._data)):
-            return None
-
-        if role == Qt.DisplayRole:
-            if index.column() == 4:  # Columna de acciones
-                return None
-            value = self._data[index.row()][index.column()]
-            if index.column() == 3:  # Cantidad
-                return f"{value} unidades"
-            return str(value)
-
-        elif role == Qt.TextAlignmentRole:
-            return Qt.AlignCenter
-
-        return None
-
-    def rowCount(self, parent=None):
-        return len(self._data)
-
-    def columnCount(self, parent=None):
-        return len(self._headers)
-
-    def headerData(self, section, orientation, role):
-        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
-            return self._headers[section]
-        return None
-
-    def refreshData(self, data):
-        self.beginResetModel()
-        self._data = data
-        self.endResetModel()
+from conexion import obtenerConexion
+import imagenes
+from paginacion import ConsultaPaginada, leerConsulta
+from ejecutor import EjecutorConsultas
+from tablas import (TablaModel, ReporteModel, Columna, ColorPorValor, ACCIONES, CENTRO, DERECHA, fecha, moneda,
+                    unidades, filtroIgual, filtroFecha, tablaConFiltros)
+from sincronizacion import Sincronizador
+from acciones import BotonesDelegate, Boton
+from movimientos import completarOrden, describirFallidos
+from catalogo import catalogoInventario, leerInventario
+
+# Consultas de lectura de la ventana; migrar.py --verificar corre EXPLAIN sobre estas mismas
+CONSULTA_VENTAS = ConsultaPaginada("SELECT * FROM venta", [("ven_fecha_venta", 3, True), ("ven_id", 0, True)])
+SQL_COTIZACIONES_PENDIENTES = "SELECT * FROM venta WHERE ven_estado = 'Pendiente'"
+SQL_VENTAS_COMPLETADAS = "SELECT * FROM venta WHERE ven_estado = 'Completada'"
+SQL_REPORTE_MENSUAL = """
+    SELECT ven_fecha_venta, ven_monto_total
+    FROM venta
+    WHERE ven_fecha_venta BETWEEN %s AND %s
+    ORDER BY ven_fecha_venta
+"""
+
+def consultaDetalleVenta(ven_id):
+    """Retorna la consulta del detalle de una venta."""
+    return ConsultaPaginada("SELECT * FROM detalle_venta", [("dv_id", 0, False)], "ven_id = %s", (ven_id,))
+
+class VentaTableModel(TablaModel):
+    columnas = [Columna("ID", campo="ven_id"), Columna("Cliente"),
+                Columna("Usuario ID", campo="ven_usu_id", nulos=True, filtro=filtroIgual("ven_usu_id")),
+                Columna("Fecha de Venta", fecha, campo="ven_fecha_venta", filtro=filtroFecha("ven_fecha_venta")),
+                Columna("Monto Total", moneda, DERECHA, campo="ven_monto_total"),
+                Columna("Estado", filtro=filtroIgual("ven_estado")), ACCIONES]
+    alineacion = CENTRO
+    color = ColorPorValor(5, {
+        'Pendiente': QColor(255, 255, 224),    # Amarillo claro
+        'Completada': QColor(240, 255, 240)    # Verde claro
+    })
+
+class DetalleTableModel(TablaModel):
+    columnas = [Columna("ID"), Columna("Venta ID"), Columna("Inventario ID"), Columna("Cantidad", unidades), ACCIONES]
+    alineacion = CENTRO
 
 class VentaDialog(QDialog):
     def __init__(self, parent=None, venta_data=None):
@@ -197,10 +147,10 @@ class VentaDialog(QDialog):
         }
 
 class DetalleDialog(QDialog):
-    def __init__(self, parent=None, detalle_data=None, inventario_items=None, tipo="solicitud"):
+    def __init__(self, parent=None, detalle_data=None, catalogo=None, tipo="solicitud"):
         super().__init__(parent)
         self.detalle_data = detalle_data
-        self.inventario_items = inventario_items or []
+        self.catalogo = catalogo if catalogo is not None else catalogoInventario()
         self.tipo = tipo  # "solicitud" o "venta"
         self.initUI()
 
@@ -251,12 +201,15 @@ class DetalleDialog(QDialog):
         layout = QFormLayout()
 
         # Campo para inventario
+        # El combo usa el catalogo compartido como modelo, sin copiar los productos
         self.inventario_combo = QComboBox()
-        if self.inventario_items:
-            for item in self.inventario_items:
-                self.inventario_combo.addItem(f"{item[0]} - {item[2]}", item[0])  # ID - Producto
-        else:
-            self.inventario_combo.addItem("Sin productos disponibles")
+        self.inventario_combo.setModel(self.catalogo)
+        self.inventario_combo.view().setUniformItemSizes(True)
+        # AdjustToContents recorreria todos los productos para medir el texto mas largo
+        self.inventario_combo.setSizeAdjustPolicy(QComboBox.AdjustToMinimumContentsLengthWithIcon)
+        self.inventario_combo.setMinimumContentsLength(30)
+        if self.catalogo.rowCount() == 0:
+            self.inventario_combo.setPlaceholderText("Sin productos disponibles")
         layout.addRow("Producto:", self.inventario_combo)
 
         # Campo para cantidad
@@ -275,10 +228,9 @@ class DetalleDialog(QDialog):
         # Precargar datos si se está editando
         if self.detalle_data:
             # Buscar el item en el combo por ID
-            for i in range(self.inventario_combo.count()):
-                if self.inventario_combo.itemData(i) == self.detalle_data[2]:
-                    self.inventario_combo.setCurrentIndex(i)
-                    break
+            posicion = self.catalogo.posicion(self.detalle_data[2])
+            if posicion >= 0:
+                self.inventario_combo.setCurrentIndex(posicion)
             self.cantidad_spin.setValue(int(self.detalle_data[3]))
 
     def getDetalleData(self):
@@ -300,12 +252,20 @@ class VentasWindow(QMainWindow):
         # Datos para las tablas
         self.ventas_data = []
         self.detalle_venta_data = []
-        self.inventario_items = []
+        self.catalogo = catalogoInventario()
         
         # Variables para tracking
         self.selected_venta_id = None
         
+        # Refresco periodico con solo las filas que cambiaron; la primera marca se toma en segundo plano
+        self.sincronizador = Sincronizador(self)
+        # Las cargas de las tablas y reportes corren en segundo plano, la ventana no se congela
+        self.ejecutor = EjecutorConsultas(self)
         self.initUI()
+        self.sincronizador.registrar(self.ventas_model, self.ventas_table)
+        self.sincronizador.registrar(self.detalle_venta_model, self.detalle_venta_table)
+        # El catalogo compartido recibe las existencias que cambiaron otros usuarios
+        self.sincronizador.registrar(self.catalogo, self)
         self.loadInitialData()
 
     def initUI(self):
@@ -436,9 +396,8 @@ class VentasWindow(QMainWindow):
 
         # Logo
         logo_label = QLabel()
-        logo_pixmap = QPixmap("Logo-Grupo-Porteo-White.png")
+        logo_pixmap = imagenes.pixmap("Logo-Grupo-Porteo-White.png", 40)
         if not logo_pixmap.isNull():
-            logo_pixmap = logo_pixmap.scaled(40, 40, Qt.KeepAspectRatio, Qt.SmoothTransformation)
             logo_label.setPixmap(logo_pixmap)
         logo_label.setStyleSheet("background-color: transparent; border: none;")
         self.toolbar.addWidget(logo_label)
@@ -505,11 +464,15 @@ class VentasWindow(QMainWindow):
         
         self.ventas_model = VentaTableModel()
         self.ventas_table.setModel(self.ventas_model)
+        # Botones de acción pintados por un delegate en lugar de crear widgets por fila
+        self.ventas_table.setItemDelegateForColumn(6, BotonesDelegate(self.ventas_table, [
+            Boton("Editar", self.editVenta),
+            Boton("Eliminar", self.deleteVenta, eliminar=True)]))
         
         # Conectar selección de fila
         self.ventas_table.selectionModel().selectionChanged.connect(self.onVentaSelected)
         
-        ventas_layout.addWidget(self.ventas_table)
+        ventas_layout.addWidget(tablaConFiltros(self.ventas_table))
         
         # Botones para ventas
         ventas_buttons = QHBoxLayout()
@@ -545,6 +508,9 @@ class VentasWindow(QMainWindow):
         
         self.detalle_venta_model = DetalleTableModel()
         self.detalle_venta_table.setModel(self.detalle_venta_model)
+        self.detalle_venta_table.setItemDelegateForColumn(4, BotonesDelegate(self.detalle_venta_table, [
+            Boton("Editar", self.editDetalleVenta),
+            Boton("Eliminar", self.deleteDetalleVenta, eliminar=True)], alto=25))
         
         detalle_venta_layout.addWidget(self.detalle_venta_table)
         
@@ -632,8 +598,10 @@ class VentasWindow(QMainWindow):
         
         self.reporte_mensual_table = QTableView()
         self.reporte_mensual_table.setStyleSheet("border: none;")
-        self.reporte_mensual_model = QStandardItemModel()
-        self.reporte_mensual_model.setHorizontalHeaderLabels(["Fecha Venta", "Monto Total"])
+        # Ventas del mes con subtotal por dia y total del mes
+        self.reporte_mensual_model = ReporteModel(
+            [Columna("Fecha Venta", lambda valor: valor.strftime("%d-%m-%Y")), Columna("Monto Total", moneda, DERECHA)],
+            sumas=[1], grupo=0)
         self.reporte_mensual_table.setModel(self.reporte_mensual_model)
         reporte_mensual_layout.addWidget(self.reporte_mensual_table)
         splitter.addWidget(reporte_mensual_frame)
@@ -644,13 +612,8 @@ class VentasWindow(QMainWindow):
 
     def connectToDatabase(self):
         try:
-            load_dotenv()
-            self.db_connection = mysql.connector.connect(
-                host=os.environ.get("DB_HOST"),
-                database=os.environ.get("DB_DATABASE"),
-                user=os.environ.get("DB_USER"),
-                password=os.environ.get("DB_PASSWORD")
-            )
+            # Conexion prestada del pool compartido, close() la regresa al pool
+            self.db_connection = obtenerConexion()
             return True
         except mysql.connector.Error as err:
             QMessageBox.critical(self, "Error de base de datos", f"No se pudo conectar: {err}")
@@ -661,59 +624,23 @@ class VentasWindow(QMainWindow):
         self.loadVentas()
         return
     
+    def mostrarErrorCarga(self, que):
+        """Retorna la funcion que muestra el error de una carga en segundo plano."""
+        return lambda err: QMessageBox.critical(self, "Error de base de datos", f"Error al cargar {que}: {err}")
+
     def loadInventarioItems(self):
-        if not self.connectToDatabase():
-            return
-        try:
-            cursor = self.db_connection.cursor()
-            cursor.execute("SELECT inv_id, inv_alm_id, inv_producto, inv_cantidad FROM inventario ORDER BY inv_producto")
-            self.inventario_items = cursor.fetchall()
-            cursor.close()
-        except mysql.connector.Error as err:
-            QMessageBox.critical(self, "Error de base de datos", f"Error al cargar inventario: {err}")
-        finally:
-            if self.db_connection:
-                self.db_connection.close()
+        # Carga completa del catalogo compartido; despues solo se actualizan los productos movidos
+        # (en una lambda de la ventana, medicion atribuye la consulta a este metodo)
+        self.ejecutor.ejecutar(lambda cursor: leerInventario(cursor), self.catalogo.mostrar,
+                               self.mostrarErrorCarga("inventario"), grupo="inventario")
 
     def loadVentas(self):
-        if not self.connectToDatabase():
-            return
-        try:
-            cursor = self.db_connection.cursor()
-            cursor.execute("SELECT * FROM venta ORDER BY ven_fecha_venta DESC")
-            self.ventas_data = cursor.fetchall()
-            self.ventas_model.refreshData(self.ventas_data)
-            
-            # Configurar botones de acción
-            for row in range(len(self.ventas_data)):
-                widget = QWidget()
-                layout = QHBoxLayout(widget)
-                layout.setContentsMargins(4, 4, 4, 4)
-                
-                edit_btn = QPushButton("Editar")
-                edit_btn.setFixedWidth(90)
-                edit_btn.setFixedHeight(30)
-                edit_btn.clicked.connect(lambda _, r=row: self.editVenta(r))
-                layout.addWidget(edit_btn)
-                
-                delete_btn = QPushButton("Eliminar")
-                delete_btn.setObjectName("deleteBtn")
-                delete_btn.setFixedWidth(90)
-                delete_btn.setFixedHeight(30)
-                delete_btn.clicked.connect(lambda _, r=row: self.deleteVenta(r))
-                layout.addWidget(delete_btn)
-                
-                layout.setAlignment(Qt.AlignCenter)
-                widget.setLayout(layout)
-                
-                self.ventas_table.setIndexWidget(self.ventas_model.index(row, 6), widget)
-            
-            cursor.close()
-        except mysql.connector.Error as err:
-            QMessageBox.critical(self, "Error de base de datos", f"Error al cargar ventas: {err}")
-        finally:
-            if self.db_connection:
-                self.db_connection.close()
+        # Las ventas se cargan por paginas (keyset sobre fecha, id)
+        self.ejecutor.ejecutar(lambda cursor: leerConsulta(CONSULTA_VENTAS, cursor), self.mostrarVentas,
+                               self.mostrarErrorCarga("ventas"), grupo="ventas")
+
+    def mostrarVentas(self, ventas):
+        self.ventas_data = self.ventas_model.mostrarConsulta(ventas)
 
     def onVentaSelected(self, selected, deselected):
         indexes = selected.indexes()
@@ -729,34 +656,10 @@ class VentasWindow(QMainWindow):
         if not self.connectToDatabase():
             return
         try:
-            cursor = self.db_connection.cursor()
-            cursor.execute("SELECT * FROM detalle_venta WHERE ven_id = %s", (venta_id,))
-            self.detalle_venta_data = cursor.fetchall()
-            self.detalle_venta_model.refreshData(self.detalle_venta_data)
-            
-            # Configurar botones de acción
-            for row in range(len(self.detalle_venta_data)):
-                widget = QWidget()
-                layout = QHBoxLayout(widget)
-                layout.setContentsMargins(2, 2, 2, 2)
-                
-                edit_btn = QPushButton("Editar")
-                edit_btn.setFixedWidth(90)
-                edit_btn.setFixedHeight(25)
-                edit_btn.clicked.connect(lambda _, r=row: self.editDetalleVenta(r))
-                layout.addWidget(edit_btn)
-                
-                delete_btn = QPushButton("Eliminar")
-                delete_btn.setObjectName("deleteBtn")
-                delete_btn.setFixedWidth(90)
-                delete_btn.setFixedHeight(25)
-                delete_btn.clicked.connect(lambda _, r=row: self.deleteDetalleVenta(r))
-                layout.addWidget(delete_btn)
-                
-                layout.setAlignment(Qt.AlignCenter)
-                widget.setLayout(layout)
-                
-                self.detalle_venta_table.setIndexWidget(self.detalle_venta_model.index(row, 4), widget)
+            # Se repite en cada click de la tabla de ventas: sentencia preparada de la conexion
+            cursor = self.db_connection.cursor(prepared=True)
+            # El modelo guarda la consulta para releer filas sueltas despues de cada cambio
+            self.detalle_venta_data = self.detalle_venta_model.cargarLista(consultaDetalleVenta(venta_id), cursor)
             
             cursor.close()
         except mysql.connector.Error as err:
@@ -784,10 +687,11 @@ class VentasWindow(QMainWindow):
                     data["monto_total"], data["estado"]
                 ))
                 self.db_connection.commit()
+                # Solo se agrega la fila nueva, sin volver a cargar la tabla
+                self.ventas_model.releerFila(cursor, "ven_id", cursor.lastrowid)
                 cursor.close()
                 
                 QMessageBox.information(self, "Éxito", "Venta creada correctamente")
-                self.loadVentas()
             except mysql.connector.Error as err:
                 QMessageBox.critical(self, "Error de base de datos", f"Error al crear venta: {err}")
             finally:
@@ -814,10 +718,10 @@ class VentasWindow(QMainWindow):
                     data["monto_total"], data["estado"], record[0]
                 ))
                 self.db_connection.commit()
+                self.ventas_model.releerFila(cursor, "ven_id", record[0], row)
                 cursor.close()
                 
                 QMessageBox.information(self, "Éxito", "Venta actualizada correctamente")
-                self.loadVentas()
             except mysql.connector.Error as err:
                 QMessageBox.critical(self, "Error de base de datos", f"Error al actualizar venta: {err}")
             finally:
@@ -845,10 +749,10 @@ class VentasWindow(QMainWindow):
                 cursor.execute("DELETE FROM venta WHERE ven_id = %s", (record[0],))
                 
                 self.db_connection.commit()
+                self.ventas_model.quitarFila(row)
                 cursor.close()
                 
                 QMessageBox.information(self, "Éxito", "Venta eliminada correctamente")
-                self.loadVentas()
             except mysql.connector.Error as err:
                 QMessageBox.critical(self, "Error de base de datos", f"Error al eliminar venta: {err}")
             finally:
@@ -860,7 +764,7 @@ class VentasWindow(QMainWindow):
             QMessageBox.warning(self, "Advertencia", "Seleccione una venta primero")
             return
             
-        dialog = DetalleDialog(self, inventario_items=self.inventario_items, tipo="venta")
+        dialog = DetalleDialog(self, catalogo=self.catalogo, tipo="venta")
         if dialog.exec_() == QDialog.Accepted:
             data = dialog.getDetalleData()
             
@@ -874,10 +778,10 @@ class VentasWindow(QMainWindow):
                 """
                 cursor.execute(query, (self.selected_venta_id, data["inventario_id"], data["cantidad"]))
                 self.db_connection.commit()
+                self.detalle_venta_model.releerFila(cursor, "dv_id", cursor.lastrowid)
                 cursor.close()
                 
                 QMessageBox.information(self, "Éxito", "Producto agregado al detalle")
-                self.loadDetalleVenta(self.selected_venta_id)
             except mysql.connector.Error as err:
                 QMessageBox.critical(self, "Error de base de datos", f"Error al agregar detalle: {err}")
             finally:
@@ -886,7 +790,7 @@ class VentasWindow(QMainWindow):
 
     def editDetalleVenta(self, row):
         record = self.detalle_venta_data[row]
-        dialog = DetalleDialog(self, record, self.inventario_items, "venta")
+        dialog = DetalleDialog(self, record, self.catalogo, "venta")
         if dialog.exec_() == QDialog.Accepted:
             data = dialog.getDetalleData()
             
@@ -901,10 +805,10 @@ class VentasWindow(QMainWindow):
                 """
                 cursor.execute(query, (data["inventario_id"], data["cantidad"], record[0]))
                 self.db_connection.commit()
+                self.detalle_venta_model.releerFila(cursor, "dv_id", record[0], row)
                 cursor.close()
                 
                 QMessageBox.information(self, "Éxito", "Detalle actualizado correctamente")
-                self.loadDetalleVenta(self.selected_venta_id)
             except mysql.connector.Error as err:
                 QMessageBox.critical(self, "Error de base de datos", f"Error al actualizar detalle: {err}")
             finally:
@@ -927,10 +831,10 @@ class VentasWindow(QMainWindow):
                 cursor = self.db_connection.cursor()
                 cursor.execute("DELETE FROM detalle_venta WHERE dv_id = %s", (record[0],))
                 self.db_connection.commit()
+                self.detalle_venta_model.quitarFila(row)
                 cursor.close()
                 
                 QMessageBox.information(self, "Éxito", "Producto eliminado del detalle")
-                self.loadDetalleVenta(self.selected_venta_id)
             except mysql.connector.Error as err:
                 QMessageBox.critical(self, "Error de base de datos", f"Error al eliminar detalle: {err}")
             finally:
@@ -958,30 +862,28 @@ class VentasWindow(QMainWindow):
             if not self.connectToDatabase():
                 return
             try:
-                cursor = self.db_connection.cursor()
-                
-                # Actualizar estado de la venta
-                cursor.execute("UPDATE venta SET ven_estado = 'Completada' WHERE ven_id = %s", 
-                             (self.selected_venta_id,))
-                
-                # Actualizar inventario con las cantidades ventadas
-                for detalle in self.detalle_venta_data:
-                    inv_id = detalle[2]
-                    cantidad_ventada = detalle[3]
-                    
-                    cursor.execute("""
-                        UPDATE inventario 
-                        SET inv_cantidad = inv_cantidad - %s 
-                        WHERE inv_id = %s
-                    """, (cantidad_ventada, inv_id))
-                
+                # Estado de la venta e inventario de todos los productos en una sola transaccion
+                resultado = completarOrden(self.db_connection, "venta", self.selected_venta_id)
+                if not resultado.aplicada:
+                    self.db_connection.rollback()
+                    QMessageBox.warning(self, "Advertencia", describirFallidos(resultado))
+                    return
                 self.db_connection.commit()
+                
+                # Solo se relee la venta completada para mostrar su estado nuevo
+                cursor = self.db_connection.cursor()
+                self.ventas_model.releerFila(cursor, "ven_id", self.selected_venta_id,
+                                             self.ventas_model.buscarFila(self.selected_venta_id))
                 cursor.close()
                 
-                QMessageBox.information(self, "Éxito", "Venta completada e inventario actualizado")
-                self.loadVentas()
-                self.loadInventarioItems()  # Recargar inventario actualizado
+                QMessageBox.information(self, "Éxito", f"Venta completada e inventario actualizado "
+                                        f"({len(resultado.resultados)} productos)")
+                self.catalogo.actualizarExistencias(resultado.resultados)  # Solo los productos movidos
             except mysql.connector.Error as err:
+                try:
+                    self.db_connection.rollback()
+                except mysql.connector.Error:
+                    pass
                 QMessageBox.critical(self, "Error de base de datos", f"Error al completar venta: {err}")
             finally:
                 if self.db_connection:
@@ -994,68 +896,48 @@ class VentasWindow(QMainWindow):
         self.generarReporteMensual()
 
     def loadCotizacionesPendientes(self):
-        if not self.connectToDatabase():
-            return
-        try:
-            cursor = self.db_connection.cursor()
-            cursor.execute("SELECT * FROM venta WHERE ven_estado = 'Pendiente'")
-            self.cotizaciones_model.refreshData(cursor.fetchall())
-            self.ajustarColumnas(self.cotizaciones_table)
-            cursor.close()
-        except mysql.connector.Error as err:
-            QMessageBox.critical(self, "Error de base de datos", f"Error al cargar ventas: {err}")
-        finally:
-            if self.db_connection:
-                self.db_connection.close()
+        def consultar(cursor):
+            cursor.execute(SQL_COTIZACIONES_PENDIENTES)
+            return cursor.fetchall()
+
+        self.ejecutor.ejecutar(consultar, self.mostrarCotizacionesPendientes,
+                               self.mostrarErrorCarga("cotizaciones"), grupo="cotizaciones")
+
+    def mostrarCotizacionesPendientes(self, datos):
+        self.cotizaciones_model.refreshData(datos)
+        self.ajustarColumnas(self.cotizaciones_table)
 
     def loadVentasCompletadas(self):
-        if not self.connectToDatabase():
-            return
-        try:
-            cursor = self.db_connection.cursor()
-            cursor.execute("SELECT * FROM venta WHERE ven_estado = 'Completada'")
-            datos = cursor.fetchall()
-            self.ventas_completadas_model.refreshData(datos)
-            self.ajustarColumnas(self.ventas_completadas_table)
-            cursor.close()
-        except mysql.connector.Error as err:
-            QMessageBox.critical(self, "Error de base de datos", f"Error al cargar ventas: {err}")
-        finally:
-            if self.db_connection:
-                self.db_connection.close()
+        def consultar(cursor):
+            cursor.execute(SQL_VENTAS_COMPLETADAS)
+            return cursor.fetchall()
+
+        self.ejecutor.ejecutar(consultar, self.mostrarVentasCompletadas,
+                               self.mostrarErrorCarga("ventas completadas"), grupo="completadas")
+
+    def mostrarVentasCompletadas(self, datos):
+        self.ventas_completadas_model.refreshData(datos)
+        self.ajustarColumnas(self.ventas_completadas_table)
 
     def generarReporteMensual(self):
-        if not self.connectToDatabase():
-            return
-        try:
-            fecha = self.date_edit_reporte.date()
-            inicio_mes = QDate(fecha.year(), fecha.month(), 1)
-            fin_mes = inicio_mes.addMonths(1).addDays(-1)
-
-            cursor = self.db_connection.cursor()
-            query = """
-            SELECT ven_fecha_venta, ven_monto_total 
-            FROM venta 
-            WHERE ven_fecha_venta BETWEEN %s AND %s
-            ORDER BY ven_fecha_venta
-            """
-            cursor.execute(query, (
-                inicio_mes.toString("yyyy-MM-dd"),
-                fin_mes.toString("yyyy-MM-dd")
-            ))
-            
-            self.reporte_mensual_model.clear()
-            self.reporte_mensual_model.setHorizontalHeaderLabels(["Fecha Venta", "Monto Total"])
-            
-            for row in cursor.fetchall():
-                fecha = QStandardItem(row[0].strftime("%d-%m-%Y"))
-                monto = QStandardItem(f"${row[1]:,.2f}")
-                self.reporte_mensual_model.appendRow([fecha, monto])
-                
-            self.ajustarColumnas(self.reporte_mensual_table)
-            
-        except mysql.connector.Error as err:
-            QMessageBox.critical(self, "Error", f"Error al generar reporte: {err}")
+        fecha = self.date_edit_reporte.date()
+        inicio_mes = QDate(fecha.year(), fecha.month(), 1)
+        fin_mes = inicio_mes.addMonths(1).addDays(-1)
+        parametros = (inicio_mes.toString("yyyy-MM-dd"), fin_mes.toString("yyyy-MM-dd"))
+
+        def consultar(cursor):
+            cursor.execute(SQL_REPORTE_MENSUAL, parametros)
+            return cursor.fetchall()
+
+        # Otro mes antes de que termine el anterior: solo se muestra el ultimo
+        self.ejecutor.ejecutar(consultar, self.mostrarReporteMensual,
+                               lambda err: QMessageBox.critical(self, "Error", f"Error al generar reporte: {err}"),
+                               grupo="reporte")
+
+    def mostrarReporteMensual(self, filas):
+        # El modelo guarda las columnas tal cual; el texto se arma al pintar cada celda
+        self.reporte_mensual_model.cargar(filas)
+        self.ajustarColumnas(self.reporte_mensual_table)
 
     def ajustarColumnas(self, tabla):
         tabla.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
@@ -0,0 +1,166 @@
+# Detector de congelamientos de la interfaz.
+# Un QTimer del hilo de la interfaz marca un latido cada INTERVALO_MS; si el
+# ciclo de eventos esta ocupado (loadDataMain, completarCompra, un redibujo de
+# matplotlib) el latido se atrasa. Un hilo aparte revisa el ultimo latido y,
+# cuando pasan mas de ERP_CONGELA_MS sin el, toma muestras de la pila de Python
+# del hilo de la interfaz hasta que vuelve el latido. Cada congelamiento se
+# guarda con su duracion, la ventana activa y las pilas mas repetidas en un log
+# circular: se reescribe con cada uno y conserva solo los ultimos ERP_CONGELA_MAX,
+# incluidos los de sesiones anteriores.
+#
+# Las muestras solo se toman cuando el hilo de la interfaz suelta el GIL (E/S de
+# la base, dibujo de Qt); un calculo de Python puro que nunca lo suelta se
+# registra igual, pero con menos muestras.
+#
+# Variables de entorno (.env):
+# ERP_VIGILAR=0               -> desactiva el detector (por defecto activo)
+# ERP_CONGELA_MS=500          -> milisegundos sin latido para considerar la interfaz congelada
+# ERP_CONGELA_MAX=50          -> congelamientos que se conservan en el log
+# ERP_LOG_CONGELAMIENTOS      -> archivo del log (por defecto congelamientos.log)
+import datetime
+import os
+import re
+import sys
+import threading
+import time
+import traceback
+from collections import Counter, deque
+from PyQt5.QtCore import QObject, QTimer, Qt
+from PyQt5.QtWidgets import QApplication
+from dotenv import load_dotenv
+
+load_dotenv()
+
+def _entero(nombre, defecto):
+    try:
+        return int(os.environ.get(nombre, defecto))
+    except ValueError:
+        return defecto
+
+ACTIVO = os.environ.get("ERP_VIGILAR", "1").strip().lower() not in ("0", "false", "no")
+UMBRAL_MS = _entero("ERP_CONGELA_MS", 500)
+MAXIMO = _entero("ERP_CONGELA_MAX", 50)
+LOG_CONGELAMIENTOS = os.environ.get("ERP_LOG_CONGELAMIENTOS", "congelamientos.log")
+# Periodo del latido y de las muestras de la pila
+INTERVALO_MS = 100
+MUESTREO_MS = 20
+# Marcos de la pila que se guardan (los mas internos) y pilas distintas por congelamiento
+PROFUNDIDAD = 25
+PILAS = 3
+
+class Vigilante(QObject):
+    def __init__(self, parent=None, umbral_ms=UMBRAL_MS, archivo=LOG_CONGELAMIENTOS, maximo=MAXIMO):
+        super().__init__(parent)
+        self.umbral = umbral_ms / 1000
+        self.archivo = archivo
+        self.congelamientos = deque(maxlen=max(1, maximo))
+        self._textos = deque(leerLog(archivo), maxlen=max(1, maximo))
+        self.latencia_max = 0.0
+        self._latido = time.monotonic()
+        self._ventana = None
+        self._hilo_interfaz = threading.get_ident()
+        self._detener = threading.Event()
+        self._hilo = None
+        self._lock = threading.Lock()
+
+        self._timer = QTimer(self)
+        self._timer.setTimerType(Qt.PreciseTimer)
+        self._timer.timeout.connect(self._latir)
+
+    def iniciar(self):
+        self._latido = time.monotonic()
+        self._timer.start(INTERVALO_MS)
+        self._detener.clear()
+        self._hilo = threading.Thread(target=self._vigilar, name="vigilancia-interfaz", daemon=True)
+        self._hilo.start()
+
+    def detener(self):
+        self._timer.stop()
+        self._detener.set()
+        if self._hilo is not None:
+            self._hilo.join()
+            self._hilo = None
+
+    def _latir(self):
+        # Hilo de la interfaz: el atraso del latido es la latencia del ciclo de eventos
+        ahora = time.monotonic()
+        self.latencia_max = max(self.latencia_max, ahora - self._latido - INTERVALO_MS / 1000)
+        ventana = QApplication.activeWindow()
+        self._ventana = type(ventana).__name__ if ventana is not None else None
+        self._latido = ahora
+
+    def _muestra(self):
+        # (archivo, linea, funcion) de los marcos mas internos; el codigo fuente se lee al registrar
+        marco = sys._current_frames().get(self._hilo_interfaz)
+        pila = []
+        while marco is not None and len(pila) < PROFUNDIDAD:
+            pila.append((marco.f_code.co_filename, marco.f_lineno, marco.f_code.co_name))
+            marco = marco.f_back
+        return tuple(reversed(pila))
+
+    def _vigilar(self):
+        latido_congelado = None
+        pilas = Counter()
+        while not self._detener.wait(MUESTREO_MS / 1000):
+            latido = self._latido
+            if latido_congelado is not None and latido != latido_congelado:
+                # Volvio el latido: termino el congelamiento
+                self._registrar(latido - latido_congelado - INTERVALO_MS / 1000, pilas)
+                latido_congelado = None
+                pilas = Counter()
+            if time.monotonic() - latido - INTERVALO_MS / 1000 < self.umbral:
+                continue
+            latido_congelado = latido
+            pila = self._muestra()
+            if pila:
+                pilas[pila] += 1
+
+    def _registrar(self, duracion, pilas):
+        congelamiento = {
+            "fecha": datetime.datetime.now().isoformat(timespec="seconds"),
+            "duracion_ms": duracion * 1000,
+            "ventana": self._ventana,
+            "muestras": sum(pilas.values()),
+            "pilas": [(veces, "".join(traceback.format_list([(*marco, None) for marco in pila])))
+                      for pila, veces in pilas.most_common(PILAS)],
+        }
+        with self._lock:
+            self.congelamientos.append(congelamiento)
+            self._textos.append(formatear(congelamiento))
+            texto = "".join(self._textos)
+        print(f"Interfaz congelada {congelamiento['duracion_ms']:.0f} ms en {congelamiento['ventana'] or '?'}")
+        if not self.archivo:
+            return
+        try:
+            with open(self.archivo, "w", encoding="utf-8") as archivo:
+                archivo.write(texto)
+        except OSError as err:
+            print(f"No se pudo escribir el log de congelamientos: {err}")
+
+def formatear(congelamiento):
+    """Retorna el texto de un congelamiento para el log."""
+    lineas = [f"=== {congelamiento['fecha']} congelamiento de {congelamiento['duracion_ms']:.0f} ms "
+              f"en {congelamiento['ventana'] or '?'} ({congelamiento['muestras']} muestras)\n"]
+    for veces, pila in congelamiento["pilas"]:
+        lineas.append(f"--- {veces} de {congelamiento['muestras']} muestras:\n{pila}")
+    return "".join(lineas) + "\n"
+
+def leerLog(ruta):
+    """Retorna los congelamientos (texto) que ya estan en el log."""
+    if not ruta or not os.path.exists(ruta):
+        return []
+    try:
+        with open(ruta, encoding="utf-8") as archivo:
+            texto = archivo.read()
+    except OSError:
+        return []
+    # Cada congelamiento empieza con una linea "=== "
+    return [bloque for bloque in re.split(r"(?m)^(?==== )", texto) if bloque.strip()]
+
+def iniciar(parent=None):
+    """Arranca el detector si ERP_VIGILAR no lo desactiva; retorna el Vigilante o None."""
+    if not ACTIVO:
+        return None
+    vigilante = Vigilante(parent or QApplication.instance())
+    vigilante.iniciar()
+    return vigilante